@@ -77,6 +77,7 @@ hiddenimports = [
     "scipy",
     "scipy.special",
     "scipy.special._cdflib",
+    "scipy.stats.qmc",
     # -- Data-export libraries
     "openpyxl",
     # -- YAML (used for config/export)
@@ -150,6 +150,10 @@ def _build_wire_menu(menu, canvas, item, scene_pos):
         reroute_action.triggered.connect(lambda: canvas.reroute_wire(item))
     menu.addAction(reroute_action)
 
+    reroute_all_action = QAction("Reroute All Wires", canvas)
+    reroute_all_action.triggered.connect(canvas.reroute_all_wires)
+    menu.addAction(reroute_all_action)
+
     if item.node:
         menu.addSeparator()
         current = item.node.get_label()
@@ -211,3 +215,9 @@ def _build_empty_area_menu(menu, canvas, scene_pos):
             )
             cut_action.triggered.connect(lambda checked=False, ids=sel_ids: canvas.cut_selected_components(ids))
             menu.addAction(cut_action)
+
+    if canvas.wires:
+        menu.addSeparator()
+        reroute_all_action = QAction("Reroute All Wires", canvas)
+        reroute_all_action.triggered.connect(canvas.reroute_all_wires)
+        menu.addAction(reroute_all_action)
@@ -1,4 +1,6 @@
 import logging
+import time
+from dataclasses import replace
 
 from PyQt6.QtCore import QPoint, QPointF, QRect, QRectF, Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QBrush, QPainter, QPen
@@ -14,6 +16,7 @@ from PyQt6.QtWidgets import (
 
 logger = logging.getLogger(__name__)
 from models.clipboard import ClipboardData
+from models.wire_index import WireIndex, WireList
 
 from .annotation_item import AnnotationItem
 from .component_item import ComponentGraphicsItem
@@ -35,12 +38,24 @@ from .styles import (
     ZOOM_MIN,
     theme_manager,
 )
-from .wire_item import WireGraphicsItem, WireItem
+from .wire_item import WireGraphicsItem, WireItem, _ComponentAdapter, snapshot_components, snapshot_wire
+
+# How often finished background routes are picked up (~one frame at 60 fps)
+_ROUTING_POLL_MS = 16
+# GUI-thread time spent applying finished routes per poll
+_ROUTING_APPLY_BUDGET_S = 0.008
+
+
+def _wire_item_endpoints(wire):
+    return (wire.start_comp, wire.start_term), (wire.end_comp, wire.end_term)
 
 
 class CircuitCanvasView(QGraphicsView):
     """Main circuit drawing canvas view"""
 
+    # Route wires moved by a drag on a worker thread instead of the GUI thread
+    background_routing = True
+
     # Signals for component and wire operations
     componentAdded = pyqtSignal(str)  # component_id
     wireAdded = pyqtSignal(str, str)  # start_comp_id, end_comp_id
@@ -69,6 +84,8 @@ class CircuitCanvasView(QGraphicsView):
         self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
 
         self.components = {}  # id -> ComponentGraphicsItem
+        # Component item -> attached wire items (see wires_for_component)
+        self._wire_index = WireIndex(_wire_item_endpoints)
         self.wires = []  # All wires
         self.nodes = []  # List of Node objects
         self.terminal_to_node = {}  # (comp_id, term_idx) -> Node
@@ -89,6 +106,10 @@ class CircuitCanvasView(QGraphicsView):
         self.show_component_labels = True  # Toggle for component IDs (R1, V1, etc.)
         self.show_component_values = True  # Toggle for component values (1k, 5V, etc.)
         self.show_node_labels = True  # Toggle for node labels (n1, n2, etc.)
+        self.show_floating_markers = True  # Toggle for unconnected-terminal markers
+
+        # Opt-in pixmap caching of component items, see set_component_render_cache()
+        self._component_render_cache = False
 
         # Grid drawing deferred to first show for faster startup
         self._grid_drawn = False
@@ -97,6 +118,15 @@ class CircuitCanvasView(QGraphicsView):
         # Batched wire rerouting (dedup across group drags)
         self._pending_reroute_components = set()
         self._batch_reroute_timer = None
+        # Components whose wires need rerouting once a batched change set is applied;
+        # None outside _handle_batch_applied
+        self._batch_reroute_neighbours = None
+        # Background routing (service and poll timer created on first use)
+        self._routing_service = None
+        self._batch_router = None
+        # Large batches routed off the GUI thread: (future, wires still wanting the result)
+        self._pending_batches = []
+        self._routing_poll_timer = None
 
         # Text annotations on the canvas
         self.annotations = []
@@ -125,6 +155,8 @@ class CircuitCanvasView(QGraphicsView):
         self._scene.selectionChanged.connect(self.on_selection_changed)
 
         if self.controller:
+            # Created before our own observer, so it is current when we handle an event
+            self.controller.diagnostics.add_observer(self._on_diagnostics_changed)
             self.controller.add_observer(self._on_model_changed)
 
     def showEvent(self, event):
@@ -138,14 +170,9 @@ class CircuitCanvasView(QGraphicsView):
     # Observer Pattern
     # ===================================================================
 
-    def _on_model_changed(self, event: str, data) -> None:
-        """
-        Dispatch model change events to specific handlers.
-
-        This method is called by CircuitController when the model changes.
-        It routes events to appropriate handler methods for automatic canvas updates.
-        """
-        handlers = {
+    def _model_event_handlers(self) -> dict:
+        """Map observer event names to their canvas handlers."""
+        return {
             "component_added": self._handle_component_added,
             "component_removed": self._handle_component_removed,
             "component_moved": self._handle_component_moved,
@@ -157,15 +184,24 @@ class CircuitCanvasView(QGraphicsView):
             "wire_routed": self._handle_wire_routed,
             "wire_lock_changed": self._handle_wire_lock_changed,
             "wire_reroute_requested": self._handle_wire_reroute_requested,
+            "wires_reroute_requested": self._handle_wires_reroute_requested,
             "circuit_cleared": self._handle_circuit_cleared,
             "nodes_rebuilt": self._handle_nodes_rebuilt,
             "model_loaded": self._handle_model_loaded,
             "annotation_added": self._handle_annotation_added,
             "annotation_removed": self._handle_annotation_removed,
             "annotation_updated": self._handle_annotation_updated,
+            "batch_applied": self._handle_batch_applied,
         }
 
-        handler = handlers.get(event)
+    def _on_model_changed(self, event: str, data) -> None:
+        """
+        Dispatch model change events to specific handlers.
+
+        This method is called by CircuitController when the model changes.
+        It routes events to appropriate handler methods for automatic canvas updates.
+        """
+        handler = self._model_event_handlers().get(event)
         if handler:
             try:
                 handler(data)
@@ -183,12 +219,42 @@ class CircuitCanvasView(QGraphicsView):
             "component_value_changed",
             "circuit_cleared",
         }
-        if event in _stale_events and self.node_voltages:
+        changed = data.event_names if event == "batch_applied" else {event}
+        if changed & _stale_events and self.node_voltages:
             self.node_voltages = {}
             self.branch_currents = {}
             self.show_node_voltages = False
             self.probe_results = []
 
+    def _handle_batch_applied(self, changes) -> None:
+        """Replay a batched change set, then sync nodes and reroute once.
+
+        Per-change node syncs, neighbour reroutes and repaints are
+        suppressed while replaying and done a single time at the end.
+        """
+        handlers = self._model_event_handlers()
+        restored = {id(wire) for wire in changes.added_wires if wire.waypoints}
+        self._batch_reroute_neighbours = set()
+        try:
+            for event, data in changes.events:
+                handler = handlers.get(event)
+                if handler is None:
+                    continue
+                try:
+                    handler(data)
+                except (AttributeError, KeyError, TypeError) as e:
+                    logger.error("Error handling batched event '%s': %s", event, e)
+        finally:
+            neighbours, self._batch_reroute_neighbours = self._batch_reroute_neighbours, None
+
+        self._sync_nodes_from_model()
+        neighbours = {comp for comp in neighbours if comp in self.components.values()}
+        if neighbours:
+            self._reroute_wires_near_components(neighbours)
+        if restored:
+            self._reroute_colliding_wires([w for w in self.wires if id(w.model) in restored])
+        self._scene.update()
+
     def _sync_nodes_from_model(self) -> None:
         """Sync local node references from the controller's model.
 
@@ -203,8 +269,12 @@ class CircuitCanvasView(QGraphicsView):
         """Create graphics item when component added to model"""
         comp = ComponentGraphicsItem.from_dict(component_data.to_dict())
         comp.canvas = self
+        if self._component_render_cache:
+            comp.set_render_cache(True)
         self._scene.addItem(comp)
         self.components[component_data.component_id] = comp
+        if self.controller:
+            comp.set_floating_terminals(self.controller.diagnostics.floating_terminals_of(comp.component_id))
 
         # Model already handled ground node registration in add_component();
         # sync our local node references so rendering stays current.
@@ -213,6 +283,14 @@ class CircuitCanvasView(QGraphicsView):
 
         self._scene.update()
 
+    def _on_diagnostics_changed(self, component_ids) -> None:
+        """Refresh the unconnected-terminal markers of *component_ids*."""
+        diagnostics = self.controller.diagnostics
+        for component_id in component_ids:
+            comp = self.components.get(component_id)
+            if comp is not None:
+                comp.set_floating_terminals(diagnostics.floating_terminals_of(component_id))
+
     def _handle_component_removed(self, component_id: str) -> None:
         """Remove graphics item when component removed from model"""
         comp = self.components.get(component_id)
@@ -253,17 +331,110 @@ class CircuitCanvasView(QGraphicsView):
 
         wires_to_reroute = set()
         for comp in components:
-            for wire in self.wires:
-                if wire.start_comp is comp or wire.end_comp is comp:
-                    wires_to_reroute.add(wire)
+            wires_to_reroute.update(self.wires_for_component(comp))
 
-        for wire in wires_to_reroute:
-            wire.update_position()
+        self._reroute_wires(wires_to_reroute)
 
-        if wires_to_reroute:
+    def _reroute_wires(self, wires):
+        """Reroute *wires* as one batch, in the background when that is enabled."""
+        if not wires:
+            return
+        if self.background_routing:
+            self._submit_background_routes(wires)
+        else:
+            self._route_wires_in_batch(sorted(wires, key=lambda w: self._wire_index.position(self.wires, w)))
+
+        self._scene.update()
+        if self.viewport():
+            self.viewport().update()
+
+    def _submit_background_routes(self, wires):
+        """Show straight previews now and route *wires* on the worker thread.
+
+        All jobs share one snapshot of the scene.  The wires being rerouted
+        are left out of the obstacle set since their old paths are obsolete.
+        """
+        from algorithms.routing_service import WireRoutingService
+
+        if self._routing_service is None:
+            self._routing_service = WireRoutingService()
+        components = snapshot_components(self.components.values())
+        obstacles = tuple(snapshot_wire(w) for w in self.wires if w not in wires)
+        jobs = []
+        for wire in wires:
+            wire.show_drag_preview()
+            jobs.append((wire, wire.routing_request(components, obstacles)))
+        self._routing_service.submit_many(jobs)
+        self._start_routing_poll()
+
+    def _start_routing_poll(self):
+        if self._routing_poll_timer is None:
+            self._routing_poll_timer = QTimer(self)
+            self._routing_poll_timer.setInterval(_ROUTING_POLL_MS)
+            self._routing_poll_timer.timeout.connect(self._apply_background_routes)
+        if not self._routing_poll_timer.isActive():
+            self._routing_poll_timer.start()
+
+    def _apply_background_routes(self):
+        """Apply routes finished since the last poll; stop polling when idle.
+
+        Work per tick is capped so a burst of finished routes is spread
+        over several frames instead of stalling one.
+        """
+        service = self._routing_service
+        applied = self._apply_finished_batches()
+        deadline = time.perf_counter() + _ROUTING_APPLY_BUDGET_S
+        while service is not None and time.perf_counter() < deadline:
+            results = service.collect(limit=8)
+            if not results:
+                break
+            for result in results:
+                wire = result.key
+                if wire in self.wires:
+                    wire.apply_route(result)
+                    applied += 1
+        idle = (service is None or not service.has_work()) and not self._pending_batches
+        if idle and self._routing_poll_timer is not None:
+            self._routing_poll_timer.stop()
+        if applied:
             self._scene.update()
-            if self.viewport():
-                self.viewport().update()
+
+    def _apply_finished_batches(self):
+        """Apply the results of background batches that have finished, in submission order."""
+        applied = 0
+        while self._pending_batches and self._pending_batches[0][0].done():
+            future, wanted = self._pending_batches.pop(0)
+            try:
+                results = future.result()
+            except Exception:
+                logger.exception("Batch wire routing failed")
+                continue
+            for result in results:
+                wire = result.key
+                if wire in wanted and wire in self.wires:
+                    wire.apply_route(result)
+                    applied += 1
+        return applied
+
+    def cancel_background_route(self, wire) -> None:
+        """Forget any pending background route for *wire* (it is being rerouted or removed)."""
+        if self._routing_service is not None:
+            self._routing_service.cancel(wire)
+        for _future, wanted in self._pending_batches:
+            wanted.discard(wire)
+
+    def _cancel_background_routes(self) -> None:
+        if self._routing_service is not None:
+            self._routing_service.cancel_all()
+        self._pending_batches = []
+
+    def shutdown_routing(self) -> None:
+        """Stop background routing threads and worker processes (on close)."""
+        self._cancel_background_routes()
+        if self._routing_service is not None:
+            self._routing_service.shutdown()
+        if self._batch_router is not None:
+            self._batch_router.shutdown()
 
     def _handle_component_rotated(self, component_data) -> None:
         """Update graphics item rotation from authoritative model data."""
@@ -272,7 +443,7 @@ class CircuitCanvasView(QGraphicsView):
             comp.sync_from_data(component_data)
             comp.update_terminals()
             comp.update()
-            self.reroute_connected_wires(comp)
+            self._reroute_wires([w for w in self.wires_for_component(comp) if not w.model.locked])
 
     def _handle_component_flipped(self, component_data) -> None:
         """Update graphics item flip from authoritative model data."""
@@ -290,8 +461,12 @@ class CircuitCanvasView(QGraphicsView):
             comp.sync_from_data(component_data)
             comp.update()
 
-    def _handle_wire_added(self, wire_data) -> None:
-        """Create wire graphics item when wire added to model"""
+    def _handle_wire_added(self, wire_data, defer_routing: bool = False) -> None:
+        """Create wire graphics item when wire added to model.
+
+        With *defer_routing*, a wire without a stored path is drawn straight
+        and left for the caller to route (see route_wires_globally()).
+        """
         start_comp = self.components.get(wire_data.start_component_id)
         end_comp = self.components.get(wire_data.end_component_id)
 
@@ -303,9 +478,13 @@ class CircuitCanvasView(QGraphicsView):
                 wire_data.end_terminal,
                 canvas=self,
                 model=wire_data,
+                defer_routing=defer_routing,
             )
             self._scene.addItem(wire)
             self.wires.append(wire)
+            self._wire_index.added(self.wires, wire)
+            if self._batch_reroute_neighbours is not None:
+                return
             # Model already updated its node graph in add_wire(); sync here.
             self._sync_nodes_from_model()
 
@@ -313,10 +492,15 @@ class CircuitCanvasView(QGraphicsView):
         """Remove wire graphics item and reroute neighboring wires."""
         if 0 <= wire_index < len(self.wires):
             wire = self.wires[wire_index]
+            self.cancel_background_route(wire)
             # Save connected components before removing, so we can reroute neighbors
             affected_components = {wire.start_comp, wire.end_comp}
             self._scene.removeItem(wire)
             del self.wires[wire_index]
+            self._wire_index.removed(self.wires, wire)
+            if self._batch_reroute_neighbours is not None:
+                self._batch_reroute_neighbours |= affected_components
+                return
             # Model already rebuilt affected nodes in remove_wire(); sync here.
             self._sync_nodes_from_model()
             # Reroute remaining wires connected to the same components —
@@ -354,6 +538,12 @@ class CircuitCanvasView(QGraphicsView):
             waypoints = [(wp.x(), wp.y()) for wp in wire.waypoints]
             self.controller.update_wire_waypoints(wire_index, waypoints)
 
+    def _handle_wires_reroute_requested(self, wire_indices) -> None:
+        """Route several wires together in one global routing pass."""
+        wires = [self.wires[i] for i in wire_indices if 0 <= i < len(self.wires)]
+        if wires:
+            self.route_wires_globally(wires)
+
     # ===================================================================
     # Scene item callbacks (avoid hierarchy climbing in items)
     # ===================================================================
@@ -433,6 +623,7 @@ class CircuitCanvasView(QGraphicsView):
 
     def _handle_circuit_cleared(self, data: None) -> None:
         """Clear all graphics items when circuit cleared"""
+        self._cancel_background_routes()
         self._scene.clear()
         self.draw_grid()
         self.components = {}
@@ -452,6 +643,7 @@ class CircuitCanvasView(QGraphicsView):
             return
 
         # Clear and rebuild everything
+        self._cancel_background_routes()
         self._scene.clear()
         self.draw_grid()
         self.components = {}
@@ -462,13 +654,18 @@ class CircuitCanvasView(QGraphicsView):
         for comp_data in self.controller.get_components().values():
             self._handle_component_added(comp_data)
 
-        # Restore wires
+        # Restore wires; those without a stored path (e.g. from an imported
+        # netlist) are routed together below rather than one by one
         for wire_data in self.controller.get_wires():
-            self._handle_wire_added(wire_data)
+            self._handle_wire_added(wire_data, defer_routing=True)
 
         # Rebuild nodes
         self._handle_nodes_rebuilt(None)
 
+        unrouted = [wire for wire in self.wires if not wire.model.waypoints]
+        if unrouted:
+            self.route_wires_globally(unrouted)
+
         # Restore annotations
         for ann_data in self.controller.get_annotations():
             self._handle_annotation_added(ann_data)
@@ -615,6 +812,20 @@ class CircuitCanvasView(QGraphicsView):
                 self._scene.addItem(label)
                 self._grid_items.append(label)
 
+    @property
+    def wires(self):
+        """All wire items, in the same order as the model's wires."""
+        return self._wires
+
+    @wires.setter
+    def wires(self, wires):
+        # A WireList lets _wire_index detect edits it was not told about
+        self._wires = WireList(wires)
+
+    def wires_for_component(self, component):
+        """Return the wire items attached to a component item, in O(degree)."""
+        return self._wire_index.wires_for(self.wires, component)
+
     def reroute_connected_wires(self, component):
         """Reroute all wires connected to a component.
 
@@ -623,18 +834,17 @@ class CircuitCanvasView(QGraphicsView):
         This prevents the same wire being rerouted twice per drag event.
         """
         wire_count = 0
-        for wire in self.wires:
-            if wire.start_comp == component or wire.end_comp == component:
-                # Skip locked wires (user pinned the path)
-                if wire.model.locked:
-                    continue
-                # Skip if both endpoints are co-selected and the other has lower ID
-                # (that endpoint's reroute call will handle this wire)
-                other = wire.end_comp if wire.start_comp == component else wire.start_comp
-                if component.isSelected() and other.isSelected() and other.component_id < component.component_id:
-                    continue
-                wire.update_position()
-                wire_count += 1
+        for wire in self.wires_for_component(component):
+            # Skip locked wires (user pinned the path)
+            if wire.model.locked:
+                continue
+            # Skip if both endpoints are co-selected and the other has lower ID
+            # (that endpoint's reroute call will handle this wire)
+            other = wire.end_comp if wire.start_comp == component else wire.start_comp
+            if component.isSelected() and other.isSelected() and other.component_id < component.component_id:
+                continue
+            wire.update_position()
+            wire_count += 1
 
         # Force a full scene update to ensure wires are redrawn
         if wire_count > 0:
@@ -660,16 +870,146 @@ class CircuitCanvasView(QGraphicsView):
         Called after wire deletion so that neighboring wires can find
         shorter paths now that the deleted wire is no longer an obstacle.
         """
+        affected = {wire for comp in components for wire in self.wires_for_component(comp)}
+        # Route in wire-list order so earlier wires are obstacles for later ones, as before
         rerouted = 0
-        for wire in self.wires:
-            if wire.start_comp in components or wire.end_comp in components:
-                if wire.model.locked:
-                    continue
-                wire.update_position()
-                rerouted += 1
+        for wire in sorted(affected, key=lambda w: self._wire_index.position(self.wires, w)):
+            if wire.model.locked:
+                continue
+            wire.update_position()
+            rerouted += 1
         if rerouted > 0:
             self._scene.update()
 
+    def _net_key(self, wire):
+        """Hashable net identity of a wire item, for routing snapshots."""
+        # Wire items carry no node; take it from the model's terminal map
+        node = self.terminal_to_node.get(wire.get_terminals()[0])
+        return ("wire", id(wire)) if node is None else id(node)
+
+    def route_wires_globally(self, wires):
+        """Route *wires* together with the net-aware global router.
+
+        Nets are routed as trees with shared trunks and compete for space
+        through negotiated congestion, instead of each wire being routed
+        alone in list order.  All other wires stay where they are and act
+        as obstacles.
+
+        Returns:
+            The GlobalRouteResult; its runtime and failure count are also
+            reported on the status bar.
+        """
+        from algorithms.global_router import GlobalRouteRequest, NetConnection, route_circuit
+
+        wires = list(wires)
+        routed = set(wires)
+        connections = []
+        for wire in wires:
+            self.cancel_background_route(wire)
+            start = wire.start_comp.get_terminal_pos(wire.start_term)
+            end = wire.end_comp.get_terminal_pos(wire.end_term)
+            connections.append(
+                NetConnection(
+                    key=wire,
+                    start=(start.x(), start.y()),
+                    end=(end.x(), end.y()),
+                    terminals=tuple(wire.get_terminals()),
+                    net=self._net_key(wire),
+                )
+            )
+        fixed = tuple(replace(snapshot_wire(w), node=self._net_key(w)) for w in self.wires if w not in routed)
+        result = route_circuit(
+            GlobalRouteRequest(
+                connections=tuple(connections),
+                components=snapshot_components(self.components.values()),
+                fixed_wires=fixed,
+                grid_size=GRID_SIZE,
+                allow_diagonal=theme_manager.routing_mode == "diagonal",
+            )
+        )
+        for wire in wires:
+            wire.apply_route(result.routes[wire])
+        self._scene.update()
+
+        message = f"Routed {len(wires)} wire{'s' if len(wires) != 1 else ''} in {result.runtime:.2f}s"
+        if result.failures:
+            message += f" ({result.failures} could not be routed — move components to create space)"
+        self.statusMessage.emit(message, 5000)
+        return result
+
+    def _reroute_colliding_wires(self, wires):
+        """Reroute only those wires whose stored path now crosses an obstacle.
+
+        Used after pasting, where wires arrive with their copied route
+        translated alongside the components.  As in route_wire(), wires on
+        other nets are obstacles too.  The obstacle map is built once per
+        net and the paths on that net are checked in a single pass.
+        """
+        from algorithms.path_finding import find_path_collisions, get_component_obstacles
+
+        wires = [w for w in wires if not w.model.locked and len(w.waypoints) >= 2]
+        if not wires:
+            return 0
+
+        net_of = self._net_key
+        existing = [replace(snapshot_wire(w), node=net_of(w)) for w in self.wires]
+        groups = {}
+        for index, wire in enumerate(wires):
+            groups.setdefault((net_of(wire), wire.algorithm), []).append(index)
+
+        components = {cid: _ComponentAdapter(c) for cid, c in self.components.items()}
+        paths = [[(p.x(), p.y()) for p in wire.waypoints] for wire in wires]
+        colliding = []
+        for (net, algorithm), indices in groups.items():
+            obstacles = get_component_obstacles(
+                components,
+                GRID_SIZE,
+                active_terminals=[terminal for i in indices for terminal in wires[i].get_terminals()],
+                # Only wires from the same algorithm layer block each other
+                existing_wires=[w for w in existing if w.algorithm == algorithm],
+                current_node=net,
+            )
+            hits = find_path_collisions([paths[i] for i in indices], obstacles, GRID_SIZE)
+            colliding.extend(indices[hit] for hit in hits)
+        self._route_wires_in_batch([wires[index] for index in sorted(colliding)])
+        return len(colliding)
+
+    def _route_wires_in_batch(self, wires):
+        """Route *wires* together against one snapshot of the scene.
+
+        The snapshot is rasterized once, and when the batch is large its
+        spatially independent groups are routed in worker processes (see
+        algorithms.batch_routing).  Results are applied in the order given.
+        The wires being routed are left out of the obstacles, since their
+        old paths are obsolete.
+
+        Large batches are routed off the GUI thread: the wires show a
+        straight preview until the poll timer applies the results, and a
+        wire that is rerouted or removed meanwhile ignores its result.
+        """
+        from algorithms.batch_routing import MIN_PARALLEL_WIRES, BatchRouter
+
+        wires = list(wires)
+        if not wires:
+            return
+        if self._batch_router is None:
+            self._batch_router = BatchRouter()
+        routed = set(wires)
+        components = snapshot_components(self.components.values())
+        obstacles = tuple(replace(snapshot_wire(w), node=self._net_key(w)) for w in self.wires if w not in routed)
+        jobs = []
+        for wire in wires:
+            self.cancel_background_route(wire)
+            jobs.append((wire, replace(wire.routing_request(components, obstacles), node=self._net_key(wire))))
+        if len(jobs) < MIN_PARALLEL_WIRES:
+            for result in self._batch_router.route(jobs):
+                result.key.apply_route(result)
+            return
+        for wire in wires:
+            wire.show_drag_preview()
+        self._pending_batches.append((self._batch_router.route_async(jobs), set(wires)))
+        self._start_routing_poll()
+
     def dragEnterEvent(self, event):
         if event is None:
             return
@@ -855,6 +1195,7 @@ class CircuitCanvasView(QGraphicsView):
                                 )
                                 self._scene.addItem(wire)
                                 self.wires.append(wire)
+                                self._wire_index.added(self.wires, wire)
                                 self.wireAdded.emit(
                                     self.wire_start_comp.component_id,
                                     clicked_component.component_id,
@@ -1292,6 +1633,18 @@ class CircuitCanvasView(QGraphicsView):
         cmd = RerouteWireCommand(self.controller, wire_index)
         self.controller.execute_command(cmd)
 
+    def reroute_all_wires(self):
+        """Reroute every unlocked wire in one global pass, as a single undoable operation."""
+        if not self.controller:
+            logger.warning("Cannot reroute wires: no controller available")
+            return
+
+        from controllers.commands import RerouteWiresCommand
+
+        indices = [i for i, wire in enumerate(self.wires) if not wire.model.locked]
+        if indices:
+            self.controller.execute_command(RerouteWiresCommand(self.controller, indices))
+
     def reroute_selected_wires(self, selected_wires):
         """Reroute multiple selected wires as a single undoable operation."""
         if not self.controller:
@@ -1796,6 +2149,7 @@ class CircuitCanvasView(QGraphicsView):
 
     def clear_circuit(self):
         """Clear all components, wires, and annotations"""
+        self._cancel_background_routes()
         self._scene.clear()
         self.draw_grid()
         self.components = {}
@@ -1899,18 +2253,44 @@ class CircuitCanvasView(QGraphicsView):
     def set_show_component_labels(self, show: bool) -> None:
         """Toggle component ID label visibility (CircuitCanvasProtocol)."""
         self.show_component_labels = show
-        self._scene.update()
+        self._invalidate_component_geometry()
 
     def set_show_component_values(self, show: bool) -> None:
         """Toggle component value label visibility (CircuitCanvasProtocol)."""
         self.show_component_values = show
+        self._invalidate_component_geometry()
+
+    def _invalidate_component_geometry(self, _theme=None) -> None:
+        """Labels or theme changed: drop every component's cached geometry."""
+        for comp in self.components.values():
+            comp.invalidate_geometry()
         self._scene.update()
 
+    def set_component_render_cache(self, enabled: bool) -> None:
+        """Render component items through a device-resolution pixmap cache.
+
+        Off by default.  Helps on large schematics where dragging and
+        scrolling would otherwise repaint every symbol; costs memory per
+        item.  Theme changes re-render the cached items.
+        """
+        self._component_render_cache = enabled
+        for comp in self.components.values():
+            comp.set_render_cache(enabled)
+        if enabled:
+            theme_manager.on_theme_changed(self._invalidate_component_geometry)
+        else:
+            theme_manager.remove_listener(self._invalidate_component_geometry)
+
     def set_show_node_labels(self, show: bool) -> None:
         """Toggle node label visibility (CircuitCanvasProtocol)."""
         self.show_node_labels = show
         self._scene.update()
 
+    def set_show_floating_markers(self, show: bool) -> None:
+        """Toggle the markers drawn around unconnected terminals."""
+        self.show_floating_markers = show
+        self._scene.update()
+
 
 # Backward compatibility alias
 CircuitCanvas = CircuitCanvasView
@@ -5,7 +5,6 @@ from collections import Counter
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QFormLayout, QGroupBox, QLabel, QScrollArea, QTextEdit, QVBoxLayout, QWidget
-from utils.connectivity import find_floating_terminals
 
 from .styles import theme_manager
 
@@ -27,7 +26,9 @@ class CircuitStatisticsPanel(QWidget):
 
         self._init_ui()
 
-        # Register as observer for model changes
+        # Floating terminals are kept incrementally by the diagnostics engine,
+        # which must exist before our observer so it is current on refresh
+        self._diagnostics = circuit_ctrl.diagnostics
         self.circuit_ctrl.add_observer(self._on_model_changed)
 
         # Initial refresh
@@ -111,7 +112,10 @@ class CircuitStatisticsPanel(QWidget):
             "nodes_rebuilt",
             "model_loaded",
         }
-        if event in refresh_events:
+        if event == "batch_applied":
+            if data.event_names & refresh_events:
+                self.refresh()
+        elif event in refresh_events:
             self.refresh()
 
     # --- Refresh ---
@@ -158,7 +162,7 @@ class CircuitStatisticsPanel(QWidget):
             self._components_form.addRow(f"{comp_type}:", label)
 
     def _update_connectivity(self):
-        floating = find_floating_terminals(self.model.components, self.model.terminal_to_node)
+        floating = self._diagnostics.floating_terminals
         if not self.model.components:
             self._floating_label.setText("-")
             self._floating_label.setStyleSheet("")
@@ -4,10 +4,10 @@ from models.component import DEFAULT_VALUES, ComponentData
 from PyQt6.QtCore import QPointF, QRectF, Qt, QTimer
 from PyQt6.QtGui import QBrush  # QPainterPath imported locally where needed
 from PyQt6.QtGui import QColor, QFont, QFontMetricsF, QPen
-from PyQt6.QtWidgets import QGraphicsItem, QInputDialog, QLineEdit, QMessageBox
+from PyQt6.QtWidgets import QGraphicsItem, QInputDialog, QLineEdit, QMessageBox, QStyleOptionGraphicsItem
 from utils.format_utils import validate_component_value
 
-from .styles import GRID_SIZE, TERMINAL_HOVER_RADIUS, theme_manager
+from .styles import COMPONENT_DETAIL_MIN_LOD, GRID_SIZE, TERMINAL_HOVER_RADIUS, theme_manager
 
 
 class ComponentGraphicsItem(QGraphicsItem):
@@ -21,6 +21,9 @@ class ComponentGraphicsItem(QGraphicsItem):
     # Class attribute for subclass type identification
     type_name = "Unknown"
 
+    # Font metrics for label geometry, shared by all items (created on first use)
+    _label_metrics = None
+
     def __init__(self, component_id, component_type="Unknown", model=None):
         super().__init__()
 
@@ -48,11 +51,24 @@ class ComponentGraphicsItem(QGraphicsItem):
         self._grading_state = None  # "passed", "failed", or None
         self._grading_feedback = ""
 
+        # Unconnected terminal indices, marked while the canvas shows them
+        self._floating_terminals = frozenset()
+
         self._position_update_timer = None
         self._pending_position = None
 
         self._hovered = False
 
+        # Memoized geometry and paint resources; see invalidate_geometry()
+        # and _paint_resources().  Keys are compared on each use, so a
+        # missed invalidation costs a recomputation, never a stale result.
+        self._geometry_key = None
+        self._bounding_rect = None
+        self._obstacle_key = None
+        self._obstacle_shape = None
+        self._paint_key = None
+        self._paint_cache = None
+
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
@@ -98,6 +114,7 @@ class ComponentGraphicsItem(QGraphicsItem):
         self.model.waveform_params = component_data.waveform_params
         self.model.initial_condition = component_data.initial_condition
         self.model.position = component_data.position
+        self.invalidate_geometry()
 
     # --- Event handlers ---
 
@@ -259,20 +276,43 @@ class ComponentGraphicsItem(QGraphicsItem):
         """Return the bounding rectangle of the symbol only (no text)."""
         return QRectF(-40, -30, 80, 60)
 
+    def _label_visibility(self):
+        """Return (show_label, show_value) from the canvas view settings."""
+        canvas = self.canvas
+        show_label = getattr(canvas, "show_component_labels", True) if canvas else True
+        show_value = getattr(canvas, "show_component_values", True) if canvas else True
+        return show_label, show_value
+
+    def _geometry_inputs(self):
+        """Everything boundingRect() depends on, for cache validation."""
+        show_label, show_value = self._label_visibility()
+        text = self._label_text(show_label, show_value) if show_label or show_value else None
+        model = self.model
+        return (text, model.rotation, model.flip_h, model.flip_v, theme_manager.revision)
+
+    def invalidate_geometry(self) -> None:
+        """Drop memoized geometry after the value, labels or orientation change."""
+        self.prepareGeometryChange()
+        self._geometry_key = None
+        self._obstacle_key = None
+        self.update()
+
     def boundingRect(self):
+        key = self._geometry_inputs()
+        if key != self._geometry_key:
+            self._bounding_rect = self._compute_bounding_rect(key[0])
+            self._geometry_key = key
+        return QRectF(self._bounding_rect)
+
+    def _compute_bounding_rect(self, text):
         base = self._symbol_rect()
 
         # Expand to include text labels that paint() draws above the symbol
-        show_label = (
-            self.canvas.show_component_labels if self.canvas and hasattr(self.canvas, "show_component_labels") else True
-        )
-        show_value = (
-            self.canvas.show_component_values if self.canvas and hasattr(self.canvas, "show_component_values") else True
-        )
-        if show_label or show_value:
-            text = self._label_text(show_label, show_value)
-            fm = QFontMetricsF(QFont())
-            text_rect = fm.boundingRect(text)
+        if text is not None:
+            metrics = ComponentGraphicsItem._label_metrics
+            if metrics is None:
+                metrics = ComponentGraphicsItem._label_metrics = QFontMetricsF(QFont())
+            text_rect = metrics.boundingRect(text)
             # Text is drawn at (-20, -25); that's the left-baseline position
             text_rect.moveLeft(-20)
             text_rect.moveBottom(-25)
@@ -283,11 +323,19 @@ class ComponentGraphicsItem(QGraphicsItem):
     def get_obstacle_shape(self):
         """Return the obstacle boundary for pathfinding, respecting symbol style.
 
-        Delegates to the registered renderer for the current symbol style.
+        Delegates to the registered renderer for the current symbol style;
+        the polygon is memoized until the style changes.
 
         Returns:
             List of (x, y) tuples forming a closed polygon in local coords.
         """
+        key = theme_manager.revision
+        if key != self._obstacle_key:
+            self._obstacle_shape = self._compute_obstacle_shape()
+            self._obstacle_key = key
+        return list(self._obstacle_shape)
+
+    def _compute_obstacle_shape(self):
         from .renderers import get_renderer
 
         renderer = get_renderer(self.component_type, theme_manager.symbol_style)
@@ -332,17 +380,54 @@ class ComponentGraphicsItem(QGraphicsItem):
 
     def draw_component_body(self, painter):
         """Dispatch to the registered renderer for the current symbol style."""
-        from .renderers import get_renderer
+        self._paint_resources()["renderer"].draw(painter, self)
+
+    def _paint_resources(self):
+        """Theme colours, pens and the renderer used by paint(), per theme revision."""
+        if self._paint_key != theme_manager.revision:
+            from .renderers import get_renderer
+
+            color = theme_manager.get_component_color(self.component_type)
+            self._paint_cache = {
+                "color": color,
+                "body_pen": QPen(color, 2),
+                "hover_pen": QPen(color.lighter(130), 1.5, Qt.PenStyle.DashLine),
+                "fill": theme_manager.brush("component_fill"),
+                "selected_pen": theme_manager.pen("component_selected"),
+                "terminal_pen": theme_manager.pen("terminal"),
+                "floating_pen": QPen(theme_manager.color("error"), 1.5),
+                "renderer": get_renderer(self.component_type, theme_manager.symbol_style),
+            }
+            self._paint_key = theme_manager.revision
+        return self._paint_cache
 
-        renderer = get_renderer(self.component_type, theme_manager.symbol_style)
-        renderer.draw(painter, self)
+    @staticmethod
+    def _show_details(painter, option):
+        """Whether the current zoom is high enough for labels and fine strokes.
+
+        Direct paint() calls without a style option always draw everything.
+        """
+        if option is None:
+            return True
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        return lod >= COMPONENT_DETAIL_MIN_LOD
+
+    def set_render_cache(self, enabled: bool) -> None:
+        """Cache the rendered item as a device-resolution pixmap.
+
+        Dragging and scrolling then blit the pixmap instead of repainting
+        the symbol; any update() (selection, hover, edits) re-renders it.
+        """
+        mode = QGraphicsItem.CacheMode.DeviceCoordinateCache if enabled else QGraphicsItem.CacheMode.NoCache
+        self.setCacheMode(mode)
 
     def paint(self, painter, option=None, widget=None):
         if painter is None:
             return
 
-        # Get component color from theme
-        color = theme_manager.get_component_color(self.component_type)
+        res = self._paint_resources()
+        color = res["color"]
+        details = self._show_details(painter, option)
 
         # Save painter state
         painter.save()
@@ -356,15 +441,14 @@ class ComponentGraphicsItem(QGraphicsItem):
 
         # Highlight if selected
         if self.isSelected():
-            painter.setPen(theme_manager.pen("component_selected"))
+            painter.setPen(res["selected_pen"])
             painter.drawRect(QRectF(-40, -20, 80, 40))
-        elif self._hovered:
-            hover_pen = QPen(color.lighter(130), 1.5, Qt.PenStyle.DashLine)
-            painter.setPen(hover_pen)
+        elif self._hovered and details:
+            painter.setPen(res["hover_pen"])
             painter.drawRect(QRectF(-40, -20, 80, 40))
 
         # Draw locked indicator (dimmed border with lock icon)
-        if getattr(self, "_locked", False):
+        if getattr(self, "_locked", False) and details:
             lock_pen = QPen(QBrush(Qt.GlobalColor.gray), 1.5, Qt.PenStyle.DashLine)
             painter.setPen(lock_pen)
             painter.drawRect(QRectF(-42, -22, 84, 44))
@@ -419,19 +503,14 @@ class ComponentGraphicsItem(QGraphicsItem):
             painter.drawRoundedRect(QRectF(-42, -22, 84, 44), 4, 4)
 
         # Draw component body
-        painter.setPen(QPen(color, 2))
-        painter.setBrush(theme_manager.brush("component_fill"))
+        painter.setPen(res["body_pen"])
+        painter.setBrush(res["fill"])
         self.draw_component_body(painter)
 
         # Draw label (check canvas visibility settings via injected reference)
-        show_label = (
-            self.canvas.show_component_labels if self.canvas and hasattr(self.canvas, "show_component_labels") else True
-        )
-        show_value = (
-            self.canvas.show_component_values if self.canvas and hasattr(self.canvas, "show_component_values") else True
-        )
+        show_label, show_value = self._label_visibility()
 
-        if show_label or show_value:
+        if (show_label or show_value) and details:
             self._draw_label_text(
                 painter,
                 color,
@@ -446,10 +525,28 @@ class ComponentGraphicsItem(QGraphicsItem):
         # Restore painter state
         painter.restore()
 
-        # Draw terminals in scene coordinates (not rotated)
-        painter.setPen(theme_manager.pen("terminal"))
+        if details:
+            self._draw_terminals(painter)
+
+    def _draw_terminals(self, painter):
+        """Draw terminal dots in item coordinates (not rotated)."""
+        res = self._paint_resources()
+        painter.setPen(res["terminal_pen"])
         for terminal in self.terminals:
             painter.drawEllipse(terminal, 3, 3)
+        if self._floating_terminals and getattr(self.canvas, "show_floating_markers", True):
+            painter.setPen(res["floating_pen"])
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            for index in self._floating_terminals:
+                if index < len(self.terminals):
+                    painter.drawEllipse(self.terminals[index], 6, 6)
+
+    def set_floating_terminals(self, indices):
+        """Mark the terminals at *indices* as unconnected (live error markers)."""
+        indices = frozenset(indices)
+        if indices != self._floating_terminals:
+            self._floating_terminals = indices
+            self.update()
 
     def _label_text(self, show_label, show_value):
         """Return the label string that paint() would draw."""
@@ -507,10 +604,9 @@ class ComponentGraphicsItem(QGraphicsItem):
             self.update()
             # Skip wire preview for followers during group drag to avoid
             # tearing artifacts from rapid forced scene repaints (#442).
-            if not self._group_moving and self.canvas and hasattr(self.canvas, "wires"):
-                for wire in self.canvas.wires:
-                    if wire.start_comp is self or wire.end_comp is self:
-                        wire.show_drag_preview()
+            if not self._group_moving and self.canvas and hasattr(self.canvas, "wires_for_component"):
+                for wire in self.canvas.wires_for_component(self):
+                    wire.show_drag_preview()
 
         return super().itemChange(change, value)
 
@@ -690,7 +786,9 @@ class Ground(ComponentGraphicsItem):
         if painter is None:
             return
 
-        color = theme_manager.get_component_color(self.component_type)
+        res = self._paint_resources()
+        color = res["color"]
+        details = self._show_details(painter, option)
 
         painter.save()
         painter.rotate(self.rotation_angle)
@@ -700,28 +798,22 @@ class Ground(ComponentGraphicsItem):
             painter.scale(sx, sy)
 
         if self.isSelected():
-            painter.setPen(theme_manager.pen("component_selected"))
+            painter.setPen(res["selected_pen"])
             painter.drawRect(QRectF(-40, -20, 80, 40))
 
-        painter.setPen(QPen(color, 2))
-        painter.setBrush(theme_manager.brush("component_fill"))
+        painter.setPen(res["body_pen"])
+        painter.setBrush(res["fill"])
         self.draw_component_body(painter)
 
-        show_label = (
-            self.canvas.show_component_labels if self.canvas and hasattr(self.canvas, "show_component_labels") else True
-        )
-        show_value = (
-            self.canvas.show_component_values if self.canvas and hasattr(self.canvas, "show_component_values") else True
-        )
+        show_label, show_value = self._label_visibility()
 
-        if show_label or show_value:
+        if (show_label or show_value) and details:
             self._draw_label_text(painter, color, sx, sy, show_label, show_value, "GND", "0V")
 
         painter.restore()
 
-        painter.setPen(theme_manager.pen("terminal"))
-        for terminal in self.terminals:
-            painter.drawEllipse(terminal, 3, 3)
+        if details:
+            self._draw_terminals(painter)
 
 
 class OpAmp(ComponentGraphicsItem):
@@ -0,0 +1,99 @@
+"""Live DC operating point: re-simulates in the background as the circuit is edited.
+
+Model edits restart a debounce timer; once they settle the circuit is
+snapshotted on the GUI thread and simulated on a single worker thread
+(see controllers.live_op_controller).  A newer edit cancels the run in
+flight, and results reach the canvas only while they still match the
+model generation they were computed for.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from controllers.live_op_controller import LIVE_OP_EVENTS, LiveOpController, LiveOpResult
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .styles import STATUS_DURATION_SHORT
+
+logger = logging.getLogger(__name__)
+
+# Quiet time after the last edit before a run starts
+LIVE_OP_DEBOUNCE_MS = 300
+
+
+class LiveOperatingPoint(QObject):
+    """Debounces edits and pushes live operating points onto the canvas."""
+
+    # Emitted from the worker thread; delivered queued on the GUI thread
+    _resultReady = pyqtSignal(object)
+    statusMessage = pyqtSignal(str, int)  # message, timeout_ms
+
+    def __init__(self, model, circuit_ctrl, canvas, parent=None, controller=None):
+        super().__init__(parent)
+        self.canvas = canvas
+        self.circuit_ctrl = circuit_ctrl
+        self.controller = controller or LiveOpController(model, circuit_ctrl)
+        self.enabled = False
+        self._executor = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(LIVE_OP_DEBOUNCE_MS)
+        self._timer.timeout.connect(self._start_run)
+        self._resultReady.connect(self._apply_result)
+        circuit_ctrl.add_observer(self._on_model_changed)
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Turn live operating point on or off."""
+        self.enabled = enabled
+        if enabled:
+            self.controller.invalidate()
+            self._timer.start()
+        else:
+            self._timer.stop()
+            self.controller.cancel()
+
+    def shutdown(self) -> None:
+        """Cancel pending work and stop the worker thread."""
+        self.set_enabled(False)
+        self.circuit_ctrl.remove_observer(self._on_model_changed)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _on_model_changed(self, event: str, data) -> None:
+        if not self.enabled:
+            return
+        changed = data.event_names if event == "batch_applied" else {event}
+        if changed & LIVE_OP_EVENTS:
+            self._timer.start()
+
+    def _start_run(self) -> None:
+        if not self.enabled:
+            return
+        job = self.controller.snapshot()
+        if job is None:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-op")
+        self._executor.submit(self._run, job)
+
+    def _run(self, job) -> None:
+        """Worker thread: simulate *job* and hand the result to the GUI thread."""
+        try:
+            result = self.controller.run(job)
+        except (OSError, ValueError, KeyError, TypeError, RuntimeError) as e:
+            logger.error("Live operating point failed: %s", e, exc_info=True)
+            result = LiveOpResult(job.generation, error=str(e))
+        try:
+            self._resultReady.emit(result)
+        except RuntimeError:
+            pass  # The window closed while the run was finishing
+
+    def _apply_result(self, result) -> None:
+        if not self.controller.finish(result) or not self.enabled:
+            return
+        if result.success:
+            self.canvas.set_op_results(result.node_voltages, result.branch_currents)
+        else:
+            self.canvas.clear_op_results()
+            self.statusMessage.emit(f"Live operating point: {result.error}", STATUS_DURATION_SHORT)
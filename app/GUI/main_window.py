@@ -38,6 +38,7 @@ from .circuit_statistics_panel import CircuitStatisticsPanel
 from .component_palette import ComponentPalette
 from .dialog_provider import QtDialogProvider
 from .grading_panel import GradingPanel
+from .live_op import LiveOperatingPoint
 from .main_window_analysis import AnalysisSettingsMixin
 from .main_window_file_ops import FileOperationsMixin
 from .main_window_help import HelpMixin
@@ -102,6 +103,7 @@ class MainWindow(
 
         # Build UI
         self.init_ui()
+        self.live_op = LiveOperatingPoint(self.model, self._circuit_ctrl, self.canvas, self)
         self.create_menu_bar()
         self.dialogs = QtDialogProvider(self)
 
@@ -158,6 +160,7 @@ class MainWindow(
         self.canvas.selectionChanged.connect(self._on_selection_changed)
         self.canvas.probeRequested.connect(self._on_probe_requested)
         self.canvas.statusMessage.connect(self._on_canvas_status_message)
+        self.live_op.statusMessage.connect(self._on_canvas_status_message)
         self.palette.componentDoubleClicked.connect(self.canvas.add_component_at_center)
         self.properties_panel.property_changed.connect(self.on_property_changed)
         self.circuit_ctrl.add_observer(self._on_dirty_change)
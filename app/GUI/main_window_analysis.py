@@ -1,10 +1,9 @@
 """Analysis type configuration dialogs and menu synchronization for MainWindow."""
 
+import math
+
 from PyQt6.QtWidgets import QDialog, QMessageBox
 
-from .analysis_dialog import AnalysisDialog
-from .monte_carlo_dialog import MonteCarloDialog
-from .parameter_sweep_dialog import ParameterSweepDialog
 from .styles import STATUS_DURATION_DEFAULT
 
 
@@ -20,6 +19,8 @@ class AnalysisSettingsMixin:
 
     def set_analysis_dc(self):
         """Set analysis type to DC Sweep with parameters"""
+        from .analysis_dialog import AnalysisDialog
+
         dialog = AnalysisDialog("DC Sweep", self, simulation_ctrl=self.simulation_ctrl)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             params = dialog.get_parameters()
@@ -39,6 +40,8 @@ class AnalysisSettingsMixin:
 
     def set_analysis_ac(self):
         """Set analysis type to AC Sweep with parameters"""
+        from .analysis_dialog import AnalysisDialog
+
         dialog = AnalysisDialog("AC Sweep", self, simulation_ctrl=self.simulation_ctrl)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             params = dialog.get_parameters()
@@ -58,6 +61,8 @@ class AnalysisSettingsMixin:
 
     def set_analysis_transient(self):
         """Set analysis type to Transient with parameters"""
+        from .analysis_dialog import AnalysisDialog
+
         dialog = AnalysisDialog("Transient", self, simulation_ctrl=self.simulation_ctrl)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             params = dialog.get_parameters()
@@ -77,6 +82,8 @@ class AnalysisSettingsMixin:
 
     def set_analysis_temp_sweep(self):
         """Set analysis type to Temperature Sweep with parameters"""
+        from .analysis_dialog import AnalysisDialog
+
         dialog = AnalysisDialog("Temperature Sweep", self, simulation_ctrl=self.simulation_ctrl)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             params = dialog.get_parameters()
@@ -99,6 +106,8 @@ class AnalysisSettingsMixin:
 
     def set_analysis_noise(self):
         """Set analysis type to Noise with parameters"""
+        from .analysis_dialog import AnalysisDialog
+
         dialog = AnalysisDialog("Noise", self, simulation_ctrl=self.simulation_ctrl)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             params = dialog.get_parameters()
@@ -118,6 +127,8 @@ class AnalysisSettingsMixin:
 
     def set_analysis_parameter_sweep(self):
         """Set analysis type to Parameter Sweep with configuration dialog"""
+        from .parameter_sweep_dialog import ParameterSweepDialog
+
         if not self.model.components:
             QMessageBox.warning(
                 self,
@@ -134,9 +145,13 @@ class AnalysisSettingsMixin:
                 self.simulation_ctrl.set_analysis("Parameter Sweep", params)
                 statusBar = self.statusBar()
                 if statusBar:
+                    swept = ", ".join(p["component_id"] for p in params["parameters"])
+                    if params["mode"] == "adaptive":
+                        steps = f"adaptive, up to {params['adaptive']['max_steps']} steps"
+                    else:
+                        steps = f"{math.prod(p['num_steps'] for p in params['parameters'])} steps"
                     statusBar.showMessage(
-                        f"Analysis: Parameter Sweep on {params['component_id']} "
-                        f"({params['num_steps']} steps, base: {params['base_analysis_type']})",
+                        f"Analysis: Parameter Sweep on {swept} ({steps}, base: {params['base_analysis_type']})",
                         3000,
                     )
             else:
@@ -151,6 +166,8 @@ class AnalysisSettingsMixin:
 
     def set_analysis_monte_carlo(self):
         """Set analysis type to Monte Carlo with configuration dialog."""
+        from .monte_carlo_dialog import MonteCarloDialog
+
         if not self.model.components:
             QMessageBox.warning(
                 self,
@@ -185,6 +202,8 @@ class AnalysisSettingsMixin:
 
     def set_analysis_sensitivity(self):
         """Set analysis type to Sensitivity with parameters"""
+        from .analysis_dialog import AnalysisDialog
+
         dialog = AnalysisDialog("Sensitivity", self, simulation_ctrl=self.simulation_ctrl)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             params = dialog.get_parameters()
@@ -204,6 +223,8 @@ class AnalysisSettingsMixin:
 
     def set_analysis_tf(self):
         """Set analysis type to Transfer Function with parameters"""
+        from .analysis_dialog import AnalysisDialog
+
         dialog = AnalysisDialog("Transfer Function", self, simulation_ctrl=self.simulation_ctrl)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             params = dialog.get_parameters()
@@ -223,6 +244,8 @@ class AnalysisSettingsMixin:
 
     def set_analysis_pz(self):
         """Set analysis type to Pole-Zero with parameters"""
+        from .analysis_dialog import AnalysisDialog
+
         dialog = AnalysisDialog("Pole-Zero", self, simulation_ctrl=self.simulation_ctrl)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             params = dialog.get_parameters()
@@ -247,6 +247,11 @@ class MenuBarMixin:
         flip_v_action.triggered.connect(lambda: self.canvas.flip_selected(False))
         edit_menu.addAction(flip_v_action)
 
+        reroute_all_action = QAction("Reroute All &Wires", self)
+        reroute_all_action.setToolTip("Route every unlocked wire again, all nets together")
+        reroute_all_action.triggered.connect(self.canvas.reroute_all_wires)
+        edit_menu.addAction(reroute_all_action)
+
         edit_menu.addSeparator()
 
         recommended_action = QAction("Edit &Recommended Components...", self)
@@ -284,6 +289,12 @@ class MenuBarMixin:
         self.show_nodes_action.triggered.connect(self.toggle_node_labels)
         view_menu.addAction(self.show_nodes_action)
 
+        self.show_floating_markers_action = QAction("Mark &Unconnected Terminals", self)
+        self.show_floating_markers_action.setCheckable(True)
+        self.show_floating_markers_action.setChecked(True)
+        self.show_floating_markers_action.triggered.connect(self.toggle_floating_markers)
+        view_menu.addAction(self.show_floating_markers_action)
+
         self.show_op_annotations_action = QAction("Show &OP Annotations", self)
         self.show_op_annotations_action.setCheckable(True)
         self.show_op_annotations_action.setChecked(True)
@@ -456,6 +467,12 @@ class MenuBarMixin:
         run_action.triggered.connect(self.run_simulation)
         sim_menu.addAction(run_action)
 
+        self.live_op_action = QAction("&Live Operating Point", self)
+        self.live_op_action.setCheckable(True)
+        self.live_op_action.setToolTip("Re-run the DC operating point in the background after each edit")
+        self.live_op_action.toggled.connect(self.set_live_op)
+        sim_menu.addAction(self.live_op_action)
+
         # Analysis menu
         analysis_menu = menubar.addMenu("&Analysis")
         if analysis_menu is None:
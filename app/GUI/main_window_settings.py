@@ -20,6 +20,7 @@ class SettingsMixin:
         settings.set("view/show_labels", self.canvas.show_component_labels)
         settings.set("view/show_values", self.canvas.show_component_values)
         settings.set("view/show_nodes", self.canvas.show_node_labels)
+        settings.set("view/show_floating_markers", self.canvas.show_floating_markers)
         # Preserve auto-save defaults if not yet set
         if settings.get("autosave/interval") is None:
             settings.set("autosave/interval", 60)
@@ -36,6 +37,7 @@ class SettingsMixin:
         settings.set("view/wire_thickness", theme_manager.wire_thickness)
         settings.set("view/show_junction_dots", theme_manager.show_junction_dots)
         settings.set("view/routing_mode", theme_manager.routing_mode)
+        settings.set("simulation/live_op", self.live_op.enabled)
 
     def _restore_settings(self):
         """Restore user preferences from the centralized settings service."""
@@ -62,13 +64,13 @@ class SettingsMixin:
         show_labels = settings.get("view/show_labels")
         if show_labels is not None:
             checked = settings.get_bool("view/show_labels")
-            self.canvas.show_component_labels = checked
+            self.canvas.set_show_component_labels(checked)
             self.show_labels_action.setChecked(checked)
 
         show_values = settings.get("view/show_values")
         if show_values is not None:
             checked = settings.get_bool("view/show_values")
-            self.canvas.show_component_values = checked
+            self.canvas.set_show_component_values(checked)
             self.show_values_action.setChecked(checked)
 
         show_nodes = settings.get("view/show_nodes")
@@ -77,12 +79,24 @@ class SettingsMixin:
             self.canvas.show_node_labels = checked
             self.show_nodes_action.setChecked(checked)
 
+        if settings.get("view/show_floating_markers") is not None:
+            checked = settings.get_bool("view/show_floating_markers")
+            self.canvas.set_show_floating_markers(checked)
+            self.show_floating_markers_action.setChecked(checked)
+
         show_stats = settings.get("view/show_statistics")
         if show_stats is not None:
             checked = settings.get_bool("view/show_statistics")
             self.statistics_panel.setVisible(checked)
             self.show_statistics_action.setChecked(checked)
 
+        if settings.get_bool("simulation/live_op"):
+            self.live_op_action.setChecked(True)
+
+        # Opt-in: pixmap-cache component symbols on very large schematics
+        if settings.get_bool("view/cache_component_rendering"):
+            self.canvas.set_component_render_cache(True)
+
         default_zoom = settings.get("view/default_zoom")
         if default_zoom is not None:
             self.canvas.set_default_zoom(int(default_zoom))
@@ -127,6 +141,8 @@ class SettingsMixin:
     def closeEvent(self, event):
         """Save settings before closing"""
         self._save_settings()
+        self.live_op.shutdown()
+        self.canvas.shutdown_routing()
         self.file_ctrl.clear_auto_save()
         super().closeEvent(event)
 
@@ -6,11 +6,7 @@ import os
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QApplication, QFileDialog, QMessageBox, QProgressDialog
 
-from .monte_carlo_results_dialog import MonteCarloResultsDialog
-from .parameter_sweep_plot_dialog import ParameterSweepPlotDialog
-from .results_plot_dialog import ACSweepPlotDialog, DCSweepPlotDialog, NoisePlotDialog
 from .styles import STATUS_DURATION_DEFAULT
-from .waveform_dialog import WaveformDialog
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +70,12 @@ class SimulationMixin:
             logger.error("Simulation failed: %s", e, exc_info=True)
             QMessageBox.critical(self, "Error", f"Simulation failed: {e}")
 
+    def set_live_op(self, enabled):
+        """Toggle the live DC operating point shown on the canvas."""
+        self.live_op.set_enabled(enabled)
+        if not enabled:
+            self.canvas.clear_op_results()
+
     def _run_parameter_sweep(self):
         """Run parameter sweep with a progress dialog."""
         sweep_config = self.model.analysis_params
@@ -92,6 +94,8 @@ class SimulationMixin:
         progress.setMinimumDuration(0)
 
         def on_progress(step, total):
+            # Grid and adaptive sweeps report their own step totals
+            progress.setMaximum(total)
             progress.setValue(step)
             progress.setLabelText(f"Running step {step + 1} of {total}...")
             QApplication.processEvents()
@@ -101,14 +105,23 @@ class SimulationMixin:
             sweep_config,
             progress_callback=on_progress,
         )
-        progress.setValue(num_steps)
+        progress.setValue(progress.maximum())
         progress.close()
 
         # Add sweep_labels to the data for the plot dialog
         if result.data:
             from utils.format_utils import format_value
 
-            result.data["sweep_labels"] = [format_value(v).strip() for v in result.data.get("sweep_values", [])]
+            parameters = result.data.get("parameters", [])
+            if len(parameters) > 1:
+                # Multi-dimensional steps are labelled with every swept value
+                ids = [p["component_id"] for p in parameters]
+                result.data["sweep_labels"] = [
+                    ", ".join(f"{cid}={format_value(v).strip()}" for cid, v in zip(ids, point))
+                    for point in result.data.get("sweep_points", [])
+                ]
+            else:
+                result.data["sweep_labels"] = [format_value(v).strip() for v in result.data.get("sweep_values", [])]
 
         return result
 
@@ -272,6 +285,8 @@ class SimulationMixin:
 
     def _display_dc_sweep_results(self, result):
         """Display DC Sweep results."""
+        from .results_plot_dialog import DCSweepPlotDialog
+
         sweep_data = result.data if result.data else None
         if sweep_data:
             self._last_results = sweep_data
@@ -294,6 +309,8 @@ class SimulationMixin:
 
     def _display_ac_sweep_results(self, result):
         """Display AC Sweep results."""
+        from .results_plot_dialog import ACSweepPlotDialog
+
         ac_data = result.data if result.data else None
         if ac_data:
             self._last_results = ac_data
@@ -314,6 +331,8 @@ class SimulationMixin:
 
     def _display_transient_results(self, result):
         """Display Transient analysis results."""
+        from .waveform_dialog import WaveformDialog
+
         tran_data = result.data if result.data else None
 
         if tran_data:
@@ -323,8 +342,10 @@ class SimulationMixin:
             table_string = self.simulation_ctrl.format_results_table(tran_data)
             self.results_text.append(table_string)
 
-            # Power summary for resistors
-            power_metrics, power_summary = self.simulation_ctrl.compute_power_metrics(tran_data, self.model.components)
+            # Power summary and energy balance
+            power_metrics, power_summary = self.simulation_ctrl.compute_power_metrics(
+                tran_data, self.model.components, self.model.nodes
+            )
             if power_metrics:
                 self.results_text.append(power_summary)
 
@@ -364,6 +385,8 @@ class SimulationMixin:
 
     def _display_noise_results(self, result):
         """Display Noise analysis results."""
+        from .results_plot_dialog import NoisePlotDialog
+
         noise_data = result.data if result.data else None
         if noise_data:
             self._last_results = noise_data
@@ -500,6 +523,8 @@ class SimulationMixin:
 
     def _display_temp_sweep_results(self, result):
         """Display Temperature Sweep results."""
+        from .results_plot_dialog import DCSweepPlotDialog
+
         temp_data = result.data if result.data else {}
         params = self.model.analysis_params
 
@@ -552,6 +577,8 @@ class SimulationMixin:
 
     def _display_param_sweep_results(self, result):
         """Display Parameter Sweep results."""
+        from .parameter_sweep_plot_dialog import ParameterSweepPlotDialog
+
         sweep_data = result.data if result.data else None
         if sweep_data:
             self._last_results = sweep_data
@@ -563,10 +590,23 @@ class SimulationMixin:
 
             self.results_text.append("\nPARAMETER SWEEP RESULTS:")
             self.results_text.append("-" * 40)
-            self.results_text.append(f"  Component:      {comp_id}")
+            parameters = sweep_data.get("parameters", [])
+            if len(parameters) > 1:
+                from utils.format_utils import format_value
+
+                self.results_text.append(f"  Components:     {', '.join(p['component_id'] for p in parameters)}")
+                for p in parameters:
+                    self.results_text.append(
+                        f"    {p['component_id']}: {format_value(p['start']).strip()} to "
+                        f"{format_value(p['stop']).strip()}, {p['num_steps']} steps ({p['spacing']})"
+                    )
+            else:
+                self.results_text.append(f"  Component:      {comp_id}")
             self.results_text.append(f"  Base analysis:  {base_type}")
             self.results_text.append(f"  Steps:          {ok_count}/{len(step_results)} succeeded")
-            if labels:
+            if sweep_data.get("mode") == "adaptive":
+                self.results_text.append("  Mode:           adaptive (steps added where the output changes fastest)")
+            if labels and len(parameters) <= 1:
                 self.results_text.append(f"  Range:          {labels[0]} to {labels[-1]}")
             if sweep_data.get("cancelled"):
                 self.results_text.append("  (sweep was cancelled)")
@@ -587,6 +627,8 @@ class SimulationMixin:
 
     def _display_monte_carlo_results(self, result):
         """Display Monte Carlo results."""
+        from .monte_carlo_results_dialog import MonteCarloResultsDialog
+
         mc_data = result.data if result.data else None
         if mc_data:
             self._last_results = mc_data
@@ -603,6 +645,18 @@ class SimulationMixin:
                 self.results_text.append(
                     f"  {cid}: \u00b1{tol['tolerance_pct']}% ({tol.get('distribution', 'gaussian')})"
                 )
+            sampling = mc_data.get("sampling")
+            if sampling:
+                self.results_text.append(f"  Sampling:       {sampling} (seed {mc_data.get('seed')})")
+            conv = mc_data.get("convergence")
+            if conv:
+                label = "yield" if conv.get("criterion") == "yield" else "mean"
+                self.results_text.append(
+                    f"  Convergence:    {label} {conv['estimate']:.6g} \u00b1 {conv['half_width']:.3g} "
+                    f"after {conv['count']} runs"
+                )
+            if mc_data.get("stopped_early"):
+                self.results_text.append("  (stopped early: convergence criterion met)")
             if mc_data.get("cancelled"):
                 self.results_text.append("  (analysis was cancelled)")
             self.results_text.append("-" * 40)
@@ -671,6 +725,8 @@ class SimulationMixin:
         If a plot dialog of the same analysis type is already open, the user
         is asked whether to overlay the new results or replace the old plot.
         """
+        from .results_plot_dialog import ACSweepPlotDialog
+
         if (
             self._plot_dialog is not None
             and self._plot_dialog.isVisible()
@@ -3,9 +3,7 @@
 from controllers.theme_controller import theme_ctrl
 from PyQt6.QtWidgets import QApplication, QFileDialog, QMessageBox
 
-from .results_plot_dialog import ACSweepPlotDialog, DCSweepPlotDialog
 from .styles import STATUS_DURATION_DEFAULT, STATUS_DURATION_SHORT, theme_manager
-from .waveform_dialog import WaveformDialog
 
 
 class ViewOperationsMixin:
@@ -245,7 +243,8 @@ class ViewOperationsMixin:
             "wire_routed",
             "net_name_changed",
         }
-        if event in dirty_events:
+        changed = data.event_names if event == "batch_applied" else {event}
+        if changed & dirty_events:
             self._set_dirty(True)
         elif event in ("circuit_cleared", "model_loaded"):
             self._set_dirty(False)
@@ -254,12 +253,7 @@ class ViewOperationsMixin:
             self._update_undo_redo_actions()
 
         # Sync palette "Used in File" when components change
-        if event in (
-            "component_added",
-            "component_removed",
-            "circuit_cleared",
-            "model_loaded",
-        ):
+        if changed & {"component_added", "component_removed", "circuit_cleared", "model_loaded"}:
             self._sync_palette_used_in_file()
         if event == "model_loaded":
             self._sync_palette_recommendations()
@@ -282,19 +276,21 @@ class ViewOperationsMixin:
 
     def toggle_component_labels(self, checked):
         """Toggle component label visibility"""
-        self.canvas.show_component_labels = checked
-        self.canvas.scene().update()
+        self.canvas.set_show_component_labels(checked)
 
     def toggle_component_values(self, checked):
         """Toggle component value visibility"""
-        self.canvas.show_component_values = checked
-        self.canvas.scene().update()
+        self.canvas.set_show_component_values(checked)
 
     def toggle_node_labels(self, checked):
         """Toggle node label visibility"""
         self.canvas.show_node_labels = checked
         self.canvas.scene().update()
 
+    def toggle_floating_markers(self, checked):
+        """Toggle the markers on unconnected terminals"""
+        self.canvas.set_show_floating_markers(checked)
+
     def toggle_op_annotations(self, checked):
         """Toggle DC operating point annotation visibility."""
         self.canvas.show_op_annotations = checked
@@ -337,6 +333,8 @@ class ViewOperationsMixin:
 
     def _probe_open_waveform(self, signal_name, probe_type):
         """Open waveform dialog focused on the probed signal."""
+        from .waveform_dialog import WaveformDialog
+
         tran_data = self._last_results
         if not tran_data:
             return
@@ -351,6 +349,8 @@ class ViewOperationsMixin:
 
     def _probe_open_dc_sweep(self, signal_name, probe_type):
         """Open DC sweep plot dialog for the probed signal."""
+        from .results_plot_dialog import DCSweepPlotDialog
+
         sweep_data = self._last_results
         if not sweep_data:
             return
@@ -363,6 +363,8 @@ class ViewOperationsMixin:
 
     def _probe_open_ac_sweep(self, signal_name, probe_type):
         """Open AC sweep Bode plot dialog for the probed signal."""
+        from .results_plot_dialog import ACSweepPlotDialog
+
         ac_data = self._last_results
         if not ac_data:
             return
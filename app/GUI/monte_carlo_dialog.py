@@ -8,6 +8,7 @@ distribution, and select the base analysis type.
 from controllers.simulation_controller import SimulationController
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
+    QCheckBox,
     QComboBox,
     QDialog,
     QDialogButtonBox,
@@ -34,6 +35,22 @@ MC_BASE_ANALYSIS_TYPES = [
     "DC Sweep",
 ]
 
+# Sampling methods: display label -> mc_config value
+MC_SAMPLING_METHODS = {
+    "Random": "random",
+    "Latin hypercube": "lhs",
+    "Sobol": "sobol",
+}
+
+# Early-stopping criteria: display label -> mc_config value
+MC_STOP_CRITERIA = {
+    "Confidence interval of mean": "ci_width",
+    "Yield estimate": "yield",
+}
+
+# Per-run reductions offered for the early-stopping metric
+MC_STOP_REDUCTIONS = ["final", "max", "min", "mean", "rms", "pp"]
+
 
 class MonteCarloDialog(QDialog):
     """Dialog for configuring Monte Carlo tolerance analysis."""
@@ -76,10 +93,72 @@ class MonteCarloDialog(QDialog):
         self.analysis_combo.currentTextChanged.connect(self._on_analysis_changed)
         run_form.addRow("Base analysis:", self.analysis_combo)
 
+        self.sampling_combo = QComboBox()
+        self.sampling_combo.addItems(list(MC_SAMPLING_METHODS))
+        self.sampling_combo.setToolTip(
+            "Random: independent draws per run.\n"
+            "Latin hypercube / Sobol: spread samples evenly across every tolerance\n"
+            "band, giving the same accuracy with fewer runs."
+        )
+        run_form.addRow("Sampling:", self.sampling_combo)
+
+        self.seed_edit = QLineEdit()
+        self.seed_edit.setPlaceholderText("random")
+        self.seed_edit.setToolTip("Integer seed for reproducible runs (leave blank for a new seed each time)")
+        run_form.addRow("Seed:", self.seed_edit)
+
         self._base_form = QFormLayout()
         run_form.addRow(self._base_form)
         layout.addWidget(run_group)
 
+        # --- Early stopping ---
+        stop_group = QGroupBox("Early Stopping")
+        stop_form = QFormLayout(stop_group)
+
+        self.stop_check = QCheckBox("Stop when the chosen metric has converged")
+        self.stop_check.setToolTip("Stop before the run count is reached once the estimate is precise enough")
+        stop_form.addRow(self.stop_check)
+
+        self.stop_signal_edit = QLineEdit()
+        self.stop_signal_edit.setPlaceholderText("e.g. out")
+        self.stop_signal_edit.setToolTip("Node or signal name whose per-run value is monitored")
+        stop_form.addRow("Signal:", self.stop_signal_edit)
+
+        self.stop_reduction_combo = QComboBox()
+        self.stop_reduction_combo.addItems(MC_STOP_REDUCTIONS)
+        self.stop_reduction_combo.setToolTip("How each run's waveform is reduced to a single value")
+        stop_form.addRow("Per-run value:", self.stop_reduction_combo)
+
+        self.stop_criterion_combo = QComboBox()
+        self.stop_criterion_combo.addItems(list(MC_STOP_CRITERIA))
+        self.stop_criterion_combo.setToolTip(
+            "Confidence interval: stop when the 95% interval of the mean is within the tolerance.\n"
+            "Yield: stop when the pass-rate estimate is within the tolerance."
+        )
+        stop_form.addRow("Criterion:", self.stop_criterion_combo)
+
+        self.stop_tolerance_spin = QDoubleSpinBox()
+        self.stop_tolerance_spin.setRange(0.1, 50.0)
+        self.stop_tolerance_spin.setValue(1.0)
+        self.stop_tolerance_spin.setSuffix("%")
+        self.stop_tolerance_spin.setDecimals(1)
+        self.stop_tolerance_spin.setToolTip(
+            "Target half-width: % of the mean (confidence interval) or percentage points (yield)"
+        )
+        stop_form.addRow("Tolerance:", self.stop_tolerance_spin)
+
+        self.spec_min_edit = QLineEdit()
+        self.spec_min_edit.setPlaceholderText("none")
+        self.spec_min_edit.setToolTip("Lower pass limit for the yield criterion (supports SI prefixes)")
+        stop_form.addRow("Spec min:", self.spec_min_edit)
+
+        self.spec_max_edit = QLineEdit()
+        self.spec_max_edit.setPlaceholderText("none")
+        self.spec_max_edit.setToolTip("Upper pass limit for the yield criterion (supports SI prefixes)")
+        stop_form.addRow("Spec max:", self.spec_max_edit)
+
+        layout.addWidget(stop_group)
+
         # Build initial base analysis fields
         self._build_base_form()
 
@@ -197,14 +276,61 @@ class MonteCarloDialog(QDialog):
         if not has_tolerance:
             errors.append("At least one component must have a tolerance greater than 0%.")
 
+        seed_text = self.seed_edit.text().strip()
+        if seed_text and not seed_text.isdigit():
+            errors.append("Seed must be a non-negative integer.")
+            set_field_error(self.seed_edit, "Invalid seed")
+        else:
+            clear_field_error(self.seed_edit)
+
+        if self.stop_check.isChecked():
+            if not self.stop_signal_edit.text().strip():
+                errors.append("Early stopping needs a signal name.")
+                set_field_error(self.stop_signal_edit, "Required")
+            else:
+                clear_field_error(self.stop_signal_edit)
+            is_yield = MC_STOP_CRITERIA[self.stop_criterion_combo.currentText()] == "yield"
+            specs = (self.spec_min_edit, self.spec_max_edit)
+            for edit in specs:
+                text = edit.text().strip()
+                if not text:
+                    clear_field_error(edit)
+                    continue
+                try:
+                    parse_value(text)
+                    clear_field_error(edit)
+                except (ValueError, TypeError):
+                    errors.append("Spec limits must be valid numbers.")
+                    set_field_error(edit, "Invalid number")
+            if is_yield and not any(edit.text().strip() for edit in specs):
+                errors.append("The yield criterion needs a spec min and/or spec max.")
+
         return errors
 
+    def _get_convergence(self):
+        """Return the early-stopping settings, or None when disabled."""
+        from utils.format_utils import parse_value
+
+        if not self.stop_check.isChecked():
+            return None
+        min_text = self.spec_min_edit.text().strip()
+        max_text = self.spec_max_edit.text().strip()
+        return {
+            "signal": self.stop_signal_edit.text().strip(),
+            "reduction": self.stop_reduction_combo.currentText(),
+            "criterion": MC_STOP_CRITERIA[self.stop_criterion_combo.currentText()],
+            "tolerance": self.stop_tolerance_spin.value() / 100.0,
+            "spec_min": parse_value(min_text) if min_text else None,
+            "spec_max": parse_value(max_text) if max_text else None,
+        }
+
     def get_parameters(self):
         """Get all Monte Carlo parameters.
 
         Returns:
             dict with keys: num_runs, base_analysis_type, base_params,
-                            tolerances
+                            tolerances, sampling, and optionally seed
+                            and convergence
             or None if validation fails.
         """
         from utils.format_utils import parse_value
@@ -241,11 +367,19 @@ class MonteCarloDialog(QDialog):
             if not tolerances:
                 return None
 
-            return {
+            params = {
                 "num_runs": num_runs,
                 "base_analysis_type": base_analysis_type,
                 "base_params": base_params,
                 "tolerances": tolerances,
+                "sampling": MC_SAMPLING_METHODS[self.sampling_combo.currentText()],
             }
+            seed_text = self.seed_edit.text().strip()
+            if seed_text:
+                params["seed"] = int(seed_text)
+            convergence = self._get_convergence()
+            if convergence:
+                params["convergence"] = convergence
+            return params
         except (ValueError, TypeError):
             return None
@@ -4,9 +4,20 @@ statistical summary and histogram view.
 """
 
 import matplotlib.pyplot as plt
+import numpy as np
+from controllers.simulation_controller import SimulationController
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from PyQt6.QtWidgets import QComboBox, QDialog, QHBoxLayout, QLabel, QTextEdit, QVBoxLayout
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTextEdit,
+    QVBoxLayout,
+)
 
 from .plot_utils import apply_mpl_theme as _apply_mpl_theme
 
@@ -28,6 +39,9 @@ class MonteCarloResultsDialog(QDialog):
         self._sim_ctrl = sim_ctrl
         self._mc_data = mc_data
         self._base_type = mc_data.get("base_analysis_type", "")
+        self._stacked = mc_data.get("stacked")
+        if self._stacked is None:
+            self._stacked = SimulationController.stack_step_results(self._base_type, mc_data.get("results", []))
 
         layout = QVBoxLayout(self)
 
@@ -37,6 +51,12 @@ class MonteCarloResultsDialog(QDialog):
         self._metric_combo = QComboBox()
         self._metric_combo.currentTextChanged.connect(self._update_histogram)
         top_layout.addWidget(self._metric_combo)
+        self._meas_domain = SimulationController.get_analysis_domain_map().get(self._base_type)
+        self._add_meas_btn = QPushButton("Add Measurement...")
+        self._add_meas_btn.setToolTip("Evaluate a .meas-style measurement on the stored runs without re-simulating")
+        self._add_meas_btn.setEnabled(self._meas_domain is not None)
+        self._add_meas_btn.clicked.connect(self._on_add_measurement)
+        top_layout.addWidget(self._add_meas_btn)
         top_layout.addStretch()
         layout.addLayout(top_layout)
 
@@ -70,56 +90,35 @@ class MonteCarloResultsDialog(QDialog):
     def _extract_metrics(self):
         """Extract scalar metrics from each successful run result.
 
-        Returns dict[metric_name -> list of float values].
+        Returns dict[metric_name -> array of float values].
         """
-        metrics = {}
-        results = self._mc_data.get("results", [])
-
-        for run_result in results:
-            if not run_result.success:
-                continue
-            data = run_result.data
-            if data is None:
-                continue
-
-            if self._base_type == "DC Operating Point":
-                voltages = data.get("node_voltages", {}) if isinstance(data, dict) else data
-                if isinstance(voltages, dict):
-                    for node, val in voltages.items():
-                        key = f"V({node})"
-                        metrics.setdefault(key, []).append(val)
-
-            elif self._base_type == "Transient":
-                if isinstance(data, list) and data:
-                    # Extract final values
-                    last_row = data[-1]
-                    for key, val in last_row.items():
-                        if key.lower() not in ("time", "index"):
-                            metric_key = f"V({key}) final"
-                            metrics.setdefault(metric_key, []).append(val)
-
-            elif self._base_type == "DC Sweep":
-                rows = data.get("data", []) if isinstance(data, dict) else []
-                headers = data.get("headers", []) if isinstance(data, dict) else []
-                if rows and len(headers) >= 3:
-                    # Use mid-point value of each signal
-                    mid = len(rows) // 2
-                    for col_idx in range(2, len(headers)):
-                        metric_key = f"{headers[col_idx]} @mid"
-                        metrics.setdefault(metric_key, []).append(rows[mid][col_idx])
-
-            elif self._base_type == "AC Sweep":
-                if isinstance(data, dict):
-                    freqs = data.get("frequencies", [])
-                    mag = data.get("magnitude", {})
-                    if freqs and mag:
-                        mid = len(freqs) // 2
-                        for node, vals in mag.items():
-                            if mid < len(vals):
-                                metric_key = f"|{node}| @{freqs[mid]:.4g}Hz"
-                                metrics.setdefault(metric_key, []).append(vals[mid])
-
-        return metrics
+        return self._stacked.default_metrics()
+
+    def _on_add_measurement(self):
+        """Measure every stored run and add the result as a histogram metric."""
+        from .meas_dialog import MeasurementEntryDialog
+
+        dialog = MeasurementEntryDialog(self._meas_domain, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        data = dialog.get_data()
+        if not data:
+            return
+        try:
+            values = SimulationController.evaluate_study_measurements(self._stacked, [data["directive"]])
+        except ValueError as e:
+            QMessageBox.warning(self, "Measurement Failed", str(e))
+            return
+        self.add_measurement_metric(data["name"], values[data["name"]])
+
+    def add_measurement_metric(self, name, values):
+        """Add per-run measurement *values* as metric ``meas: name`` and show it."""
+        values = np.asarray(values, dtype=float)
+        label = f"meas: {name}"
+        self._metrics[label] = values[~np.isnan(values)]
+        self._populate_combo()
+        self._metric_combo.setCurrentText(label)
+        self._update_histogram()
 
     def _populate_combo(self):
         self._metric_combo.blockSignals(True)
@@ -129,91 +128,46 @@ class MonteCarloResultsDialog(QDialog):
         self._metric_combo.blockSignals(False)
 
     def _plot_overlay(self):
-        """Plot all simulation runs overlaid."""
+        """Plot all simulation runs overlaid, with a 5–95 % percentile band."""
         ax = self._overlay_fig.add_subplot(111)
-        results = self._mc_data.get("results", [])
+        stacked = self._stacked
         cmap = plt.get_cmap("tab10")
+        ok = stacked.ok
 
         if self._base_type == "DC Operating Point":
-            # Bar chart of node voltages for each run
-            ok_results = [r for r in results if r.success and r.data]
-            if ok_results:
-                first_data = ok_results[0].data
-                if isinstance(first_data, dict) and "node_voltages" in first_data:
-                    nodes = sorted(first_data.get("node_voltages", {}).keys())
-                elif isinstance(first_data, dict):
-                    nodes = sorted(first_data.keys())
-                else:
-                    nodes = []
-                for i, r in enumerate(ok_results):
-                    if isinstance(r.data, dict) and "node_voltages" in r.data:
-                        voltages = r.data.get("node_voltages", {})
-                    else:
-                        voltages = r.data
-                    if isinstance(voltages, dict):
-                        vals = [voltages.get(n, 0) for n in nodes]
-                        ax.scatter(
-                            nodes,
-                            vals,
-                            alpha=0.3,
-                            s=10,
-                            color=cmap(0),
-                            zorder=2,
-                        )
-                ax.set_ylabel("Voltage (V)")
-                ax.set_title("DC OP — All Runs")
-
-        elif self._base_type == "Transient":
-            ok_results = [r for r in results if r.success and r.data]
-            for i, r in enumerate(ok_results):
-                data = r.data
-                if not isinstance(data, list) or not data:
-                    continue
-                time_vals = [row.get("time", 0) for row in data]
-                signal_keys = sorted(k for k in data[0].keys() if k.lower() not in ("time", "index"))
-                for j, key in enumerate(signal_keys):
-                    vals = [row.get(key, 0) for row in data]
-                    ax.plot(time_vals, vals, alpha=0.2, color=cmap(j % 10), linewidth=0.5)
-            ax.set_xlabel("Time (s)")
-            ax.set_ylabel("Voltage (V)")
-            ax.set_title("Transient — All Runs")
-
-        elif self._base_type == "DC Sweep":
-            ok_results = [r for r in results if r.success and r.data]
-            for i, r in enumerate(ok_results):
-                data = r.data
-                if not isinstance(data, dict):
-                    continue
-                rows = data.get("data", [])
-                headers = data.get("headers", [])
-                if rows and len(headers) >= 3:
-                    sweep_vals = [row[1] for row in rows]
-                    for col_idx in range(2, len(headers)):
-                        vals = [row[col_idx] for row in rows]
-                        ax.plot(
-                            sweep_vals,
-                            vals,
-                            alpha=0.2,
-                            color=cmap((col_idx - 2) % 10),
-                            linewidth=0.5,
-                        )
-            ax.set_xlabel("Sweep Value")
+            # Scatter of node voltages for each run
+            nodes = sorted(n for n in stacked.signal_names if not n.startswith("i("))
+            for node in nodes:
+                vals = stacked.signal(node)[ok, 0]
+                ax.scatter([node] * len(vals), vals, alpha=0.3, s=10, color=cmap(0), zorder=2)
             ax.set_ylabel("Voltage (V)")
-            ax.set_title("DC Sweep — All Runs")
-
-        elif self._base_type == "AC Sweep":
-            ok_results = [r for r in results if r.success and r.data]
-            for i, r in enumerate(ok_results):
-                data = r.data
-                if not isinstance(data, dict):
+            ax.set_title("DC OP — All Runs")
+
+        elif self._base_type in ("Transient", "DC Sweep", "AC Sweep"):
+            plot = ax.semilogx if self._base_type == "AC Sweep" else ax.plot
+            for j, name in enumerate(sorted(stacked.signal_names)):
+                color = cmap(j % 10)
+                runs = stacked.signal(name)[ok]
+                if runs.size == 0:
                     continue
-                freqs = data.get("frequencies", [])
-                mag = data.get("magnitude", {})
-                for j, (node, vals) in enumerate(sorted(mag.items())):
-                    ax.semilogx(freqs, vals, alpha=0.2, color=cmap(j % 10), linewidth=0.5)
-            ax.set_xlabel("Frequency (Hz)")
-            ax.set_ylabel("Magnitude")
-            ax.set_title("AC Sweep — All Runs")
+                plot(stacked.axis, runs.T, alpha=0.2, color=color, linewidth=0.5)
+                if runs.shape[0] >= 3:
+                    low, median, high = stacked.percentile_envelope(name, (5.0, 50.0, 95.0))
+                    ax.fill_between(stacked.axis, low, high, color=color, alpha=0.15, linewidth=0)
+                    plot(stacked.axis, median, color=color, linewidth=1.2)
+
+            if self._base_type == "Transient":
+                ax.set_xlabel("Time (s)")
+                ax.set_ylabel("Voltage (V)")
+                ax.set_title("Transient — All Runs")
+            elif self._base_type == "DC Sweep":
+                ax.set_xlabel("Sweep Value")
+                ax.set_ylabel("Voltage (V)")
+                ax.set_title("DC Sweep — All Runs")
+            else:
+                ax.set_xlabel("Frequency (Hz)")
+                ax.set_ylabel("Magnitude")
+                ax.set_title("AC Sweep — All Runs")
 
         ax.grid(True, alpha=0.3)
         _apply_mpl_theme(self._overlay_fig)
@@ -228,7 +182,7 @@ class MonteCarloResultsDialog(QDialog):
         metric = self._metric_combo.currentText()
         values = self._metrics.get(metric, [])
 
-        if not values:
+        if len(values) == 0:
             ax.text(0.5, 0.5, "No data", ha="center", va="center", transform=ax.transAxes)
             self._summary.setPlainText("No metric data available.")
         else:
@@ -246,8 +200,6 @@ class MonteCarloResultsDialog(QDialog):
             if self._sim_ctrl is not None:
                 stats = self._sim_ctrl.compute_mc_statistics(values)
             else:
-                from controllers.simulation_controller import SimulationController
-
                 stats = SimulationController.compute_mc_statistics(values)
             lines = [
                 f"Metric: {metric}",
@@ -1,19 +1,27 @@
 """
-Parameter Sweep Dialog — Configure sweeping a component parameter across a range
-of values with a selectable base analysis type.
+Parameter Sweep Dialog — Configure sweeping one or more component parameters
+across a range of values with a selectable base analysis type.
 """
 
+import math
+
 from PyQt6.QtWidgets import (
     QComboBox,
     QDialog,
     QDialogButtonBox,
+    QDoubleSpinBox,
     QFormLayout,
     QGroupBox,
+    QHBoxLayout,
+    QHeaderView,
     QLabel,
     QLineEdit,
+    QPushButton,
     QSpinBox,
+    QTableWidget,
     QVBoxLayout,
 )
+from simulation.parameter_sweep import MAX_SWEEP_POINTS
 from utils.format_utils import format_value, parse_value
 
 from .styles import theme_manager
@@ -40,6 +48,21 @@ BASE_ANALYSIS_TYPES = [
     "DC Sweep",
 ]
 
+# Value spacing along a sweep axis: display label -> sweep_config value
+SWEEP_SPACINGS = {
+    "Linear": "linear",
+    "Logarithmic": "log",
+}
+
+# Sweep modes: display label -> sweep_config value
+SWEEP_MODES = {
+    "Grid": "grid",
+    "Adaptive": "adaptive",
+}
+
+# Per-step reductions an adaptive sweep can refine on
+ADAPTIVE_REDUCTIONS = ["final", "max", "min", "mean", "rms", "pp"]
+
 
 class ParameterSweepDialog(QDialog):
     """Dialog for configuring a parameter sweep across component values."""
@@ -52,7 +75,7 @@ class ParameterSweepDialog(QDialog):
         """
         super().__init__(parent)
         self.setWindowTitle("Parameter Sweep Configuration")
-        self.setMinimumWidth(420)
+        self.setMinimumWidth(480)
 
         # Filter to sweepable components
         self._sweepable = {cid: comp for cid, comp in components.items() if comp.component_type in SWEEPABLE_TYPES}
@@ -65,7 +88,8 @@ class ParameterSweepDialog(QDialog):
 
         # Description
         desc = QLabel(
-            "Sweep a component parameter across a range of values, running the selected analysis at each step."
+            "Sweep one or more component parameters across a range of values, "
+            "running the selected analysis at each step."
         )
         desc.setWordWrap(True)
         layout.addWidget(desc)
@@ -97,11 +121,90 @@ class ParameterSweepDialog(QDialog):
         self.steps_spin = QSpinBox()
         self.steps_spin.setRange(2, 100)
         self.steps_spin.setValue(10)
-        self.steps_spin.setToolTip("Number of sweep steps (2-100)")
+        self.steps_spin.setToolTip("Number of sweep steps (2-100); the coarse pass in adaptive mode")
         sweep_form.addRow("Number of Steps:", self.steps_spin)
 
+        self.spacing_combo = QComboBox()
+        self.spacing_combo.addItems(list(SWEEP_SPACINGS))
+        self.spacing_combo.setToolTip(
+            "Linear: equal steps between start and stop.\n"
+            "Logarithmic: equal ratios between steps (start and stop must have the same sign)."
+        )
+        sweep_form.addRow("Spacing:", self.spacing_combo)
+
         layout.addWidget(sweep_group)
 
+        # --- Additional Parameters (multi-dimensional grid) ---
+        extra_group = QGroupBox("Additional Parameters")
+        extra_layout = QVBoxLayout(extra_group)
+
+        self.extra_table = QTableWidget(0, 5)
+        self.extra_table.setToolTip(
+            "Further components to sweep. Every combination of values is simulated (full grid)."
+        )
+        self.extra_table.setHorizontalHeaderLabels(["Component", "Start", "Stop", "Steps", "Spacing"])
+        self.extra_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.extra_table.setMaximumHeight(130)
+        extra_layout.addWidget(self.extra_table)
+
+        extra_buttons = QHBoxLayout()
+        self.add_param_btn = QPushButton("Add Parameter")
+        self.add_param_btn.setToolTip("Add another component to sweep as a new grid dimension")
+        self.add_param_btn.clicked.connect(self._add_extra_row)
+        self.add_param_btn.setEnabled(len(self._sweepable) > 1)
+        extra_buttons.addWidget(self.add_param_btn)
+        self.remove_param_btn = QPushButton("Remove Parameter")
+        self.remove_param_btn.setToolTip("Remove the selected additional parameter")
+        self.remove_param_btn.clicked.connect(self._remove_extra_row)
+        extra_buttons.addWidget(self.remove_param_btn)
+        extra_buttons.addStretch()
+        extra_layout.addLayout(extra_buttons)
+
+        layout.addWidget(extra_group)
+
+        # --- Sweep Mode ---
+        mode_group = QGroupBox("Sweep Mode")
+        mode_form = QFormLayout(mode_group)
+
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(list(SWEEP_MODES))
+        self.mode_combo.setToolTip(
+            "Grid: simulate every step.\n"
+            "Adaptive: simulate the steps as a coarse pass, then add steps only where\n"
+            "the chosen output changes fastest (single parameter only)."
+        )
+        self.mode_combo.currentTextChanged.connect(self._on_mode_changed)
+        mode_form.addRow("Mode:", self.mode_combo)
+
+        self.adaptive_signal_edit = QLineEdit()
+        self.adaptive_signal_edit.setPlaceholderText("e.g. out")
+        self.adaptive_signal_edit.setToolTip("Node or signal name whose per-step value guides refinement")
+        mode_form.addRow("Signal:", self.adaptive_signal_edit)
+
+        self.adaptive_reduction_combo = QComboBox()
+        self.adaptive_reduction_combo.addItems(ADAPTIVE_REDUCTIONS)
+        self.adaptive_reduction_combo.setToolTip("How each step's waveform is reduced to a single value")
+        mode_form.addRow("Per-step value:", self.adaptive_reduction_combo)
+
+        self.adaptive_tolerance_spin = QDoubleSpinBox()
+        self.adaptive_tolerance_spin.setRange(0.1, 50.0)
+        self.adaptive_tolerance_spin.setValue(5.0)
+        self.adaptive_tolerance_spin.setSuffix("%")
+        self.adaptive_tolerance_spin.setDecimals(1)
+        self.adaptive_tolerance_spin.setToolTip(
+            "Refine until no interval changes the value by more than this share of its total range"
+        )
+        mode_form.addRow("Resolution:", self.adaptive_tolerance_spin)
+
+        self.adaptive_max_spin = QSpinBox()
+        self.adaptive_max_spin.setRange(3, 500)
+        self.adaptive_max_spin.setValue(50)
+        self.adaptive_max_spin.setToolTip("Maximum total number of simulations, including the coarse pass")
+        mode_form.addRow("Max Steps:", self.adaptive_max_spin)
+
+        layout.addWidget(mode_group)
+        self._on_mode_changed(self.mode_combo.currentText())
+
         # --- Base Analysis Configuration ---
         analysis_group = QGroupBox("Base Analysis")
         analysis_layout = QVBoxLayout(analysis_group)
@@ -139,7 +242,10 @@ class ParameterSweepDialog(QDialog):
 
     def _update_defaults_from_component(self):
         """Update start/stop defaults based on selected component's current value."""
-        cid = self.component_combo.currentData()
+        self._apply_default_range(self.component_combo.currentData(), self.start_edit, self.stop_edit)
+
+    def _apply_default_range(self, cid, start_edit, stop_edit):
+        """Fill *start_edit*/*stop_edit* with a range around a component's value."""
         if cid and cid in self._sweepable:
             comp = self._sweepable[cid]
             try:
@@ -147,11 +253,81 @@ class ParameterSweepDialog(QDialog):
                 # Default: sweep from 1/10 to 10x current value
                 start = current_val / 10
                 stop = current_val * 10
-                self.start_edit.setText(format_value(start).strip().replace(" ", ""))
-                self.stop_edit.setText(format_value(stop).strip().replace(" ", ""))
+                start_edit.setText(format_value(start).strip().replace(" ", ""))
+                stop_edit.setText(format_value(stop).strip().replace(" ", ""))
             except (ValueError, TypeError):
                 pass
 
+    def _add_extra_row(self):
+        """Append a row for another swept component, defaulting to an unused one."""
+        used = {cid for cid, *_ in self._parameter_rows()}
+        row = self.extra_table.rowCount()
+        self.extra_table.insertRow(row)
+
+        combo = QComboBox()
+        combo.setToolTip("Component whose value is swept along this dimension")
+        for cid, comp in sorted(self._sweepable.items()):
+            combo.addItem(f"{cid} ({comp.value})", cid)
+        for i in range(combo.count()):
+            if combo.itemData(i) not in used:
+                combo.setCurrentIndex(i)
+                break
+
+        start_edit = QLineEdit()
+        start_edit.setToolTip("Start value (supports SI prefixes)")
+        stop_edit = QLineEdit()
+        stop_edit.setToolTip("Stop value (supports SI prefixes)")
+        steps_spin = QSpinBox()
+        steps_spin.setRange(2, 100)
+        steps_spin.setValue(5)
+        steps_spin.setToolTip("Number of steps along this dimension (2-100)")
+        spacing_combo = QComboBox()
+        spacing_combo.addItems(list(SWEEP_SPACINGS))
+        spacing_combo.setToolTip("Linear or logarithmic spacing of the values")
+
+        for col, widget in enumerate((combo, start_edit, stop_edit, steps_spin, spacing_combo)):
+            self.extra_table.setCellWidget(row, col, widget)
+
+        self._apply_default_range(combo.currentData(), start_edit, stop_edit)
+        combo.currentIndexChanged.connect(
+            lambda _, c=combo, a=start_edit, b=stop_edit: self._apply_default_range(c.currentData(), a, b)
+        )
+
+    def _remove_extra_row(self):
+        """Remove the selected additional parameter (or the last one)."""
+        row = self.extra_table.currentRow()
+        if row < 0:
+            row = self.extra_table.rowCount() - 1
+        if row >= 0:
+            self.extra_table.removeRow(row)
+
+    def _parameter_rows(self):
+        """Yield (component_id, start_edit, stop_edit, steps_spin, spacing_combo) per swept parameter."""
+        yield (
+            self.component_combo.currentData(),
+            self.start_edit,
+            self.stop_edit,
+            self.steps_spin,
+            self.spacing_combo,
+        )
+        for row in range(self.extra_table.rowCount()):
+            widgets = [self.extra_table.cellWidget(row, col) for col in range(5)]
+            yield (widgets[0].currentData(), *widgets[1:])
+
+    def _on_mode_changed(self, mode_label):
+        adaptive = SWEEP_MODES.get(mode_label) == "adaptive"
+        for widget in (
+            self.adaptive_signal_edit,
+            self.adaptive_reduction_combo,
+            self.adaptive_tolerance_spin,
+            self.adaptive_max_spin,
+        ):
+            widget.setEnabled(adaptive)
+        # Adaptive refinement works along a single parameter
+        self.extra_table.setEnabled(not adaptive)
+        self.add_param_btn.setEnabled(not adaptive and len(self._sweepable) > 1)
+        self.remove_param_btn.setEnabled(not adaptive)
+
     def _on_analysis_changed(self, analysis_type):
         self._build_base_form()
 
@@ -178,30 +354,54 @@ class ParameterSweepDialog(QDialog):
         if not self.component_combo.currentData():
             errors.append("No component selected for sweep.")
 
-        # Validate start/stop values
-        start_ok, stop_ok = True, True
-        try:
-            parse_value(self.start_edit.text())
-            clear_field_error(self.start_edit)
-        except (ValueError, TypeError):
-            errors.append("Start value must be a valid number.")
-            set_field_error(self.start_edit, "Invalid number")
-            start_ok = False
-
-        try:
-            parse_value(self.stop_edit.text())
-            clear_field_error(self.stop_edit)
-        except (ValueError, TypeError):
-            errors.append("Stop value must be a valid number.")
-            set_field_error(self.stop_edit, "Invalid number")
-            stop_ok = False
+        # Validate start/stop values of every swept parameter
+        adaptive = SWEEP_MODES[self.mode_combo.currentText()] == "adaptive"
+        rows = list(self._parameter_rows())[:1] if adaptive else list(self._parameter_rows())
+        seen = set()
+        for index, (cid, start_edit, stop_edit, _steps, spacing_combo) in enumerate(rows):
+            prefix = "" if index == 0 else f"{cid}: "
+            if cid in seen:
+                errors.append(f"{cid} is swept more than once.")
+            seen.add(cid)
+
+            start_ok, stop_ok = True, True
+            try:
+                parse_value(start_edit.text())
+                clear_field_error(start_edit)
+            except (ValueError, TypeError):
+                errors.append(f"{prefix}Start value must be a valid number.")
+                set_field_error(start_edit, "Invalid number")
+                start_ok = False
 
-        if start_ok and stop_ok:
-            start = parse_value(self.start_edit.text())
-            stop = parse_value(self.stop_edit.text())
-            if start == stop:
-                errors.append("Start and stop values must be different.")
-                set_field_error(self.stop_edit, "Must differ from start")
+            try:
+                parse_value(stop_edit.text())
+                clear_field_error(stop_edit)
+            except (ValueError, TypeError):
+                errors.append(f"{prefix}Stop value must be a valid number.")
+                set_field_error(stop_edit, "Invalid number")
+                stop_ok = False
+
+            if start_ok and stop_ok:
+                start = parse_value(start_edit.text())
+                stop = parse_value(stop_edit.text())
+                if start == stop:
+                    errors.append(f"{prefix}Start and stop values must be different.")
+                    set_field_error(stop_edit, "Must differ from start")
+                elif SWEEP_SPACINGS[spacing_combo.currentText()] == "log" and (
+                    start == 0 or stop == 0 or (start > 0) != (stop > 0)
+                ):
+                    errors.append(f"{prefix}Logarithmic spacing needs non-zero start and stop of the same sign.")
+                    set_field_error(stop_edit, "Invalid for log spacing")
+
+        if adaptive:
+            if not self.adaptive_signal_edit.text().strip():
+                errors.append("Adaptive sweeps need an output signal.")
+            if self.adaptive_max_spin.value() < self.steps_spin.value():
+                errors.append("Max steps must be at least the number of coarse steps.")
+        else:
+            num_points = math.prod(steps.value() for _, _, _, steps, _ in rows)
+            if num_points > MAX_SWEEP_POINTS:
+                errors.append(f"The sweep grid has {num_points} points; the limit is {MAX_SWEEP_POINTS}.")
 
         # Validate base analysis params
         for key, (widget, field_type) in self._base_field_widgets.items():
@@ -225,8 +425,10 @@ class ParameterSweepDialog(QDialog):
         Get all sweep parameters.
 
         Returns:
-            dict with keys: component_id, start, stop, num_steps,
-                            base_analysis_type, base_params
+            dict with keys: component_id, start, stop, num_steps, spacing
+                            (first parameter), parameters (every swept
+                            parameter), mode, base_analysis_type,
+                            base_params, and adaptive for adaptive sweeps
             or None if validation fails.
         """
         try:
@@ -234,12 +436,24 @@ class ParameterSweepDialog(QDialog):
             if not component_id:
                 return None
 
-            start = parse_value(self.start_edit.text())
-            stop = parse_value(self.stop_edit.text())
-            num_steps = self.steps_spin.value()
-
-            if start == stop:
-                return None
+            mode = SWEEP_MODES[self.mode_combo.currentText()]
+            parameters = []
+            for cid, start_edit, stop_edit, steps_spin, spacing_combo in self._parameter_rows():
+                start = parse_value(start_edit.text())
+                stop = parse_value(stop_edit.text())
+                if start == stop:
+                    return None
+                parameters.append(
+                    {
+                        "component_id": cid,
+                        "start": start,
+                        "stop": stop,
+                        "num_steps": steps_spin.value(),
+                        "spacing": SWEEP_SPACINGS[spacing_combo.currentText()],
+                    }
+                )
+                if mode == "adaptive":
+                    break
 
             base_analysis_type = self.analysis_combo.currentText()
 
@@ -255,13 +469,22 @@ class ParameterSweepDialog(QDialog):
                 else:
                     base_params[key] = widget.text()
 
-            return {
-                "component_id": component_id,
-                "start": start,
-                "stop": stop,
-                "num_steps": num_steps,
-                "base_analysis_type": base_analysis_type,
-                "base_params": base_params,
-            }
+            params = dict(parameters[0])
+            params.update(
+                {
+                    "parameters": parameters,
+                    "mode": mode,
+                    "base_analysis_type": base_analysis_type,
+                    "base_params": base_params,
+                }
+            )
+            if mode == "adaptive":
+                params["adaptive"] = {
+                    "signal": self.adaptive_signal_edit.text().strip(),
+                    "reduction": self.adaptive_reduction_combo.currentText(),
+                    "tolerance": self.adaptive_tolerance_spin.value() / 100.0,
+                    "max_steps": self.adaptive_max_spin.value(),
+                }
+            return params
         except (ValueError, TypeError):
             return None
@@ -1,15 +1,17 @@
 """
 Parameter Sweep Plot Dialog — Matplotlib-based overlay of simulation results
-from sweeping a component parameter across a range of values.
+from sweeping one or more component parameters across a range of values.
 """
 
 import logging
 
 import GUI.plot_utils  # noqa: F401  — ensures matplotlib backend is configured
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from PyQt6.QtWidgets import QDialog, QHBoxLayout, QPushButton, QVBoxLayout
+from utils.format_utils import format_value
 
 from .plot_utils import safe_legend
 from .results_plot_dialog import save_plot
@@ -25,9 +27,8 @@ class ParameterSweepPlotDialog(QDialog):
 
     def __init__(self, sweep_data, parent=None):
         super().__init__(parent)
-        component_id = sweep_data["component_id"]
         base_type = sweep_data["base_analysis_type"]
-        self.setWindowTitle(f"Parameter Sweep — {component_id} ({base_type})")
+        self.setWindowTitle(f"Parameter Sweep — {self._swept_ids(sweep_data)} ({base_type})")
         self.setMinimumSize(900, 600)
 
         layout = QVBoxLayout(self)
@@ -67,32 +68,67 @@ class ParameterSweepPlotDialog(QDialog):
 
         fig.tight_layout()
 
+    @staticmethod
+    def _get_stacked(sweep_data):
+        """Return the sweep's StackedResults, building it for legacy data."""
+        stacked = sweep_data.get("stacked")
+        if stacked is None:
+            from controllers.simulation_controller import SimulationController
+
+            stacked = SimulationController.stack_step_results(
+                sweep_data["base_analysis_type"], sweep_data.get("results", [])
+            )
+        return stacked
+
+    @staticmethod
+    def _swept_ids(sweep_data):
+        """Return the swept component IDs joined for titles (e.g. ``R1 × C1``)."""
+        parameters = sweep_data.get("parameters") or [{"component_id": sweep_data["component_id"]}]
+        return " × ".join(p["component_id"] for p in parameters)
+
+    @staticmethod
+    def _step_label(sweep_data, i):
+        """Return the legend label of sweep step *i*."""
+        sweep_labels = sweep_data.get("sweep_labels", [])
+        label = sweep_labels[i] if i < len(sweep_labels) else str(i)
+        if len(sweep_data.get("parameters", [])) > 1:
+            return label
+        return f"{sweep_data['component_id']}={label}"
+
+    @staticmethod
+    def _families(sweep_data, num_runs):
+        """Group step indices by the values of every parameter except the first.
+
+        Returns a list of ``(label, indices)``; one-dimensional sweeps give a
+        single family with an empty label.
+        """
+        parameters = sweep_data.get("parameters", [])
+        points = sweep_data.get("sweep_points")
+        if len(parameters) <= 1 or not points:
+            return [("", np.arange(num_runs))]
+        groups: dict[tuple, list[int]] = {}
+        for i, point in enumerate(points[:num_runs]):
+            groups.setdefault(tuple(point[1:]), []).append(i)
+        families = []
+        for key, indices in groups.items():
+            label = ", ".join(f"{p['component_id']}={format_value(v).strip()}" for p, v in zip(parameters[1:], key))
+            families.append((label, np.asarray(indices)))
+        return families
+
     # ------------------------------------------------------------------
     # DC Operating Point base: X = parameter value, Y = node voltages
+    # (one curve per node and per combination of further parameters)
     # ------------------------------------------------------------------
-    @staticmethod
-    def _extract_node_voltages(data):
-        """Extract node voltages from OP result data (handles both formats)."""
-        if isinstance(data, dict) and "node_voltages" in data:
-            return data["node_voltages"]
-        return data
-
     def _plot_op_sweep(self, fig, sweep_data):
         ax = fig.add_subplot(111)
 
-        sweep_values = sweep_data["sweep_values"]
-        results = sweep_data["results"]
+        stacked = self._get_stacked(sweep_data)
+        sweep_values = np.asarray(sweep_data["sweep_values"][: stacked.num_runs], dtype=float)
         component_id = sweep_data["component_id"]
+        families = self._families(sweep_data, len(sweep_values))
 
-        # Collect all node names
-        all_nodes = set()
-        for r in results:
-            if r.success and r.data:
-                nv = self._extract_node_voltages(r.data)
-                if isinstance(nv, dict):
-                    all_nodes.update(nv.keys())
-
-        if not all_nodes:
+        nodes = sorted(n for n in stacked.signal_names if not n.startswith("i("))
+        if not nodes:
             ax.text(
                 0.5,
                 0.5,
@@ -105,21 +141,31 @@ class ParameterSweepPlotDialog(QDialog):
 
         cmap = plt.get_cmap("tab10")
 
-        for idx, node in enumerate(sorted(all_nodes)):
-            vals = []
-            voltages = []
-            for sv, r in zip(sweep_values, results):
-                if r.success and r.data:
-                    nv = self._extract_node_voltages(r.data)
-                    if isinstance(nv, dict) and node in nv:
-                        vals.append(sv)
-                        voltages.append(nv[node])
-            if vals:
-                ax.plot(vals, voltages, "o-", label=node, color=cmap(idx % 10), markersize=4)
+        idx = 0
+        for node in nodes:
+            voltages = stacked.signal(node)[: len(sweep_values), 0]
+            valid = stacked.ok[: len(sweep_values)] & ~np.isnan(voltages)
+            for family_label, indices in families:
+                indices = indices[valid[indices]]
+                if len(indices) == 0:
+                    continue
+                label = f"{node} ({family_label})" if family_label else node
+                ax.plot(
+                    sweep_values[indices],
+                    voltages[indices],
+                    "o-",
+                    label=label,
+                    color=cmap(idx % 10),
+                    markersize=4,
+                )
+                idx += 1
 
+        parameters = sweep_data.get("parameters", [])
+        if parameters and parameters[0].get("spacing") == "log":
+            ax.set_xscale("log" if sweep_values[0] > 0 else "symlog")
         ax.set_xlabel(f"{component_id} Value")
         ax.set_ylabel("Voltage (V)")
-        ax.set_title(f"Parameter Sweep — {component_id}")
+        ax.set_title(f"Parameter Sweep — {self._swept_ids(sweep_data)}")
         safe_legend(ax, fontsize="small")
         ax.grid(True, alpha=0.3)
 
@@ -129,37 +175,28 @@ class ParameterSweepPlotDialog(QDialog):
     def _plot_transient_sweep(self, fig, sweep_data):
         ax = fig.add_subplot(111)
 
-        results = sweep_data["results"]
-        sweep_labels = sweep_data.get("sweep_labels", [])
-        component_id = sweep_data["component_id"]
+        stacked = self._get_stacked(sweep_data)
 
         cmap = plt.get_cmap("viridis")
-        n = len(results)
-
-        for i, r in enumerate(results):
-            if not r.success or not r.data:
-                continue
-
-            label = sweep_labels[i] if i < len(sweep_labels) else str(i)
-            times = [pt["time"] for pt in r.data]
-            nodes = [k for k in r.data[0].keys() if k != "time"]
+        n = stacked.num_runs
 
+        for i in np.flatnonzero(stacked.ok):
+            label = self._step_label(sweep_data, i)
             color = cmap(i / max(n - 1, 1))
 
-            for node in nodes:
-                values = [pt[node] for pt in r.data]
+            for node in stacked.signal_names:
                 ax.plot(
-                    times,
-                    values,
+                    stacked.axis,
+                    stacked.signal(node)[i],
                     color=color,
-                    label=f"{node} ({component_id}={label})",
+                    label=f"{node} ({label})",
                     alpha=0.8,
                     linewidth=1,
                 )
 
         ax.set_xlabel("Time (s)")
         ax.set_ylabel("Voltage (V)")
-        ax.set_title(f"Transient Parameter Sweep — {component_id}")
+        ax.set_title(f"Transient Parameter Sweep — {self._swept_ids(sweep_data)}")
         safe_legend(ax, fontsize="x-small", ncol=2)
         ax.grid(True, alpha=0.3)
 
@@ -170,43 +207,34 @@ class ParameterSweepPlotDialog(QDialog):
         ax_mag = fig.add_subplot(211)
         ax_phase = fig.add_subplot(212, sharex=ax_mag)
 
-        results = sweep_data["results"]
-        sweep_labels = sweep_data.get("sweep_labels", [])
-        component_id = sweep_data["component_id"]
+        stacked = self._get_stacked(sweep_data)
 
         cmap = plt.get_cmap("viridis")
-        n = len(results)
-
-        for i, r in enumerate(results):
-            if not r.success or not r.data:
-                continue
-
-            label = sweep_labels[i] if i < len(sweep_labels) else str(i)
-            freqs = r.data.get("frequencies", [])
-            magnitude = r.data.get("magnitude", {})
-            phase = r.data.get("phase", {})
+        n = stacked.num_runs
 
+        for i in np.flatnonzero(stacked.ok):
+            label = self._step_label(sweep_data, i)
             color = cmap(i / max(n - 1, 1))
 
-            for node, mag_vals in sorted(magnitude.items()):
+            for node in sorted(stacked.signal_names):
                 ax_mag.semilogx(
-                    freqs,
-                    mag_vals,
+                    stacked.axis,
+                    stacked.signal(node)[i],
                     color=color,
-                    label=f"{node} ({component_id}={label})",
+                    label=f"{node} ({label})",
                     alpha=0.8,
                 )
-                if node in phase:
+                if node in stacked.phase:
                     ax_phase.semilogx(
-                        freqs,
-                        phase[node],
+                        stacked.axis,
+                        stacked.signal(node, phase=True)[i],
                         color=color,
-                        label=f"{node} ({component_id}={label})",
+                        label=f"{node} ({label})",
                         alpha=0.8,
                     )
 
         ax_mag.set_ylabel("Magnitude")
-        ax_mag.set_title(f"AC Parameter Sweep — {component_id}")
+        ax_mag.set_title(f"AC Parameter Sweep — {self._swept_ids(sweep_data)}")
         safe_legend(ax_mag, fontsize="x-small")
         ax_mag.grid(True, which="both", alpha=0.3)
 
@@ -221,43 +249,27 @@ class ParameterSweepPlotDialog(QDialog):
     def _plot_dc_sweep(self, fig, sweep_data):
         ax = fig.add_subplot(111)
 
-        results = sweep_data["results"]
-        sweep_labels = sweep_data.get("sweep_labels", [])
-        component_id = sweep_data["component_id"]
+        stacked = self._get_stacked(sweep_data)
 
         cmap = plt.get_cmap("viridis")
-        n = len(results)
-        x_label = "Sweep"
-
-        for i, r in enumerate(results):
-            if not r.success or not r.data:
-                continue
-
-            label = sweep_labels[i] if i < len(sweep_labels) else str(i)
-            headers = r.data.get("headers", [])
-            rows = r.data.get("data", [])
-
-            if not rows or len(headers) < 3:
-                continue
+        n = stacked.num_runs
 
-            sweep_vals = [row[1] for row in rows]
+        for i in np.flatnonzero(stacked.ok):
+            label = self._step_label(sweep_data, i)
             color = cmap(i / max(n - 1, 1))
-            x_label = headers[1] if len(headers) > 1 else "Sweep"
 
-            for col_idx in range(2, len(headers)):
-                col_label = headers[col_idx]
-                values = [row[col_idx] for row in rows]
+            for col_label in stacked.signal_names:
                 ax.plot(
-                    sweep_vals,
-                    values,
+                    stacked.axis,
+                    stacked.signal(col_label)[i],
                     color=color,
-                    label=f"{col_label} ({component_id}={label})",
+                    label=f"{col_label} ({label})",
                     alpha=0.8,
                 )
 
-        ax.set_xlabel(x_label)
+        ax.set_xlabel(stacked.axis_name or "Sweep")
         ax.set_ylabel("Voltage (V)")
-        ax.set_title(f"DC Sweep with Parameter Sweep — {component_id}")
+        ax.set_title(f"DC Sweep with Parameter Sweep — {self._swept_ids(sweep_data)}")
         safe_legend(ax, fontsize="x-small")
         ax.grid(True, alpha=0.3)
 
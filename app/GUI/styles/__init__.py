@@ -29,6 +29,7 @@ from . import theme_store
 
 # Core constants (always available, theme-independent)
 from .constants import (
+    COMPONENT_DETAIL_MIN_LOD,
     COMPONENTS,
     DEFAULT_COMPONENT_COUNTER,
     DEFAULT_SPLITTER_SIZES,
@@ -93,6 +94,7 @@ __all__ = [
     "ZOOM_MIN",
     "ZOOM_MAX",
     "ZOOM_FIT_PADDING",
+    "COMPONENT_DETAIL_MIN_LOD",
     # Z-value layering
     "Z_GRID",
     "Z_COMPONENT",
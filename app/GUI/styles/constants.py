@@ -35,6 +35,10 @@ ZOOM_MIN = 0.1  # Minimum zoom level (10%)
 ZOOM_MAX = 5.0  # Maximum zoom level (500%)
 ZOOM_FIT_PADDING = 50  # Pixels of padding when fitting to circuit
 
+# Component level of detail: below this zoom, labels, terminal dots and
+# hover/lock outlines are skipped so dense schematics stay fluid
+COMPONENT_DETAIL_MIN_LOD = 0.4
+
 # Z-value layering (higher values are drawn on top)
 Z_GRID = -1  # Grid lines and labels (background)
 Z_COMPONENT = 0  # Components (default QGraphicsItem z)
@@ -13,6 +13,7 @@ from PyQt6.QtWidgets import (
     QGroupBox,
     QHBoxLayout,
     QHeaderView,
+    QInputDialog,
     QLabel,
     QLineEdit,
     QMessageBox,
@@ -154,6 +155,11 @@ class WaveformDialog(QDialog):
         fft_button.clicked.connect(self._show_fft_analysis)
         right_layout.addWidget(fft_button)
 
+        expression_button = QPushButton("Add Expression...")
+        expression_button.setToolTip("Plot a derived signal, e.g. v(in,out), d/dt(v(out)) or v(out)*i(v1)")
+        expression_button.clicked.connect(self._on_add_expression)
+        right_layout.addWidget(expression_button)
+
         # Measurement cursors
         self._cursor_readout = CursorReadoutPanel()
         right_layout.addWidget(self._cursor_readout)
@@ -210,6 +216,38 @@ class WaveformDialog(QDialog):
 
         self.update_view()
 
+    def _on_add_expression(self):
+        """Prompt for a derived-signal expression and add it as a trace."""
+        expression, ok = QInputDialog.getText(self, "Add Expression", "Expression (e.g. v(in,out), d/dt(v(out))):")
+        if not ok or not expression.strip():
+            return
+        try:
+            self.add_expression_trace(expression.strip())
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Expression", str(e))
+
+    def add_expression_trace(self, expression):
+        """Evaluate *expression* on the primary dataset and add it as a trace.
+
+        Raises:
+            ValueError: if the expression is invalid or names an unknown signal.
+        """
+        if expression in self.voltage_keys:
+            return
+        values = SimulationController.evaluate_waveform_expression(self.analysis_type, self.full_data, expression)
+        self.full_data = [dict(row, **{expression: float(v)}) for row, v in zip(self.full_data, values)]
+
+        # Derived traces sit with the base signals, ahead of any overlay entries
+        self.voltage_keys.append(expression)
+        self.column_visibility[expression] = True
+        self.plot_colors[expression] = plt.get_cmap("Paired")((len(self.voltage_keys) - 1) % 12)
+        checkbox = QCheckBox(expression)
+        checkbox.setChecked(True)
+        checkbox.toggled.connect(lambda state, k=expression: self._on_visibility_changed(k, state))
+        self._toggle_scroll_content.layout().insertWidget(len(self.voltage_keys) - 1, checkbox)
+
+        self.apply_filters()
+
     def clear_overlays(self):
         """Remove all overlay datasets."""
         self._overlay_datasets.clear()
@@ -600,6 +638,7 @@ class FFTAnalysisDialog(QDialog):
 
     Features:
     - Signal and windowing function selection
+    - Full-run or steady-state range, optional Welch averaging
     - dB / linear magnitude toggle
     - Log / linear frequency scale toggle
     - Harmonic identification and labeling (first 5 harmonics)
@@ -623,6 +662,10 @@ class FFTAnalysisDialog(QDialog):
         self.data = data
         self.signal_names = signal_names
         self._fft_result = None
+        # Spectra memoized per (signal, window, steady state, segments)
+        self._spectra: dict[tuple, object] = {}
+        self._signals: dict[str, np.ndarray] = {}
+        self._steady_ranges: dict[str, tuple[float, float]] = {}
 
         # Main layout
         layout = QVBoxLayout()
@@ -643,6 +686,21 @@ class FFTAnalysisDialog(QDialog):
         self.window_combo.currentTextChanged.connect(self._update_fft)
         controls_layout.addWidget(self.window_combo)
 
+        controls_layout.addWidget(QLabel("Range:"))
+        self.range_combo = QComboBox()
+        self.range_combo.addItems(["Full run", "Steady state"])
+        self.range_combo.setToolTip("Steady state skips start-up transients and analyzes whole periods")
+        self.range_combo.currentIndexChanged.connect(self._update_fft)
+        controls_layout.addWidget(self.range_combo)
+
+        controls_layout.addWidget(QLabel("Averaging:"))
+        self.averaging_combo = QComboBox()
+        for label, segments in (("Off", 1), ("4 segments", 4), ("8 segments", 8)):
+            self.averaging_combo.addItem(label, segments)
+        self.averaging_combo.setToolTip("Welch averaging: lower noise, coarser frequency resolution")
+        self.averaging_combo.currentIndexChanged.connect(self._update_fft)
+        controls_layout.addWidget(self.averaging_combo)
+
         controls_layout.addStretch()
         layout.addLayout(controls_layout)
 
@@ -697,20 +755,39 @@ class FFTAnalysisDialog(QDialog):
             return f"{freq_hz:.2f} Hz"
 
     def _update_fft(self):
-        """Compute FFT for selected signal and replot."""
+        """Show the spectrum for the current selection, computing it only once."""
         signal_name = self.signal_combo.currentText()
         window_type = self.window_combo.currentText().lower()
+        steady_state = self.range_combo.currentIndex() == 1
+        segments = self.averaging_combo.currentData() or 1
+        key = (signal_name, window_type, steady_state, segments)
 
-        signal = np.array([row.get(signal_name, 0) for row in self.data])
-
-        try:
-            if self._sim_ctrl is not None:
-                self._fft_result = self._sim_ctrl.compute_signal_fft(self.time, signal, signal_name, window_type)
-            else:
-                self._fft_result = SimulationController.compute_signal_fft(self.time, signal, signal_name, window_type)
-            self._replot()
-        except (ValueError, TypeError, RuntimeError) as e:
-            QMessageBox.critical(self, "FFT Error", f"Failed to compute FFT: {e}")
+        result = self._spectra.get(key)
+        if result is None:
+            ctrl = self._sim_ctrl if self._sim_ctrl is not None else SimulationController
+            try:
+                signal = self._signal(signal_name)
+                time_range = None
+                if steady_state:
+                    time_range = self._steady_ranges.get(signal_name)
+                    if time_range is None:
+                        time_range = ctrl.compute_steady_state_range(self.time, signal)
+                        self._steady_ranges[signal_name] = time_range
+                result = ctrl.compute_signal_fft(self.time, signal, signal_name, window_type, time_range, segments)
+            except (ValueError, TypeError, RuntimeError) as e:
+                QMessageBox.critical(self, "FFT Error", f"Failed to compute FFT: {e}")
+                return
+            self._spectra[key] = result
+        self._fft_result = result
+        self._replot()
+
+    def _signal(self, signal_name):
+        """Column of *signal_name* as an array, extracted from the rows once."""
+        signal = self._signals.get(signal_name)
+        if signal is None:
+            signal = np.array([row.get(signal_name, 0) for row in self.data], dtype=float)
+            self._signals[signal_name] = signal
+        return signal
 
     def _replot(self):
         """Redraw plots using current FFT result and toggle settings."""
@@ -727,6 +804,11 @@ class FFTAnalysisDialog(QDialog):
         # Update info label
         info_text = f"<b>Signal:</b> {signal_name}"
         info_text += f" | <b>Window:</b> {fft_result.window_type.title()}"
+        if self.range_combo.currentIndex() == 1 and fft_result.time_range is not None:
+            start, end = fft_result.time_range
+            info_text += f" | <b>Range:</b> {format_value(start, 's')} – {format_value(end, 's')}"
+        if fft_result.segments > 1:
+            info_text += f" | <b>Averaged:</b> {fft_result.segments} segments"
         if fft_result.fundamental_freq is not None and fft_result.fundamental_freq > 0:
             info_text += f" | <b>Fundamental:</b> {self._format_freq(fft_result.fundamental_freq)}"
         if fft_result.thd_percent is not None:
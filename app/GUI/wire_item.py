@@ -1,6 +1,6 @@
 import logging
 
-# path_finding imported lazily in update_position() for faster startup
+# routing_service/path_finding imported lazily in update_position() for faster startup
 from models.wire import WireData
 from PyQt6.QtCore import QPointF, Qt
 from PyQt6.QtGui import QBrush, QPainterPath, QPainterPathStroker, QPen
@@ -178,6 +178,7 @@ class WireGraphicsItem(QGraphicsPathItem):
         algorithm="astar",
         layer_color=None,
         model=None,
+        defer_routing=False,
     ):
         super().__init__()
 
@@ -223,6 +224,9 @@ class WireGraphicsItem(QGraphicsPathItem):
 
         if self.model.waypoints:
             self._restore_waypoints()
+        elif defer_routing:
+            # The canvas routes this wire later, together with others
+            self.show_drag_preview()
         else:
             self.update_position()
 
@@ -267,112 +271,104 @@ class WireGraphicsItem(QGraphicsPathItem):
         self.update()
 
     def update_position(self):
-        """Update wire path using selected algorithm"""
+        """Reroute the wire synchronously using the selected algorithm."""
+        if self.canvas and hasattr(self.canvas, "cancel_background_route"):
+            # A pending background route was computed for older geometry
+            self.canvas.cancel_background_route(self)
+        if not self.canvas:
+            # Fallback to direct line
+            start_qpt = self.start_comp.get_terminal_pos(self.start_term)
+            end_qpt = self.end_comp.get_terminal_pos(self.end_term)
+            self._set_path([start_qpt, end_qpt])
+            self._persist_routing_result([(start_qpt.x(), start_qpt.y()), (end_qpt.x(), end_qpt.y())])
+            return
+
         # Lazy import for faster startup - only loaded when wires are created
-        from algorithms.path_finding import IDAStarPathfinder, get_component_obstacles
+        from algorithms.routing_service import route_wire
+
+        logger.debug(
+            "Routing wire (%s) from %s[%s] to %s[%s]",
+            self.algorithm,
+            self.start_comp.component_id,
+            self.start_term,
+            self.end_comp.component_id,
+            self.end_term,
+        )
+        self.apply_route(route_wire(self.routing_request()))
 
-        # Get old bounding rect for invalidation
-        old_rect = self.boundingRect()
+    def routing_request(self, components=None, wires=None):
+        """Snapshot the geometry needed to route this wire.
 
-        # Prepare for update by invalidating current bounds
-        self.prepareGeometryChange()
+        The returned RouteRequest holds only plain tuples, so it can be
+        routed on a worker thread while the scene keeps changing.
 
-        start_qpt = self.start_comp.get_terminal_pos(self.start_term)
-        end_qpt = self.end_comp.get_terminal_pos(self.end_term)
+        Args:
+            components: Pre-built component snapshots (shared across a batch);
+                taken from the canvas when omitted.
+            wires: Pre-built snapshots of the wires acting as obstacles;
+                defaults to every wire on the canvas.
+        """
+        from algorithms.routing_service import RouteRequest
 
-        # Get obstacles from canvas
-        if self.canvas:
-            # Don't exclude connected components entirely, but only clear their terminal areas
-            # This prevents wires from crossing through component bodies
-            terminal_clearance = {
-                self.start_comp.component_id,
-                self.end_comp.component_id,
-            }
+        if components is None:
+            components = snapshot_components(self.canvas.components.values())
+        if wires is None:
+            wires = tuple(snapshot_wire(w) for w in getattr(self.canvas, "wires", []))
 
-            # Specify the exact terminals this wire is using - these MUST be cleared for pathfinding
-            active_terminals = [
+        start_qpt = self.start_comp.get_terminal_pos(self.start_term)
+        end_qpt = self.end_comp.get_terminal_pos(self.end_term)
+        return RouteRequest(
+            start=(start_qpt.x(), start_qpt.y()),
+            end=(end_qpt.x(), end_qpt.y()),
+            # The exact terminals this wire uses - these MUST be cleared for pathfinding
+            active_terminals=(
                 (self.start_comp.component_id, self.start_term),
                 (self.end_comp.component_id, self.end_term),
-            ]
+            ),
+            components=components,
+            wires=wires,
+            node=_node_key(self.node),
+            algorithm=self.algorithm,
+            grid_size=GRID_SIZE,
+            allow_diagonal=theme_manager.routing_mode == "diagonal",
+        )
 
-            logger.debug(
-                "Routing wire (%s) from %s[%s] to %s[%s]",
-                self.algorithm,
+    def apply_route(self, result):
+        """Show and persist a RouteResult produced by route_wire()."""
+        self._set_path([QPointF(x, y) for x, y in result.waypoints])
+
+        # Persist through controller (falls back to direct model write during init)
+        self._persist_routing_result(list(result.waypoints), result.runtime, result.iterations, result.routing_failed)
+
+        if result.routing_failed:
+            logger.warning(
+                "Pathfinding failed for wire %s[%s] -> %s[%s]: "
+                "could not find valid route, using straight-line fallback",
                 self.start_comp.component_id,
                 self.start_term,
                 self.end_comp.component_id,
                 self.end_term,
             )
+            self._notify_routing_failed()
 
-            # Get all existing wires in the circuit for wire-to-wire obstacle detection
-            # Only consider wires from the SAME algorithm layer for fair comparison
-            # Wires from the same node won't be treated as obstacles (allows bundling)
-            all_wires = self.canvas.wires if hasattr(self.canvas, "wires") else []
-            existing_wires = [w for w in all_wires if w.algorithm == self.algorithm]
-
-            # Adapt Qt objects for the Qt-free pathfinding module
-            adapted_components = {cid: _ComponentAdapter(c) for cid, c in self.canvas.components.items()}
-            adapted_wires = [_WireAdapter(w) for w in existing_wires]
-
-            obstacles = get_component_obstacles(
-                adapted_components,
-                GRID_SIZE,
-                terminal_clearance_only=terminal_clearance,
-                active_terminals=active_terminals,
-                existing_wires=adapted_wires,
-                current_node=self.node,
-            )
+    def _set_path(self, waypoints):
+        """Replace the drawn path with *waypoints* (QPointF list)."""
+        # Get old bounding rect for invalidation
+        old_rect = self.boundingRect()
+        self.prepareGeometryChange()
 
-            # Convert QPointF positions to tuples for the pathfinder
-            start_tuple = (start_qpt.x(), start_qpt.y())
-            end_tuple = (end_qpt.x(), end_qpt.y())
-
-            allow_diagonal = theme_manager.routing_mode == "diagonal"
-            pathfinder = IDAStarPathfinder(GRID_SIZE, allow_diagonal=allow_diagonal)
-            result = pathfinder.find_path(start_tuple, end_tuple, obstacles, algorithm=self.algorithm)
-
-            # Unpack result (waypoints, runtime, iterations, routing_failed)
-            tuple_waypoints, runtime, iterations, routing_failed = result
-
-            # Convert tuple waypoints back to QPointF for Qt drawing
-            self.waypoints = [QPointF(wp[0], wp[1]) for wp in tuple_waypoints]
-
-            # Persist through controller (falls back to direct model write during init)
-            self._persist_routing_result(list(tuple_waypoints), runtime, iterations, routing_failed)
-
-            if routing_failed:
-                logger.warning(
-                    "Pathfinding failed for wire %s[%s] -> %s[%s]: "
-                    "could not find valid route, using straight-line fallback",
-                    self.start_comp.component_id,
-                    self.start_term,
-                    self.end_comp.component_id,
-                    self.end_term,
-                )
-                self._notify_routing_failed()
-        else:
-            # Fallback to direct line
-            self.waypoints = [start_qpt, end_qpt]
-            fallback_wps = [
-                (start_qpt.x(), start_qpt.y()),
-                (end_qpt.x(), end_qpt.y()),
-            ]
-            self._persist_routing_result(fallback_wps)
-
-        # Create path from waypoints
+        self.waypoints = waypoints
         path = QPainterPath()
         if self.waypoints:
             path.moveTo(self.waypoints[0])
             for waypoint in self.waypoints[1:]:
                 path.lineTo(waypoint)
-
         self.setPath(path)
 
         # Force updates on both old and new regions
         if self.scene():
             self.scene().update(old_rect)
             self.scene().update(self.boundingRect())
-
         self.update()  # Force item redraw
 
     def _restore_waypoints(self):
@@ -589,6 +585,48 @@ class WireGraphicsItem(QGraphicsPathItem):
         return wire
 
 
+# ---------------------------------------------------------------------------
+# Snapshots: immutable routing geometry for background pathfinding
+# ---------------------------------------------------------------------------
+
+
+def _node_key(node):
+    """Hashable stand-in for a Node, so snapshots never share mutable state."""
+    return None if node is None else id(node)
+
+
+def snapshot_components(components):
+    """Freeze the routing geometry of ComponentGraphicsItems into a tuple."""
+    from algorithms.routing_service import ComponentSnapshot
+
+    snapshots = []
+    for comp in components:
+        pos = comp.pos()
+        snapshots.append(
+            ComponentSnapshot(
+                component_id=comp.component_id,
+                position=(pos.x(), pos.y()),
+                rotation_angle=comp.rotation_angle,
+                terminal_positions=tuple(
+                    (p.x(), p.y()) for p in (comp.get_terminal_pos(i) for i in range(len(comp.terminals)))
+                ),
+                obstacle_shape=tuple(tuple(pt) for pt in comp.get_obstacle_shape()),
+            )
+        )
+    return tuple(snapshots)
+
+
+def snapshot_wire(wire):
+    """Freeze a WireGraphicsItem's current path as an obstacle snapshot."""
+    from algorithms.routing_service import WireSnapshot
+
+    return WireSnapshot(
+        waypoints=tuple((p.x(), p.y()) if isinstance(p, QPointF) else (p[0], p[1]) for p in wire.waypoints),
+        node=_node_key(wire.node),
+        algorithm=wire.algorithm,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Adapters: convert Qt objects to tuple-based interface for pathfinding
 # ---------------------------------------------------------------------------
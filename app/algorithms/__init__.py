@@ -1,6 +1,8 @@
+from .layout import auto_layout_model, compute_layout
 from .path_finding import (
     IDAStarPathfinder,
     WeightedPathfinder,
+    find_path_collisions,
     get_component_obstacles,
     get_wire_obstacles,
     polygon_to_grid_filled,
@@ -12,8 +14,11 @@ from .path_finding import (
 # Import directly from algorithms.graph_ops instead.
 
 __all__ = [
+    "auto_layout_model",
+    "compute_layout",
     "IDAStarPathfinder",
     "WeightedPathfinder",
+    "find_path_collisions",
     "get_component_obstacles",
     "get_wire_obstacles",
     "polygon_to_grid_filled",
@@ -0,0 +1,363 @@
+"""Parallel routing of many wires against one shared obstacle snapshot.
+
+Rerouting after a paste or a multi-component edit touches many wires
+that all see the same components and the same untouched wires, yet
+route_wire() rebuilds the obstacle set for each of them and they are
+routed one after another.  BatchRouter instead:
+
+* rasterizes the snapshot once into an ObstacleGrid: a byte per cell
+  for component bodies and terminals, plus an int32 per cell and
+  algorithm layer recording which net's wire occupies it;
+* partitions the wires into spatial groups (wires whose padded
+  bounding boxes overlap share a group) so that groups can be routed
+  independently;
+* routes the groups concurrently in a process pool whose workers map
+  the grid read-only from a temporary file, so it is written once and
+  never pickled per wire;
+* merges the results back in input order, whatever order the workers
+  finish in.
+
+Within a group the wires are routed in input order and each new route
+blocks the later wires of other nets, as when the wires are routed one
+by one.  Small batches, or batches that form a single group, are routed
+in-process against the same grid.  route_async() runs a batch on a
+background thread, so a GUI thread is not blocked while it waits for
+the workers.
+
+No Qt dependencies — pure computation module.
+"""
+
+import logging
+import mmap
+import os
+import tempfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, replace
+from typing import Hashable, Optional, Sequence
+
+from .path_finding import IDAStarPathfinder, get_component_obstacles, get_wire_obstacles
+from .routing_service import RouteRequest, RouteResult, WireSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Batches smaller than this are not worth handing to worker processes
+MIN_PARALLEL_WIRES = 64
+DEFAULT_BATCH_WORKERS = min(4, os.cpu_count() or 1)
+# Padding (grid cells) around a wire's endpoints when grouping: routes
+# rarely detour further than this, so padded boxes that do not overlap
+# belong to wires that can be routed independently
+_GROUP_MARGIN = 5
+# Owner value of a cell holding wires of several nets, or of a wire without a net
+_ANY_NET = -1
+# Arm length (cells) cleared around an active terminal, as in get_component_obstacles()
+_TERMINAL_ARM = 3
+
+
+@dataclass(frozen=True)
+class ObstacleGrid:
+    """Layout of a rasterized obstacle snapshot; the cells live in a separate buffer.
+
+    The buffer holds ``width * height`` bytes (1 = component body or
+    terminal), padded to 4 bytes, followed by one ``width * height``
+    int32 owner array per algorithm layer: 0 for a free cell, the net's
+    id from *net_ids*, or -1 when any net's wire there blocks every
+    route.  Cells outside the grid are free.
+    """
+
+    origin: tuple[int, int]
+    width: int
+    height: int
+    layers: tuple[str, ...]
+    net_ids: dict
+    terminal_cells: dict
+
+    @property
+    def owner_offset(self) -> int:
+        return (self.width * self.height + 3) // 4 * 4
+
+    @property
+    def size(self) -> int:
+        return self.owner_offset + 4 * self.width * self.height * len(self.layers)
+
+
+def build_obstacle_grid(requests: Sequence[RouteRequest]) -> tuple[ObstacleGrid, bytearray]:
+    """Rasterize the snapshot shared by *requests* into a grid and its buffer."""
+    first = requests[0]
+    grid_size = first.grid_size
+    components = {comp.component_id: comp for comp in first.components}
+    blocked = get_component_obstacles(components, grid_size, active_terminals=[])
+    terminal_cells = {
+        (comp.component_id, i): (round(x / grid_size), round(y / grid_size))
+        for comp in first.components
+        for i, (x, y) in enumerate(comp.terminal_positions)
+    }
+
+    layers = tuple(sorted({request.algorithm for request in requests}))
+    net_ids = {}
+    owners = {layer: {} for layer in layers}
+    for wire in first.wires:
+        if wire.algorithm not in owners:
+            continue  # only wires from the same algorithm layer block each other
+        owner = _ANY_NET if wire.node is None else net_ids.setdefault(wire.node, len(net_ids) + 1)
+        cells = owners[wire.algorithm]
+        for cell in _wire_cells(wire, grid_size):
+            cells[cell] = owner if cells.get(cell, owner) == owner else _ANY_NET
+
+    every = [*blocked, *terminal_cells.values(), *(cell for cells in owners.values() for cell in cells)]
+    if every:
+        min_x, min_y = min(c[0] for c in every), min(c[1] for c in every)
+        width, height = max(c[0] for c in every) - min_x + 1, max(c[1] for c in every) - min_y + 1
+    else:
+        min_x = min_y = 0
+        width = height = 1
+    grid = ObstacleGrid((min_x, min_y), width, height, layers, net_ids, terminal_cells)
+
+    buffer = bytearray(grid.size)
+    for x, y in blocked:
+        buffer[(y - min_y) * width + (x - min_x)] = 1
+    view = memoryview(buffer)
+    for index, layer in enumerate(layers):
+        start = grid.owner_offset + 4 * width * height * index
+        with view[start : start + 4 * width * height].cast("i") as owner_cells:
+            for (x, y), owner in owners[layer].items():
+                owner_cells[(y - min_y) * width + (x - min_x)] = owner
+    view.release()
+    return grid, buffer
+
+
+def partition_requests(requests: Sequence[RouteRequest], margin: int = _GROUP_MARGIN) -> list[list[int]]:
+    """Group request indices whose padded endpoint bounding boxes overlap.
+
+    Groups are sorted by their first index and hold their indices in
+    increasing order, so the partition depends only on the input.
+    """
+    boxes = []
+    for request in requests:
+        xs = [round(p[0] / request.grid_size) for p in (request.start, request.end)]
+        ys = [round(p[1] / request.grid_size) for p in (request.start, request.end)]
+        boxes.append((min(xs) - margin, min(ys) - margin, max(xs) + margin, max(ys) + margin))
+
+    parent = list(range(len(requests)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Sweep along x, keeping the boxes whose x-range is still open
+    active: list[int] = []
+    for i in sorted(range(len(boxes)), key=lambda i: boxes[i][0]):
+        x0, y0, _, y1 = boxes[i]
+        active = [j for j in active if boxes[j][2] >= x0]
+        for j in active:
+            if boxes[j][1] <= y1 and y0 <= boxes[j][3]:
+                parent[find(i)] = find(j)
+        active.append(i)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(requests)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values(), key=lambda group: group[0])
+
+
+class BatchRouter:
+    """Route batches of wires, spreading independent groups over worker processes.
+
+    The pool is started on first parallel use and kept for later
+    batches.  Workers are spawned rather than forked, so they never
+    inherit the GUI's threads or Qt state.
+
+    Args:
+        workers: Maximum number of worker processes; 1 routes in-process.
+    """
+
+    def __init__(self, workers: int = DEFAULT_BATCH_WORKERS):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self._executor = None
+        # Single thread running route_async() batches in submission order
+        self._thread = None
+
+    def route(self, jobs: Sequence[tuple[Hashable, RouteRequest]]) -> list[RouteResult]:
+        """Route each (key, request) pair; results come back in input order with *key* set.
+
+        All requests must share one snapshot: the same components,
+        obstacle wires and grid size.
+
+        Raises:
+            ValueError: If the requests do not share a snapshot.
+        """
+        if not jobs:
+            return []
+        keys = [key for key, _ in jobs]
+        requests = [request for _, request in jobs]
+        first = requests[0]
+        for request in requests[1:]:
+            if (request.components, request.wires, request.grid_size) != (
+                first.components,
+                first.wires,
+                first.grid_size,
+            ):
+                raise ValueError("all requests in a batch must share one snapshot")
+
+        grid, buffer = build_obstacle_grid(requests)
+        groups = partition_requests(requests)
+        # Workers only need the per-wire fields; the snapshot travels as the grid
+        bare = [replace(request, components=(), wires=()) for request in requests]
+        routed = None
+        if self.workers > 1 and len(groups) > 1 and len(requests) >= MIN_PARALLEL_WIRES:
+            try:
+                routed = self._route_in_pool(grid, buffer, [[(i, bare[i]) for i in group] for group in groups])
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning("Parallel routing unavailable, routing in-process: %s", e)
+                self._shutdown_pool()
+        if routed is None:
+            view = _GridView(grid, memoryview(buffer))
+            try:
+                routed = [_route_group(view, [(i, bare[i]) for i in group]) for group in groups]
+            finally:
+                view.release()
+
+        results: list[Optional[RouteResult]] = [None] * len(requests)
+        for group in routed:
+            for index, result in group:
+                results[index] = replace(result, key=keys[index])
+        return results
+
+    def route_async(self, jobs: Sequence[tuple[Hashable, RouteRequest]]) -> Future:
+        """Run route() on a background thread; the future resolves to its result list."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self._thread is None:
+            self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-router")
+        return self._thread.submit(self.route, list(jobs))
+
+    def _route_in_pool(self, grid: ObstacleGrid, buffer: bytearray, groups: list) -> list:
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+        handle, path = tempfile.mkstemp(prefix="wire-grid-", suffix=".bin")
+        try:
+            with os.fdopen(handle, "wb") as f:
+                f.write(buffer)
+            futures = [self._executor.submit(_route_group_from_file, path, grid, group) for group in groups]
+            return [future.result() for future in futures]
+        finally:
+            os.unlink(path)
+
+    def shutdown(self) -> None:
+        """Stop the background thread and the worker processes, if any were started."""
+        if self._thread is not None:
+            self._thread.shutdown(wait=True, cancel_futures=True)
+            self._thread = None
+        self._shutdown_pool()
+
+    def _shutdown_pool(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+
+class _GridView:
+    """Read access to an ObstacleGrid buffer (bytes, bytearray or mmap)."""
+
+    def __init__(self, grid: ObstacleGrid, buffer: memoryview):
+        self.grid = grid
+        self._buffer = buffer
+        cells = grid.width * grid.height
+        self.blocked = buffer[:cells]
+        self.owners = {
+            layer: buffer[grid.owner_offset + 4 * cells * i : grid.owner_offset + 4 * cells * (i + 1)].cast("i")
+            for i, layer in enumerate(grid.layers)
+        }
+
+    def release(self) -> None:
+        for owners in self.owners.values():
+            owners.release()
+        self.blocked.release()
+        self._buffer.release()
+
+
+class _Obstacles:
+    """Set-like obstacle view for one wire: ``cell in obstacles`` is all IDA* needs."""
+
+    __slots__ = ("_blocked", "_owners", "_open", "_net", "_node", "_routed", "_x0", "_y0", "_w", "_h")
+
+    def __init__(self, view: _GridView, request: RouteRequest, routed: dict):
+        grid = view.grid
+        self._blocked = view.blocked
+        self._owners = view.owners[request.algorithm]
+        self._x0, self._y0 = grid.origin
+        self._w, self._h = grid.width, grid.height
+        # 0 never matches a wire: a net without wires in the snapshot is blocked by all of them
+        self._node = request.node
+        self._net = grid.net_ids.get(request.node, 0) if request.node is not None else 0
+        self._routed = routed
+        self._open = set()
+        for terminal in request.active_terminals:
+            cell = grid.terminal_cells.get(terminal)
+            if cell is None:
+                continue
+            x, y = cell
+            self._open.add(cell)
+            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+                self._open.update((x + dx * step, y + dy * step) for step in range(1, _TERMINAL_ARM + 1))
+
+    def __contains__(self, cell) -> bool:
+        if cell in self._open:
+            return False
+        nets = self._routed.get(cell)
+        if nets is not None and (self._node is None or nets != {self._node}):
+            return True
+        x, y = cell[0] - self._x0, cell[1] - self._y0
+        if not (0 <= x < self._w and 0 <= y < self._h):
+            return False
+        index = y * self._w + x
+        if self._blocked[index]:
+            return True
+        owner = self._owners[index]
+        return owner != 0 and (owner == _ANY_NET or owner != self._net)
+
+
+def _wire_cells(wire: WireSnapshot, grid_size: int) -> set:
+    # A sentinel node that matches no wire, so the wire is always rasterized
+    return get_wire_obstacles([wire], object(), grid_size)
+
+
+def _route_group(view: _GridView, group: list[tuple[int, RouteRequest]]) -> list[tuple[int, RouteResult]]:
+    """Route one group in order; each route blocks later wires of other nets."""
+    routed: dict[tuple, dict] = {}  # algorithm -> {cell: nets routed there in this group}
+    results = []
+    for index, request in group:
+        layer = routed.setdefault(request.algorithm, {})
+        pathfinder = IDAStarPathfinder(request.grid_size, allow_diagonal=request.allow_diagonal)
+        waypoints, runtime, iterations, routing_failed = pathfinder.find_path(
+            request.start, request.end, _Obstacles(view, request, layer), algorithm=request.algorithm
+        )
+        waypoints = tuple((float(x), float(y)) for x, y in waypoints)
+        if not routing_failed:
+            for cell in _wire_cells(WireSnapshot(waypoints, request.node), request.grid_size):
+                # Wires without a net block everyone, like in the snapshot
+                layer.setdefault(cell, set()).add(request.node if request.node is not None else ("wire", index))
+        results.append((index, RouteResult(waypoints, runtime, iterations, routing_failed)))
+    return results
+
+
+def _route_group_from_file(path: str, grid: ObstacleGrid, group: list) -> list:
+    """Process-pool entry point: map the grid file read-only and route one group."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = _GridView(grid, memoryview(mapped))
+        try:
+            return _route_group(view, group)
+        finally:
+            view.release()
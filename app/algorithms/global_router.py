@@ -0,0 +1,405 @@
+"""Whole-circuit wire routing with negotiated congestion.
+
+Routing wires one at a time, in whatever order they happen to be
+stored, lets early wires box in later ones: a late wire finds its way
+blocked, exhausts the IDA* iteration cap and falls back to a straight
+line.  route_circuit() routes every wire of a circuit together instead:
+
+* Nets are routed in order of difficulty (most connections, then the
+  widest spread, first), and within a net the longest connection goes
+  first so it forms the trunk.
+* Cells already used by the same net are cheap, so the later wires of
+  a net run along the trunk and the net is drawn as a rectilinear
+  Steiner tree rather than a fan of point-to-point wires.
+* Nets may share cells while negotiating, at a price that grows with
+  every pass (PathFinder rip-up and reroute): each cell keeps a
+  history cost that rises while it stays overused, and only the nets
+  involved in a conflict are ripped up and rerouted.
+* Connections still overlapping another net after the last pass are
+  routed once more with other nets as hard obstacles, like
+  route_wire() does, and fall back to a straight line if that fails.
+
+Each wire remains a polyline between its two terminals, so the result
+plugs into the existing wire model unchanged.
+
+No Qt dependencies — pure computation module.
+"""
+
+import heapq
+import math
+import time
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from .path_finding import get_component_obstacles, get_wire_obstacles
+from .routing_service import ComponentSnapshot, RouteResult, WireSnapshot
+
+Cell = tuple[int, int]
+
+# Negotiation schedule: present-congestion factor of the first pass, its
+# growth per pass, and the history cost added per pass a cell stays overused
+_PRESENT_FACTOR = 0.5
+_PRESENT_GROWTH = 2.0
+_HISTORY_STEP = 1.0
+_MAX_STALLED_PASSES = 2
+# Cost multiplier for running along a wire of the same net
+_SAME_NET_COST = 0.1
+_BEND_PENALTY = 2.0
+_SQRT2 = math.sqrt(2)
+# Grid cells of free space kept around the circuit's bounding box
+_MARGIN = 10
+_ORTHOGONAL = ((0, 1), (0, -1), (1, 0), (-1, 0))
+_DIAGONAL = _ORTHOGONAL + ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+@dataclass(frozen=True)
+class NetConnection:
+    """One wire to route: two terminals of the same net."""
+
+    key: Hashable
+    start: tuple[float, float]
+    end: tuple[float, float]
+    terminals: tuple[tuple[str, int], tuple[str, int]]
+    # Connections sharing a net may overlap; None puts the wire on a net of its own
+    net: Optional[Hashable] = None
+
+
+@dataclass(frozen=True)
+class GlobalRouteRequest:
+    """Everything route_circuit() needs, detached from the scene.
+
+    *fixed_wires* (e.g. locked wires) are not rerouted; they occupy
+    their cells for their own net for the whole run.
+    """
+
+    connections: tuple[NetConnection, ...]
+    components: tuple[ComponentSnapshot, ...]
+    fixed_wires: tuple[WireSnapshot, ...] = ()
+    grid_size: int = 20
+    allow_diagonal: bool = False
+    max_passes: int = 8
+    # Search nodes one connection may expand before it is given up
+    max_expansions: int = 200_000
+
+
+@dataclass(frozen=True)
+class GlobalRouteResult:
+    """Outcome of route_circuit().
+
+    Attributes:
+        routes: RouteResult per connection key (``key`` is set).
+        runtime: Wall-clock seconds for the whole run.
+        passes: Negotiation passes performed.
+        failures: Connections left as a straight-line fallback.
+    """
+
+    routes: dict
+    runtime: float
+    passes: int
+    failures: int
+
+
+def route_circuit(request: GlobalRouteRequest) -> GlobalRouteResult:
+    """Route every connection of *request* together (safe to call on any thread)."""
+    started = time.perf_counter()
+    router = _Router(request)
+    passes = router.negotiate()
+    routes = router.finish()
+    return GlobalRouteResult(
+        routes=routes,
+        runtime=time.perf_counter() - started,
+        passes=passes,
+        failures=sum(1 for route in routes.values() if route.routing_failed),
+    )
+
+
+class _Router:
+    """Shared occupancy grid and negotiation state for one route_circuit() call."""
+
+    def __init__(self, request: GlobalRouteRequest):
+        self.request = request
+        self.grid_size = grid = request.grid_size
+        self.directions = _DIAGONAL if request.allow_diagonal else _ORTHOGONAL
+        self.connections = {conn.key: conn for conn in request.connections}
+
+        components = {comp.component_id: comp for comp in request.components}
+        # Bodies and every terminal, computed once; each net then reopens its own terminals
+        self.blocked = get_component_obstacles(components, grid, active_terminals=[])
+        self.terminal_cells = {
+            (comp.component_id, i): _to_cell(pos, grid)
+            for comp in request.components
+            for i, pos in enumerate(comp.terminal_positions)
+        }
+        self.bounds = self._bounds()
+
+        self.nets: dict[Hashable, list[NetConnection]] = {}
+        for conn in request.connections:
+            self.nets.setdefault(_net_of(conn), []).append(conn)
+        for conns in self.nets.values():
+            # Longest connection first: it becomes the net's trunk
+            conns.sort(key=lambda c: -_span(c))
+        self.order = sorted(self.nets, key=self._difficulty, reverse=True)
+        self.openings = {net: self._openings(conns) for net, conns in self.nets.items()}
+
+        # cell -> {net: number of wires of that net through the cell}
+        self.usage: dict[Cell, dict[Hashable, int]] = {}
+        # net -> number of cells it currently occupies
+        self.net_cells: dict[Hashable, int] = {}
+        self.history: dict[Cell, float] = {}
+        self.paths: dict[Hashable, list[Cell]] = {}
+        self.stats: dict[Hashable, list[float]] = {}
+        for wire in request.fixed_wires:
+            net = ("fixed", id(wire)) if wire.node is None else wire.node
+            # A sentinel node that matches no wire, so every fixed wire is rasterized
+            for cell in get_wire_obstacles([wire], object(), grid):
+                self._occupy(cell, net, 1)
+
+    # --- Negotiation ---
+
+    def negotiate(self) -> int:
+        """Route all nets, then rip up and reroute conflicting ones; return passes run."""
+        pending = list(self.order)
+        passes = 0
+        least_overuse, stalled = math.inf, 0
+        for passes in range(1, self.request.max_passes + 1):
+            present = _PRESENT_FACTOR * _PRESENT_GROWTH ** (passes - 1)
+            for net in pending:
+                self._route_net(net, present)
+            overused = [cell for cell, nets in self.usage.items() if len(nets) > 1]
+            if not overused:
+                break
+            # Stop negotiating once the overuse has stopped shrinking
+            stalled = stalled + 1 if len(overused) >= least_overuse else 0
+            least_overuse = min(least_overuse, len(overused))
+            if stalled >= _MAX_STALLED_PASSES:
+                break
+            for cell in overused:
+                self.history[cell] = self.history.get(cell, 0.0) + _HISTORY_STEP
+            conflicting = {net for cell in overused for net in self.usage[cell]}
+            pending = [net for net in self.order if net in conflicting]
+            if not pending:
+                break  # only fixed wires overlap; nothing left to negotiate
+        return passes
+
+    def finish(self) -> dict:
+        """Resolve leftover overlaps strictly and build one RouteResult per connection."""
+        for net in self.order:
+            for conn in self.nets[net]:
+                path = self.paths.get(conn.key)
+                if path is None or not self._overlaps(path, net):
+                    continue
+                self._release(path, net)
+                self.paths[conn.key] = self._search(conn, net, present=None)
+                self._claim(self.paths[conn.key], net)
+
+        routes = {}
+        for conn in self.request.connections:
+            path = self.paths.get(conn.key)
+            runtime, iterations = self.stats.get(conn.key, (0.0, 0))
+            if path is None:
+                waypoints = (tuple(conn.start), tuple(conn.end))
+            else:
+                waypoints = tuple((float(x * self.grid_size), float(y * self.grid_size)) for x, y in _simplify(path))
+            routes[conn.key] = RouteResult(
+                waypoints=waypoints,
+                runtime=runtime,
+                iterations=int(iterations),
+                routing_failed=path is None,
+                key=conn.key,
+            )
+        return routes
+
+    def _route_net(self, net: Hashable, present: float) -> None:
+        for conn in self.nets[net]:
+            old = self.paths.pop(conn.key, None)
+            if old is not None:
+                self._release(old, net)
+        for conn in self.nets[net]:
+            path = self._search(conn, net, present)
+            self.paths[conn.key] = path
+            self._claim(path, net)
+
+    # --- Occupancy ---
+
+    def _occupy(self, cell: Cell, net: Hashable, delta: int) -> None:
+        nets = self.usage.setdefault(cell, {})
+        before = nets.get(net, 0)
+        count = before + delta
+        if count > 0:
+            nets[net] = count
+        else:
+            nets.pop(net, None)
+            if not nets:
+                del self.usage[cell]
+        if (before > 0) != (count > 0):
+            self.net_cells[net] = self.net_cells.get(net, 0) + (1 if count > 0 else -1)
+
+    def _claim(self, path: Optional[list[Cell]], net: Hashable) -> None:
+        for cell in _cells_of(path):
+            self._occupy(cell, net, 1)
+
+    def _release(self, path: Optional[list[Cell]], net: Hashable) -> None:
+        for cell in _cells_of(path):
+            self._occupy(cell, net, -1)
+
+    def _overlaps(self, path: list[Cell], net: Hashable) -> bool:
+        return any(len(self.usage.get(cell, ())) > 1 for cell in path if net in self.usage.get(cell, ()))
+
+    # --- Search ---
+
+    def _search(self, conn: NetConnection, net: Hashable, present: Optional[float]) -> Optional[list[Cell]]:
+        """A* over (cell, direction) states with congestion-aware cell costs.
+
+        With *present* None, cells used by other nets are hard obstacles.
+        Returns the cell path, or None when no path was found.
+        """
+        started = time.perf_counter()
+        grid = self.grid_size
+        start, goal = _to_cell(conn.start, grid), _to_cell(conn.end, grid)
+        gx, gy = goal
+        blocked, opened = self.blocked, self.openings[net]
+        usage, history = self.usage, self.history
+        min_x, min_y, max_x, max_y = self.bounds
+        strict = present is None
+        present = present or 0.0
+        diagonal = self.request.allow_diagonal
+        octile = math.sqrt(2) - 2
+        push, pop = heapq.heappush, heapq.heappop
+
+        def passable(cell: Cell) -> bool:
+            x, y = cell
+            if x < min_x or x > max_x or y < min_y or y > max_y:
+                return False
+            if cell in blocked and cell not in opened:
+                return False
+            if strict:
+                nets = usage.get(cell)
+                return not nets or (len(nets) == 1 and net in nets)
+            return True
+
+        # Plain distance: admissible except where the route runs along its
+        # own net, which only makes the search favour joining the trunk
+        best = {(start, None): 0.0}
+        came_from = {}
+        frontier = [(0.0, 0, 0.0, start, None)]
+        tie = 0
+        expansions = 0
+        limit = self.request.max_expansions
+        found = None
+        while frontier and expansions < limit:
+            _, _, cost, cell, heading = pop(frontier)
+            if cost > best[(cell, heading)]:
+                continue
+            if cell == goal:
+                found = (cell, heading)
+                break
+            expansions += 1
+            cx, cy = cell
+            for direction in self.directions:
+                dx, dy = direction
+                neighbor = (cx + dx, cy + dy)
+                if not passable(neighbor):
+                    continue
+                step = 1.0
+                if dx and dy:
+                    # No corner-cutting past obstacles
+                    if not passable((cx + dx, cy)) or not passable((cx, cy + dy)):
+                        continue
+                    step = _SQRT2
+                nets = usage.get(neighbor)
+                if nets:
+                    own = net in nets
+                    step = (step + history.get(neighbor, 0.0)) * (1.0 + present * (len(nets) - own))
+                    if own:
+                        step *= _SAME_NET_COST
+                elif history:
+                    step += history.get(neighbor, 0.0)
+                if heading is not None and heading != direction:
+                    step += _BEND_PENALTY
+                new_cost = cost + step
+                state = (neighbor, direction)
+                if new_cost < best.get(state, math.inf):
+                    best[state] = new_cost
+                    came_from[state] = (cell, heading)
+                    hx, hy = abs(neighbor[0] - gx), abs(neighbor[1] - gy)
+                    estimate = hx + hy + octile * min(hx, hy) if diagonal else hx + hy
+                    tie += 1
+                    push(frontier, (new_cost + estimate, tie, new_cost, neighbor, direction))
+
+        stats = self.stats.setdefault(conn.key, [0.0, 0])
+        stats[0] += time.perf_counter() - started
+        stats[1] += expansions
+        if found is None:
+            return None
+        path = [found[0]]
+        while found in came_from:
+            found = came_from[found]
+            path.append(found[0])
+        path.reverse()
+        return path
+
+    # --- Setup helpers ---
+
+    def _openings(self, conns: list[NetConnection]) -> set[Cell]:
+        """Cells a net may enter despite the base obstacles: its terminals and their approaches."""
+        own = {terminal for conn in conns for terminal in conn.terminals}
+        foreign = {cell for terminal, cell in self.terminal_cells.items() if terminal not in own}
+        opened = set()
+        for conn in conns:
+            for terminal, pos in zip(conn.terminals, (conn.start, conn.end)):
+                x, y = self.terminal_cells.get(terminal, _to_cell(pos, self.grid_size))
+                opened.add((x, y))
+                for dx, dy in _ORTHOGONAL:
+                    opened.update((x + dx * step, y + dy * step) for step in range(1, 4))
+        # Other nets' terminals stay blocked even next to our own
+        return opened - foreign
+
+    def _bounds(self) -> tuple[int, int, int, int]:
+        cells = list(self.terminal_cells.values())
+        for comp in self.request.components:
+            cells.append(_to_cell(comp.position, self.grid_size))
+        for conn in self.request.connections:
+            cells += [_to_cell(conn.start, self.grid_size), _to_cell(conn.end, self.grid_size)]
+        for wire in self.request.fixed_wires:
+            cells += [_to_cell(p, self.grid_size) for p in wire.waypoints]
+        if not cells:
+            return (0, 0, 0, 0)
+        xs, ys = [c[0] for c in cells], [c[1] for c in cells]
+        return (min(xs) - _MARGIN, min(ys) - _MARGIN, max(xs) + _MARGIN, max(ys) + _MARGIN)
+
+    def _difficulty(self, net: Hashable) -> tuple:
+        conns = self.nets[net]
+        xs = [p[0] for c in conns for p in (c.start, c.end)]
+        ys = [p[1] for c in conns for p in (c.start, c.end)]
+        spread = (max(xs) - min(xs)) + (max(ys) - min(ys))
+        # The key repr breaks ties so the order never depends on input order
+        return (len(conns), spread, repr(net))
+
+
+def _net_of(conn: NetConnection) -> Hashable:
+    return ("wire", conn.key) if conn.net is None else conn.net
+
+
+def _span(conn: NetConnection) -> float:
+    return abs(conn.start[0] - conn.end[0]) + abs(conn.start[1] - conn.end[1])
+
+
+def _to_cell(pos, grid_size: int) -> Cell:
+    return (round(pos[0] / grid_size), round(pos[1] / grid_size))
+
+
+def _cells_of(path: Optional[list[Cell]]) -> set[Cell]:
+    # A wire counts once per cell, even where it doubles back
+    return set(path) if path else set()
+
+
+def _simplify(path: list[Cell]) -> list[Cell]:
+    """Drop cells where the path keeps going in the same direction."""
+    if len(path) <= 2:
+        return list(path)
+    kept = [path[0]]
+    for prev, cell, nxt in zip(path, path[1:], path[2:]):
+        if (cell[0] - prev[0], cell[1] - prev[1]) != (nxt[0] - cell[0], nxt[1] - cell[1]):
+            kept.append(cell)
+    kept.append(path[-1])
+    return kept
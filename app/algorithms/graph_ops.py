@@ -133,6 +133,12 @@ def shift_wire_indices(nodes: list[NodeData], removed_index: int) -> None:
         node.wire_indices = new_indices
 
 
+def shift_wire_indices_for_insert(nodes: list[NodeData], inserted_index: int) -> None:
+    """Adjust every node's wire_indices before a wire is inserted at *inserted_index*."""
+    for node in nodes:
+        node.wire_indices = {idx + 1 if idx >= inserted_index else idx for idx in node.wire_indices}
+
+
 def rebuild_nodes_after_wire_removal(
     nodes: list[NodeData],
     terminal_to_node: dict[tuple[str, int], NodeData],
@@ -146,12 +152,34 @@ def rebuild_nodes_after_wire_removal(
     removed wire.  It is dissolved and the relevant wires are
     reprocessed so that connectivity may split into multiple nodes.
     """
-    affected_terminals = set(affected_node.terminals)
-    saved_label = affected_node.custom_label
+    rebuild_affected_nodes(nodes, terminal_to_node, components, wires, [affected_node])
+
+
+def rebuild_affected_nodes(
+    nodes: list[NodeData],
+    terminal_to_node: dict[tuple[str, int], NodeData],
+    components: dict[str, ComponentData],
+    wires: list[WireData],
+    affected_nodes,
+) -> None:
+    """Dissolve *affected_nodes* and rebuild them from the current wires.
 
-    # Remove affected node and its terminal mappings
-    if affected_node in nodes:
-        nodes.remove(affected_node)
+    Used after one or more wire removals.  Nodes that are not affected
+    keep their identity (and auto-generated labels).
+    """
+    # Skip duplicates and nodes that a later rebuild already discarded
+    live = {id(node) for node in nodes}
+    affected_nodes = list({id(node): node for node in affected_nodes if id(node) in live}.values())
+    affected_terminals: set[tuple[str, int]] = set()
+    saved_labels: list[tuple[set, str]] = []
+    for affected_node in affected_nodes:
+        affected_terminals |= affected_node.terminals
+        if affected_node.custom_label:
+            saved_labels.append((set(affected_node.terminals), affected_node.custom_label))
+
+        # Remove affected node and its terminal mappings
+        if affected_node in nodes:
+            nodes.remove(affected_node)
     for term in affected_terminals:
         terminal_to_node.pop(term, None)
 
@@ -173,9 +201,9 @@ def rebuild_nodes_after_wire_removal(
     for wire_idx in relevant_wires:
         update_nodes_for_wire(nodes, terminal_to_node, components, wires[wire_idx], wire_idx)
 
-    # Restore custom label on rebuilt nodes
-    if saved_label:
-        for term in affected_terminals:
+    # Restore custom labels on rebuilt nodes
+    for terminals, saved_label in saved_labels:
+        for term in sorted(terminals):
             node = terminal_to_node.get(term)
             if node and not node.custom_label:
                 node.set_custom_label(saved_label)
@@ -13,6 +13,10 @@ from abc import ABC, abstractmethod
 from typing import Set, Tuple
 
 
+class RoutingCancelled(Exception):
+    """Raised inside a search when the pathfinder's should_stop() returns True."""
+
+
 class WeightedPathfinder(ABC):
     """
     Abstract base class for grid-based pathfinding with weighted edges.
@@ -54,6 +58,10 @@ class WeightedPathfinder(ABC):
         self.body_crossing_penalty = float("inf")  # Component body crossing (blocked)
         self.non_net_crossing_penalty = float("inf")  # Non-net terminal crossing (blocked)
 
+        # Optional callable polled during the search; returning True aborts
+        # it with RoutingCancelled (used to stop stale background routes)
+        self.should_stop = None
+
         # Performance tracking
         self.last_runtime = 0
         self.last_iterations = 0
@@ -359,6 +367,9 @@ class IDAStarPathfinder(WeightedPathfinder):
             - new threshold (float) if path not found within threshold
             - float('inf') if no path exists
         """
+        if self.should_stop is not None and self.should_stop():
+            raise RoutingCancelled()
+
         f_score = g_score + self._heuristic(current, goal)
 
         if f_score > threshold:
@@ -848,3 +859,67 @@ def get_component_obstacles(
             # This creates infinite cost for routing through unused terminals
 
     return obstacles
+
+
+def find_path_collisions(paths, obstacles, grid_size=20):
+    """
+    Return indices of the polylines in *paths* that cross an obstacle cell.
+
+    All paths are rasterized onto the grid together and tested against
+    *obstacles* in one vectorized membership check, so checking a whole
+    pasted selection costs a single pass rather than one obstacle lookup
+    per wire.  The first and last cell of each path are its terminals and
+    are never counted as collisions.
+
+    Args:
+        paths: list of waypoint lists, each a sequence of (x, y) tuples
+        obstacles: set of (grid_x, grid_y) blocked cells
+        grid_size: size of grid cells
+
+    Returns:
+        sorted list of indices into *paths*
+    """
+    if not obstacles:
+        return []
+
+    # Lazy import: path_finding is loaded at startup, numpy is not needed until a paste
+    import numpy as np
+
+    starts, ends, owners = [], [], []
+    for index, path in enumerate(paths):
+        if len(path) < 2:
+            continue
+        points = np.rint(np.asarray(path, dtype=float) / grid_size).astype(np.int64)
+        starts.append(points[:-1])
+        ends.append(points[1:])
+        owners.append(np.full(len(points) - 1, index))
+    if not starts:
+        return []
+
+    start = np.concatenate(starts)
+    delta = np.concatenate(ends) - start
+    owner = np.concatenate(owners)
+
+    # Sample every grid step along each segment (orthogonal or diagonal)
+    steps = np.maximum(np.abs(delta).max(axis=1), 1)
+    segment = np.repeat(np.arange(len(start)), steps + 1)
+    offsets = np.arange(len(segment)) - np.repeat(np.cumsum(steps + 1) - (steps + 1), steps + 1)
+    frac = offsets / steps[segment]
+    cells = np.rint(start[segment] + delta[segment] * frac[:, None]).astype(np.int64)
+    cell_owner = owner[segment]
+
+    # Drop each path's own terminal cells
+    first_cell = np.zeros((len(paths), 2), dtype=np.int64)
+    last_cell = np.zeros((len(paths), 2), dtype=np.int64)
+    first_cell[cell_owner[::-1]] = cells[::-1]
+    last_cell[cell_owner] = cells
+    is_terminal = (cells == first_cell[cell_owner]).all(axis=1) | (cells == last_cell[cell_owner]).all(axis=1)
+
+    blocked = np.array(list(obstacles), dtype=np.int64).reshape(-1, 2)
+    origin = np.minimum(blocked.min(axis=0), cells.min(axis=0))
+    width = int(max(blocked[:, 1].max(), cells[:, 1].max()) - origin[1]) + 1
+    cell_keys = (cells[:, 0] - origin[0]) * width + (cells[:, 1] - origin[1])
+    blocked_keys = (blocked[:, 0] - origin[0]) * width + (blocked[:, 1] - origin[1])
+
+    hits = np.isin(cell_keys, blocked_keys) & ~is_terminal
+    return sorted(set(cell_owner[hits].tolist()))
@@ -0,0 +1,317 @@
+"""Background wire routing with stale-result discard.
+
+The GUI thread takes an immutable snapshot of the geometry a wire needs
+(component bodies, terminal positions, other wires' paths) and hands it
+to WireRoutingService, which runs IDA* on a worker thread.  Every submit
+for the same wire bumps that wire's generation counter; a job that has
+not started yet is cancelled, and a result that arrives for an older
+generation is dropped, so only the route for the latest geometry is
+ever applied.
+
+Results are collected by the GUI thread with collect() (e.g. from a
+short timer), never delivered from the worker.
+
+No Qt dependencies — pure computation module.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from .path_finding import IDAStarPathfinder, RoutingCancelled, get_component_obstacles
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUTING_WORKERS = 1
+# Search nodes between GIL releases in a worker, so the GUI thread never
+# waits a full interpreter switch interval while a route is computed
+_YIELD_EVERY = 64
+
+
+@dataclass(frozen=True)
+class ComponentSnapshot:
+    """Routing geometry of one component, in scene coordinates.
+
+    Implements the duck-typed component interface expected by
+    get_component_obstacles().
+    """
+
+    component_id: str
+    position: tuple[float, float]
+    rotation_angle: float
+    terminal_positions: tuple[tuple[float, float], ...]
+    obstacle_shape: tuple[tuple[float, float], ...]
+
+    @property
+    def terminals(self) -> tuple[tuple[float, float], ...]:
+        return self.terminal_positions
+
+    def pos(self) -> tuple[float, float]:
+        return self.position
+
+    def get_terminal_pos(self, index: int) -> tuple[float, float]:
+        return self.terminal_positions[index]
+
+    def get_obstacle_shape(self) -> list[tuple[float, float]]:
+        return list(self.obstacle_shape)
+
+
+@dataclass(frozen=True)
+class WireSnapshot:
+    """Path of an existing wire, used as an obstacle for other nets."""
+
+    waypoints: tuple[tuple[float, float], ...]
+    node: Optional[Hashable] = None
+    algorithm: str = "idastar"
+
+
+@dataclass(frozen=True)
+class RouteRequest:
+    """Everything needed to route one wire, detached from the scene."""
+
+    start: tuple[float, float]
+    end: tuple[float, float]
+    active_terminals: tuple[tuple[str, int], ...]
+    components: tuple[ComponentSnapshot, ...]
+    wires: tuple[WireSnapshot, ...] = ()
+    node: Optional[Hashable] = None
+    algorithm: str = "idastar"
+    grid_size: int = 20
+    allow_diagonal: bool = False
+
+
+@dataclass(frozen=True)
+class RouteResult:
+    """Outcome of route_wire(); *key* and *generation* are set by the service."""
+
+    waypoints: tuple[tuple[float, float], ...]
+    runtime: float
+    iterations: int
+    routing_failed: bool
+    key: Any = None
+    generation: int = 0
+
+
+def route_wire(request: RouteRequest, should_stop: Optional[Callable[[], bool]] = None) -> RouteResult:
+    """Route a single wire from a snapshot (safe to call on any thread).
+
+    Raises:
+        RoutingCancelled: If *should_stop* returns True during the search.
+    """
+    components = {comp.component_id: comp for comp in request.components}
+    obstacles = get_component_obstacles(
+        components,
+        request.grid_size,
+        terminal_clearance_only={cid for cid, _ in request.active_terminals},
+        active_terminals=list(request.active_terminals),
+        # Only wires from the same algorithm layer block each other
+        existing_wires=[w for w in request.wires if w.algorithm == request.algorithm],
+        current_node=request.node,
+    )
+    pathfinder = IDAStarPathfinder(request.grid_size, allow_diagonal=request.allow_diagonal)
+    pathfinder.should_stop = should_stop
+    waypoints, runtime, iterations, routing_failed = pathfinder.find_path(
+        request.start, request.end, obstacles, algorithm=request.algorithm
+    )
+    return RouteResult(
+        waypoints=tuple((float(x), float(y)) for x, y in waypoints),
+        runtime=runtime,
+        iterations=iterations,
+        routing_failed=routing_failed,
+    )
+
+
+def _route_in_worker(job: "_Job") -> RouteResult:
+    """Worker-thread entry point: route the job's request until done or stopped."""
+    calls = 0
+
+    def should_stop() -> bool:
+        nonlocal calls
+        calls += 1
+        if calls % _YIELD_EVERY == 0:
+            time.sleep(0)
+        return job.stopped
+
+    return route_wire(job.request, should_stop)
+
+
+@dataclass
+class _Job:
+    key: Hashable
+    generation: int
+    request: RouteRequest
+    # Set by the service once the result can no longer be used
+    stopped: bool = False
+
+
+class WireRoutingService:
+    """Route wires on worker threads, keeping only each wire's latest result.
+
+    Queued jobs are kept per wire, so resubmitting a wire that has not
+    started yet simply replaces its request.  Worker threads start on
+    first use and are daemons.
+
+    Args:
+        workers: Number of routing threads.
+    """
+
+    def __init__(self, workers: int = DEFAULT_ROUTING_WORKERS):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._threads: list[threading.Thread] = []
+        self._shutdown = False
+        # Latest generation per wire, drawn from one counter so numbers are
+        # never reused after a wire is forgotten
+        self._counter = itertools.count(1)
+        self._generations: dict[Hashable, int] = {}
+        self._queued: OrderedDict[Hashable, _Job] = OrderedDict()
+        self._running: dict[Hashable, _Job] = {}
+        self._results: deque[RouteResult] = deque()
+        self._stats = {"submitted": 0, "completed": 0, "cancelled": 0, "discarded": 0, "errors": 0}
+
+    @property
+    def pending(self) -> int:
+        """Number of wires with a job queued or running."""
+        with self._lock:
+            return len(self._queued) + len(self._running)
+
+    def has_work(self) -> bool:
+        """True while jobs are outstanding or results await collect()."""
+        with self._lock:
+            return bool(self._queued or self._running or self._results)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def submit(self, key: Hashable, request: RouteRequest) -> int:
+        """Queue *request* for the wire identified by *key*.
+
+        An earlier job for the same key is replaced if it has not started
+        and stopped otherwise; its result is never delivered.
+
+        Returns:
+            The generation number assigned to this job.
+        """
+        return self.submit_many([(key, request)])[0]
+
+    def submit_many(self, jobs: Iterable[tuple[Hashable, RouteRequest]]) -> list[int]:
+        """Queue several (key, request) pairs under a single lock."""
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("routing service has been shut down")
+            generations = []
+            for key, request in jobs:
+                generation = next(self._counter)
+                self._generations[key] = generation
+                self._stop_running_locked(key)
+                if self._queued.pop(key, None) is not None:
+                    self._stats["cancelled"] += 1
+                self._queued[key] = _Job(key, generation, request)
+                self._stats["submitted"] += 1
+                generations.append(generation)
+            self._start_workers_locked()
+            self._changed.notify_all()
+        return generations
+
+    def cancel(self, key: Hashable) -> None:
+        """Drop any queued or running job for *key* (e.g. the wire was deleted)."""
+        with self._lock:
+            # Without a current generation any late result for *key* is stale
+            self._generations.pop(key, None)
+            if self._queued.pop(key, None) is not None:
+                self._stats["cancelled"] += 1
+            self._stop_running_locked(key)
+            self._changed.notify_all()
+
+    def cancel_all(self) -> None:
+        """Drop every queued or running job and any uncollected results."""
+        with self._lock:
+            self._stats["cancelled"] += len(self._queued)
+            self._queued.clear()
+            for key in list(self._running):
+                self._stop_running_locked(key)
+            self._results.clear()
+            self._generations.clear()
+            self._changed.notify_all()
+
+    def _stop_running_locked(self, key: Hashable) -> None:
+        job = self._running.get(key)
+        if job is not None:
+            job.stopped = True
+
+    def _start_workers_locked(self) -> None:
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"wire-router-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queued and not self._shutdown:
+                    self._changed.wait()
+                if self._shutdown:
+                    return
+                _, job = self._queued.popitem(last=False)
+                self._running[job.key] = job
+            try:
+                result, error = _route_in_worker(job), None
+            except Exception as e:  # noqa: BLE001 - reported through stats and the log
+                result, error = None, e
+            with self._lock:
+                if self._running.get(job.key) is job:
+                    del self._running[job.key]
+                self._finish_locked(job, result, error)
+                self._changed.notify_all()
+
+    def _finish_locked(self, job: _Job, result: Optional[RouteResult], error: Optional[Exception]) -> None:
+        if isinstance(error, RoutingCancelled):
+            self._stats["cancelled"] += 1
+            return
+        current = job.generation == self._generations.get(job.key)
+        if error is not None:
+            self._stats["errors"] += 1
+            logger.warning("Background routing failed for %r: %s", job.key, error)
+            if current:
+                del self._generations[job.key]
+            return
+        if not current:
+            self._stats["discarded"] += 1
+            return
+        self._results.append(replace(result, key=job.key, generation=job.generation))
+
+    def collect(self, limit: Optional[int] = None) -> list[RouteResult]:
+        """Return up to *limit* finished results that are still current, oldest first."""
+        with self._lock:
+            results = []
+            while self._results and (limit is None or len(results) < limit):
+                result = self._results.popleft()
+                if result.generation != self._generations.get(result.key):
+                    self._stats["discarded"] += 1
+                    continue
+                results.append(result)
+                self._stats["completed"] += 1
+                if result.key not in self._queued and result.key not in self._running:
+                    # Nothing newer can arrive for this wire; forget it
+                    del self._generations[result.key]
+            return results
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until no job is queued or running; False on timeout."""
+        with self._lock:
+            return self._changed.wait_for(lambda: not self._queued and not self._running, timeout)
+
+    def shutdown(self) -> None:
+        """Cancel outstanding work and stop the worker threads."""
+        self.cancel_all()
+        with self._lock:
+            self._shutdown = True
+            self._changed.notify_all()
@@ -10,20 +10,30 @@ Usage::
     python -m cli validate circuit.json
     python -m cli export circuit.json --format cir --output circuit.cir
     python -m cli batch circuits/ --output-dir results/
+    python -m cli batch circuits/ --jobs 8 --format jsonl --output-dir results/ --resume
+    python -m cli serve --port 8765 --workers 4
+    python -m cli watch circuit.json
     python -m cli repl
     python -m cli repl --load circuit.json
 """
 
 import argparse
 import glob
+import hashlib
 import json
 import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 
 from controllers.circuit_controller import CircuitController
 from controllers.file_controller import validate_circuit_data
 from controllers.simulation_controller import SimulationController
 from models.circuit import CircuitModel
+from services.simulation_server import DEFAULT_CACHE_SIZE, DEFAULT_HOST, DEFAULT_PORT, DEFAULT_WORKERS, serve
+from utils.constants import SIMULATION_TIMEOUT
+from utils.file_watcher import DEFAULT_POLL_INTERVAL, FileWatcher
 
 __version__ = "0.1.0"
 from simulation.csv_exporter import (
@@ -235,6 +245,103 @@ def _result_to_csv(result, circuit_name: str = "") -> str:
         return _result_to_json(result)
 
 
+BATCH_STATUS_OK = "OK"
+BATCH_STATUS_SKIPPED = "SKIPPED"
+
+
+def _batch_output_path(output_dir: Path | None, filepath: Path, fmt: str) -> Path | None:
+    """Per-file result path inside *output_dir* (None without an output directory)."""
+    if output_dir is None:
+        return None
+    ext = "csv" if fmt == "csv" else "json"
+    return output_dir / f"{filepath.stem}.{ext}"
+
+
+def _is_up_to_date(filepath: Path, out_path: Path | None) -> bool:
+    """True when *out_path* exists and is newer than the circuit file."""
+    if out_path is None or not out_path.exists():
+        return False
+    try:
+        return out_path.stat().st_mtime >= filepath.stat().st_mtime
+    except OSError:
+        return False
+
+
+def _result_metrics(result) -> dict:
+    """Small per-run summary for batch records (not the full result data)."""
+    data = result.data
+    metrics = {}
+    if isinstance(data, list):
+        metrics["points"] = len(data)
+    elif isinstance(data, dict):
+        if "node_voltages" in data:
+            metrics["node_voltages"] = data["node_voltages"]
+        points = data.get("frequencies") or data.get("data")
+        if isinstance(points, list):
+            metrics["points"] = len(points)
+    if result.warnings:
+        metrics["warnings"] = len(result.warnings)
+    return metrics
+
+
+def simulate_batch_file(filepath: str, analysis: str | None, fmt: str, out_path: str | None) -> dict:
+    """Simulate one circuit file for ``batch`` and return its result record.
+
+    Runs in a worker process when ``--jobs`` is greater than one, so it takes
+    and returns only plain data.  The per-file result is written to
+    *out_path* here rather than shipped back to the parent.
+    """
+    path = Path(filepath)
+    start = time.perf_counter()
+    record = {"file": path.name}
+
+    model, error = try_load_circuit(filepath)
+    if model is None:
+        record.update(status="LOAD_ERROR", error=error)
+    else:
+        sim = SimulationController(model, CircuitController(model))
+        if analysis:
+            sim.set_analysis(analysis)
+        result = sim.run_simulation()
+        if not result.success:
+            record.update(status="FAIL", error=result.error)
+        else:
+            record.update(status=BATCH_STATUS_OK, analysis=result.analysis_type, metrics=_result_metrics(result))
+            if out_path:
+                Path(out_path).write_text(_format_result(result, fmt, path.stem))
+
+    record["elapsed_s"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def _run_batch(jobs: list[tuple], workers: int):
+    """Yield (index, record) for each job as it completes.
+
+    With one worker the files run in order in this process; otherwise a
+    process pool runs them concurrently.  Closing the generator early (for
+    --fail-fast) cancels jobs that have not started.
+    """
+    if workers <= 1:
+        for index, job in enumerate(jobs):
+            yield index, simulate_batch_file(*job)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(simulate_batch_file, *job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:  # worker crashed (e.g. killed) — report, keep going
+                record = {"file": Path(jobs[index][0]).name, "status": "FAIL", "error": f"worker error: {e}"}
+            yield index, record
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def cmd_batch(args: argparse.Namespace) -> int:
     """Run simulations on multiple circuit files."""
     # Resolve input files
@@ -252,6 +359,16 @@ def cmd_batch(args: argparse.Namespace) -> int:
         print(f"No .json circuit files found matching: {pattern}", file=sys.stderr)
         return 1
 
+    jobs_count = getattr(args, "jobs", 1) or 1
+    if jobs_count < 1:
+        print("Error: --jobs must be at least 1", file=sys.stderr)
+        return 1
+
+    resume = getattr(args, "resume", False)
+    if resume and not args.output_dir:
+        print("Error: --resume requires --output-dir", file=sys.stderr)
+        return 1
+
     # Create output directory if specified
     output_dir = None
     if args.output_dir:
@@ -259,61 +376,56 @@ def cmd_batch(args: argparse.Namespace) -> int:
         output_dir.mkdir(parents=True, exist_ok=True)
 
     fmt = args.format
-    results_summary = []
-    any_failed = False
-
-    for filepath in files:
-        name = filepath.stem
-        model, error = try_load_circuit(str(filepath))
-
-        if model is None:
-            results_summary.append({"file": filepath.name, "status": "LOAD_ERROR", "error": error})
-            any_failed = True
-            if args.fail_fast:
-                break
+    stream = fmt == "jsonl"
+    records: dict[int, dict] = {}
+    jobs = []
+    job_index = []
+
+    for index, filepath in enumerate(files):
+        out_path = _batch_output_path(output_dir, filepath, fmt)
+        if resume and _is_up_to_date(filepath, out_path):
+            records[index] = {"file": filepath.name, "status": BATCH_STATUS_SKIPPED, "elapsed_s": 0.0}
+            if stream:
+                print(json.dumps(records[index]), flush=True)
             continue
+        jobs.append((str(filepath), args.analysis, fmt, str(out_path) if out_path else None))
+        job_index.append(index)
 
-        controller = CircuitController(model)
-        sim = SimulationController(model, controller)
-
-        if args.analysis:
-            sim.set_analysis(args.analysis)
-
-        result = sim.run_simulation()
-
-        if not result.success:
-            results_summary.append({"file": filepath.name, "status": "FAIL", "error": result.error})
-            any_failed = True
-            if args.fail_fast:
-                break
-            continue
-
-        results_summary.append(
-            {
-                "file": filepath.name,
-                "status": "OK",
-                "analysis": result.analysis_type,
-            }
-        )
-
-        # Write per-file results if output directory specified
-        if output_dir:
-            ext = "csv" if fmt == "csv" else "json"
-            out_path = output_dir / f"{name}.{ext}"
-            out_path.write_text(_format_result(result, fmt, name))
+    any_failed = False
+    results = _run_batch(jobs, min(jobs_count, len(jobs)))
+    try:
+        for position, record in results:
+            records[job_index[position]] = record
+            if stream:
+                print(json.dumps(record, default=str), flush=True)
+            if record["status"] != BATCH_STATUS_OK:
+                any_failed = True
+                if args.fail_fast:
+                    break
+    finally:
+        results.close()
+
+    summary = [records[i] for i in sorted(records)]
+    total = len(summary)
+    passed = sum(1 for e in summary if e["status"] == BATCH_STATUS_OK)
+    skipped = sum(1 for e in summary if e["status"] == BATCH_STATUS_SKIPPED)
+    failed = total - passed - skipped
+    totals = f"{passed}/{total} succeeded, {failed} failed" + (f", {skipped} skipped" if skipped else "")
+
+    if stream:
+        # Keep stdout machine-readable; the totals go to stderr
+        print(totals, file=sys.stderr)
+        return 1 if any_failed else 0
 
     # Print summary table
     print(f"\n{'File':<40} {'Status':<12} {'Details'}")
     print("-" * 70)
-    for entry in results_summary:
+    for entry in summary:
         status = entry["status"]
         details = entry.get("analysis", entry.get("error", ""))
         print(f"{entry['file']:<40} {status:<12} {details}")
 
-    total = len(results_summary)
-    passed = sum(1 for e in results_summary if e["status"] == "OK")
-    failed = total - passed
-    print(f"\n{passed}/{total} succeeded, {failed} failed")
+    print(f"\n{totals}")
 
     return 1 if any_failed else 0
 
@@ -388,11 +500,37 @@ def cmd_repl(args: argparse.Namespace) -> int:
     return 0
 
 
+# Schematic formats accepted by ``import`` besides SPICE netlists
+_SCHEMATIC_SUFFIXES = (".asc", ".tex")
+
+
+def _import_schematic(filepath: Path, text: str, auto_layout: bool):
+    """Parse an LTspice or CircuiTikZ schematic; returns (model, analysis)."""
+    if filepath.suffix.lower() == ".asc":
+        from simulation.asc_parser import import_asc
+
+        model, analysis, warnings = import_asc(text, auto_layout=auto_layout)
+    else:
+        from simulation.circuitikz_parser import import_circuitikz
+
+        model, warnings = import_circuitikz(text, auto_layout=auto_layout)
+        analysis = None
+    for warning in warnings:
+        print(f"Warning: {warning}", file=sys.stderr)
+    return model, analysis
+
+
 def cmd_import(args: argparse.Namespace) -> int:
-    """Import a SPICE netlist and convert to circuit JSON."""
+    """Import a SPICE netlist or schematic and convert to circuit JSON."""
+    from simulation.asc_parser import AscParseError
+    from simulation.circuitikz_parser import CircuitikzParseError
     from simulation.netlist_parser import NetlistParseError, import_netlist
 
     filepath = Path(args.netlist)
+    schematic = filepath.suffix.lower() in _SCHEMATIC_SUFFIXES
+    if schematic and args.layout == "grid":
+        print("Error: --layout grid only applies to netlists", file=sys.stderr)
+        return 1
     if not filepath.exists():
         print(f"Error: file not found: {filepath}", file=sys.stderr)
         return 1
@@ -404,9 +542,13 @@ def cmd_import(args: argparse.Namespace) -> int:
         return 1
 
     try:
-        model, analysis = import_netlist(text)
-    except NetlistParseError as e:
-        print(f"Error parsing netlist: {e}", file=sys.stderr)
+        if schematic:
+            # Schematics keep their drawn placement unless asked otherwise
+            model, analysis = _import_schematic(filepath, text, auto_layout=args.layout == "auto")
+        else:
+            model, analysis = import_netlist(text, layout=args.layout or "auto")
+    except (NetlistParseError, AscParseError, CircuitikzParseError) as e:
+        print(f"Error parsing {filepath.name}: {e}", file=sys.stderr)
         return 1
 
     if analysis:
@@ -461,6 +603,12 @@ def diff_circuits(model_a: CircuitModel, model_b: CircuitModel) -> dict:
             changes["rotation"] = {"from": ca.rotation, "to": cb.rotation}
         if ca.position != cb.position:
             changes["position"] = {"from": list(ca.position), "to": list(cb.position)}
+        if (ca.flip_h, ca.flip_v) != (cb.flip_h, cb.flip_v):
+            changes["flip"] = {"from": [ca.flip_h, ca.flip_v], "to": [cb.flip_h, cb.flip_v]}
+        if ca.initial_condition != cb.initial_condition:
+            changes["initial_condition"] = {"from": ca.initial_condition, "to": cb.initial_condition}
+        if ca.value == cb.value and ca.get_spice_value() != cb.get_spice_value():
+            changes["waveform"] = {"from": ca.get_spice_value(), "to": cb.get_spice_value()}
         if changes:
             changed.append({"id": cid, "changes": changes})
 
@@ -517,6 +665,18 @@ def _is_empty_diff(diff: dict) -> bool:
     return not diff["components"] and not diff["wires"] and not diff["analysis"]
 
 
+# Component changes that move things on the canvas without changing the netlist
+LAYOUT_FIELDS = {"position", "rotation", "flip"}
+
+
+def is_layout_only_diff(diff: dict) -> bool:
+    """True if *diff* (from diff_circuits) contains only layout changes."""
+    comp = diff["components"]
+    if diff["wires"] or diff["analysis"] or comp.get("added") or comp.get("removed"):
+        return False
+    return all(set(item["changes"]) <= LAYOUT_FIELDS for item in comp.get("changed", []))
+
+
 def _format_diff_text(diff: dict, name_a: str, name_b: str) -> str:
     """Format a circuit diff as human-readable text."""
     lines = [f"Comparing {name_a} vs {name_b}", ""]
@@ -579,6 +739,131 @@ def cmd_diff(args: argparse.Namespace) -> int:
     return 0 if identical else 1
 
 
+@dataclass
+class WatchUpdate:
+    """Outcome of reloading a watched circuit file."""
+
+    status: str  # simulated | cached | layout | error
+    diff: dict | None = None
+    result: object = None
+    error: str = ""
+    elapsed_s: float = 0.0
+
+
+class WatchSession:
+    """Reloads a circuit file and re-simulates only when it matters.
+
+    Each reload is diffed against the previous model with diff_circuits().
+    Layout-only edits (moving, rotating or flipping parts, rerouting wires)
+    skip simulation.  Otherwise the netlist is regenerated and results are
+    looked up by netlist content, so reverting an edit reuses the earlier
+    result instead of running ngspice again.
+    """
+
+    def __init__(self, path: str, analysis: str | None = None, cache_size: int = 32):
+        self.path = path
+        self.analysis = analysis
+        self.cache_size = cache_size
+        self.model: CircuitModel | None = None
+        self._sim = SimulationController()
+        self._netlist_key: str | None = None
+        self._results: OrderedDict[str, object] = OrderedDict()
+
+    def update(self) -> WatchUpdate:
+        """Reload the file and simulate if needed."""
+        start = time.perf_counter()
+        update = self._update()
+        update.elapsed_s = time.perf_counter() - start
+        return update
+
+    def _update(self) -> WatchUpdate:
+        model, error = try_load_circuit(self.path)
+        if model is None:
+            return WatchUpdate("error", error=error)
+        if self.analysis:
+            model.analysis_type = self.analysis
+            model.analysis_params = {}
+
+        previous, self.model = self.model, model
+        diff = diff_circuits(previous, model) if previous is not None else None
+        if diff is not None and is_layout_only_diff(diff) and _net_names(previous) == _net_names(model):
+            return WatchUpdate("layout", diff=diff)
+
+        self._sim.model = model
+        try:
+            netlist = self._sim.generate_netlist()
+        except (ValueError, KeyError, TypeError) as e:
+            self._netlist_key = None
+            return WatchUpdate("error", diff=diff, error=f"netlist generation failed: {e}")
+
+        key = hashlib.sha256(netlist.encode()).hexdigest()
+        self._netlist_key = key
+        cached = self._results.get(key)
+        if cached is not None:
+            self._results.move_to_end(key)
+            return WatchUpdate("cached", diff=diff, result=cached)
+
+        result = self._sim.run_simulation()
+        if result.success:
+            self._results[key] = result
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        return WatchUpdate("simulated", diff=diff, result=result)
+
+
+def _net_names(model: CircuitModel) -> dict:
+    return model.to_dict().get("net_names", {})
+
+
+def _report_watch_update(update: WatchUpdate, args: argparse.Namespace) -> None:
+    """Print a watch update: status to stderr, results to stdout or --output."""
+    stamp = time.strftime("%H:%M:%S")
+    if update.diff is not None and not _is_empty_diff(update.diff):
+        changes = _format_diff_text(update.diff, "", "").splitlines()[2:]
+        print("\n".join(line for line in changes if line.strip()), file=sys.stderr)
+
+    if update.status == "layout":
+        print(f"[{stamp}] Layout-only change; results unchanged", file=sys.stderr)
+        return
+    if update.status == "error":
+        print(f"[{stamp}] Error: {update.error}", file=sys.stderr)
+        return
+
+    result = update.result
+    label = "reused cached result" if update.status == "cached" else "simulated"
+    if not result.success:
+        print(f"[{stamp}] Simulation failed: {result.error}", file=sys.stderr)
+        return
+    print(f"[{stamp}] {label} in {update.elapsed_s * 1000:.0f} ms", file=sys.stderr)
+
+    output_text = _format_result(result, args.format, Path(args.circuit).stem)
+    if args.output:
+        Path(args.output).write_text(output_text)
+    else:
+        print(output_text, flush=True)
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+    """Re-simulate a circuit file every time it is saved."""
+    if not Path(args.circuit).exists():
+        print(f"Error: file not found: {args.circuit}", file=sys.stderr)
+        return 1
+
+    session = WatchSession(args.circuit, args.analysis)
+    watcher = FileWatcher(args.circuit, poll_interval=args.interval)
+    mode = "OS notifications" if watcher.uses_notifications else f"polling every {args.interval:g} s"
+    print(f"Watching {args.circuit} ({mode}); press Ctrl+C to stop", file=sys.stderr)
+    try:
+        _report_watch_update(session.update(), args)
+        while watcher.wait_for_change():
+            _report_watch_update(session.update(), args)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+    return 0
+
+
 def circuit_stats(model: CircuitModel) -> dict:
     """Compute circuit complexity statistics.
 
@@ -693,9 +978,9 @@ def build_parser() -> argparse.ArgumentParser:
     batch_parser.add_argument("path", help="Directory or glob pattern matching circuit JSON files")
     batch_parser.add_argument(
         "--format",
-        choices=["json", "csv"],
+        choices=["json", "csv", "jsonl"],
         default="json",
-        help="Output format for per-file results (default: json)",
+        help="Output format for per-file results (default: json); jsonl also streams one record per file to stdout",
     )
     batch_parser.add_argument("--output-dir", help="Write per-file results to this directory")
     batch_parser.add_argument(
@@ -711,19 +996,41 @@ def build_parser() -> argparse.ArgumentParser:
         help="Override the analysis type for all circuits",
     )
     batch_parser.add_argument("--fail-fast", action="store_true", help="Stop on first error")
+    batch_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of circuits to simulate concurrently in worker processes (default: 1)",
+    )
+    batch_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip files whose result in --output-dir is newer than the circuit file",
+    )
 
     # repl
     repl_parser = subparsers.add_parser("repl", help="Launch interactive Python REPL with scripting API")
     repl_parser.add_argument("--load", help="Pre-load a circuit JSON file as 'circuit' variable")
 
     # import
-    import_parser = subparsers.add_parser("import", help="Import a SPICE netlist to circuit JSON")
-    import_parser.add_argument("netlist", help="Path to SPICE netlist file (.cir, .spice, .sp)")
+    import_parser = subparsers.add_parser("import", help="Import a SPICE netlist or schematic to circuit JSON")
+    import_parser.add_argument(
+        "netlist",
+        help="Path to SPICE netlist (.cir, .spice, .sp), LTspice schematic (.asc) or CircuiTikZ file (.tex)",
+    )
     import_parser.add_argument(
         "--output",
         "-o",
         help="Output JSON file path (default: same name with .json extension)",
     )
+    import_parser.add_argument(
+        "--layout",
+        choices=["auto", "grid"],
+        default=None,
+        help="Component placement: auto groups connected parts, grid keeps netlist order "
+        "(default: auto for netlists; schematics keep their drawn placement)",
+    )
 
     # diff
     diff_parser = subparsers.add_parser("diff", help="Compare two circuit files and report differences")
@@ -748,12 +1055,80 @@ def build_parser() -> argparse.ArgumentParser:
         help="Output format (default: text)",
     )
 
+    # watch
+    watch_parser = subparsers.add_parser("watch", help="Re-simulate a circuit file whenever it is saved")
+    watch_parser.add_argument("circuit", help="Path to circuit JSON file")
+    watch_parser.add_argument(
+        "--format",
+        choices=["json", "csv"],
+        default="json",
+        help="Output format (default: json)",
+    )
+    watch_parser.add_argument("--output", "-o", help="Rewrite results to this file instead of printing them")
+    watch_parser.add_argument(
+        "--analysis",
+        choices=[
+            "DC Operating Point",
+            "DC Sweep",
+            "AC Sweep",
+            "Transient",
+            "Temperature Sweep",
+            "Noise",
+        ],
+        help="Override the analysis type configured in the circuit file",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f"Polling interval in seconds when OS notifications are unavailable (default: {DEFAULT_POLL_INTERVAL})",
+    )
+
+    # serve
+    serve_parser = subparsers.add_parser("serve", help="Run a local HTTP/JSON server for simulation jobs")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST, help=f"Address to bind (default: {DEFAULT_HOST})")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent simulation workers (default: {DEFAULT_WORKERS})",
+    )
+    serve_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=SIMULATION_TIMEOUT,
+        help=f"Default per-job time limit in seconds (default: {SIMULATION_TIMEOUT})",
+    )
+    serve_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help=f"Results kept in the request cache, 0 to disable (default: {DEFAULT_CACHE_SIZE})",
+    )
+
     # selftest
     subparsers.add_parser("selftest", help="Run post-install smoke tests to verify the installation")
 
     return parser
 
 
+def cmd_serve(args: argparse.Namespace) -> int:
+    """Run the local HTTP/JSON simulation server."""
+    if args.workers < 1:
+        print("Error: --workers must be at least 1", file=sys.stderr)
+        return 1
+    if args.timeout <= 0:
+        print("Error: --timeout must be positive", file=sys.stderr)
+        return 1
+    try:
+        serve(args.host, args.port, args.workers, args.timeout, args.cache_size)
+    except OSError as e:
+        print(f"Error: cannot listen on {args.host}:{args.port}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
 def cmd_selftest(args: argparse.Namespace) -> int:
     """Run post-install smoke tests."""
     from simulation.selftest import print_selftest, run_selftest
@@ -778,6 +1153,8 @@ def main(argv=None) -> int:
         "diff": cmd_diff,
         "stats": cmd_stats,
         "selftest": cmd_selftest,
+        "serve": cmd_serve,
+        "watch": cmd_watch,
     }
 
     handler = handlers.get(args.command)
@@ -6,7 +6,9 @@ and notifies views of changes through an observer pattern.
 """
 
 import logging
-from typing import Any, Callable, Optional
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
 
 from controllers.undo_manager import UndoManager
 from models.annotation import AnnotationData
@@ -18,6 +20,41 @@ from models.wire import WireData
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class BatchChanges:
+    """Change set collected by one ``CircuitController.batch()`` transaction.
+
+    ``events`` holds the ``(event, data)`` notifications that would have
+    been sent one by one, in the order they happened, so observers can
+    replay them (wire indices in ``wire_removed`` depend on that order).
+    """
+
+    events: list[tuple[str, Any]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def event_names(self) -> set[str]:
+        return {event for event, _ in self.events}
+
+    def payloads(self, event: str) -> list:
+        """Return the data of every *event* notification in order."""
+        return [data for name, data in self.events if name == event]
+
+    @property
+    def added_components(self) -> list[ComponentData]:
+        return self.payloads("component_added")
+
+    @property
+    def removed_component_ids(self) -> list[str]:
+        return self.payloads("component_removed")
+
+    @property
+    def added_wires(self) -> list[WireData]:
+        return self.payloads("wire_added")
+
+
 class CircuitController:
     """
     Controller for circuit component and wire operations.
@@ -41,6 +78,7 @@ class CircuitController:
         model_saved (None) - Circuit saved to file
         simulation_started (None) - Simulation began
         simulation_completed (SimulationResult) - Simulation finished
+        batch_applied (BatchChanges) - Several changes made in one batch()
     """
 
     def __init__(self, model: Optional[CircuitModel] = None, max_undo_depth: int = 100):
@@ -49,6 +87,20 @@ class CircuitController:
         self._clipboard = ClipboardData()
         self.undo_manager = UndoManager(max_depth=max_undo_depth)
         self._locked_components: set[str] = set()
+        self._batch: Optional[BatchChanges] = None
+        self._diagnostics = None
+
+    @property
+    def diagnostics(self):
+        """Incremental validation state of the model (see simulation.circuit_diagnostics).
+
+        Created on first use; from then on it follows this controller's events.
+        """
+        if self._diagnostics is None:
+            from simulation.circuit_diagnostics import CircuitDiagnostics
+
+            self._diagnostics = CircuitDiagnostics(self.model, self)
+        return self._diagnostics
 
     def add_observer(self, callback: Callable[[str, Any], None]) -> None:
         """Register a callback for model change events."""
@@ -72,9 +124,48 @@ class CircuitController:
                 logger.error("Error notifying observer: %s", e)
 
     def _notify(self, event: str, data: Any) -> None:
-        """Notify all observers of a model change."""
+        """Notify all observers of a model change (or record it inside a batch)."""
+        if self._batch is not None:
+            self._batch.events.append((event, data))
+            return
         self.notify(event, data)
 
+    @contextmanager
+    def batch(self) -> Iterator[BatchChanges]:
+        """Group several mutations into one transaction.
+
+        Inside the ``with`` block node-graph maintenance is deferred and
+        notifications are collected.  On exit the node graph is reconciled
+        in a single pass and observers receive one ``batch_applied`` event
+        carrying the :class:`BatchChanges` (a batch holding a single change
+        is delivered as that plain event).  Nested batches join the
+        outermost one.
+
+            with controller.batch():
+                for ...:
+                    controller.add_wire(...)
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+
+        changes = BatchChanges()
+        self._batch = changes
+        self.model.begin_batch()
+        try:
+            yield changes
+        finally:
+            self._batch = None
+            self.model.end_batch()
+            if len(changes) == 1:
+                self.notify(*changes.events[0])
+            elif changes.events:
+                self.notify("batch_applied", changes)
+
+    def in_batch(self) -> bool:
+        """Return whether a batch() transaction is open."""
+        return self._batch is not None
+
     # --- Component operations ---
 
     def add_component(self, component_type: str, position: tuple[float, float]) -> ComponentData:
@@ -121,7 +212,7 @@ class CircuitController:
         """Rotate a component 90 degrees. Locked components cannot be rotated."""
         if self.is_component_locked(component_id):
             return
-        component = self.model.components.get(component_id)
+        component = self.model.own_component(component_id)
         if component is None:
             return
         delta = 90 if clockwise else -90
@@ -132,7 +223,7 @@ class CircuitController:
         """Set a component's rotation to an exact value. Locked components cannot be rotated."""
         if self.is_component_locked(component_id):
             return
-        component = self.model.components.get(component_id)
+        component = self.model.own_component(component_id)
         if component is None:
             return
         component.rotation = rotation % 360
@@ -142,7 +233,7 @@ class CircuitController:
         """Flip (mirror) a component. Locked components cannot be flipped."""
         if self.is_component_locked(component_id):
             return
-        component = self.model.components.get(component_id)
+        component = self.model.own_component(component_id)
         if component is None:
             return
         if horizontal:
@@ -155,7 +246,7 @@ class CircuitController:
         """Update a component's value. Locked components cannot be changed."""
         if self.is_component_locked(component_id):
             return
-        component = self.model.components.get(component_id)
+        component = self.model.own_component(component_id)
         if component is None:
             return
         component.value = value
@@ -165,7 +256,7 @@ class CircuitController:
         """Update a component's waveform configuration. Locked components cannot be changed."""
         if self.is_component_locked(component_id):
             return
-        component = self.model.components.get(component_id)
+        component = self.model.own_component(component_id)
         if component is None:
             return
         component.waveform_type = waveform_type
@@ -179,7 +270,7 @@ class CircuitController:
         """Update a component's initial condition. Locked components cannot be changed."""
         if self.is_component_locked(component_id):
             return
-        component = self.model.components.get(component_id)
+        component = self.model.own_component(component_id)
         if component is None:
             return
         component.initial_condition = initial_condition
@@ -189,7 +280,7 @@ class CircuitController:
         """Move a component to a new position. Locked components cannot be moved."""
         if self.is_component_locked(component_id):
             return
-        component = self.model.components.get(component_id)
+        component = self.model.own_component(component_id)
         if component is None:
             return
         component.position = position
@@ -225,7 +316,7 @@ class CircuitController:
         end_term: int,
     ) -> bool:
         """Check if a wire already exists between the given terminal pair."""
-        for wire in self.model.wires:
+        for wire in self.model.wires_at_terminal(start_comp_id, start_term):
             same_fwd = (
                 wire.start_component_id == start_comp_id
                 and wire.start_terminal == start_term
@@ -286,7 +377,7 @@ class CircuitController:
     def update_wire_waypoints(self, wire_index: int, waypoints: list[tuple[float, float]]) -> None:
         """Update a wire's routing path."""
         if 0 <= wire_index < len(self.model.wires):
-            wire = self.model.wires[wire_index]
+            wire = self.model.own_wire(wire_index)
             wire.waypoints = waypoints
             self._notify("wire_routed", (wire_index, wire))
 
@@ -304,7 +395,7 @@ class CircuitController:
         is persisted through the controller rather than via direct model writes.
         """
         if 0 <= wire_index < len(self.model.wires):
-            wire = self.model.wires[wire_index]
+            wire = self.model.own_wire(wire_index)
             wire.waypoints = waypoints
             wire.runtime = runtime
             wire.iterations = iterations
@@ -314,7 +405,7 @@ class CircuitController:
     def set_wire_locked(self, wire_index: int, locked: bool) -> None:
         """Set whether a wire's path is locked (skip auto-reroute)."""
         if 0 <= wire_index < len(self.model.wires):
-            wire = self.model.wires[wire_index]
+            wire = self.model.own_wire(wire_index)
             wire.locked = locked
             self._notify("wire_lock_changed", (wire_index, wire))
 
@@ -347,6 +438,7 @@ class CircuitController:
 
     def set_net_name(self, node, label) -> None:
         """Set a custom net name on a node and notify observers."""
+        node = self.model.own_node(node)
         node.set_custom_label(label)
         self._notify("net_name_changed", node)
 
@@ -437,19 +529,52 @@ class CircuitController:
 
         self._clipboard.paste_count += 1
         multiplier = self._clipboard.paste_count
-        dx = offset[0] * multiplier
-        dy = offset[1] * multiplier
+        with self.batch():
+            return self._paste_clipboard(self._clipboard, (offset[0] * multiplier, offset[1] * multiplier))
+
+    def replay_paste(
+        self,
+        clipboard: ClipboardData,
+        delta: tuple[float, float],
+        component_ids: list[str],
+    ) -> tuple[list[ComponentData], list[WireData]]:
+        """
+        Repeat an earlier paste of *clipboard* translated by *delta* (e.g. on redo).
+
+        The components get *component_ids* again unless one of them has
+        been taken in the meantime, in which case fresh IDs are used.
+
+        Returns:
+            Tuple of (new_components, new_wires) that were added.
+        """
+        if len(component_ids) != len(clipboard.components) or any(
+            cid in self.model.components for cid in component_ids
+        ):
+            component_ids = None
+        with self.batch():
+            return self._paste_clipboard(clipboard, delta, component_ids)
+
+    def _paste_clipboard(
+        self,
+        clipboard: ClipboardData,
+        delta: tuple[float, float],
+        component_ids: Optional[list[str]] = None,
+    ) -> tuple[list[ComponentData], list[WireData]]:
+        dx, dy = delta
 
         id_map: dict[str, str] = {}
         new_components: list[ComponentData] = []
 
-        for comp_dict in self._clipboard.components:
+        for i, comp_dict in enumerate(clipboard.components):
             comp_data = ComponentData.from_dict(comp_dict)
 
-            symbol = SPICE_SYMBOLS.get(comp_data.component_type, "X")
-            count = self.model.component_counter.get(symbol, 0) + 1
-            self.model.component_counter[symbol] = count
-            new_id = f"{symbol}{count}"
+            if component_ids is not None:
+                new_id = component_ids[i]
+            else:
+                symbol = SPICE_SYMBOLS.get(comp_data.component_type, "X")
+                count = self.model.component_counter.get(symbol, 0) + 1
+                self.model.component_counter[symbol] = count
+                new_id = f"{symbol}{count}"
 
             old_id = comp_data.component_id
             id_map[old_id] = new_id
@@ -468,7 +593,7 @@ class CircuitController:
             new_components.append(new_comp)
 
         new_wires: list[WireData] = []
-        for wire_dict in self._clipboard.wires:
+        for wire_dict in clipboard.wires:
             new_start = id_map.get(wire_dict["start_comp"])
             new_end = id_map.get(wire_dict["end_comp"])
 
@@ -480,6 +605,10 @@ class CircuitController:
                 start_terminal=wire_dict["start_term"],
                 end_component_id=new_end,
                 end_terminal=wire_dict["end_term"],
+                # Carry the copied route along; the view only reroutes wires
+                # whose translated path runs into something.
+                waypoints=[(x + dx, y + dy) for x, y in wire_dict.get("waypoints") or []],
+                locked=wire_dict.get("locked", False),
             )
             self.model.add_wire(wire)
             self._notify("wire_added", wire)
@@ -491,9 +620,10 @@ class CircuitController:
         """Cut selected components: copy to clipboard, then delete."""
         copied = self.copy_components(component_ids)
         if copied:
-            for comp_id in list(component_ids):
-                if comp_id in self.model.components:
-                    self.remove_component(comp_id)
+            with self.batch():
+                for comp_id in list(component_ids):
+                    if comp_id in self.model.components:
+                        self.remove_component(comp_id)
         return copied
 
     def has_clipboard_content(self) -> bool:
@@ -504,6 +634,10 @@ class CircuitController:
         """Replace the controller's clipboard with the given data."""
         self._clipboard = clipboard
 
+    def get_clipboard(self) -> ClipboardData:
+        """Return the current clipboard snapshot (treat as read-only)."""
+        return self._clipboard
+
     def get_clipboard_paste_count(self) -> int:
         """Return the current clipboard paste count."""
         return self._clipboard.paste_count
@@ -520,9 +654,14 @@ class CircuitController:
         Args:
             command: A Command instance to execute
         """
-        self.undo_manager.execute(command)
+        with self._command_batch(command):
+            self.undo_manager.execute(command)
         self._notify("undo_state_changed", None)
 
+    def _command_batch(self, command):
+        """Open a batch for commands that touch many items at once."""
+        return self.batch() if getattr(command, "batched", False) else nullcontext()
+
     def push_already_executed(self, command) -> None:
         """Push a pre-executed command onto the undo stack.
 
@@ -538,7 +677,8 @@ class CircuitController:
         Returns:
             True if an action was undone, False otherwise
         """
-        result = self.undo_manager.undo()
+        with self._command_batch(self.undo_manager.peek_undo()):
+            result = self.undo_manager.undo()
         if result:
             self._notify("undo_state_changed", None)
         return result
@@ -550,7 +690,8 @@ class CircuitController:
         Returns:
             True if an action was redone, False otherwise
         """
-        result = self.undo_manager.redo()
+        with self._command_batch(self.undo_manager.peek_redo()):
+            result = self.undo_manager.redo()
         if result:
             self._notify("undo_state_changed", None)
         return result
@@ -6,19 +6,40 @@ Commands are executed through the CircuitController to maintain consistency.
 """
 
 import logging
+import sys
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Sequence
 
 from models.annotation import AnnotationData
+from models.clipboard import ClipboardData
 from models.component import ComponentData
 from models.wire import WireData
 
 logger = logging.getLogger(__name__)
 
 
+def _deep_size(value) -> int:
+    """Rough memory footprint of command state, following containers and model data."""
+    if isinstance(value, Command):
+        return value.estimated_size()
+    if isinstance(value, (ComponentData, WireData, AnnotationData)):
+        return _deep_size(value.to_dict())
+    if isinstance(value, ClipboardData):
+        return sys.getsizeof(value) + _deep_size(value.components) + _deep_size(value.wires)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(key) + _deep_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item) for item in value)
+    return size
+
+
 class Command(ABC):
     """Base class for undoable commands."""
 
+    # Commands that add or remove many items run inside controller.batch()
+    batched: bool = False
+
     @abstractmethod
     def execute(self) -> None:
         """Execute the command (perform the action)."""
@@ -33,6 +54,25 @@ class Command(ABC):
         """Return a human-readable description of this command."""
         return self.__class__.__name__
 
+    def merge_key(self) -> Optional[tuple]:
+        """Identify what this command edits, or None if it never merges.
+
+        UndoManager folds a command into the one before it when both
+        return the same key, by calling ``absorb(other)`` on the earlier
+        command; subclasses that return a key must define it.
+        """
+        return None
+
+    def estimated_size(self) -> int:
+        """Approximate bytes this command keeps alive for undo/redo.
+
+        Counts the command's own state, including any clipboard snapshot
+        it replays from; only the controller is not charged to it.
+        """
+        return sys.getsizeof(self) + sum(
+            _deep_size(value) for name, value in vars(self).items() if name != "controller"
+        )
+
 
 class AddComponentCommand(Command):
     """Command to add a component to the circuit."""
@@ -60,6 +100,8 @@ class AddComponentCommand(Command):
 class DeleteComponentCommand(Command):
     """Command to delete a component from the circuit."""
 
+    batched = True
+
     def __init__(self, controller, component_id: str):
         self.controller = controller
         self.component_id = component_id
@@ -143,6 +185,12 @@ class MoveComponentCommand(Command):
             return
         self.controller.move_component(self.component_id, self.old_position)
 
+    def merge_key(self) -> Optional[tuple]:
+        return None if self.old_position is None else ("move", self.component_id)
+
+    def absorb(self, other: "MoveComponentCommand") -> None:
+        self.new_position = other.new_position
+
     def get_description(self) -> str:
         return f"Move {self.component_id}"
 
@@ -246,6 +294,12 @@ class ChangeValueCommand(Command):
             return
         self.controller.update_component_value(self.component_id, self.old_value)
 
+    def merge_key(self) -> Optional[tuple]:
+        return None if self.old_value is None else ("value", self.component_id)
+
+    def absorb(self, other: "ChangeValueCommand") -> None:
+        self.new_value = other.new_value
+
     def get_description(self) -> str:
         return f"Change {self.component_id} value"
 
@@ -330,8 +384,7 @@ class DeleteWireCommand(Command):
         ):
             logger.warning("DeleteWireCommand.undo: endpoint component(s) no longer exist, skipping")
             return
-        model.wires.insert(self.wire_index, self.wire_data)
-        model.rebuild_nodes()
+        model.insert_wire(self.wire_index, self.wire_data)
         self.controller._notify("wire_added", self.wire_data)
 
     def get_description(self) -> str:
@@ -354,8 +407,7 @@ class ToggleWireLockCommand(Command):
                 self.wire_index,
             )
             return
-        self.controller.model.wires[self.wire_index].locked = self.locked
-        self.controller._notify("wire_lock_changed", (self.wire_index, self.locked))
+        self.controller.set_wire_locked(self.wire_index, self.locked)
 
     def undo(self) -> None:
         """Restore previous locked state."""
@@ -365,8 +417,7 @@ class ToggleWireLockCommand(Command):
                 self.wire_index,
             )
             return
-        self.controller.model.wires[self.wire_index].locked = not self.locked
-        self.controller._notify("wire_lock_changed", (self.wire_index, not self.locked))
+        self.controller.set_wire_locked(self.wire_index, not self.locked)
 
     def get_description(self) -> str:
         return "Lock wire" if self.locked else "Unlock wire"
@@ -408,22 +459,73 @@ class RerouteWireCommand(Command):
         return "Reroute wire"
 
 
+class RerouteWiresCommand(Command):
+    """Command to reroute several wires together in one global routing pass."""
+
+    def __init__(self, controller, wire_indices: list[int]):
+        self.controller = controller
+        self.wire_indices = list(wire_indices)
+        self.old_waypoints: dict[int, list[tuple[float, float]]] = {}
+
+    def execute(self) -> None:
+        """Save old waypoints and signal that the wires need rerouting."""
+        wires = self.controller.model.wires
+        indices = [i for i in self.wire_indices if 0 <= i < len(wires)]
+        if len(indices) < len(self.wire_indices):
+            logger.warning(
+                "RerouteWiresCommand: skipping %d out-of-range wire(s)", len(self.wire_indices) - len(indices)
+            )
+        self.old_waypoints = {i: list(wires[i].waypoints) for i in indices}
+        if indices:
+            self.controller._notify("wires_reroute_requested", indices)
+
+    def undo(self) -> None:
+        """Restore old waypoints."""
+        for index, waypoints in self.old_waypoints.items():
+            if index < len(self.controller.model.wires):
+                self.controller.update_wire_waypoints(index, waypoints)
+
+    def get_description(self) -> str:
+        return f"Reroute {len(self.wire_indices)} wires"
+
+
 class PasteCommand(Command):
-    """Command to paste clipboard contents."""
+    """Command to paste clipboard contents.
+
+    The paste is kept as a compact diff against the clipboard snapshot it
+    came from: the translation applied and the IDs handed out.  Snapshots
+    are replaced rather than edited, so the command shares the pasted
+    data instead of copying it, and redo re-creates the same components
+    and wires.
+    """
+
+    batched = True
 
     def __init__(self, controller, offset: tuple[float, float] = (40.0, 40.0)):
         self.controller = controller
         self.offset = offset
         self.pasted_component_ids: list[str] = []
-        self.pasted_wire_indices: list[int] = []
+        # Pasted wires are appended together, so a range covers them
+        self.pasted_wire_indices: Sequence[int] = range(0)
+        self._source: Optional[ClipboardData] = None
+        self._delta: tuple[float, float] = (0.0, 0.0)
 
     def execute(self) -> None:
         """Paste components and wires, storing their IDs/indices."""
-        new_components, new_wires = self.controller.paste_components(self.offset)
+        if self._source is None:
+            source = self.controller.get_clipboard()
+            new_components, new_wires = self.controller.paste_components(self.offset)
+            if new_components:
+                count = self.controller.get_clipboard_paste_count()
+                self._source = source
+                self._delta = (self.offset[0] * count, self.offset[1] * count)
+        else:
+            new_components, new_wires = self.controller.replay_paste(
+                self._source, self._delta, self.pasted_component_ids
+            )
         self.pasted_component_ids = [comp.component_id for comp in new_components]
-        # Store indices of pasted wires (they're at the end of the wire list)
         wire_count = len(self.controller.model.wires)
-        self.pasted_wire_indices = list(range(wire_count - len(new_wires), wire_count))
+        self.pasted_wire_indices = range(wire_count - len(new_wires), wire_count)
 
     def undo(self) -> None:
         """Delete all pasted components and wires."""
@@ -605,7 +707,7 @@ class UpdateWaveformCommand(Command):
         """Restore the old waveform configuration."""
         if self.old_waveform_type is None:
             return
-        component = self.controller.model.components.get(self.component_id)
+        component = self.controller.model.own_component(self.component_id)
         if not component:
             logger.warning(
                 "UpdateWaveformCommand.undo: component %s not found, skipping",
@@ -688,6 +790,12 @@ class MoveWaypointCommand(Command):
         self.controller.update_wire_waypoints(self.wire_index, self.old_waypoints)
         self.controller.set_wire_locked(self.wire_index, True)
 
+    def merge_key(self) -> Optional[tuple]:
+        return ("waypoints", self.wire_index)
+
+    def absorb(self, other: "MoveWaypointCommand") -> None:
+        self.new_waypoints = other.new_waypoints
+
     def get_description(self) -> str:
         return "Move waypoint"
 
@@ -695,6 +803,8 @@ class MoveWaypointCommand(Command):
 class CompoundCommand(Command):
     """Command that groups multiple commands into a single undo step."""
 
+    batched = True
+
     def __init__(self, commands: list[Command], description: str = "Multiple actions"):
         self.commands = commands
         self.description = description
@@ -709,5 +819,15 @@ class CompoundCommand(Command):
         for command in reversed(self.commands):
             command.undo()
 
+    def merge_key(self) -> Optional[tuple]:
+        keys = tuple(command.merge_key() for command in self.commands)
+        if not keys or None in keys:
+            return None
+        return ("compound",) + keys
+
+    def absorb(self, other: "CompoundCommand") -> None:
+        for command, later in zip(self.commands, other.commands):
+            command.absorb(later)
+
     def get_description(self) -> str:
         return self.description
@@ -0,0 +1,182 @@
+"""
+LiveOpController - Keeps a DC operating point in step with the circuit.
+
+Every model edit bumps a generation counter and cancels the run in
+flight.  A view snapshots the circuit after edits settle (snapshot()),
+hands the job to a worker thread (run()) and only shows a result while
+is_current() says no newer edit has arrived in the meantime.
+
+Snapshots are detached copies of the model (CircuitModel.snapshot()),
+so later edits never reach objects the worker is reading.  A
+copy-on-write CircuitModel.copy() would not do here: the live model
+would then swap in private duplicates on its next edit, leaving the
+canvas items holding the old objects.  The node graph is not rebuilt for
+a snapshot: node labels stay those the canvas shows, and the global node
+counter is never touched off the GUI thread.
+
+No Qt dependencies — threading is left to the caller.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+from models.circuit import CircuitModel
+
+logger = logging.getLogger(__name__)
+
+LIVE_OP_ANALYSIS = "DC Operating Point"
+
+# Controller events after which the netlist may have changed
+LIVE_OP_EVENTS = frozenset(
+    {
+        "component_added",
+        "component_removed",
+        "component_value_changed",
+        "wire_added",
+        "wire_removed",
+        "circuit_cleared",
+        "nodes_rebuilt",
+        "model_loaded",
+        "net_name_changed",
+    }
+)
+
+_CANCELLED = "Simulation cancelled"
+
+
+@dataclass
+class LiveOpJob:
+    """A circuit snapshot waiting for an operating point."""
+
+    generation: int
+    model: CircuitModel
+    cancel: threading.Event = field(default_factory=threading.Event)
+
+
+@dataclass
+class LiveOpResult:
+    """Outcome of a live operating-point run."""
+
+    generation: int
+    node_voltages: dict = field(default_factory=dict)
+    branch_currents: dict = field(default_factory=dict)
+    error: str = ""
+    cancelled: bool = False
+
+    @property
+    def success(self) -> bool:
+        return not self.error and not self.cancelled
+
+
+class LiveOpController:
+    """Generation tracking, snapshotting and cancellable operating-point runs.
+
+    run() may be called from a worker thread but must not overlap with
+    another run() of the same controller; everything else belongs to the
+    thread that edits the model.
+    """
+
+    def __init__(self, model: CircuitModel, circuit_ctrl=None, runner=None):
+        self.model = model
+        self.circuit_ctrl = circuit_ctrl
+        self.generation = 0
+        self._runner = runner
+        self._job: Optional[LiveOpJob] = None
+        self._completed_generation: Optional[int] = None
+        if circuit_ctrl is not None:
+            circuit_ctrl.add_observer(self._on_model_changed)
+
+    @property
+    def runner(self):
+        """Dedicated NgspiceRunner, so live runs never clean up files of a user run."""
+        if self._runner is None:
+            from simulation import NgspiceRunner
+
+            self._runner = NgspiceRunner(output_dir=os.path.join("simulation_output", "live_op"))
+        return self._runner
+
+    def _on_model_changed(self, event: str, data) -> None:
+        changed = data.event_names if event == "batch_applied" else {event}
+        if changed & LIVE_OP_EVENTS:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Mark the circuit as changed and cancel the run in flight."""
+        self.generation += 1
+        self.cancel()
+
+    def cancel(self) -> None:
+        """Cancel the run in flight, if any."""
+        if self._job is not None:
+            self._job.cancel.set()
+            self._job = None
+
+    def snapshot(self) -> Optional[LiveOpJob]:
+        """Capture the circuit for a new run.
+
+        Returns None when the current generation already has a result or
+        a run, or when the model is in the middle of a batch.
+        """
+        if self._completed_generation == self.generation:
+            return None
+        if self._job is not None and self._job.generation == self.generation:
+            return None
+        if self.model.in_batch:
+            return None
+        self.cancel()
+        self._job = LiveOpJob(self.generation, self.model.snapshot())
+        return self._job
+
+    def is_current(self, result: LiveOpResult) -> bool:
+        """True if *result* belongs to the circuit as it is now."""
+        return not result.cancelled and result.generation == self.generation
+
+    def finish(self, result: LiveOpResult) -> bool:
+        """Record a returned run; returns is_current(result)."""
+        if self._job is not None and self._job.generation == result.generation:
+            self._job = None
+        current = self.is_current(result)
+        if current:
+            self._completed_generation = result.generation
+        return current
+
+    def run(self, job: LiveOpJob) -> LiveOpResult:
+        """Validate, generate and simulate *job*'s snapshot (worker thread)."""
+        from simulation import NetlistGenerator, ResultParser, validate_circuit
+
+        model = job.model
+        is_valid, errors, _warnings = validate_circuit(model.components, list(model.wires), LIVE_OP_ANALYSIS)
+        if not is_valid:
+            return LiveOpResult(job.generation, error="; ".join(errors))
+        if job.cancel.is_set():
+            return LiveOpResult(job.generation, cancelled=True)
+
+        try:
+            netlist = NetlistGenerator(
+                components=model.components,
+                wires=model.wires,
+                nodes=model.nodes,
+                terminal_to_node=model.terminal_to_node,
+                analysis_type=LIVE_OP_ANALYSIS,
+                analysis_params={},
+            ).generate()
+        except (ValueError, KeyError, TypeError) as e:
+            return LiveOpResult(job.generation, error=f"Netlist generation failed: {e}")
+
+        success, output_file, stdout, stderr = self.runner.run_simulation(netlist, cancel=job.cancel)
+        if job.cancel.is_set() or (not success and stderr == _CANCELLED):
+            return LiveOpResult(job.generation, cancelled=True)
+        if not success:
+            from simulation.convergence import diagnose_error, format_user_message
+
+            return LiveOpResult(job.generation, error=format_user_message(diagnose_error(stderr, stdout)))
+
+        data = ResultParser.parse_op_results(self.runner.read_output(output_file))
+        if not data.get("node_voltages") and stdout:
+            data = ResultParser.parse_op_results(stdout)
+        if not data.get("node_voltages"):
+            return LiveOpResult(job.generation, error="No node voltages found in output.")
+        return LiveOpResult(job.generation, data["node_voltages"], data.get("branch_currents", {}))
@@ -6,6 +6,7 @@ configuration, circuit validation, netlist generation, ngspice
 execution, and result parsing.
 """
 
+import itertools
 import logging
 import os
 from dataclasses import dataclass, field
@@ -16,6 +17,13 @@ from models.circuit import CircuitModel
 
 logger = logging.getLogger(__name__)
 
+_run_counter = itertools.count()
+
+
+def _run_token() -> str:
+    """Timestamp, process ID and a counter, unique even for concurrent runs."""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{os.getpid()}_{next(_run_counter)}"
+
 
 @dataclass
 class SimulationResult:
@@ -83,13 +91,18 @@ class SimulationController:
 
         Returns a SimulationResult with success=False and errors if invalid.
         """
-        from simulation import validate_circuit
+        diagnostics = self._diagnostics()
+        if diagnostics is not None:
+            # Kept current from controller events; unchanged circuits are not rescanned
+            is_valid, errors, warnings = diagnostics.validate(self.model.analysis_type)
+        else:
+            from simulation import validate_circuit
 
-        is_valid, errors, warnings = validate_circuit(
-            self.model.components,
-            [w for w in self.model.wires],
-            self.model.analysis_type,
-        )
+            is_valid, errors, warnings = validate_circuit(
+                self.model.components,
+                [w for w in self.model.wires],
+                self.model.analysis_type,
+            )
         return SimulationResult(
             success=is_valid,
             errors=errors,
@@ -97,6 +110,14 @@ class SimulationController:
             error="; ".join(errors) if errors else "",
         )
 
+    def _diagnostics(self):
+        """The circuit controller's diagnostics engine, if it watches this model."""
+        from controllers.circuit_controller import CircuitController
+
+        if isinstance(self.circuit_ctrl, CircuitController) and self.circuit_ctrl.model is self.model:
+            return self.circuit_ctrl.diagnostics
+        return None
+
     def generate_netlist(
         self,
         wrdata_filepath: Optional[str] = None,
@@ -117,6 +138,7 @@ class SimulationController:
             wrdata_filepath=wrdata_filepath or "transient_data.txt",
             spice_options=spice_options,
             measurements=measurements,
+            line_cache=self.model.netlist_cache,
         )
         return generator.generate()
 
@@ -126,6 +148,56 @@ class SimulationController:
 
         Steps: validate -> generate netlist -> find ngspice -> run -> parse
         """
+        steps = self._simulation_steps(register_wrdata_early=True)
+        try:
+            netlist = next(steps)
+            while True:
+                netlist = steps.send(self.runner.run_simulation(netlist))
+        except StopIteration as done:
+            return done.value
+
+    async def run_simulation_async(self, timeout: Optional[float] = None) -> SimulationResult:
+        """
+        Run the simulation pipeline without blocking the event loop.
+
+        Same steps as :meth:`run_simulation`, but ngspice runs through
+        ``asyncio.create_subprocess_exec`` so several circuits can be
+        simulated concurrently.  Cancelling the awaiting task kills the
+        ngspice process.
+
+        Args:
+            timeout: Seconds allowed for each ngspice run (default
+                SIMULATION_TIMEOUT).  A timed-out run returns a failed result.
+        """
+        steps = self._simulation_steps(register_wrdata_early=False)
+        # Like the wrdata file, ngspice output is handed to the runner's
+        # cleanup only once parsed; another run may start in the meantime.
+        outputs = []
+        try:
+            netlist = next(steps)
+            while True:
+                run = await self.runner.run_simulation_async(netlist, timeout=timeout, track_output=False)
+                if run[1]:
+                    outputs.append(run[1])
+                netlist = steps.send(run)
+        except StopIteration as done:
+            return done.value
+        finally:
+            self.runner.register_extra_files(outputs)
+
+    def _simulation_steps(self, register_wrdata_early: bool):
+        """Simulation pipeline shared by the blocking and asyncio drivers.
+
+        A generator that yields each netlist to run and is sent back the
+        runner's ``(success, output_file, stdout, stderr)`` tuple; its
+        return value is the final SimulationResult.
+
+        Args:
+            register_wrdata_early: Register the wrdata file for cleanup
+                before running (blocking driver).  Concurrent runs register
+                it only once parsed, so another run starting on the same
+                runner cannot delete it mid-flight.
+        """
         if self.circuit_ctrl:
             self.circuit_ctrl._notify("simulation_started", None)
 
@@ -137,8 +209,7 @@ class SimulationController:
             return validation
 
         # 2. Generate wrdata path for transient
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        wrdata_filepath = os.path.join(self.runner.output_dir, f"wrdata_{timestamp}.txt")
+        wrdata_filepath = os.path.join(self.runner.output_dir, f"wrdata_{_run_token()}.txt")
 
         # 3. Generate netlist (include .meas directives if configured)
         meas_directives = self.model.analysis_params.get("measurements", [])
@@ -169,10 +240,18 @@ class SimulationController:
             return result
 
         # Track wrdata file for cleanup on next run
-        self.runner.register_extra_files([wrdata_filepath])
+        if register_wrdata_early:
+            self.runner.register_extra_files([wrdata_filepath])
+        try:
+            return (yield from self._run_and_parse(netlist, wrdata_filepath, validation))
+        finally:
+            if not register_wrdata_early:
+                self.runner.register_extra_files([wrdata_filepath])
 
+    def _run_and_parse(self, netlist: str, wrdata_filepath: str, validation: SimulationResult):
+        """Run *netlist* (retrying with relaxed tolerances) and parse the output."""
         # 5. Run simulation
-        success, output_file, stdout, stderr = self.runner.run_simulation(netlist)
+        success, output_file, stdout, stderr = yield netlist
         if not success:
             # Classify the error and attempt retry with relaxed tolerances
             from simulation.convergence import RELAXED_OPTIONS, diagnose_error, format_user_message, is_retriable
@@ -191,7 +270,7 @@ class SimulationController:
                     relaxed_netlist = None
 
                 if relaxed_netlist:
-                    retry_ok, retry_out, retry_stdout, retry_stderr = self.runner.run_simulation(relaxed_netlist)
+                    retry_ok, retry_out, retry_stdout, retry_stderr = yield relaxed_netlist
                     if retry_ok:
                         # Parse retried results, add warning about relaxed tolerances
                         result = self._parse_results(
@@ -367,35 +446,76 @@ class SimulationController:
 
     def run_parameter_sweep(self, sweep_config: dict, progress_callback=None) -> SimulationResult:
         """
-        Run a parameter sweep: modify a component's value across a range
+        Run a parameter sweep: modify component values across a range
         and run the base analysis at each step.
 
         Args:
-            sweep_config: dict with keys component_id, start, stop, num_steps,
-                          base_analysis_type, base_params
+            sweep_config: dict with keys base_analysis_type, base_params and
+                either component_id, start, stop, num_steps (one-dimensional
+                sweep) or ``parameters`` -- a list of such dicts, one per
+                axis of a full-factorial grid.  Each axis may also set
+                ``spacing`` ("linear" or "log").  Optional keys:
+                mode -- "grid" (default) or "adaptive".  Adaptive sweeps
+                        take one parameter, run its num_steps values as a
+                        coarse pass, then bisect the intervals where an
+                        output metric changes fastest.
+                adaptive -- settings for adaptive mode: signal, reduction
+                        (a StackedResults run metric, default "final"), at,
+                        tolerance (largest metric change per interval as a
+                        fraction of its range, default 0.05), max_steps
+                        (total simulation budget, default 50)
+                keep_raw_output -- see _keep_step_raw_output
             progress_callback: optional callable(step_index, total_steps) -> bool.
                                Return False to cancel the sweep.
 
         Returns:
             SimulationResult with analysis_type="Parameter Sweep" and data
-            containing sweep results.
+            containing sweep results.  ``data["stacked"]`` holds every
+            step's signals as a StackedResults; the per-step entries in
+            ``data["results"]`` are compact (status and errors only).
+            ``data["sweep_points"]`` gives each step's value for every
+            parameter and ``data["sweep_values"]`` those of the first one.
+            Adaptive sweeps are returned sorted by sweep value.
         """
-        component_id = sweep_config["component_id"]
-        start = sweep_config["start"]
-        stop = sweep_config["stop"]
-        num_steps = sweep_config["num_steps"]
+        from simulation.parameter_sweep import SWEEP_MODES, grid_sweep_points, normalize_sweep_parameters
+        from simulation.stacked_results import RUN_METRICS, StackedResultsBuilder
+
         base_type = sweep_config["base_analysis_type"]
         base_params = sweep_config["base_params"]
+        mode = sweep_config.get("mode", "grid")
+        parameters = normalize_sweep_parameters(sweep_config)
 
-        comp = self.model.components.get(component_id)
-        if comp is None:
-            return SimulationResult(
-                success=False,
-                error=f"Component {component_id} not found in circuit",
-            )
+        comps = []
+        for param in parameters:
+            comp = self.model.own_component(param["component_id"])
+            if comp is None:
+                return SimulationResult(
+                    success=False,
+                    error=f"Component {param['component_id']} not found in circuit",
+                )
+            comps.append(comp)
+
+        try:
+            if mode not in SWEEP_MODES:
+                raise ValueError(f"Unknown sweep mode '{mode}'. Use one of: {', '.join(SWEEP_MODES)}")
+            sweep_points, grid_shape = grid_sweep_points(parameters)
+            adaptive = None
+            if mode == "adaptive":
+                if len(parameters) != 1:
+                    raise ValueError("Adaptive sweeps refine a single parameter")
+                adaptive = dict(sweep_config.get("adaptive") or {})
+                if not adaptive.get("signal"):
+                    raise ValueError("Adaptive sweeps need an output signal to refine on")
+                if adaptive.setdefault("reduction", "final") not in RUN_METRICS:
+                    raise ValueError(f"Unknown adaptive reduction '{adaptive['reduction']}'")
+                adaptive.setdefault("tolerance", 0.05)
+                adaptive.setdefault("max_steps", 50)
+                grid_shape = None
+        except ValueError as e:
+            return SimulationResult(success=False, error=str(e))
 
         # Save original state
-        original_value = comp.value
+        original_values = [comp.value for comp in comps]
         original_analysis = self.model.analysis_type
         original_params = self.model.analysis_params.copy()
 
@@ -417,81 +537,66 @@ class SimulationController:
                 error="ngspice executable not found. Please install ngspice.",
             )
 
-        # Calculate sweep values (linear spacing)
-        if num_steps <= 1:
-            sweep_values = [start]
-        else:
-            sweep_values = [start + (stop - start) * i / (num_steps - 1) for i in range(num_steps)]
+        total_steps = adaptive["max_steps"] if adaptive else len(sweep_points)
 
         # Run sweep
+        builder = StackedResultsBuilder(base_type, keep_raw_output=self._keep_step_raw_output(sweep_config))
         step_results = []
+        run_points: list[tuple] = []
         errors = []
         cancelled = False
         wrdata_files: list[str] = []
 
         try:
-            for i, val in enumerate(sweep_values):
-                # Check for cancellation
-                if progress_callback and not progress_callback(i, num_steps):
-                    cancelled = True
+            pending = sweep_points[:total_steps]
+            while pending:
+                for point in pending:
+                    i = len(step_results)
+                    # Check for cancellation
+                    if progress_callback and not progress_callback(i, total_steps):
+                        cancelled = True
+                        break
+
+                    for comp, val in zip(comps, point):
+                        comp.value = self._format_sweep_value(val)
+                    run_points.append(point)
+                    step_label = ", ".join(comp.value for comp in comps)
+                    result, error = self._run_sweep_step(i, validation.warnings, wrdata_files)
+                    step_results.append(builder.add(result))
+                    if error:
+                        errors.append(f"Step {i + 1} ({step_label}): {error}")
+
+                if cancelled or adaptive is None:
                     break
-
-                comp.value = self._format_sweep_value(val)
-
-                # Generate netlist
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-                wrdata_filepath = os.path.join(self.runner.output_dir, f"wrdata_sweep_{i}_{timestamp}.txt")
-                wrdata_files.append(wrdata_filepath)
-
-                try:
-                    netlist = self.generate_netlist(wrdata_filepath=wrdata_filepath)
-                except (ValueError, KeyError, TypeError) as e:
-                    step_results.append(SimulationResult(success=False, error=f"Netlist generation failed: {e}"))
-                    errors.append(f"Step {i + 1} ({comp.value}): netlist failed: {e}")
-                    continue
-
-                # Run simulation
-                success, output_file, stdout, stderr = self.runner.run_simulation(netlist)
-                if not success:
-                    step_results.append(
-                        SimulationResult(
-                            success=False,
-                            error=stderr or "Simulation failed",
-                            netlist=netlist,
-                            raw_output=stdout,
-                        )
-                    )
-                    errors.append(f"Step {i + 1} ({comp.value}): {stderr or 'failed'}")
-                    continue
-
-                # Parse results
-                result = self._parse_results(
-                    output_file=output_file,
-                    wrdata_filepath=wrdata_filepath,
-                    netlist=netlist,
-                    raw_output=stdout,
-                    warnings=validation.warnings,
+                pending = self._adaptive_sweep_points(
+                    builder, run_points, parameters[0]["spacing"], adaptive, total_steps - len(step_results)
                 )
-                step_results.append(result)
-
-                if not result.success:
-                    errors.append(f"Step {i + 1} ({comp.value}): {result.error}")
         finally:
             # Restore original state
-            comp.value = original_value
+            for comp, value in zip(comps, original_values):
+                comp.value = value
             self.set_analysis(original_analysis, original_params)
             # Track wrdata files for cleanup on next run
             self.runner.register_extra_files(wrdata_files)
 
-        # Trim sweep_values to match actual results if cancelled
-        actual_values = sweep_values[: len(step_results)]
+        stacked = builder.build()
+        if adaptive is not None:
+            order = sorted(range(len(run_points)), key=lambda k: run_points[k][0])
+            run_points = [run_points[k] for k in order]
+            step_results = [step_results[k] for k in order]
+            stacked = stacked.take(order)
 
         sweep_data = {
-            "component_id": component_id,
-            "component_type": comp.component_type,
-            "sweep_values": actual_values,
+            "component_id": parameters[0]["component_id"],
+            "component_type": comps[0].component_type,
+            "parameters": [dict(p, component_type=comp.component_type) for p, comp in zip(parameters, comps)],
+            "mode": mode,
+            "grid_shape": grid_shape,
+            "sweep_points": run_points,
+            "sweep_values": [point[0] for point in run_points],
             "base_analysis_type": base_type,
             "results": step_results,
+            "stacked": stacked,
             "num_steps": len(step_results),
             "cancelled": cancelled,
         }
@@ -504,8 +609,63 @@ class SimulationController:
             data=sweep_data,
             errors=errors,
             warnings=validation.warnings,
+            netlist=stacked.netlist,
         )
 
+    def _run_sweep_step(self, index: int, validation_warnings: list, wrdata_files: list):
+        """Simulate the circuit as currently valued for one parameter-sweep step.
+
+        Returns:
+            (SimulationResult, error message for the sweep's error list or None)
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        wrdata_filepath = os.path.join(self.runner.output_dir, f"wrdata_sweep_{index}_{timestamp}.txt")
+        wrdata_files.append(wrdata_filepath)
+
+        try:
+            netlist = self.generate_netlist(wrdata_filepath=wrdata_filepath)
+        except (ValueError, KeyError, TypeError) as e:
+            return SimulationResult(success=False, error=f"Netlist generation failed: {e}"), f"netlist failed: {e}"
+
+        success, output_file, stdout, stderr = self.runner.run_simulation(netlist)
+        if not success:
+            failed = SimulationResult(
+                success=False,
+                error=stderr or "Simulation failed",
+                netlist=netlist,
+                raw_output=stdout,
+            )
+            return failed, stderr or "failed"
+
+        result = self._parse_results(
+            output_file=output_file,
+            wrdata_filepath=wrdata_filepath,
+            netlist=netlist,
+            raw_output=stdout,
+            warnings=validation_warnings,
+        )
+        return result, None if result.success else result.error
+
+    @staticmethod
+    def _adaptive_sweep_points(builder, run_points, spacing, adaptive, budget) -> list:
+        """Return the next adaptive sweep points, or [] when the sweep is resolved."""
+        from simulation.parameter_sweep import refine_sweep_values
+
+        if budget <= 0:
+            return []
+        stacked = builder.build(signals=[adaptive["signal"]])
+        if adaptive["signal"] not in stacked.signals:
+            return []
+        metric = stacked.run_metric(adaptive["signal"], adaptive["reduction"], at=adaptive.get("at"))
+        new_values = refine_sweep_values(
+            [point[0] for point in run_points],
+            metric,
+            spacing=spacing,
+            tolerance=adaptive["tolerance"],
+            max_new=budget,
+        )
+        return [(value,) for value in new_values]
+
     def run_monte_carlo(self, mc_config: dict, progress_callback=None) -> SimulationResult:
         """
         Run Monte Carlo analysis: vary component values randomly and run
@@ -513,14 +673,33 @@ class SimulationController:
 
         Args:
             mc_config: dict with keys:
-                num_runs, base_analysis_type, base_params, tolerances
+                num_runs, base_analysis_type, base_params, tolerances,
+                and optionally:
+                keep_raw_output -- see _keep_step_raw_output
+                sampling -- "random" (default), "lhs" or "sobol"
+                seed -- integer seed; a fresh one is drawn and recorded
+                        in the result when omitted
+                convergence -- early-stopping settings: signal, reduction
+                        (a StackedResults run metric, default "final"), at,
+                        criterion ("ci_width" or "yield"), tolerance,
+                        confidence, spec_min, spec_max, min_runs,
+                        check_every
             progress_callback: optional callable(step, total) -> bool.
 
         Returns:
-            SimulationResult with analysis_type='Monte Carlo'.
+            SimulationResult with analysis_type='Monte Carlo'.  As with
+            run_parameter_sweep, ``data["stacked"]`` holds the signals of
+            every run.  ``data["seed"]`` reproduces the study and
+            ``data["convergence"]`` reports the last convergence check.
         """
         import numpy as np
-        from simulation.monte_carlo import apply_tolerance
+        from simulation.monte_carlo import (
+            CONVERGENCE_CRITERIA,
+            apply_tolerance,
+            generate_unit_samples,
+            tolerance_from_unit,
+        )
+        from simulation.stacked_results import RUN_METRICS, StackedResultsBuilder
 
         num_runs = mc_config["num_runs"]
         base_type = mc_config["base_analysis_type"]
@@ -555,7 +734,35 @@ class SimulationController:
                 error="ngspice executable not found. Please install ngspice.",
             )
 
-        rng = np.random.default_rng()
+        sampling = mc_config.get("sampling", "random")
+        seed = mc_config.get("seed")
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % (2**63))
+        rng = np.random.default_rng(seed)
+
+        conv_config = mc_config.get("convergence") or None
+        if conv_config and (
+            conv_config.get("criterion", "ci_width") not in CONVERGENCE_CRITERIA
+            or conv_config.get("reduction", "final") not in RUN_METRICS
+        ):
+            self.set_analysis(original_analysis, original_params)
+            return SimulationResult(success=False, error=f"Invalid Monte Carlo convergence settings: {conv_config}")
+
+        tol_ids = list(tolerances)
+        unit_samples = None
+        if sampling != "random":
+            # Early stopping only ever happens at a check point, so make each
+            # stretch between check points its own Latin hypercube
+            blocks = self._mc_check_blocks(conv_config, num_runs) if conv_config else None
+            try:
+                unit_samples = generate_unit_samples(num_runs, len(tol_ids), sampling, rng, blocks=blocks)
+            except ValueError as e:
+                self.set_analysis(original_analysis, original_params)
+                return SimulationResult(success=False, error=str(e))
+        conv_status = None
+        stopped_early = False
+
+        builder = StackedResultsBuilder(base_type, keep_raw_output=self._keep_step_raw_output(mc_config))
         step_results = []
         run_values = []
         errors = []
@@ -569,16 +776,18 @@ class SimulationController:
                     break
 
                 values_this_run = {}
-                for cid, tol_config in tolerances.items():
-                    comp = self.model.components.get(cid)
+                for j, cid in enumerate(tol_ids):
+                    tol_config = tolerances[cid]
+                    comp = self.model.own_component(cid)
                     if comp is None:
                         continue
-                    new_val = apply_tolerance(
-                        original_values[cid],
-                        tol_config["tolerance_pct"],
-                        tol_config.get("distribution", "gaussian"),
-                        rng,
-                    )
+                    distribution = tol_config.get("distribution", "gaussian")
+                    if unit_samples is None:
+                        new_val = apply_tolerance(original_values[cid], tol_config["tolerance_pct"], distribution, rng)
+                    else:
+                        new_val = tolerance_from_unit(
+                            original_values[cid], tol_config["tolerance_pct"], distribution, unit_samples[i, j]
+                        )
                     comp.value = new_val
                     values_this_run[cid] = new_val
 
@@ -591,17 +800,22 @@ class SimulationController:
                 try:
                     netlist = self.generate_netlist(wrdata_filepath=wrdata_filepath)
                 except (ValueError, KeyError, TypeError) as e:
-                    step_results.append(SimulationResult(success=False, error=f"Netlist generation failed: {e}"))
+                    step_results.append(
+                        builder.add(SimulationResult(success=False, error=f"Netlist generation failed: {e}"))
+                    )
                     errors.append(f"Run {i + 1}: netlist failed: {e}")
                     continue
 
                 success, output_file, stdout, stderr = self.runner.run_simulation(netlist)
                 if not success:
                     step_results.append(
-                        SimulationResult(
-                            success=False,
-                            error=stderr or "Simulation failed",
-                            netlist=netlist,
+                        builder.add(
+                            SimulationResult(
+                                success=False,
+                                error=stderr or "Simulation failed",
+                                netlist=netlist,
+                                raw_output=stdout,
+                            )
                         )
                     )
                     errors.append(f"Run {i + 1}: {stderr or 'failed'}")
@@ -614,12 +828,19 @@ class SimulationController:
                     raw_output=stdout,
                     warnings=validation.warnings,
                 )
-                step_results.append(result)
+                step_results.append(builder.add(result))
                 if not result.success:
                     errors.append(f"Run {i + 1}: {result.error}")
+                    continue
+
+                if conv_config and self._mc_check_due(conv_config, len(step_results)):
+                    conv_status = self._mc_convergence_status(builder, conv_config)
+                    if conv_status["converged"]:
+                        stopped_early = len(step_results) < num_runs
+                        break
         finally:
             for cid, orig_val in original_values.items():
-                comp = self.model.components.get(cid)
+                comp = self.model.own_component(cid)
                 if comp:
                     comp.value = orig_val
             self.set_analysis(original_analysis, original_params)
@@ -627,6 +848,7 @@ class SimulationController:
             self.runner.register_extra_files(wrdata_files)
 
         any_success = any(r.success for r in step_results)
+        stacked = builder.build()
 
         mc_data = {
             "num_runs": len(step_results),
@@ -634,7 +856,12 @@ class SimulationController:
             "tolerances": tolerances,
             "run_values": run_values,
             "results": step_results,
+            "stacked": stacked,
             "cancelled": cancelled,
+            "sampling": sampling,
+            "seed": seed,
+            "stopped_early": stopped_early,
+            "convergence": conv_status,
         }
 
         return SimulationResult(
@@ -643,8 +870,60 @@ class SimulationController:
             data=mc_data,
             errors=errors,
             warnings=validation.warnings,
+            netlist=stacked.netlist,
         )
 
+    @staticmethod
+    def _mc_check_due(conv_config: dict, runs_done: int) -> bool:
+        """Whether a Monte Carlo convergence check is due after *runs_done* runs."""
+        min_runs = max(int(conv_config.get("min_runs", 10)), 2)
+        check_every = max(int(conv_config.get("check_every", 5)), 1)
+        return runs_done >= min_runs and (runs_done - min_runs) % check_every == 0
+
+    @staticmethod
+    def _mc_check_blocks(conv_config: dict, num_runs: int) -> list[int]:
+        """Run counts between successive convergence checks (see _mc_check_due)."""
+        min_runs = max(int(conv_config.get("min_runs", 10)), 2)
+        check_every = max(int(conv_config.get("check_every", 5)), 1)
+        blocks = [min_runs]
+        while sum(blocks) < num_runs:
+            blocks.append(check_every)
+        return blocks
+
+    @staticmethod
+    def _mc_convergence_status(builder, conv_config: dict) -> dict:
+        """Evaluate the early-stopping criterion on the runs recorded so far."""
+        from simulation.monte_carlo import check_convergence
+
+        signal = conv_config.get("signal", "")
+        stacked = builder.build(signals=[signal])
+        if signal not in stacked.signals:
+            return {"converged": False, "count": 0, "estimate": float("nan"), "half_width": float("inf")}
+        values = stacked.run_metric(signal, conv_config.get("reduction", "final"), at=conv_config.get("at"))
+        status = check_convergence(
+            values[stacked.ok],
+            criterion=conv_config.get("criterion", "ci_width"),
+            tolerance=conv_config.get("tolerance", 0.01),
+            confidence=conv_config.get("confidence", 0.95),
+            spec_min=conv_config.get("spec_min"),
+            spec_max=conv_config.get("spec_max"),
+        )
+        status["criterion"] = conv_config.get("criterion", "ci_width")
+        return status
+
+    def _keep_step_raw_output(self, config: dict) -> bool:
+        """Whether multi-run studies should keep each step's raw ngspice output.
+
+        Off by default to keep sweep / Monte Carlo results compact.  Enabled
+        by ``config["keep_raw_output"]`` or, for debugging, by the runner's
+        keep-files environment variable.
+        """
+        if "keep_raw_output" in config:
+            return bool(config["keep_raw_output"])
+        from simulation.ngspice_runner import NgspiceRunner
+
+        return os.environ.get(NgspiceRunner.KEEP_FILES_ENV_VAR, "").lower() in ("1", "true", "yes")
+
     # --- Result analysis helpers ---
 
     @staticmethod
@@ -655,8 +934,12 @@ class SimulationController:
         return ResultParser.format_results_as_table(tran_data)
 
     @staticmethod
-    def compute_power_metrics(tran_data: dict, components: dict) -> tuple:
-        """Compute transient power metrics for resistors.
+    def compute_power_metrics(tran_data: dict, components: dict, nodes=None) -> tuple:
+        """Compute transient power metrics for every component that can be resolved.
+
+        *nodes* (the circuit's NodeData list) locates each component's
+        terminals so voltages come from node waveforms and unknown
+        currents follow from Kirchhoff's current law.
 
         Returns:
             (power_metrics, summary_text) where *power_metrics* is a list of
@@ -665,11 +948,24 @@ class SimulationController:
         """
         from simulation.power_metrics import compute_transient_power_metrics, format_power_summary
 
-        metrics = compute_transient_power_metrics(tran_data, components)
+        metrics = compute_transient_power_metrics(tran_data, components, nodes)
         if metrics:
             return metrics, format_power_summary(metrics)
         return [], ""
 
+    @staticmethod
+    def analyze_power(data, components: dict, nodes=None, run_values=None):
+        """Time-domain power of every component for one transient run or a study.
+
+        *data* is a transient payload or the StackedResults of a sweep or
+        Monte Carlo study; *run_values* are per-run component values (the
+        ``run_values`` of a Monte Carlo result).  Returns a PowerAnalysis
+        whose reductions and energy balance have one entry per run.
+        """
+        from simulation.power_metrics import analyze_power
+
+        return analyze_power(data, components, nodes, run_values)
+
     @staticmethod
     def compute_power(components, nodes, node_voltages, branch_currents=None) -> tuple:
         """Calculate power dissipation for all components.
@@ -693,11 +989,18 @@ class SimulationController:
         return compute_markers(frequencies, magnitude, phase, is_db=is_db)
 
     @staticmethod
-    def compute_signal_fft(time, signal, signal_name, window_type="hamming"):
+    def compute_signal_fft(time, signal, signal_name, window_type="hamming", time_range=None, segments=1):
         """Compute FFT spectrum for a transient signal."""
         from simulation.fft_analysis import analyze_signal_spectrum
 
-        return analyze_signal_spectrum(time, signal, signal_name, window_type)
+        return analyze_signal_spectrum(time, signal, signal_name, window_type, time_range, segments)
+
+    @staticmethod
+    def compute_steady_state_range(time, signal) -> tuple[float, float]:
+        """Return the (start, end) of a transient run's steady-state part for FFT analysis."""
+        from simulation.fft_analysis import steady_state_range
+
+        return steady_state_range(time, signal)
 
     @staticmethod
     def compute_mc_statistics(values) -> dict:
@@ -706,6 +1009,13 @@ class SimulationController:
 
         return compute_mc_statistics(values)
 
+    @staticmethod
+    def stack_step_results(analysis_type: str, results: list) -> Any:
+        """Stack per-step results of a sweep or Monte Carlo study into arrays."""
+        from simulation.stacked_results import stack_results
+
+        return stack_results(analysis_type, results)
+
     @staticmethod
     def _format_sweep_value(value: float) -> str:
         """Format a float as a SPICE-compatible value string.
@@ -773,6 +1083,40 @@ class SimulationController:
 
         return build_directive(domain, name, meas_type, params)
 
+    @staticmethod
+    def evaluate_measurements(analysis_type: str, data, directives) -> dict:
+        """Evaluate .meas directives on a stored result without re-simulating.
+
+        Returns name -> float (None where the measurement failed), like the
+        measurements ngspice reports.  Raises ValueError for directives the
+        offline engine cannot evaluate.
+        """
+        from simulation.measurement_engine import measure_result
+
+        return measure_result(analysis_type, data, directives)
+
+    @staticmethod
+    def evaluate_study_measurements(stacked, directives) -> dict:
+        """Evaluate .meas directives on every run of a sweep or Monte Carlo study.
+
+        Returns name -> array with one value per run (NaN where it failed).
+        Raises ValueError for directives the offline engine cannot evaluate.
+        """
+        from simulation.measurement_engine import measure_stacked
+
+        return measure_stacked(stacked, directives)
+
+    @staticmethod
+    def evaluate_waveform_expression(analysis_type: str, data, expression: str):
+        """Evaluate a derived-signal expression such as ``v(in,out)^2/1k``.
+
+        Returns a 1-D numpy array aligned with the result's axis.  Raises
+        ValueError for invalid expressions or unknown signals.
+        """
+        from simulation.waveform_expressions import evaluate_expression
+
+        return evaluate_expression(analysis_type, data, expression)
+
     # --- Monte Carlo metadata ---
 
     @staticmethod
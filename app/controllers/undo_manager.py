@@ -1,33 +1,63 @@
 """
 UndoManager - Manages undo/redo stacks and command execution.
 
-Maintains a history of executed commands with configurable depth limit.
-Supports undo, redo, and clearing history.
+Maintains a history of executed commands bounded both by count and by
+an estimate of the memory the commands hold (see Command.estimated_size),
+evicting the oldest entries first.  Consecutive commands on the same
+target recorded within a short window (successive moves of one
+component, drags of one wire's waypoints, rapid value edits) are merged
+into a single undo step.
 """
 
+import time
+from collections import deque
 from typing import Optional
 
 from controllers.commands import Command
 
+# Default memory budget for the whole history (undo + redo)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Commands recorded closer together than this (seconds) may be merged
+DEFAULT_MERGE_WINDOW = 1.0
+
 
 class UndoManager:
     """
     Manages command execution with undo/redo support.
 
     Commands are executed through this manager to ensure they can be undone.
-    The manager maintains undo and redo stacks with a maximum depth limit.
+    The manager maintains undo and redo stacks bounded by a maximum depth
+    and a byte budget.  The most recent command is always kept, even if it
+    alone exceeds the budget.
     """
 
-    def __init__(self, max_depth: int = 100):
+    def __init__(
+        self,
+        max_depth: int = 100,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        merge_window: float = DEFAULT_MERGE_WINDOW,
+    ):
         """
         Initialize the undo manager.
 
         Args:
             max_depth: Maximum number of commands to keep in history (default 100)
+            max_bytes: Approximate memory budget for the history, in bytes
+            merge_window: Seconds within which same-target commands are merged;
+                0 disables merging
         """
         self.max_depth = max_depth
-        self._undo_stack: list[Command] = []
-        self._redo_stack: list[Command] = []
+        self.max_bytes = max_bytes
+        self.merge_window = merge_window
+        self._undo_stack: deque[Command] = deque()
+        self._redo_stack: deque[Command] = deque()
+        # id(command) -> bytes charged for it; both stacks keep their
+        # commands alive, so an id cannot be reused while it is here
+        self._sizes: dict[int, int] = {}
+        self.total_bytes = 0
+        # When the top of the undo stack was recorded (None: not mergeable)
+        self._recorded_at: Optional[float] = None
 
     def execute(self, command: Command) -> None:
         """
@@ -39,16 +69,7 @@ class UndoManager:
             command: The command to execute
         """
         command.execute()
-
-        # Add to undo stack
-        self._undo_stack.append(command)
-
-        # Enforce max depth
-        if len(self._undo_stack) > self.max_depth:
-            self._undo_stack.pop(0)
-
-        # Clear redo stack - new actions invalidate redo history
-        self._redo_stack.clear()
+        self._record(command)
 
     def undo(self) -> bool:
         """
@@ -63,6 +84,7 @@ class UndoManager:
         command = self._undo_stack.pop()
         command.undo()
         self._redo_stack.append(command)
+        self._recorded_at = None
 
         return True
 
@@ -79,9 +101,18 @@ class UndoManager:
         command = self._redo_stack.pop()
         command.execute()
         self._undo_stack.append(command)
+        self._recorded_at = None
 
         return True
 
+    def peek_undo(self) -> Optional[Command]:
+        """Return the command that undo() would revert, without removing it."""
+        return self._undo_stack[-1] if self._undo_stack else None
+
+    def peek_redo(self) -> Optional[Command]:
+        """Return the command that redo() would re-apply, without removing it."""
+        return self._redo_stack[-1] if self._redo_stack else None
+
     def can_undo(self) -> bool:
         """Return whether there are commands to undo."""
         return len(self._undo_stack) > 0
@@ -121,15 +152,15 @@ class UndoManager:
         Args:
             command: The already-executed command to record
         """
-        self._undo_stack.append(command)
-        if len(self._undo_stack) > self.max_depth:
-            self._undo_stack.pop(0)
-        self._redo_stack.clear()
+        self._record(command)
 
     def clear(self) -> None:
         """Clear both undo and redo stacks."""
         self._undo_stack.clear()
         self._redo_stack.clear()
+        self._sizes.clear()
+        self.total_bytes = 0
+        self._recorded_at = None
 
     def get_undo_count(self) -> int:
         """Return the number of commands in the undo stack."""
@@ -138,3 +169,50 @@ class UndoManager:
     def get_redo_count(self) -> int:
         """Return the number of commands in the redo stack."""
         return len(self._redo_stack)
+
+    # --- Internals ---
+
+    def _record(self, command: Command) -> None:
+        """Put an executed command on the undo stack, merging and evicting as needed."""
+        # New actions invalidate redo history
+        for dropped in self._redo_stack:
+            self._release(dropped)
+        self._redo_stack.clear()
+
+        now = time.monotonic()
+        if self._merge_into_top(command, now):
+            top = self._undo_stack[-1]
+            self._release(top)
+            self._charge(top)
+        else:
+            self._undo_stack.append(command)
+            self._charge(command)
+        self._recorded_at = now
+
+        while len(self._undo_stack) > self.max_depth or (
+            self.total_bytes > self.max_bytes and len(self._undo_stack) > 1
+        ):
+            self._release(self._undo_stack.popleft())
+
+    def _merge_into_top(self, command: Command, now: float) -> bool:
+        if self.merge_window <= 0 or not self._undo_stack or self._recorded_at is None:
+            return False
+        if now - self._recorded_at > self.merge_window:
+            return False
+        top = self._undo_stack[-1]
+        if not isinstance(command, Command) or not isinstance(top, Command):
+            return False
+        key = command.merge_key()
+        if key is None or top.merge_key() != key:
+            return False
+        top.absorb(command)
+        return True
+
+    def _charge(self, command: Command) -> None:
+        # Duck-typed commands without size accounting are charged nothing
+        size = command.estimated_size() if isinstance(command, Command) else 0
+        self._sizes[id(command)] = size
+        self.total_bytes += size
+
+    def _release(self, command: Command) -> None:
+        self.total_bytes -= self._sizes.pop(id(command), 0)
@@ -1,14 +1,22 @@
 """Student feedback report exporter for batch grading results.
 
 Generates individual HTML reports per student showing their
-score, percentage, and per-check results with feedback text.
+score, percentage, and per-check results with feedback text.  Batch
+exports run in a thread pool and skip students whose report inputs are
+unchanged since the previous export.
 
 No Qt dependencies - pure Python module.
 """
 
 from __future__ import annotations
 
+import base64
+import hashlib
 import html
+import json
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -16,27 +24,41 @@ if TYPE_CHECKING:
     from grading.batch_grader import BatchGradingResult
     from grading.grader import GradingResult
 
+REPORT_CSS = """\
+body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }
+h1 { color: #333; border-bottom: 2px solid #4CAF50; padding-bottom: 10px; }
+.summary { background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 15px 0; }
+.summary p { margin: 5px 0; }
+.score { font-size: 1.4em; font-weight: bold; }
+table { width: 100%; border-collapse: collapse; margin-top: 15px; }
+th { background: #4CAF50; color: white; padding: 10px; text-align: left; }
+td { padding: 8px 10px; border-bottom: 1px solid #ddd; }
+tr:nth-child(even) { background: #f9f9f9; }
+.pass { color: #388E3C; font-weight: bold; }
+.fail { color: #D32F2F; font-weight: bold; }
+.feedback { color: #666; font-style: italic; }
+.schematic img { max-width: 100%; border: 1px solid #ddd; }
+footer { margin-top: 30px; color: #999; font-size: 0.9em; border-top: 1px solid #ddd; padding-top: 10px; }
+"""
+
+# Name of the stylesheet written next to the reports when shared_css is used
+SHARED_CSS_NAME = "report.css"
+
+# Records the content hash each report was last written from
+MANIFEST_NAME = ".report-manifest.json"
+
+# Bump when the report layout changes so existing reports are regenerated
+REPORT_FORMAT_VERSION = 1
+
+_INLINE_STYLE = "<style>\n" + REPORT_CSS + "</style>"
+
 _HTML_TEMPLATE = """\
 <!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="utf-8">
 <title>Grading Report - {student_file}</title>
-<style>
-body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }}
-h1 {{ color: #333; border-bottom: 2px solid #4CAF50; padding-bottom: 10px; }}
-.summary {{ background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 15px 0; }}
-.summary p {{ margin: 5px 0; }}
-.score {{ font-size: 1.4em; font-weight: bold; }}
-table {{ width: 100%; border-collapse: collapse; margin-top: 15px; }}
-th {{ background: #4CAF50; color: white; padding: 10px; text-align: left; }}
-td {{ padding: 8px 10px; border-bottom: 1px solid #ddd; }}
-tr:nth-child(even) {{ background: #f9f9f9; }}
-.pass {{ color: #388E3C; font-weight: bold; }}
-.fail {{ color: #D32F2F; font-weight: bold; }}
-.feedback {{ color: #666; font-style: italic; }}
-footer {{ margin-top: 30px; color: #999; font-size: 0.9em; border-top: 1px solid #ddd; padding-top: 10px; }}
-</style>
+{style}
 </head>
 <body>
 <h1>Grading Report</h1>
@@ -45,7 +67,7 @@ footer {{ margin-top: 30px; color: #999; font-size: 0.9em; border-top: 1px solid
 <p><strong>Rubric:</strong> {rubric_title}</p>
 <p class="score">Score: {earned}/{total} ({percentage:.1f}%)</p>
 </div>
-
+{schematic}
 <h2>Check Results</h2>
 <table>
 <thead>
@@ -63,6 +85,11 @@ Generated by Spice-GUI Grading System
 </html>
 """
 
+_SCHEMATIC_TEMPLATE = """\
+<h2>Schematic</h2>
+<div class="schematic"><img src="{src}" alt="Schematic for {student_file}"></div>
+"""
+
 _CHECK_ROW_TEMPLATE = """\
 <tr>
 <td>{check_id}</td>
@@ -72,11 +99,17 @@ _CHECK_ROW_TEMPLATE = """\
 </tr>"""
 
 
-def generate_student_report_html(result: GradingResult) -> str:
+def generate_student_report_html(
+    result: GradingResult,
+    css_href: str | None = None,
+    schematic_src: str | None = None,
+) -> str:
     """Generate an HTML feedback report for a single student.
 
     Args:
         result: The grading result for one student.
+        css_href: Link this stylesheet instead of embedding the CSS.
+        schematic_src: Image URL (or data URI) of the student's schematic.
 
     Returns:
         Complete HTML document as a string.
@@ -93,8 +126,19 @@ def generate_student_report_html(result: GradingResult) -> str:
         )
         check_rows.append(row)
 
+    student_file = html.escape(result.student_file)
+    if css_href:
+        style = f'<link rel="stylesheet" href="{html.escape(css_href)}">'
+    else:
+        style = _INLINE_STYLE
+    schematic = ""
+    if schematic_src:
+        schematic = _SCHEMATIC_TEMPLATE.format(src=html.escape(schematic_src), student_file=student_file)
+
     return _HTML_TEMPLATE.format(
-        student_file=html.escape(result.student_file),
+        style=style,
+        schematic=schematic,
+        student_file=student_file,
         rubric_title=html.escape(result.rubric_title),
         earned=result.earned_points,
         total=result.total_points,
@@ -103,40 +147,176 @@ def generate_student_report_html(result: GradingResult) -> str:
     )
 
 
-def export_student_reports(
+def report_content_hash(result: GradingResult, css_href: str | None = None, schematic: bytes | None = None) -> str:
+    """SHA-256 of everything a student's report is rendered from."""
+    from grading.session_persistence import grading_result_to_dict
+
+    digest = hashlib.sha256()
+    header = {"version": REPORT_FORMAT_VERSION, "css_href": css_href, "result": grading_result_to_dict(result)}
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+    if css_href is None:
+        digest.update(REPORT_CSS.encode())
+    if schematic is not None:
+        digest.update(schematic)
+    return digest.hexdigest()
+
+
+@dataclass
+class ReportExport:
+    """Outcome of export_reports()."""
+
+    paths: list[str] = field(default_factory=list)
+    written: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    # student_file -> exception raised while rendering or writing its report
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+
+class ReportExportError(OSError):
+    """One or more student reports could not be exported.
+
+    Raised by export_student_reports() after every other report has been
+    written.  ``failures`` maps each affected student_file to its error.
+    """
+
+    def __init__(self, failures: dict[str, Exception]):
+        lines = [f"{student}: {error}" for student, error in failures.items()]
+        super().__init__(f"{len(failures)} report(s) could not be exported:\n" + "\n".join(lines))
+        self.failures = failures
+
+
+def _report_name(result: GradingResult) -> str:
+    # Generate filename from student file (strip extension, add .html)
+    return f"{Path(result.student_file).stem}_report.html"
+
+
+def _image_data_uri(path: str, data: bytes) -> str:
+    mime = mimetypes.guess_type(path)[0] or "image/png"
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def _load_manifest(out_path: Path) -> dict:
+    try:
+        data = json.loads((out_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def export_reports(
     result: BatchGradingResult,
     output_dir: str,
-) -> list[str]:
-    """Export individual HTML feedback reports for all students.
+    schematic_images: dict[str, str] | None = None,
+    workers: int | None = None,
+    shared_css: bool = False,
+    force: bool = False,
+) -> ReportExport:
+    """Export per-student HTML reports concurrently, skipping unchanged ones.
 
-    Creates one HTML file per student in the output directory, named
-    after the student's submission file.
+    Each report's inputs (grading result, stylesheet choice, schematic
+    image) are hashed and recorded in a manifest in *output_dir*; a report
+    whose hash matches the manifest and whose file still exists is not
+    rewritten.  Rendering and writing run in a thread pool, since the work
+    is dominated by file I/O.  A report that fails does not stop the
+    others: its error is recorded in ``failed`` and the manifest is still
+    saved for every report that succeeded.
 
     Args:
         result: Batch grading result with per-student results.
         output_dir: Directory to write report files.
+        schematic_images: Optional map of student_file -> schematic image
+            path; the image is embedded in that student's report.
+        workers: Thread pool size (default: chosen by ThreadPoolExecutor).
+        shared_css: Write the stylesheet once as report.css and link it,
+            instead of embedding it in every report.
+        force: Rewrite every report regardless of the manifest.
 
     Returns:
-        List of created file paths.
+        ReportExport listing every report path, which were written or
+        skipped, and which students' reports failed.
 
     Raises:
-        OSError: If the output directory cannot be created or files can't be written.
+        OSError: If the output directory or shared stylesheet cannot be written.
     """
     from utils.atomic_write import atomic_write_text
 
     out_path = Path(output_dir)
     out_path.mkdir(parents=True, exist_ok=True)
 
-    created_files = []
-    for gr in result.results:
-        # Generate filename from student file (strip extension, add .html)
-        base_name = Path(gr.student_file).stem
-        report_name = f"{base_name}_report.html"
-        report_path = out_path / report_name
+    css_href = None
+    if shared_css:
+        css_href = SHARED_CSS_NAME
+        css_file = out_path / SHARED_CSS_NAME
+        if force or not css_file.exists() or css_file.read_text(encoding="utf-8") != REPORT_CSS:
+            atomic_write_text(css_file, REPORT_CSS)
+
+    manifest = {} if force else _load_manifest(out_path)
+    images = schematic_images or {}
+
+    def export_one(gr: GradingResult) -> tuple[str, str, bool]:
+        name = _report_name(gr)
+        report_path = out_path / name
+        image_path = images.get(gr.student_file)
+        image = Path(image_path).read_bytes() if image_path else None
+        content_hash = report_content_hash(gr, css_href, image)
+        if manifest.get(name) == content_hash and report_path.exists():
+            return name, content_hash, False
+        schematic_src = _image_data_uri(image_path, image) if image is not None else None
+        atomic_write_text(report_path, generate_student_report_html(gr, css_href, schematic_src))
+        return name, content_hash, True
 
-        html_content = generate_student_report_html(gr)
-        atomic_write_text(report_path, html_content)
+    export = ReportExport()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(export_one, gr): gr for gr in result.results}
+        outcomes = {}
+        for future in as_completed(futures):
+            try:
+                outcomes[future] = future.result()
+            except Exception as e:
+                export.failed[futures[future].student_file] = e
 
-        created_files.append(str(report_path))
+    # Report in input order, whatever order the workers finished in
+    for future in futures:
+        if future not in outcomes:
+            continue
+        name, content_hash, written = outcomes[future]
+        report_path = str(out_path / name)
+        export.paths.append(report_path)
+        (export.written if written else export.skipped).append(report_path)
+        manifest[name] = content_hash
 
-    return created_files
+    if export.written or force:
+        atomic_write_text(out_path / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True))
+    return export
+
+
+def export_student_reports(
+    result: BatchGradingResult,
+    output_dir: str,
+    schematic_images: dict[str, str] | None = None,
+    workers: int | None = None,
+) -> list[str]:
+    """Export individual HTML feedback reports for all students.
+
+    Creates one HTML file per student in the output directory, named
+    after the student's submission file.  Reports whose inputs are
+    unchanged since the last export are left as they are; see
+    export_reports() for the options.
+
+    Args:
+        result: Batch grading result with per-student results.
+        output_dir: Directory to write report files.
+        schematic_images: Optional map of student_file -> schematic image path.
+        workers: Thread pool size.
+
+    Returns:
+        List of report file paths (written or already up to date).
+
+    Raises:
+        ReportExportError: If any report failed; the others are still
+            written.  It is an OSError, as are directory errors.
+    """
+    export = export_reports(result, output_dir, schematic_images=schematic_images, workers=workers)
+    if export.failed:
+        raise ReportExportError(export.failed)
+    return export.paths
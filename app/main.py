@@ -14,10 +14,15 @@ This prototype implements:
 - Results display
 """
 
+import multiprocessing
 import sys
 
 
 def main():
+    # Frozen (PyInstaller) builds re-enter main() in every worker process the
+    # batch router spawns; this turns those re-entries into worker startups.
+    multiprocessing.freeze_support()
+
     # Handle --selftest before importing Qt to allow headless execution.
     if "--selftest" in sys.argv:
         from simulation.selftest import print_selftest, run_selftest
@@ -26,6 +31,14 @@ def main():
         print_selftest(result)
         sys.exit(0 if result.passed else 1)
 
+    # --startup-profile checks that plotting/analysis imports stay deferred.
+    if "--startup-profile" in sys.argv:
+        from utils.startup_profile import print_startup_profile, profile_startup
+
+        profile = profile_startup()
+        print_startup_profile(profile)
+        sys.exit(0 if not profile.problems() else 1)
+
     from GUI.main_window import MainWindow
     from PyQt6.QtWidgets import QApplication
 
@@ -5,14 +5,19 @@ This module contains no Qt dependencies. It holds all circuit data
 (components, wires, nodes) and provides node graph operations.
 """
 
+import copy
+import dataclasses
 import logging
 from dataclasses import dataclass, field
+from typing import Optional
 
 from algorithms.graph_ops import (
     handle_ground_added,
+    rebuild_affected_nodes,
     rebuild_all_nodes,
     rebuild_nodes_after_wire_removal,
     shift_wire_indices,
+    shift_wire_indices_for_insert,
     update_nodes_for_wire,
 )
 
@@ -20,6 +25,7 @@ from .annotation import AnnotationData
 from .component import ComponentData
 from .node import NodeData
 from .wire import WireData
+from .wire_index import WireIndex, WireList
 
 logger = logging.getLogger(__name__)
 
@@ -50,11 +56,155 @@ class CircuitModel:
     analysis_type: str = "DC Operating Point"
     analysis_params: dict = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        # Node-graph work deferred by begin_batch(): {"added": [WireData], "affected": [NodeData]}
+        self._pending_nodes: Optional[dict] = None
+        # Copy-on-write bookkeeping for copy(): component IDs and wires
+        # still shared with another model, and whether the node objects
+        # are shared.  Shared wires are held by id() -> wire so an id
+        # cannot be reused by another wire while it is recorded here.
+        self._shared_components: set[str] = set()
+        self._shared_wires: dict[int, WireData] = {}
+        self._nodes_shared = False
+        # Per-component netlist lines, see NetlistGenerator(line_cache=...)
+        self.netlist_cache: dict = {}
+        # Component/terminal -> wires, kept in step by add_wire()/remove_wire();
+        # WireList lets it notice edits made to self.wires directly
+        if not isinstance(self.wires, WireList):
+            self.wires = WireList(self.wires)
+        self._wire_index = WireIndex(WireData.get_terminals)
+
+    # --- Copy-on-write cloning ---
+
+    def copy(self) -> "CircuitModel":
+        """Return a cheap copy for exploring variants of this circuit.
+
+        The copy gets its own containers but shares the component, wire and
+        node objects with this model; an object is duplicated only when one
+        side is about to change it (see own_component(), own_wire() and
+        own_node()).  The node graph is not rebuilt, and netlist lines of
+        components that are never touched keep being reused.
+
+        Objects reached through ``components`` or ``wires`` may therefore
+        belong to both models: modify them only via own_component() and
+        own_wire(), never in place.
+        """
+        if self._pending_nodes is not None:
+            raise RuntimeError("Cannot copy a circuit while a batch is open")
+        clone = CircuitModel(
+            components=dict(self.components),
+            wires=list(self.wires),
+            nodes=list(self.nodes),
+            terminal_to_node=dict(self.terminal_to_node),
+            component_counter=dict(self.component_counter),
+            annotations=[copy.copy(a) for a in self.annotations],
+            recommended_components=list(self.recommended_components),
+            analysis_type=self.analysis_type,
+            analysis_params=copy.deepcopy(self.analysis_params),
+        )
+        shared_wires = {id(wire): wire for wire in self.wires}
+        for model in (self, clone):
+            model._shared_components.update(self.components)
+            model._shared_wires.update(shared_wires)
+            model._nodes_shared = model._nodes_shared or bool(self.nodes)
+        clone.netlist_cache = dict(self.netlist_cache)
+        return clone
+
+    def snapshot(self) -> "CircuitModel":
+        """Return a detached copy that shares no mutable objects with this model.
+
+        Unlike copy(), nothing here is marked shared, so later edits keep
+        modifying this model's objects in place and views holding them stay
+        valid.  Meant for handing the circuit to another thread; costs one
+        shallow duplicate per component, wire and node.
+        """
+        if self._pending_nodes is not None:
+            raise RuntimeError("Cannot snapshot a circuit while a batch is open")
+        components = {}
+        for component_id, component in self.components.items():
+            owned = copy.copy(component)
+            owned.waveform_params = copy.deepcopy(component.waveform_params)
+            components[component_id] = owned
+        wires = []
+        for wire in self.wires:
+            owned = copy.copy(wire)
+            owned.waypoints = list(wire.waypoints)
+            wires.append(owned)
+        nodes = {
+            id(node): dataclasses.replace(node, terminals=set(node.terminals), wire_indices=set(node.wire_indices))
+            for node in self.nodes
+        }
+        return CircuitModel(
+            components=components,
+            wires=wires,
+            nodes=list(nodes.values()),
+            terminal_to_node={terminal: nodes.get(id(node), node) for terminal, node in self.terminal_to_node.items()},
+            component_counter=dict(self.component_counter),
+            annotations=[copy.copy(a) for a in self.annotations],
+            recommended_components=list(self.recommended_components),
+            analysis_type=self.analysis_type,
+            analysis_params=copy.deepcopy(self.analysis_params),
+        )
+
+    def own_component(self, component_id: str) -> Optional[ComponentData]:
+        """Return the component for in-place modification.
+
+        A component still shared with a copy is replaced by a private
+        duplicate first.  Returns None if the component does not exist.
+        """
+        component = self.components.get(component_id)
+        if component is not None and component_id in self._shared_components:
+            self._shared_components.discard(component_id)
+            component = copy.copy(component)
+            component.waveform_params = copy.deepcopy(component.waveform_params)
+            self.components[component_id] = component
+        return component
+
+    def own_wire(self, wire_index: int) -> Optional[WireData]:
+        """Return the wire at *wire_index* for in-place modification.
+
+        Like own_component(), a shared wire is duplicated first.  Returns
+        None if the index is out of range.
+        """
+        if not (0 <= wire_index < len(self.wires)):
+            return None
+        wire = self.wires[wire_index]
+        if self._shared_wires.get(id(wire)) is wire:
+            del self._shared_wires[id(wire)]
+            owned = copy.copy(wire)
+            owned.waypoints = list(wire.waypoints)
+            self.wires[wire_index] = owned
+            self._wire_index.replaced(self.wires, wire, owned)
+            wire = owned
+        return wire
+
+    def own_node(self, node: NodeData) -> NodeData:
+        """Return this model's private version of *node* for modification."""
+        if not self._nodes_shared:
+            return node
+        index = next((i for i, n in enumerate(self.nodes) if n is node), None)
+        self._own_nodes()
+        return node if index is None else self.nodes[index]
+
+    def _own_nodes(self) -> None:
+        """Duplicate node objects shared with a copy before the graph changes."""
+        if not self._nodes_shared:
+            return
+        self._nodes_shared = False
+        owned = {
+            id(node): dataclasses.replace(node, terminals=set(node.terminals), wire_indices=set(node.wire_indices))
+            for node in self.nodes
+        }
+        self.nodes[:] = [owned[id(node)] for node in self.nodes]
+        for terminal, node in self.terminal_to_node.items():
+            self.terminal_to_node[terminal] = owned.get(id(node), node)
+
     # --- Component operations ---
 
     def add_component(self, component: ComponentData) -> None:
         """Add a component to the circuit."""
         self.components[component.component_id] = component
+        self._shared_components.discard(component.component_id)
         if component.component_type == "Ground":
             self._handle_ground_added(component)
 
@@ -68,19 +218,50 @@ class CircuitModel:
         if component_id not in self.components:
             return []
 
-        # Find wires connected to this component
-        wire_indices = [i for i, wire in enumerate(self.wires) if wire.connects_component(component_id)]
+        wire_indices = self.wire_indices_for_component(component_id)
 
         del self.components[component_id]
+        self._shared_components.discard(component_id)
         return wire_indices
 
     # --- Wire operations ---
 
+    def wires_for_component(self, component_id: str) -> list[WireData]:
+        """Return the wires attached to a component, in wire-list order."""
+        return self._wire_index.wires_for(self.wires, component_id)
+
+    def wires_at_terminal(self, component_id: str, terminal: int) -> list[WireData]:
+        """Return the wires attached to one terminal, in wire-list order."""
+        return self._wire_index.wires_at(self.wires, component_id, terminal)
+
+    def wire_indices_for_component(self, component_id: str) -> list[int]:
+        """Return the ascending indices of the wires attached to a component."""
+        wires = self.wires_for_component(component_id)
+        return sorted(self._wire_index.position(self.wires, wire) for wire in wires)
+
     def add_wire(self, wire: WireData) -> None:
         """Add a wire and update the node graph."""
         self.wires.append(wire)
+        self._wire_index.added(self.wires, wire)
+        if self._pending_nodes is not None:
+            self._pending_nodes["added"].append(wire)
+            return
         self._update_nodes_for_wire(wire)
 
+    def insert_wire(self, wire_index: int, wire: WireData) -> None:
+        """Insert a wire at *wire_index* (e.g. to restore a deleted one) and update the node graph."""
+        if wire_index >= len(self.wires):
+            self.add_wire(wire)
+            return
+        # The WireList records the insert; WireIndex re-indexes on its next lookup
+        self.wires.insert(wire_index, wire)
+        self._own_nodes()
+        shift_wire_indices_for_insert(self.nodes, wire_index)
+        if self._pending_nodes is not None:
+            self._pending_nodes["added"].append(wire)
+            return
+        self._update_nodes_for_wire(wire, wire_index)
+
     def remove_wire(self, wire_index: int) -> None:
         """Remove a wire by index and incrementally update affected nodes."""
         if not (0 <= wire_index < len(self.wires)):
@@ -92,11 +273,22 @@ class CircuitModel:
 
         # Find the affected node (both terminals should be in the same node)
         affected_node = self.terminal_to_node.get(start_terminal) or self.terminal_to_node.get(end_terminal)
+        if affected_node is not None:
+            affected_node = self.own_node(affected_node)
 
         del self.wires[wire_index]
+        self._wire_index.removed(self.wires, wire)
+        if self._shared_wires.get(id(wire)) is wire:
+            del self._shared_wires[id(wire)]
 
+        self._own_nodes()
         shift_wire_indices(self.nodes, wire_index)
 
+        if self._pending_nodes is not None:
+            if affected_node is not None:
+                self._pending_nodes["affected"].append(affected_node)
+            return
+
         if affected_node is not None:
             rebuild_nodes_after_wire_removal(
                 self.nodes,
@@ -106,21 +298,63 @@ class CircuitModel:
                 affected_node,
             )
 
+    # --- Batched updates ---
+
+    @property
+    def in_batch(self) -> bool:
+        return self._pending_nodes is not None
+
+    def begin_batch(self) -> None:
+        """Defer node-graph maintenance for wire edits until end_batch().
+
+        Wires added or removed in the meantime are reconciled in a single
+        pass instead of updating the graph after each one.
+        """
+        if self._pending_nodes is None:
+            self._pending_nodes = {"added": [], "affected": []}
+
+    def end_batch(self) -> bool:
+        """Bring the node graph up to date after begin_batch().
+
+        Returns:
+            True if any wire edits were reconciled.
+        """
+        pending, self._pending_nodes = self._pending_nodes, None
+        if not pending or not (pending["added"] or pending["affected"]):
+            return False
+
+        self._own_nodes()
+        if pending["affected"]:
+            rebuild_affected_nodes(self.nodes, self.terminal_to_node, self.components, self.wires, pending["affected"])
+        if pending["added"]:
+            index_of = {id(wire): i for i, wire in enumerate(self.wires)}
+            for wire in pending["added"]:
+                wire_index = index_of.get(id(wire))
+                if wire_index is not None:
+                    self._update_nodes_for_wire(wire, wire_index)
+        return True
+
     # --- Node graph operations (delegated to algorithms.graph_ops) ---
 
     def _handle_ground_added(self, ground_comp: ComponentData) -> None:
         """Handle adding a ground component to the node graph."""
+        self._own_nodes()
         handle_ground_added(self.nodes, self.terminal_to_node, ground_comp)
 
     def _update_nodes_for_wire(self, wire: WireData, wire_index: int | None = None) -> None:
         """Update node connectivity when a wire is added."""
         if wire_index is None:
             wire_index = len(self.wires) - 1
+        self._own_nodes()
         update_nodes_for_wire(self.nodes, self.terminal_to_node, self.components, wire, wire_index)
 
     def rebuild_nodes(self) -> None:
         """Rebuild all nodes from scratch based on current wires."""
         rebuild_all_nodes(self.nodes, self.terminal_to_node, self.components, self.wires)
+        self._nodes_shared = False
+        if self._pending_nodes is not None:
+            # A full rebuild already covers everything deferred so far
+            self._pending_nodes = {"added": [], "affected": []}
 
     # --- Circuit operations ---
 
@@ -135,6 +369,11 @@ class CircuitModel:
         self.recommended_components.clear()
         self.analysis_type = "DC Operating Point"
         self.analysis_params = {}
+        self._shared_components.clear()
+        self._shared_wires.clear()
+        self._nodes_shared = False
+        self.netlist_cache.clear()
+        self._wire_index.clear()
 
     # --- Serialization ---
 
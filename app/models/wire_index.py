@@ -0,0 +1,243 @@
+"""
+WireIndex - Component/terminal to wire adjacency for a list of wires.
+
+Finding the wires attached to a component by scanning every wire is
+O(W); dragging on a large sheet does that on every mouse event.  The
+index keeps, per component and per terminal, the wires attached to it,
+so lookups cost O(degree), and a wire's list position costs O(log W).
+
+The owner keeps its wires in a WireList and reports edits through
+added(), removed() and replaced().  A WireList counts every mutation,
+so an edit made behind the index's back (an insert, a slice assignment,
+``wires[i] = other``) is noticed and the index is rebuilt on the next
+lookup: a missed notification costs one O(W) pass, never a wrong
+answer.  Plain lists are accepted too, but are re-indexed on every
+lookup since their edits cannot be tracked.
+
+This module contains no Qt dependencies.
+"""
+
+from typing import Callable, Hashable, Optional
+
+# (component, terminal) pair identifying one end of a wire
+Endpoint = tuple[Hashable, Hashable]
+
+
+class WireList(list):
+    """A list that counts its mutations, so WireIndex can trust its cache."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.mutations = 0
+
+    def _touch(self) -> None:
+        self.mutations = getattr(self, "mutations", 0) + 1
+
+    def append(self, item) -> None:
+        super().append(item)
+        self._touch()
+
+    def extend(self, items) -> None:
+        super().extend(items)
+        self._touch()
+
+    def insert(self, index, item) -> None:
+        super().insert(index, item)
+        self._touch()
+
+    def pop(self, *args):
+        item = super().pop(*args)
+        self._touch()
+        return item
+
+    def remove(self, item) -> None:
+        super().remove(item)
+        self._touch()
+
+    def clear(self) -> None:
+        super().clear()
+        self._touch()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._touch()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._touch()
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._touch()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._touch()
+
+    def __iadd__(self, items):
+        result = super().__iadd__(items)
+        self._touch()
+        return result
+
+    def __imul__(self, count):
+        result = super().__imul__(count)
+        self._touch()
+        return result
+
+
+class WireIndex:
+    """
+    Adjacency index from components and terminals to wires.
+
+    Positions are answered from a Fenwick tree over insertion slots:
+    every indexed wire owns a slot, removing a wire empties its slot,
+    and a wire's list position is the number of occupied slots before
+    it.  Both updates and queries are O(log W).
+
+    Args:
+        endpoints: Returns the two (component, terminal) endpoints of a
+            wire.  Components may be IDs or any hashable object.
+    """
+
+    def __init__(self, endpoints: Callable[[object], tuple[Endpoint, Endpoint]]):
+        self._endpoints = endpoints
+        self.clear()
+
+    # --- Lookups ---
+
+    def wires_for(self, wires: list, component: Hashable) -> list:
+        """Wires in *wires* attached to *component*, in list order."""
+        self._sync(wires)
+        return list(self._by_component.get(component, ()))
+
+    def wires_at(self, wires: list, component: Hashable, terminal: Hashable) -> list:
+        """Wires in *wires* attached to one terminal, in list order."""
+        self._sync(wires)
+        return list(self._by_terminal.get((component, terminal), ()))
+
+    def position(self, wires: list, wire) -> Optional[int]:
+        """Index of *wire* (by identity) in *wires*, or None."""
+        self._sync(wires)
+        slot = self._slot_of.get(id(wire))
+        return None if slot is None else self._prefix(slot) - 1
+
+    # --- Change notifications (call right after editing the list) ---
+
+    def added(self, wires: list, wire) -> None:
+        """*wire* was appended to *wires*."""
+        if not self._one_edit_behind(wires) or not wires or wires[-1] is not wire:
+            self.clear()
+            return
+        self._insert(wire)
+        self._append_slot(wire)
+        self._mutations += 1
+        if len(self._tree) > 2 * len(wires) + 64:
+            # Too many emptied slots; compact on the next lookup
+            self.clear()
+
+    def removed(self, wires: list, wire) -> None:
+        """*wire* was deleted from *wires*."""
+        slot = self._slot_of.get(id(wire))
+        if not self._one_edit_behind(wires) or slot is None:
+            self.clear()
+            return
+        for key in self._keys(wire):
+            _discard(self._by_component, key, wire)
+        for endpoint in set(self._endpoints(wire)):
+            _discard(self._by_terminal, endpoint, wire)
+        del self._slot_of[id(wire)]
+        self._add(slot, -1)
+        self._mutations += 1
+
+    def replaced(self, wires: list, old, new) -> None:
+        """*old* was replaced in place by *new*, with the same endpoints."""
+        slot = self._slot_of.get(id(old))
+        if not self._one_edit_behind(wires) or slot is None:
+            self.clear()
+            return
+        buckets = [self._by_component.get(key) for key in self._keys(old)]
+        buckets += [self._by_terminal.get(endpoint) for endpoint in set(self._endpoints(old))]
+        for bucket in buckets:
+            for i, wire in enumerate(bucket or ()):
+                if wire is old:
+                    bucket[i] = new
+        del self._slot_of[id(old)]
+        self._slot_of[id(new)] = slot
+        self._mutations += 1
+
+    def clear(self) -> None:
+        """Forget everything; the next lookup rebuilds from scratch."""
+        self._source: Optional[WireList] = None
+        self._mutations = 0
+        self._by_component: dict[Hashable, list] = {}
+        self._by_terminal: dict[Endpoint, list] = {}
+        # id(wire) -> slot; the buckets keep every indexed wire alive,
+        # so an id cannot be reused while it is in this map
+        self._slot_of: dict[int, int] = {}
+        # 1-based Fenwick tree of occupied slots (entry 0 unused)
+        self._tree: list[int] = [0]
+
+    # --- Internals ---
+
+    def _one_edit_behind(self, wires: list) -> bool:
+        return self._source is wires and getattr(wires, "mutations", None) == self._mutations + 1
+
+    def _sync(self, wires: list) -> None:
+        if self._source is wires and getattr(wires, "mutations", None) == self._mutations:
+            return
+        self.clear()
+        for wire in wires:
+            self._insert(wire)
+        n = len(wires)
+        self._slot_of = {id(wire): slot for slot, wire in enumerate(wires, 1)}
+        tree = [0] + [1] * n
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+        if isinstance(wires, WireList):
+            self._source = wires
+            self._mutations = wires.mutations
+
+    def _keys(self, wire) -> set:
+        (start, _), (end, _) = self._endpoints(wire)
+        return {start, end}
+
+    def _insert(self, wire) -> None:
+        for key in self._keys(wire):
+            self._by_component.setdefault(key, []).append(wire)
+        for endpoint in set(self._endpoints(wire)):
+            self._by_terminal.setdefault(endpoint, []).append(wire)
+
+    def _append_slot(self, wire) -> None:
+        slot = len(self._tree)
+        # tree[slot] covers slots (slot - lowbit, slot]; all but the new one exist
+        self._tree.append(1 + self._prefix(slot - 1) - self._prefix(slot - (slot & -slot)))
+        self._slot_of[id(wire)] = slot
+
+    def _add(self, slot: int, delta: int) -> None:
+        tree = self._tree
+        while slot < len(tree):
+            tree[slot] += delta
+            slot += slot & -slot
+
+    def _prefix(self, slot: int) -> int:
+        tree, total = self._tree, 0
+        while slot > 0:
+            total += tree[slot]
+            slot -= slot & -slot
+        return total
+
+
+def _discard(buckets: dict, key: Hashable, wire) -> None:
+    """Remove *wire* from buckets[key] by identity (WireData compares by value)."""
+    bucket = buckets.get(key)
+    if bucket is None:
+        return
+    for i, item in enumerate(bucket):
+        if item is wire:
+            del bucket[i]
+            break
+    if not bucket:
+        del buckets[key]
@@ -23,6 +23,7 @@ ObserverEvent = Literal[
     "wire_routed",
     "wire_lock_changed",
     "wire_reroute_requested",
+    "wires_reroute_requested",
     "circuit_cleared",
     "nodes_rebuilt",
     "model_loaded",
@@ -35,6 +36,7 @@ ObserverEvent = Literal[
     "net_name_changed",
     "locked_components_changed",
     "recommended_components_changed",
+    "batch_applied",
 ]
 
 # Payload type documentation.
@@ -45,6 +47,7 @@ ObserverEvent = Literal[
 #   from models.node import NodeData
 #   from models.annotation import AnnotationData
 #   from controllers.simulation_controller import SimulationResult
+#   from controllers.circuit_controller import BatchChanges
 #
 EVENT_PAYLOADS: dict[str, str] = {
     "component_added": "ComponentData",
@@ -58,6 +61,7 @@ EVENT_PAYLOADS: dict[str, str] = {
     "wire_routed": "tuple[int, WireData]  # (wire_index, wire_data)",
     "wire_lock_changed": "tuple[int, bool]  # (wire_index, locked)",
     "wire_reroute_requested": "int  # wire_index",
+    "wires_reroute_requested": "list[int]  # wire indices, routed together",
     "circuit_cleared": "None",
     "nodes_rebuilt": "None",
     "model_loaded": "None",
@@ -70,4 +74,5 @@ EVENT_PAYLOADS: dict[str, str] = {
     "net_name_changed": "NodeData",
     "locked_components_changed": "list[str]  # component_ids",
     "recommended_components_changed": "list[str]  # component_types",
+    "batch_applied": "BatchChanges  # ordered (event, data) pairs from controller.batch()",
 }
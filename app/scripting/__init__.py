@@ -21,17 +21,24 @@ Usage::
     print(result.data)
 
     circuit.save("my_circuit.json")
+
+Several variants can be simulated concurrently from a notebook::
+
+    batch = await simulate_many(variants, concurrency=8)
+    df = pandas.DataFrame(batch.columns())
 """
 
 # Re-export SimulationResult for convenience
 from controllers.simulation_controller import SimulationResult
-from scripting.circuit import Circuit
+from scripting.circuit import Circuit, SimulationBatch, simulate_many
 from scripting.jupyter import circuit_to_svg, plot_result, register_jupyter_formatters
 
 __all__ = [
     "Circuit",
+    "SimulationBatch",
     "SimulationResult",
     "circuit_to_svg",
     "plot_result",
     "register_jupyter_formatters",
+    "simulate_many",
 ]
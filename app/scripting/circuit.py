@@ -5,16 +5,49 @@ No GUI or PyQt6 dependency. Wraps the existing model/controller/simulation
 layers behind a user-friendly interface.
 """
 
+import asyncio
 import csv
 import json
+from collections.abc import Mapping
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
 
 from controllers.circuit_controller import CircuitController
 from controllers.simulation_controller import SimulationController, SimulationResult
 from models.circuit import CircuitModel
 from models.component import COMPONENT_TYPES, ComponentData
 
+if TYPE_CHECKING:
+    from simulation.stacked_results import StackedResults
+
+
+class _OwnedComponents(Mapping):
+    """Read-only mapping of a model's components that hands out owned objects.
+
+    A forked circuit shares ComponentData objects with its parent, so
+    every lookup goes through CircuitModel.own_component() and an edit
+    such as ``circuit.components["R1"].value = "2k"`` stays in this
+    circuit.
+    """
+
+    def __init__(self, model: CircuitModel):
+        self._model = model
+
+    def __getitem__(self, component_id: str) -> ComponentData:
+        if component_id not in self._model.components:
+            raise KeyError(component_id)
+        return self._model.own_component(component_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._model.components)
+
+    def __len__(self) -> int:
+        return len(self._model.components)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._model.components)!r})"
+
 
 class Circuit:
     """A scriptable circuit that can be built, simulated, and saved programmatically.
@@ -174,6 +207,33 @@ class Circuit:
         wire = self._controller.add_wire(start_component, start_terminal, end_component, end_terminal)
         return wire is not None
 
+    def batch(self):
+        """Group many edits into one transaction.
+
+        Node connectivity is updated once when the block exits instead of
+        after every wire, which keeps bulk construction fast::
+
+            with circuit.batch():
+                for i in range(100):
+                    circuit.add_component("Resistor", position=(i * 80, 0))
+        """
+        return self._controller.batch()
+
+    def fork(self) -> "Circuit":
+        """Return a cheap, independent copy for exploring a variant.
+
+        Components, wires and the node graph are shared with this circuit
+        until either side edits them, so forking a large circuit to change
+        one value costs little::
+
+            variant = circuit.fork()
+            variant.update_value("R2", "4.7k")
+
+        Returns:
+            A new Circuit; edits to it never affect this one.
+        """
+        return Circuit(self._model.copy())
+
     # --- Analysis ---
 
     def set_analysis(self, analysis_type: str, params: Optional[dict] = None) -> None:
@@ -203,6 +263,21 @@ class Circuit:
         """
         return self._sim.run_simulation()
 
+    async def simulate_async(self, timeout: Optional[float] = None) -> SimulationResult:
+        """Run the configured simulation without blocking the event loop.
+
+        Awaitable from a notebook cell; cancelling the task stops ngspice.
+        Use :func:`simulate_many` to run several circuits concurrently.
+
+        Args:
+            timeout: Seconds allowed for the ngspice run (default
+                SIMULATION_TIMEOUT).  A timed-out run returns a failed result.
+
+        Returns:
+            A SimulationResult, exactly as from simulate().
+        """
+        return await self._sim.run_simulation_async(timeout=timeout)
+
     def validate(self) -> SimulationResult:
         """Validate the circuit without running a simulation.
 
@@ -238,9 +313,14 @@ class Circuit:
     # --- Properties ---
 
     @property
-    def components(self) -> dict[str, ComponentData]:
-        """All components in the circuit, keyed by ID."""
-        return self._model.components
+    def components(self) -> Mapping[str, ComponentData]:
+        """All components in the circuit, keyed by ID.
+
+        The mapping is read-only; use add_component() and
+        remove_component() to change which components exist.  The
+        returned objects belong to this circuit alone, even after fork().
+        """
+        return _OwnedComponents(self._model)
 
     @property
     def wires(self) -> list:
@@ -283,7 +363,7 @@ class Circuit:
         Returns:
             List of matching ComponentData objects.
         """
-        results = list(self._model.components.values())
+        results = list(self.components.values())
         if component_type is not None:
             results = [c for c in results if c.component_type == component_type]
         if value is not None:
@@ -299,7 +379,7 @@ class Circuit:
         Returns:
             List of WireData objects connected to the component.
         """
-        return [w for w in self._model.wires if w.connects_component(component_id)]
+        return self._model.wires_for_component(component_id)
 
     def summary(self) -> str:
         """Return a human-readable summary of the circuit."""
@@ -403,6 +483,91 @@ class Circuit:
             _write_generic_csv(data, path)
 
 
+@dataclass
+class SimulationBatch:
+    """Results of :func:`simulate_many`, in the order the circuits were given.
+
+    Attributes:
+        results: One SimulationResult per circuit.
+        stacked: Every run's signals as ``(runs x samples)`` arrays, or None
+            when the circuits use different (or non-stackable) analyses.
+    """
+
+    results: list[SimulationResult]
+    stacked: Optional["StackedResults"] = None
+
+    @property
+    def ok(self) -> list[bool]:
+        return [r.success for r in self.results]
+
+    def columns(self) -> dict:
+        """Long-format 1-D columns, ready for ``pandas.DataFrame(batch.columns())``.
+
+        Raises:
+            ValueError: If the results could not be stacked.
+        """
+        if self.stacked is None:
+            raise ValueError("Results of different or non-stackable analyses cannot be combined into columns")
+        return self.stacked.columns()
+
+
+async def simulate_many(
+    circuits: Iterable[Circuit],
+    concurrency: int = 4,
+    timeout: Optional[float] = None,
+) -> SimulationBatch:
+    """Simulate several circuits concurrently.
+
+    At most *concurrency* ngspice processes run at once.  If the awaiting
+    task is cancelled, every pending and running simulation is cancelled
+    and its ngspice process killed.
+
+    Example (in a notebook cell)::
+
+        variants = [make_filter(r) for r in ("1k", "2.2k", "4.7k")]
+        batch = await simulate_many(variants, concurrency=8)
+        df = pandas.DataFrame(batch.columns())
+
+    Args:
+        circuits: Circuits to simulate, each with its analysis configured.
+        concurrency: Maximum number of simultaneous simulations.
+        timeout: Per-simulation timeout in seconds (default SIMULATION_TIMEOUT).
+
+    Returns:
+        A SimulationBatch with per-circuit results and stacked arrays.
+
+    Raises:
+        ValueError: If *concurrency* is less than 1.
+    """
+    from simulation.stacked_results import STACKABLE_TYPES, stack_results
+
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    circuits = list(circuits)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(circuit: Circuit) -> SimulationResult:
+        async with semaphore:
+            return await circuit.simulate_async(timeout=timeout)
+
+    tasks = [asyncio.ensure_future(run(circuit)) for circuit in circuits]
+    try:
+        results = list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    analysis_types = {circuit.analysis_type for circuit in circuits}
+    stacked = None
+    if len(analysis_types) == 1:
+        analysis_type = analysis_types.pop()
+        if analysis_type in STACKABLE_TYPES:
+            stacked = stack_results(analysis_type, results)
+    return SimulationBatch(results, stacked)
+
+
 def _write_op_csv(data: dict, path: Path) -> None:
     """Write DC Operating Point results as name,value rows."""
     import io
@@ -0,0 +1,435 @@
+"""Local simulation server with an in-process job queue.
+
+Lets an autograder or lab kiosk submit circuits over HTTP/JSON without
+starting the GUI or a new Python interpreter per request::
+
+    python -m cli serve --port 8765 --workers 4
+
+Endpoints (all bodies are JSON):
+
+    GET  /health            server status and cache statistics
+    POST /validate          {"circuit": {...}, "analysis": ..., "params": {...}}
+    POST /netlist           same payload as /validate
+    POST /simulate          same payload, plus optional "timeout" (seconds)
+    POST /grade             {"circuit": {...}, "rubric": {...}, "reference": {...}}
+    POST /jobs              {"op": "simulate", ...} — queue without waiting (202)
+    GET  /jobs/<id>         poll a queued job
+
+The op endpoints wait for the job and return the same record as
+``GET /jobs/<id>``.  Each worker thread keeps one SimulationController
+(with its resolved ngspice runner) warm between jobs, and results are
+cached by request content, so resubmitting an unchanged circuit is free.
+
+No Qt dependencies — pure computation module.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from utils.constants import SIMULATION_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ("validate", "netlist", "simulate", "grade")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 2
+DEFAULT_CACHE_SIZE = 256
+
+# Finished jobs kept for polling before the oldest are forgotten
+MAX_FINISHED_JOBS = 1000
+
+# Largest accepted request body
+MAX_REQUEST_BYTES = 10 * 1024 * 1024
+
+_job_ids = itertools.count(1)
+
+
+@dataclass
+class Job:
+    """One queued request and, once finished, its outcome."""
+
+    op: str
+    payload: dict
+    timeout: float
+    job_id: str = field(default_factory=lambda: str(next(_job_ids)))
+    status: str = "queued"  # queued | running | done | failed | timeout
+    result: Optional[dict] = None
+    error: str = ""
+    cached: bool = False
+    submitted: float = field(default_factory=time.monotonic)
+    elapsed_s: float = 0.0
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes; False if *timeout* ran out first."""
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> dict:
+        data = {"id": self.job_id, "op": self.op, "status": self.status}
+        if self.finished:
+            data["elapsed_s"] = round(self.elapsed_s, 4)
+            data["cached"] = self.cached
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class JobTimeout(Exception):
+    """Raised by a worker when a job exceeds its time limit."""
+
+
+def _load_model(circuit: Any):
+    from controllers.file_controller import validate_circuit_data
+    from models.circuit import CircuitModel
+
+    if not isinstance(circuit, dict):
+        raise ValueError("'circuit' must be a circuit JSON object")
+    validate_circuit_data(circuit)
+    return CircuitModel.from_dict(circuit)
+
+
+def _result_payload(result) -> dict:
+    return {
+        "success": result.success,
+        "analysis_type": result.analysis_type,
+        "data": result.data,
+        "errors": result.errors,
+        "warnings": result.warnings,
+        "error": result.error,
+    }
+
+
+def request_key(op: str, payload: dict) -> str:
+    """Cache key for a request: a digest of everything that affects the result."""
+    relevant = {k: v for k, v in payload.items() if k not in ("op", "timeout")}
+    canonical = json.dumps({"op": op, "payload": relevant}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SimulationService:
+    """Job queue and worker pool behind the HTTP server.
+
+    Usable on its own for in-process clients::
+
+        service = SimulationService(workers=4).start()
+        job = service.submit("simulate", {"circuit": data})
+        job.wait()
+
+    Args:
+        workers: Number of worker threads (concurrent ngspice runs).
+        timeout: Default per-job time limit in seconds.
+        cache_size: Results kept in the LRU cache (0 disables caching).
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        timeout: float = SIMULATION_TIMEOUT,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # --- Lifecycle ---
+
+    def start(self) -> "SimulationService":
+        """Start the worker threads (idempotent)."""
+        if not self._threads:
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"sim-worker-{i + 1}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        """Let queued jobs finish, then stop the workers."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    # --- Jobs ---
+
+    def submit(self, op: str, payload: dict, timeout: Optional[float] = None) -> Job:
+        """Queue a job and return it immediately.
+
+        Raises:
+            ValueError: If *op* is unknown or the timeout is not positive.
+        """
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{op}'. Valid operations: {', '.join(OPERATIONS)}")
+        timeout = self.timeout if timeout is None else float(timeout)
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        job = Job(op=op, payload=payload, timeout=timeout)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._forget_old_jobs()
+        self._queue.put(job)
+        return job
+
+    def run(self, op: str, payload: dict, timeout: Optional[float] = None) -> Job:
+        """Submit a job and wait for it to finish."""
+        job = self.submit(op, payload, timeout)
+        job.wait()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job.status == "running")
+            return {
+                "workers": self.workers,
+                "queued": self._queue.qsize(),
+                "running": running,
+                "cache_entries": len(self._cache),
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+            }
+
+    def _forget_old_jobs(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    # --- Result cache ---
+
+    def _cache_get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            result = self._cache.get(key)
+            if result is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return result
+
+    def _cache_put(self, key: str, result: dict) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # --- Workers ---
+
+    def _worker(self) -> None:
+        from controllers.simulation_controller import SimulationController
+
+        # One controller per thread: its ngspice runner stays resolved between jobs
+        sim = SimulationController()
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._process(sim, job)
+
+    def _process(self, sim, job: Job) -> None:
+        start = time.monotonic()
+        job.status = "running"
+        key = request_key(job.op, job.payload)
+        try:
+            cached = self._cache_get(key)
+            if cached is not None:
+                job.result, job.cached = cached, True
+            else:
+                job.result = self._execute(sim, job)
+                # Failed runs (e.g. ngspice missing) are worth retrying later
+                if job.result.get("success", True):
+                    self._cache_put(key, job.result)
+            job.status = "done"
+        except JobTimeout:
+            job.status = "timeout"
+            job.error = f"Job exceeded its time limit ({job.timeout:g} s)"
+        except (ValueError, KeyError, TypeError) as e:
+            job.status = "failed"
+            job.error = str(e)
+        except Exception as e:  # keep the worker alive whatever the job does
+            logger.exception("Job %s (%s) crashed", job.job_id, job.op)
+            job.status = "failed"
+            job.error = f"{type(e).__name__}: {e}"
+        finally:
+            job.elapsed_s = time.monotonic() - start
+            job._done.set()
+
+    def _execute(self, sim, job: Job) -> dict:
+        payload = job.payload
+        model = _load_model(payload.get("circuit"))
+
+        if job.op == "grade":
+            return self._grade(model, payload)
+
+        sim.model = model
+        if payload.get("analysis"):
+            sim.set_analysis(payload["analysis"], payload.get("params"))
+
+        if job.op == "validate":
+            return _result_payload(sim.validate_circuit())
+        if job.op == "netlist":
+            return {"netlist": sim.generate_netlist()}
+        return _result_payload(self._simulate(sim, job.timeout))
+
+    @staticmethod
+    def _simulate(sim, timeout: float):
+        async def run():
+            # Cancelling on timeout kills the ngspice process
+            return await asyncio.wait_for(sim.run_simulation_async(timeout=timeout), timeout)
+
+        try:
+            return asyncio.run(run())
+        except asyncio.TimeoutError:
+            raise JobTimeout() from None
+
+    @staticmethod
+    def _grade(model, payload: dict) -> dict:
+        from grading.grader import CircuitGrader
+        from grading.rubric import Rubric, validate_rubric
+        from grading.session_persistence import grading_result_to_dict
+
+        rubric_data = payload.get("rubric")
+        validate_rubric(rubric_data)
+        reference = payload.get("reference")
+        result = CircuitGrader().grade(
+            student_circuit=model,
+            rubric=Rubric.from_dict(rubric_data),
+            reference_circuit=_load_model(reference) if reference is not None else None,
+            student_file=str(payload.get("student_file", "")),
+        )
+        data = grading_result_to_dict(result)
+        data["percentage"] = result.percentage
+        return data
+
+
+class SimulationRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for a SimulationService (set on the server)."""
+
+    server_version = "SpiceGUISimulationServer/1.0"
+
+    @property
+    def service(self) -> SimulationService:
+        return self.server.service
+
+    def log_message(self, format, *args):  # noqa: A002 — signature from BaseHTTPRequestHandler
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> dict:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ValueError("Invalid Content-Length header") from None
+        if length < 0:
+            raise ValueError("Content-Length must not be negative")
+        if length > MAX_REQUEST_BYTES:
+            raise ValueError(f"Request body too large (limit {MAX_REQUEST_BYTES} bytes)")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}") from None
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        if path == "/health":
+            self._send_json(200, {"status": "ok", **self.service.stats()})
+        elif path.startswith("/jobs/"):
+            job = self.service.get(path[len("/jobs/") :])
+            if job is None:
+                self._send_json(404, {"error": "Unknown job"})
+            else:
+                self._send_json(200, job.to_dict())
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        path = self.path.strip("/")
+        if path != "jobs" and path not in OPERATIONS:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        try:
+            body = self._read_json()
+            if path == "jobs":
+                job = self.service.submit(body.get("op", ""), body, body.get("timeout"))
+                self._send_json(202, job.to_dict())
+            else:
+                job = self.service.run(path, body, body.get("timeout"))
+                self._send_json(200, job.to_dict())
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+
+
+def create_server(
+    service: SimulationService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+) -> ThreadingHTTPServer:
+    """Bind an HTTP server for *service* (port 0 picks a free port)."""
+    server = ThreadingHTTPServer((host, port), SimulationRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = DEFAULT_WORKERS,
+    timeout: float = SIMULATION_TIMEOUT,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> None:
+    """Run the server until interrupted."""
+    service = SimulationService(workers=workers, timeout=timeout, cache_size=cache_size).start()
+    server = create_server(service, host, port)
+    bound_host, bound_port = server.server_address[:2]
+    print(f"Serving simulations on http://{bound_host}:{bound_port} ({workers} workers)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
@@ -79,6 +79,7 @@ class ThemeManager:
     _wire_thickness: str
     _show_junction_dots: bool
     _routing_mode: str
+    _revision: int
 
     def __new__(cls) -> "ThemeManager":
         if cls._instance is None:
@@ -90,6 +91,7 @@ class ThemeManager:
             cls._instance._wire_thickness = "normal"
             cls._instance._show_junction_dots = True
             cls._instance._routing_mode = "orthogonal"
+            cls._instance._revision = 0
         return cls._instance
 
     @property
@@ -107,6 +109,15 @@ class ThemeManager:
         """Get the current color mode ('color' or 'monochrome')."""
         return self._color_mode
 
+    @property
+    def revision(self) -> int:
+        """Counter bumped on every theme, style or color-mode change.
+
+        Lets callers memoize theme-derived objects and compare one integer
+        to tell whether they are stale.
+        """
+        return self._revision
+
     def set_theme(self, theme: ThemeProtocol) -> None:
         """
         Set a new theme and notify all listeners.
@@ -220,6 +231,7 @@ class ThemeManager:
 
     def _notify_listeners(self) -> None:
         """Notify all registered listeners of theme change."""
+        self._revision += 1
         for callback in self._listeners:
             try:
                 callback(self._theme)
@@ -18,6 +18,7 @@ LTspice .asc format is a plain-text format with lines like:
 import logging
 import re
 
+from algorithms.layout import auto_layout_model
 from models.circuit import CircuitModel
 from models.component import DEFAULT_VALUES, SPICE_SYMBOLS, ComponentData
 from models.wire import WireData
@@ -398,11 +399,13 @@ def _parse_dc(directive):
     return {"type": "DC Sweep", "params": params}
 
 
-def import_asc(text):
+def import_asc(text, auto_layout=False):
     """Parse an LTspice .asc schematic and build a CircuitModel.
 
     Args:
         text: The full text content of a .asc file.
+        auto_layout: Replace the drawn placement with a connectivity-aware
+            layout (see algorithms.layout) once the wires are known.
 
     Returns:
         tuple of (CircuitModel, analysis_dict_or_None, warnings_list)
@@ -633,6 +636,8 @@ def import_asc(text):
             model.add_wire(wire)
 
     # Phase 6: Rebuild node graph and set analysis
+    if auto_layout:
+        auto_layout_model(model)
     model.rebuild_nodes()
 
     if analysis:
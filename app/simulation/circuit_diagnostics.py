@@ -0,0 +1,232 @@
+"""Incremental circuit diagnostics (circuit_diagnostics).
+
+Keeps what validate_circuit() checks — component types present, wire
+ends per terminal and the floating terminals of every component — up to
+date from CircuitController events instead of rescanning the circuit.
+Each edit costs O(terminals of the components it touches), and the
+validation result is memoized per analysis type until an edit changes
+one of those facts.
+
+Like WireIndex, the engine trusts notifications but verifies cheaply:
+if the wire or component counts no longer match the model (an edit made
+behind the controller's back), the state is rebuilt once from scratch.
+
+No Qt dependencies — pure computation module.
+"""
+
+import logging
+from collections import Counter
+from typing import Callable, Optional
+
+from .circuit_semantic_validator import validation_report
+
+logger = logging.getLogger(__name__)
+
+# Events after which everything is rebuilt
+_RESET_EVENTS = frozenset({"circuit_cleared", "model_loaded"})
+
+
+class CircuitDiagnostics:
+    """
+    Live validation state of one CircuitModel.
+
+    Args:
+        model: The circuit to watch.
+        circuit_ctrl: Controller whose events keep the state current.
+            Without one, call refresh() after editing the model.
+    """
+
+    def __init__(self, model, circuit_ctrl=None):
+        self.model = model
+        # Bumped whenever a fact validate() depends on changes
+        self.revision = 0
+        self._observers: list[Callable[[set[str]], None]] = []
+        self._reports: dict[str, tuple[int, tuple]] = {}
+        self._rebuild()
+        if circuit_ctrl is not None:
+            circuit_ctrl.add_observer(self._on_model_changed)
+
+    # --- Queries ---
+
+    def validate(self, analysis_type: str) -> tuple[bool, list[str], list[str]]:
+        """Same result as validate_circuit() for the model, memoized per revision."""
+        self._verify()
+        cached = self._reports.get(analysis_type)
+        if cached is None or cached[0] != self.revision:
+            unconnected = [
+                (cid, self._types[cid], len(self._floating[cid]) == self._terminal_counts[cid])
+                for cid in sorted(self._floating, key=self._order.__getitem__)
+            ]
+            cached = (self.revision, validation_report(self._type_counts, unconnected, analysis_type))
+            self._reports[analysis_type] = cached
+        is_valid, errors, warnings = cached[1]
+        return is_valid, list(errors), list(warnings)
+
+    @property
+    def floating_terminals(self) -> set[tuple[str, int]]:
+        """``(component_id, terminal_index)`` of every unconnected terminal (Ground excluded)."""
+        self._verify()
+        return {(cid, index) for cid, indices in self._floating.items() for index in indices}
+
+    def floating_terminals_of(self, component_id: str) -> frozenset[int]:
+        """Unconnected terminal indices of one component."""
+        self._verify()
+        return self._floating.get(component_id, frozenset())
+
+    @property
+    def has_ground(self) -> bool:
+        return self._type_counts.get("Ground", 0) > 0
+
+    def add_observer(self, callback: Callable[[set[str]], None]) -> None:
+        """Call *callback(component_ids)* whenever those components' floating terminals change."""
+        if callback not in self._observers:
+            self._observers.append(callback)
+
+    def remove_observer(self, callback: Callable[[set[str]], None]) -> None:
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def refresh(self) -> None:
+        """Rebuild from the model, e.g. after editing it without a controller."""
+        self._reset()
+
+    # --- Event handling ---
+
+    def _on_model_changed(self, event: str, data) -> None:
+        changed: set[str] = set()
+        if event == "batch_applied":
+            for name, payload in data.events:
+                if not self._apply(name, payload, changed):
+                    return
+            if not self._in_step():
+                self._reset()
+                return
+        elif not self._apply(event, data, changed):
+            return
+        elif event in ("wire_added", "wire_removed") and not self._in_step():
+            self._reset()
+            return
+        self._notify(changed)
+
+    def _apply(self, event: str, data, changed: set[str]) -> bool:
+        """Apply one event; False if the state had to be rebuilt instead."""
+        if event in _RESET_EVENTS:
+            self._reset()
+            return False
+        if event == "component_added":
+            if data.component_id in self._types:
+                self._reset()
+                return False
+            self._add_component(data)
+            changed.add(data.component_id)
+        elif event == "component_removed":
+            self._remove_component(data)
+            changed.add(data)
+        elif event == "wire_added":
+            ends = (data.start_component_id, data.start_terminal), (data.end_component_id, data.end_terminal)
+            self._wire_ends.append(ends)
+            self._connect(ends, 1, changed)
+        elif event == "wire_removed":
+            if not 0 <= data < len(self._wire_ends):
+                self._reset()
+                return False
+            self._connect(self._wire_ends.pop(data), -1, changed)
+        return True
+
+    def _in_step(self) -> bool:
+        wires = self.model.wires
+        if len(self._wire_ends) != len(wires):
+            return False
+        if not wires:
+            return True
+        # Spot-check the last wire; appends land there, so a misplaced insert shows up
+        last = wires[-1]
+        return self._wire_ends[-1] == (
+            (last.start_component_id, last.start_terminal),
+            (last.end_component_id, last.end_terminal),
+        )
+
+    def _verify(self) -> None:
+        if len(self._types) != len(self.model.components) or len(self._wire_ends) != len(self.model.wires):
+            logger.debug("Circuit diagnostics out of step with the model; rebuilding")
+            self._reset()
+
+    def _reset(self) -> None:
+        changed = set(self._types)
+        self._rebuild()
+        self._notify(changed | set(self._types))
+
+    def _notify(self, changed: set[str]) -> None:
+        if not changed:
+            return
+        for observer in list(self._observers):
+            observer(changed)
+
+    # --- State ---
+
+    def _rebuild(self) -> None:
+        self.revision += 1
+        self._types: dict[str, str] = {}
+        self._type_counts: Counter = Counter()
+        # Component ID -> insertion sequence, matching the model's dict order
+        self._order: dict[str, int] = {}
+        self._next_order = 0
+        # Non-ground components only
+        self._terminal_counts: dict[str, int] = {}
+        self._floating: dict[str, frozenset[int]] = {}
+        # Wire ends per (component_id, terminal); one entry per model wire
+        self._ends: Counter = Counter()
+        self._wire_ends: list[tuple[tuple[str, int], tuple[str, int]]] = []
+        for wire in self.model.wires:
+            ends = (wire.start_component_id, wire.start_terminal), (wire.end_component_id, wire.end_terminal)
+            self._wire_ends.append(ends)
+            self._ends.update(ends)
+        for component in self.model.components.values():
+            self._add_component(component)
+
+    def _add_component(self, component) -> None:
+        cid, component_type = component.component_id, component.component_type
+        self._types[cid] = component_type
+        self._type_counts[component_type] += 1
+        self._order[cid] = self._next_order
+        self._next_order += 1
+        self.revision += 1
+        if component_type != "Ground":
+            self._terminal_counts[cid] = component.get_terminal_count()
+            self._update_floating(cid)
+
+    def _remove_component(self, component_id: str) -> None:
+        component_type = self._types.pop(component_id, None)
+        if component_type is None:
+            return
+        self._type_counts[component_type] -= 1
+        if not self._type_counts[component_type]:
+            del self._type_counts[component_type]
+        del self._order[component_id]
+        self._terminal_counts.pop(component_id, None)
+        self._floating.pop(component_id, None)
+        self.revision += 1
+
+    def _connect(self, ends, delta: int, changed: set[str]) -> None:
+        for end in ends:
+            self._ends[end] += delta
+            if self._ends[end] <= 0:
+                del self._ends[end]
+        for cid in {ends[0][0], ends[1][0]}:
+            if cid in self._terminal_counts and self._update_floating(cid):
+                changed.add(cid)
+
+    def _update_floating(self, component_id: str) -> bool:
+        """Recompute one component's floating terminals; True if they changed."""
+        floating = frozenset(
+            index for index in range(self._terminal_counts[component_id]) if (component_id, index) not in self._ends
+        )
+        previous: Optional[frozenset[int]] = self._floating.get(component_id)
+        if floating == (previous or frozenset()):
+            return False
+        if floating:
+            self._floating[component_id] = floating
+        else:
+            del self._floating[component_id]
+        self.revision += 1
+        return True
@@ -5,6 +5,8 @@ ground presence, connected terminals, analysis-specific source requirements.
 No Qt dependencies. Error messages are student-friendly.
 """
 
+from collections import Counter
+
 
 def validate_circuit(components, wires, analysis_type):
     """
@@ -21,12 +23,47 @@ def validate_circuit(components, wires, analysis_type):
             errors: list[str] — problems that block simulation
             warnings: list[str] — non-blocking issues
     """
+    # Build set of connected terminals from wires
+    connected_terminals = set()
+    for wire in wires:
+        connected_terminals.add((wire.start_component_id, wire.start_terminal))
+        connected_terminals.add((wire.end_component_id, wire.end_terminal))
+
+    unconnected = []
+    for comp in components.values():
+        if comp.component_type == "Ground":
+            continue
+        terminal_count = comp.get_terminal_count()
+        missing = sum(1 for i in range(terminal_count) if (comp.component_id, i) not in connected_terminals)
+        if missing:
+            unconnected.append((comp.component_id, comp.component_type, missing == terminal_count))
+
+    type_counts = Counter(c.component_type for c in components.values())
+    return validation_report(type_counts, unconnected, analysis_type)
+
+
+def validation_report(type_counts, unconnected, analysis_type):
+    """
+    Turn the facts validate_circuit() checks into its result.
+
+    Shared with the incremental CircuitDiagnostics, so both report the
+    same messages.
+
+    Args:
+        type_counts: Mapping of component type -> number of components
+        unconnected: (component_id, component_type, fully_unconnected) for
+            each non-ground component with an unconnected terminal, in
+            circuit order
+        analysis_type: str
+
+    Returns:
+        (is_valid, errors, warnings) as for validate_circuit()
+    """
     errors = []
     warnings = []
 
     # 1. Circuit must have components (beyond just Ground)
-    non_ground = [c for c in components.values() if c.component_type != "Ground"]
-    if not non_ground:
+    if sum(type_counts.values()) - type_counts.get("Ground", 0) <= 0:
         errors.append(
             "There are no components on the canvas. "
             "Drag components from the palette on the left to start "
@@ -35,8 +72,7 @@ def validate_circuit(components, wires, analysis_type):
         return False, errors, warnings
 
     # 2. Must have a ground node
-    has_ground = any(c.component_type == "Ground" for c in components.values())
-    if not has_ground:
+    if not type_counts.get("Ground"):
         errors.append(
             "Your circuit needs a ground connection. "
             "Every circuit needs a reference point (0 V). "
@@ -44,52 +80,33 @@ def validate_circuit(components, wires, analysis_type):
             "to your circuit."
         )
 
-    # 3. Build set of connected terminals from wires
-    connected_terminals = set()
-    for wire in wires:
-        connected_terminals.add((wire.start_component_id, wire.start_terminal))
-        connected_terminals.add((wire.end_component_id, wire.end_terminal))
-
-    # 4. Check for unconnected terminals
-    for comp in components.values():
-        if comp.component_type == "Ground":
-            continue
-        terminal_count = comp.get_terminal_count()
-        comp_connected = []
-        comp_unconnected = []
-        for i in range(terminal_count):
-            if (comp.component_id, i) in connected_terminals:
-                comp_connected.append(i)
-            else:
-                comp_unconnected.append(i)
-
-        if len(comp_unconnected) == terminal_count:
+    # 3. Check for unconnected terminals
+    for component_id, component_type, fully_unconnected in unconnected:
+        if fully_unconnected:
             errors.append(
-                f"{comp.component_id} ({comp.component_type}) has no connections. "
+                f"{component_id} ({component_type}) has no connections. "
                 f"Make sure all component terminals (the dots on each end) "
                 f"are connected with wires before simulating."
             )
-        elif comp_unconnected:
+        else:
             warnings.append(
-                f"{comp.component_id} ({comp.component_type}) has unconnected "
+                f"{component_id} ({component_type}) has unconnected "
                 f"terminals. Make sure all component terminals (the dots on "
                 f"each end) are connected with wires before simulating."
             )
 
-    # 5. Analysis-specific checks
-    voltage_sources = [c for c in components.values() if c.component_type in ("Voltage Source", "Waveform Source")]
-    current_sources = [c for c in components.values() if c.component_type == "Current Source"]
+    # 4. Analysis-specific checks
+    has_voltage_source = type_counts.get("Voltage Source", 0) + type_counts.get("Waveform Source", 0) > 0
+    has_current_source = type_counts.get("Current Source", 0) > 0
 
-    if analysis_type == "DC Sweep":
-        dc_sources = [c for c in components.values() if c.component_type == "Voltage Source"]
-        if not dc_sources:
-            errors.append(
-                "DC Sweep analysis requires a Voltage Source to sweep. "
-                "Add a Voltage Source to your circuit and connect it "
-                "before running this analysis."
-            )
+    if analysis_type == "DC Sweep" and not type_counts.get("Voltage Source"):
+        errors.append(
+            "DC Sweep analysis requires a Voltage Source to sweep. "
+            "Add a Voltage Source to your circuit and connect it "
+            "before running this analysis."
+        )
 
-    if not voltage_sources and not current_sources:
+    if not has_voltage_source and not has_current_source:
         warnings.append(
             "Circuit has no voltage or current sources. "
             "Add a Voltage Source or Current Source to provide power "
@@ -9,6 +9,7 @@ import logging
 import re
 from collections import defaultdict
 
+from algorithms.layout import auto_layout_model
 from models.circuit import CircuitModel
 from models.component import DEFAULT_VALUES, ComponentData
 from models.wire import WireData
@@ -153,11 +154,13 @@ def _extract_circuitikz_body(text):
     return text
 
 
-def import_circuitikz(text):
+def import_circuitikz(text, auto_layout=False):
     """Parse CircuiTikZ LaTeX code and build a CircuitModel.
 
     Args:
         text: LaTeX source code (standalone document or bare environment).
+        auto_layout: Replace the drawn placement with a connectivity-aware
+            layout (see algorithms.layout) once the wires are known.
 
     Returns:
         (CircuitModel, list[str]): The circuit model and a list of warnings.
@@ -472,5 +475,7 @@ def import_circuitikz(text):
             )
             model.wires.append(wire)
 
+    if auto_layout:
+        auto_layout_model(model)
     model.rebuild_nodes()
     return model, warnings
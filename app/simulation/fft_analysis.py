@@ -3,12 +3,25 @@ FFT Analysis Module
 
 Provides Fourier transform analysis for transient simulation results.
 Includes magnitude/phase spectrum computation, windowing, and THD calculation.
+
+ngspice chooses transient timesteps adaptively, so samples are first
+interpolated onto a uniform grid.  Long runs can be restricted to a
+steady-state window (see steady_state_range) and averaged over
+overlapping segments (Welch's method) to steady the noise floor.
 """
 
+import math
 from typing import Optional
 
 import numpy as np
 
+_WINDOWS = {
+    "hanning": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+    "none": np.ones,
+}
+
 
 class FFTResult:
     """Container for FFT analysis results"""
@@ -22,6 +35,8 @@ class FFTResult:
         signal_name: str,
         sample_rate: float,
         window_type: str,
+        time_range: Optional[tuple[float, float]] = None,
+        segments: int = 1,
     ):
         self.frequencies = frequencies
         self.magnitude = magnitude
@@ -30,25 +45,83 @@ class FFTResult:
         self.signal_name = signal_name
         self.sample_rate = sample_rate
         self.window_type = window_type
+        # Span of the run that was analyzed, and the number of averaged segments
+        self.time_range = time_range
+        self.segments = segments
         self.fundamental_freq: Optional[float] = None
         self.thd_percent: Optional[float] = None
         self.harmonics: list = []
 
 
+def resample_uniform(
+    time: np.ndarray,
+    signal: np.ndarray,
+    time_range: Optional[tuple[float, float]] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Interpolate a signal onto a uniform time grid.
+
+    The grid spans *time_range* (default: the whole record) with as many
+    points as the record has samples there.  Uniformly sampled input
+    covering the whole record is returned unchanged.
+
+    Args:
+        time: Non-decreasing time array (seconds)
+        signal: Signal amplitude array
+        time_range: Optional (start, end) to restrict the grid to
+
+    Returns:
+        (uniform_time, resampled_signal)
+
+    Raises:
+        ValueError: If the time data is not increasing, the range is empty
+            or does not overlap the data, or it holds fewer than 4 samples
+    """
+    time = np.asarray(time, dtype=float)
+    signal = np.asarray(signal, dtype=float)
+    diffs = np.diff(time)
+    if time[-1] <= time[0] or np.any(diffs < 0):
+        raise ValueError("Time data must be strictly increasing")
+
+    start, end = time[0], time[-1]
+    if time_range is not None:
+        lo, hi = time_range
+        if hi <= lo:
+            raise ValueError(f"Time range start ({lo:g} s) must be before its end ({hi:g} s)")
+        if hi < start or lo > end:
+            raise ValueError(f"Time range {lo:g} s to {hi:g} s is outside the data ({start:g} s to {end:g} s)")
+        start, end = max(start, lo), min(end, hi)
+    inside = np.count_nonzero((time >= start) & (time <= end))
+    if inside < 4 or end <= start:
+        raise ValueError("Need at least 4 samples for FFT analysis")
+
+    if inside == len(time):
+        step = (end - start) / (len(time) - 1)
+        if np.all(np.abs(diffs - step) <= 1e-6 * step):
+            return time, signal
+    grid = np.linspace(start, end, inside)
+    return grid, np.interp(grid, time, signal)
+
+
 def compute_fft(
     time: np.ndarray,
     signal: np.ndarray,
     signal_name: str = "Signal",
     window: str = "hanning",
+    time_range: Optional[tuple[float, float]] = None,
+    segments: int = 1,
 ) -> FFTResult:
     """
     Compute FFT of a time-domain signal.
 
     Args:
-        time: Time array (seconds)
+        time: Time array (seconds); need not be uniformly spaced
         signal: Signal amplitude array
         signal_name: Name of the signal for labeling
         window: Window function ('hanning', 'hamming', 'blackman', 'none')
+        time_range: Optional (start, end) of the run to analyze
+        segments: Number of half-overlapping segments to average (Welch);
+            1 transforms the whole span at full resolution
 
     Returns:
         FFTResult containing frequency-domain data
@@ -62,46 +135,41 @@ def compute_fft(
     if len(time) < 4:
         raise ValueError("Need at least 4 samples for FFT analysis")
 
-    # Calculate sample rate from time array
-    dt = np.mean(np.diff(time))
-    if dt <= 0:
-        raise ValueError("Time data must be strictly increasing (mean time step is <= 0)")
-    sample_rate = 1.0 / dt
-    n_samples = len(signal)
-
-    # Apply window function to reduce spectral leakage
-    if window.lower() == "hanning":
-        window_func = np.hanning(n_samples)
-    elif window.lower() == "hamming":
-        window_func = np.hamming(n_samples)
-    elif window.lower() == "blackman":
-        window_func = np.blackman(n_samples)
-    elif window.lower() == "none":
-        window_func = np.ones(n_samples)
-    else:
+    window_factory = _WINDOWS.get(window.lower())
+    if window_factory is None:
         raise ValueError(f"Unknown window type: {window}. Use 'hanning', 'hamming', 'blackman', or 'none'")
 
+    uniform_time, uniform_signal = resample_uniform(time, signal, time_range)
+    n_total = len(uniform_signal)
+    dt = (uniform_time[-1] - uniform_time[0]) / (n_total - 1)
+    sample_rate = 1.0 / dt
+
+    # Welch: `segments` windows overlapping by half cover (segments + 1) / 2 lengths
+    segments = max(1, int(segments))
+    n_samples = n_total if segments == 1 else max(4, int(2 * n_total / (segments + 1)))
+    frames = np.lib.stride_tricks.sliding_window_view(uniform_signal, n_samples)[:: max(1, n_samples // 2)]
+    frames = frames[:segments]
+
     # Apply window and compensate for window power loss
-    windowed_signal = signal * window_func
+    window_func = window_factory(n_samples)
     window_power_correction = np.sqrt(np.mean(window_func**2))
+    spectra = np.fft.rfft(frames * window_func, axis=1) / (n_samples * window_power_correction)
 
-    # Compute FFT
-    fft_result = np.fft.fft(windowed_signal) / n_samples
-    fft_result = fft_result / window_power_correction  # Correct for window attenuation
-
-    # Get positive frequencies only (first half of spectrum)
+    # Positive frequencies below Nyquist
     n_positive = n_samples // 2
-    frequencies = np.fft.fftfreq(n_samples, dt)[:n_positive]
+    spectra = spectra[:, :n_positive]
+    frequencies = np.fft.rfftfreq(n_samples, dt)[:n_positive]
 
-    # Magnitude (multiply by 2 to account for negative frequencies, except DC)
-    magnitude = np.abs(fft_result[:n_positive])
-    magnitude[1:] *= 2  # Double all except DC component
+    # Average power across segments; magnitude doubled for the folded negative
+    # frequencies (except DC)
+    magnitude = np.sqrt(np.mean(np.abs(spectra) ** 2, axis=0))
+    magnitude[1:] *= 2
 
     # Magnitude in dB (avoid log(0) by adding tiny epsilon)
     magnitude_db = 20 * np.log10(magnitude + 1e-12)
 
-    # Phase in degrees
-    phase = np.angle(fft_result[:n_positive], deg=True)
+    # Phase in degrees (of the coherent average when segments are averaged)
+    phase = np.angle(np.mean(spectra, axis=0), deg=True)
 
     return FFTResult(
         frequencies=frequencies,
@@ -111,9 +179,50 @@ def compute_fft(
         signal_name=signal_name,
         sample_rate=sample_rate,
         window_type=window,
+        time_range=(float(uniform_time[0]), float(uniform_time[-1])),
+        segments=len(frames),
     )
 
 
+def steady_state_range(
+    time: np.ndarray,
+    signal: np.ndarray,
+    settle_fraction: float = 0.5,
+) -> tuple[float, float]:
+    """
+    Choose the part of a long run to analyze once start-up transients have died out.
+
+    Skips the first *settle_fraction* of the run, then trims the rest to a
+    whole number of periods of its fundamental, ending at the last sample,
+    so the FFT sees a periodic record with little leakage.  Without a
+    detectable fundamental the whole tail is used.
+
+    Returns:
+        (start, end) times in seconds
+    """
+    time = np.asarray(time, dtype=float)
+    start = time[0] + settle_fraction * (time[-1] - time[0])
+    end = time[-1]
+    try:
+        tail_time, tail_signal = resample_uniform(time, signal, (start, end))
+    except ValueError:
+        return float(time[0]), float(end)
+    # Without its mean, DC leaking through the window cannot pose as a fundamental
+    tail = compute_fft(tail_time, tail_signal - tail_signal.mean(), window="hanning")
+
+    # Need at least two cycles in the tail to trust a peak, and a peak that
+    # stands out from numerical noise
+    min_freq = 2.0 / (end - start)
+    fundamental = find_fundamental_frequency(tail, min_freq=min_freq)
+    ac = tail.magnitude[tail.frequencies >= min_freq]
+    if ac.size == 0 or ac.max() <= 1e-9 * np.max(np.abs(tail_signal)):
+        fundamental = 0.0
+    periods = math.floor((end - start) * fundamental) if fundamental > 0 else 0
+    if periods < 1:
+        return float(start), float(end)
+    return float(end - periods / fundamental), float(end)
+
+
 def find_fundamental_frequency(fft_result: FFTResult, min_freq: float = 10.0) -> float:
     """
     Find the fundamental frequency (peak in magnitude spectrum).
@@ -239,6 +348,8 @@ def analyze_signal_spectrum(
     signal: np.ndarray,
     signal_name: str = "Signal",
     window: str = "hanning",
+    time_range: Optional[tuple[float, float]] = None,
+    segments: int = 1,
 ) -> FFTResult:
     """
     Complete spectral analysis including FFT, fundamental detection, and THD.
@@ -248,12 +359,14 @@ def analyze_signal_spectrum(
         signal: Signal amplitude array
         signal_name: Name of the signal
         window: Window function type
+        time_range: Optional (start, end) of the run to analyze
+        segments: Number of segments to average (Welch); 1 for none
 
     Returns:
         FFTResult with fundamental frequency and THD populated
     """
     # Compute FFT
-    fft_result = compute_fft(time, signal, signal_name, window)
+    fft_result = compute_fft(time, signal, signal_name, window, time_range, segments)
 
     # Find fundamental frequency
     fundamental = find_fundamental_frequency(fft_result)
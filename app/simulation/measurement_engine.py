@@ -0,0 +1,397 @@
+"""
+Offline evaluation of .meas measurements.
+
+Evaluates the measurement types produced by measurement_builder (AVG, RMS,
+MIN, MAX, PP, INTEG, FIND...AT, FIND...WHEN, TRIG...TARG) plus WHEN,
+DERIV and MIN_AT/MAX_AT directly on stored waveforms, so measurements can
+be added or changed without re-running ngspice.
+
+Every evaluation works on ``(runs x samples)`` arrays on a shared axis, so
+all runs of a parameter sweep or Monte Carlo study (a StackedResults) are
+measured in one vectorized pass.  Failed runs and measurements whose
+condition never occurs yield NaN, like ngspice's "failed".
+
+No Qt dependencies — pure computation module.
+"""
+
+import re
+import warnings
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from utils.format_utils import parse_spice_value
+
+from .waveform_expressions import ExpressionError, WaveformEvaluator
+
+# Measurement kinds understood by the engine
+WINDOW_MEASUREMENTS = ("AVG", "RMS", "MIN", "MAX", "PP", "INTEG", "MIN_AT", "MAX_AT")
+POINT_MEASUREMENTS = ("FIND_AT", "FIND_WHEN", "WHEN", "DERIV_AT", "DERIV_WHEN", "TRIG_TARG")
+
+
+class MeasurementError(ValueError):
+    """Raised when a measurement cannot be evaluated offline."""
+
+
+@dataclass
+class Event:
+    """A crossing event such as ``v(out)=2.5 RISE=1 TD=1u``.
+
+    ``target`` is either a number or the name of a second signal.
+    ``occurrence`` is a 1-based count or ``"last"``.
+    """
+
+    variable: str
+    target: object
+    edge: str = "cross"
+    occurrence: object = 1
+    td: Optional[float] = None
+
+
+@dataclass
+class MeasSpec:
+    """A parsed .meas directive."""
+
+    name: str
+    domain: str
+    kind: str
+    variable: str = ""
+    from_val: Optional[float] = None
+    to_val: Optional[float] = None
+    at: Optional[float] = None
+    when: Optional[Event] = None
+    trig: Optional[Event] = None
+    targ: Optional[Event] = None
+    options: dict = field(default_factory=dict)
+
+
+# ---------------------------------------------------------------------------
+# Directive parsing
+# ---------------------------------------------------------------------------
+
+
+def _number(text, what):
+    value = parse_spice_value(text)
+    if value is None:
+        raise MeasurementError(f"Invalid {what} value '{text}'")
+    return value
+
+
+def _split_options(tokens):
+    """Split ``KEY=value`` tokens into a dict (keys upper-cased) and leftovers."""
+    options, rest = {}, []
+    for tok in tokens:
+        key, sep, value = tok.partition("=")
+        if sep and key.upper() in ("FROM", "TO", "AT", "VAL", "TD", "RISE", "FALL", "CROSS"):
+            options[key.upper()] = value
+        else:
+            rest.append(tok)
+    return options, rest
+
+
+def _parse_edge(options):
+    """Return (edge, occurrence) from RISE=/FALL=/CROSS= options."""
+    for edge in ("RISE", "FALL", "CROSS"):
+        if edge in options:
+            raw = options[edge]
+            if raw.upper() == "LAST":
+                return edge.lower(), "last"
+            try:
+                occurrence = int(raw)
+            except ValueError:
+                raise MeasurementError(f"Invalid {edge} count '{raw}'") from None
+            if occurrence < 1:
+                raise MeasurementError(f"{edge} count must be at least 1")
+            return edge.lower(), occurrence
+    return "cross", 1
+
+
+def _parse_event(tokens, variable=None):
+    """Parse ``var=value [edge] [TD=..]`` or ``var VAL=value [edge] [TD=..]``."""
+    options, rest = _split_options(tokens)
+    if variable is None:
+        if not rest:
+            raise MeasurementError("Missing condition")
+        lhs, sep, rhs = rest[0].partition("=")
+        if not sep:
+            raise MeasurementError(f"Condition '{rest[0]}' must have the form signal=value")
+        variable = lhs
+        value = parse_spice_value(rhs)
+        target = value if value is not None else rhs
+    else:
+        if "VAL" not in options:
+            raise MeasurementError(f"Missing VAL= for {variable}")
+        target = _number(options["VAL"], "VAL")
+    edge, occurrence = _parse_edge(options)
+    td = _number(options["TD"], "TD") if "TD" in options else None
+    return Event(variable=variable, target=target, edge=edge, occurrence=occurrence, td=td)
+
+
+def parse_meas_directive(directive: str) -> MeasSpec:
+    """Parse a ``.meas`` directive into a :class:`MeasSpec`.
+
+    Raises:
+        MeasurementError: if the directive is malformed or uses a form the
+            offline engine does not support (e.g. PARAM expressions).
+    """
+    text = re.sub(r"\s*=\s*", "=", directive.strip())
+    tokens = text.split()
+    if tokens and tokens[0].lower() in (".meas", ".measure"):
+        tokens = tokens[1:]
+    if len(tokens) < 3:
+        raise MeasurementError(f"Incomplete measurement: '{directive}'")
+
+    domain, name, keyword = tokens[0].lower(), tokens[1], tokens[2].upper()
+    args = tokens[3:]
+
+    if keyword in WINDOW_MEASUREMENTS:
+        if not args:
+            raise MeasurementError(f"{keyword} needs a signal")
+        options, _ = _split_options(args[1:])
+        return MeasSpec(
+            name=name,
+            domain=domain,
+            kind=keyword,
+            variable=args[0],
+            from_val=_number(options["FROM"], "FROM") if "FROM" in options else None,
+            to_val=_number(options["TO"], "TO") if "TO" in options else None,
+        )
+
+    if keyword in ("FIND", "DERIV"):
+        if not args:
+            raise MeasurementError(f"{keyword} needs a signal")
+        variable = args[0]
+        if len(args) > 1 and args[1].upper() == "WHEN":
+            return MeasSpec(name, domain, f"{keyword}_WHEN", variable, when=_parse_event(args[2:]))
+        options, _ = _split_options(args[1:])
+        if "AT" not in options:
+            raise MeasurementError(f"{keyword} needs AT= or WHEN")
+        return MeasSpec(name, domain, f"{keyword}_AT", variable, at=_number(options["AT"], "AT"))
+
+    if keyword == "WHEN":
+        event = _parse_event(args)
+        return MeasSpec(name, domain, "WHEN", event.variable, when=event)
+
+    if keyword == "TRIG":
+        upper = [tok.upper() for tok in args]
+        if "TARG" not in upper or not args:
+            raise MeasurementError("TRIG needs a matching TARG")
+        split = upper.index("TARG")
+        trig_tokens, targ_tokens = args[:split], args[split + 1 :]
+        if not trig_tokens or not targ_tokens:
+            raise MeasurementError("TRIG and TARG each need a signal")
+        trig = _parse_event(trig_tokens[1:], variable=trig_tokens[0])
+        targ = _parse_event(targ_tokens[1:], variable=targ_tokens[0])
+        return MeasSpec(name, domain, "TRIG_TARG", targ.variable, trig=trig, targ=targ)
+
+    raise MeasurementError(f"Measurement type '{keyword}' cannot be evaluated offline")
+
+
+# ---------------------------------------------------------------------------
+# Vectorized primitives on a shared axis
+# ---------------------------------------------------------------------------
+
+
+def values_at(axis, arr, x):
+    """Linearly interpolate every row of *arr* at axis position(s) *x*.
+
+    *x* may be a scalar or one position per row.  Positions outside the
+    axis (or NaN) give NaN.
+    """
+    arr = np.atleast_2d(arr)
+    xq = np.broadcast_to(np.asarray(x, dtype=float), (arr.shape[0],))
+    out = np.full(arr.shape[0], np.nan)
+    if len(axis) == 1:
+        hit = xq == axis[0]
+        out[hit] = arr[hit, 0]
+        return out
+    inside = (xq >= axis[0]) & (xq <= axis[-1])
+    if not inside.any():
+        return out
+    rows = np.flatnonzero(inside)
+    j = np.clip(np.searchsorted(axis, xq[rows], side="right") - 1, 0, len(axis) - 2)
+    t = (xq[rows] - axis[j]) / (axis[j + 1] - axis[j])
+    out[rows] = arr[rows, j] * (1.0 - t) + arr[rows, j + 1] * t
+    return out
+
+
+def _window(axis, arr, lo, hi):
+    """Return ``(x, y)`` restricted to [lo, hi] with interpolated end points."""
+    lo = axis[0] if lo is None else max(lo, axis[0])
+    hi = axis[-1] if hi is None else min(hi, axis[-1])
+    if hi < lo:
+        return None, None
+    inner = (axis > lo) & (axis < hi)
+    x = np.concatenate([[lo], axis[inner], [hi]])
+    y = np.concatenate([values_at(axis, arr, lo)[:, None], arr[:, inner], values_at(axis, arr, hi)[:, None]], axis=1)
+    return x, y
+
+
+def crossing_positions(axis, diff, edge="cross", occurrence=1, td=None):
+    """Return the axis position where each row of *diff* crosses zero.
+
+    Args:
+        axis: shared increasing axis
+        diff: ``(runs x samples)`` signal minus its target level
+        edge: "rise", "fall" or "cross"
+        occurrence: 1-based crossing count, or "last"
+        td: ignore crossings before this axis value
+
+    Returns:
+        1-D array with one position per run (NaN when not found).
+    """
+    if diff.shape[1] < 2:
+        # No sample intervals, so nothing can cross
+        return np.full(diff.shape[0], np.nan)
+    a, b = diff[:, :-1], diff[:, 1:]
+    rise = (a < 0) & (b >= 0)
+    fall = (a > 0) & (b <= 0)
+    mask = rise if edge == "rise" else fall if edge == "fall" else rise | fall
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(a != b, a / (a - b), 0.0)
+    positions = axis[:-1] + frac * np.diff(axis)
+    if td is not None:
+        mask &= positions >= td
+
+    if occurrence == "last":
+        found = mask.any(axis=1)
+        idx = mask.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1)
+    else:
+        hit = mask & (np.cumsum(mask, axis=1) == occurrence)
+        found = hit.any(axis=1)
+        idx = np.argmax(hit, axis=1)
+
+    out = np.take_along_axis(positions, idx[:, None], axis=1)[:, 0]
+    out[~found] = np.nan
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+
+def _resolve_signal(evaluator, variable):
+    """Return the ``(runs x samples)`` array for a .meas signal reference.
+
+    Accepts anything the waveform expression language does: bare names,
+    ``v(node)``, ``v(a,b)``, ``vm``/``vdb``/``vp``, ``i(device)`` and
+    derived expressions such as ``v(a)*i(v1)``.
+    """
+    try:
+        return evaluator.evaluate(variable)
+    except ExpressionError as e:
+        raise MeasurementError(str(e)) from e
+
+
+def _event_positions(evaluator, axis, event, order):
+    diff = _resolve_signal(evaluator, event.variable)[:, order]
+    if isinstance(event.target, str):
+        diff = diff - _resolve_signal(evaluator, event.target)[:, order]
+    else:
+        diff = diff - event.target
+    return crossing_positions(axis, diff, event.edge, event.occurrence, event.td)
+
+
+def _evaluate(evaluator, spec, axis, order):
+    """Evaluate one parsed measurement; returns one value per run."""
+    stacked = evaluator.stacked
+    if spec.kind in WINDOW_MEASUREMENTS:
+        y_all = _resolve_signal(evaluator, spec.variable)[:, order]
+        x, y = _window(axis, y_all, spec.from_val, spec.to_val)
+        if x is None:
+            return np.full(stacked.num_runs, np.nan)
+        span = x[-1] - x[0]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            if spec.kind == "INTEG":
+                return np.trapezoid(y, x, axis=1)
+            if spec.kind == "AVG":
+                return np.trapezoid(y, x, axis=1) / span if span > 0 else y[:, 0]
+            if spec.kind == "RMS":
+                return np.sqrt(np.trapezoid(y**2, x, axis=1) / span) if span > 0 else np.abs(y[:, 0])
+            if spec.kind == "MIN":
+                return y.min(axis=1)
+            if spec.kind == "MAX":
+                return y.max(axis=1)
+            if spec.kind == "PP":
+                return y.max(axis=1) - y.min(axis=1)
+        # MIN_AT / MAX_AT: axis position of the extreme value
+        filled = np.where(np.isnan(y), np.inf if spec.kind == "MIN_AT" else -np.inf, y)
+        idx = np.argmin(filled, axis=1) if spec.kind == "MIN_AT" else np.argmax(filled, axis=1)
+        out = x[idx]
+        out[np.isnan(y).all(axis=1)] = np.nan
+        return out
+
+    if spec.kind == "WHEN":
+        return _event_positions(evaluator, axis, spec.when, order)
+
+    if spec.kind == "TRIG_TARG":
+        return _event_positions(evaluator, axis, spec.targ, order) - _event_positions(evaluator, axis, spec.trig, order)
+
+    values = _resolve_signal(evaluator, spec.variable)[:, order]
+    if spec.kind.startswith("DERIV"):
+        if len(axis) < 2:
+            return np.full(stacked.num_runs, np.nan)
+        values = np.gradient(values, axis, axis=1)
+    at = spec.at if spec.kind.endswith("_AT") else _event_positions(evaluator, axis, spec.when, order)
+    return values_at(axis, values, at)
+
+
+def _prepared_axis(stacked):
+    """Return the increasing, duplicate-free axis and the sample order for it."""
+    axis = np.asarray(stacked.axis, dtype=float)
+    if len(axis) == 0:
+        raise MeasurementError(f"{stacked.analysis_type} results have no axis to measure along")
+    order = np.arange(len(axis))
+    if len(axis) > 1 and axis[0] > axis[-1]:
+        order = order[::-1]
+    keep = np.concatenate([[True], np.diff(axis[order]) > 0])
+    order = order[keep]
+    return axis[order], order
+
+
+def measure_stacked(stacked, directives) -> dict:
+    """Evaluate .meas directives on every run of a StackedResults.
+
+    Args:
+        stacked: StackedResults of a Transient, AC Sweep or DC Sweep study
+        directives: iterable of .meas directive strings or MeasSpec objects
+
+    Returns:
+        dict mapping measurement name -> 1-D array with one value per run
+        (NaN where the run failed or the measurement did not resolve).
+
+    Raises:
+        MeasurementError: if a directive is unsupported or refers to an
+            unknown signal.
+    """
+    axis, order = _prepared_axis(stacked)
+    evaluator = WaveformEvaluator(stacked)
+    results = {}
+    for directive in directives:
+        spec = directive if isinstance(directive, MeasSpec) else parse_meas_directive(directive)
+        values = np.asarray(_evaluate(evaluator, spec, axis, order), dtype=float)
+        values[~stacked.ok] = np.nan
+        results[spec.name] = values
+    return results
+
+
+def measure_result(analysis_type, data, directives) -> dict:
+    """Evaluate .meas directives on one parsed simulation payload.
+
+    Returns a dict in the format of ResultParser.parse_measurement_results:
+    name -> float, or None where the measurement failed.
+    """
+    from .stacked_results import StackedResultsBuilder
+
+    builder = StackedResultsBuilder(analysis_type)
+    builder.add_data(data)
+    stacked = builder.build()
+    if not stacked.ok.any():
+        raise MeasurementError(f"No {analysis_type} data to measure")
+    return {
+        name: (None if np.isnan(values[0]) else float(values[0]))
+        for name, values in measure_stacked(stacked, directives).items()
+    }
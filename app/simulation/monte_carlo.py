@@ -6,6 +6,9 @@ No Qt dependencies — pure computation module.
 """
 
 import logging
+import math
+import warnings
+from statistics import NormalDist
 
 import numpy as np
 from utils.format_utils import parse_spice_value
@@ -60,6 +63,29 @@ def format_spice_value(value):
 
 _VALID_DISTRIBUTIONS = {"gaussian", "uniform"}
 
+# Sampling strategies for drawing component values across runs.
+#   random: independent pseudo-random draws per run (apply_tolerance)
+#   lhs:    Latin hypercube — every run falls in its own stratum per component
+#   sobol:  scrambled Sobol low-discrepancy sequence
+SAMPLING_METHODS = ("random", "lhs", "sobol")
+
+# Early-stopping criteria accepted by check_convergence().
+CONVERGENCE_CRITERIA = ("ci_width", "yield")
+
+# Keeps quasi-random samples strictly inside (0, 1) so the inverse normal
+# CDF stays finite.
+_UNIT_EPS = 1e-12
+
+
+def _check_tolerance_args(tolerance_pct, distribution):
+    """Validate the tolerance arguments shared by the sampling helpers."""
+    if not isinstance(tolerance_pct, (int, float)):
+        raise ValueError(f"tolerance_pct must be a number, got {type(tolerance_pct).__name__}")
+    if tolerance_pct < 0:
+        raise ValueError(f"tolerance_pct must be non-negative, got {tolerance_pct}")
+    if distribution not in _VALID_DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {distribution!r}, expected one of {_VALID_DISTRIBUTIONS}")
+
 
 def apply_tolerance(value_str, tolerance_pct, distribution="gaussian", rng=None):
     """Apply a random tolerance to a SPICE value string.
@@ -77,12 +103,7 @@ def apply_tolerance(value_str, tolerance_pct, distribution="gaussian", rng=None)
     Raises:
         ValueError: If tolerance_pct is negative or distribution is unknown.
     """
-    if not isinstance(tolerance_pct, (int, float)):
-        raise ValueError(f"tolerance_pct must be a number, got {type(tolerance_pct).__name__}")
-    if tolerance_pct < 0:
-        raise ValueError(f"tolerance_pct must be non-negative, got {tolerance_pct}")
-    if distribution not in _VALID_DISTRIBUTIONS:
-        raise ValueError(f"Unknown distribution {distribution!r}, expected one of {_VALID_DISTRIBUTIONS}")
+    _check_tolerance_args(tolerance_pct, distribution)
 
     if rng is None:
         rng = np.random.default_rng()
@@ -102,6 +123,150 @@ def apply_tolerance(value_str, tolerance_pct, distribution="gaussian", rng=None)
     return format_spice_value(new_value)
 
 
+def _latin_hypercube(num_runs, num_dims, rng):
+    """One point per stratum [k/n, (k+1)/n), strata shuffled per column."""
+    strata = np.argsort(rng.random((num_runs, num_dims)), axis=0)
+    return (strata + rng.random((num_runs, num_dims))) / num_runs
+
+
+def generate_unit_samples(num_runs, num_dims, method="lhs", rng=None, blocks=None):
+    """Draw a ``(num_runs x num_dims)`` array of samples in the open unit cube.
+
+    Args:
+        num_runs: Number of rows (Monte Carlo runs).
+        num_dims: Number of toleranced components.
+        method: One of :data:`SAMPLING_METHODS`.
+        rng: numpy random Generator used for shuffling / scrambling.
+        blocks: For ``"lhs"`` only — sizes of consecutive row blocks that
+            are each a complete Latin hypercube.  A run stopped early at a
+            block boundary has then used whole hypercubes only and stays
+            stratified; a single design cut short does not.  Rows left
+            over after the listed blocks form one final block.  Default:
+            a single block of *num_runs* rows.
+
+    Raises:
+        ValueError: If *method* is unknown or a block size is not positive.
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method {method!r}, expected one of {SAMPLING_METHODS}")
+    if rng is None:
+        rng = np.random.default_rng()
+    if num_runs <= 0 or num_dims <= 0:
+        return np.empty((max(num_runs, 0), max(num_dims, 0)))
+
+    if method == "random":
+        samples = rng.random((num_runs, num_dims))
+    elif method == "lhs":
+        sizes, remaining = [], num_runs
+        for size in blocks or ():
+            if size <= 0:
+                raise ValueError(f"LHS block sizes must be positive, got {size}")
+            if remaining == 0:
+                break
+            sizes.append(min(size, remaining))
+            remaining -= sizes[-1]
+        if remaining:
+            sizes.append(remaining)
+        samples = np.vstack([_latin_hypercube(size, num_dims, rng) for size in sizes])
+    else:
+        from scipy.stats import qmc
+
+        sampler = qmc.Sobol(d=num_dims, scramble=True, seed=rng)
+        with warnings.catch_warnings():
+            # Balance is best at powers of two; any prefix is still valid.
+            warnings.simplefilter("ignore", UserWarning)
+            samples = sampler.random(num_runs)
+
+    return np.clip(samples, _UNIT_EPS, 1.0 - _UNIT_EPS)
+
+
+def tolerance_from_unit(value_str, tolerance_pct, distribution, u):
+    """Apply a tolerance using a pre-drawn sample *u* in (0, 1).
+
+    The quasi-random counterpart of :func:`apply_tolerance`: *u* is mapped
+    through the inverse CDF of the chosen distribution, so stratified or
+    low-discrepancy samples keep their coverage of the tolerance band.
+
+    Raises:
+        ValueError: If tolerance_pct is negative or distribution is unknown.
+    """
+    _check_tolerance_args(tolerance_pct, distribution)
+
+    base_value = parse_spice_value(value_str)
+    if base_value is None or base_value == 0:
+        return value_str
+
+    fraction = tolerance_pct / 100.0
+    u = min(max(float(u), _UNIT_EPS), 1.0 - _UNIT_EPS)
+    if distribution == "gaussian":
+        # Same 3-sigma convention as apply_tolerance
+        factor = 1.0 + NormalDist().inv_cdf(u) * fraction / 3.0
+    else:  # uniform
+        factor = 1.0 + (2.0 * u - 1.0) * fraction
+
+    return format_spice_value(base_value * factor)
+
+
+def check_convergence(values, criterion="ci_width", tolerance=0.01, confidence=0.95, spec_min=None, spec_max=None):
+    """Decide whether a Monte Carlo estimate has converged.
+
+    Args:
+        values: Metric values from the runs completed so far (NaNs ignored).
+        criterion: ``"ci_width"`` — the confidence-interval half-width of the
+            mean is at most *tolerance* x |mean| (absolute if the mean is 0).
+            ``"yield"`` — the Wilson interval half-width of the fraction of
+            runs within [spec_min, spec_max] is at most *tolerance*.
+        tolerance: Relative (ci_width) or absolute (yield) half-width target.
+        confidence: Two-sided confidence level, e.g. 0.95.
+        spec_min, spec_max: Pass limits for the yield criterion (either may
+            be None for a one-sided spec).
+
+    The intervals assume independent runs.  For Latin hypercube samples
+    drawn in blocks ending at the check points (see
+    :func:`generate_unit_samples`) they are conservative, since the
+    variance of a stratified mean is no larger than that of independent
+    draws.  Stopping an LHS design part-way through a block loses that
+    stratification, and the runs used are then no longer a hypercube.
+
+    Returns:
+        dict with ``converged``, ``count``, ``estimate`` (mean or yield) and
+        ``half_width``.
+
+    Raises:
+        ValueError: If *criterion* is unknown.
+    """
+    if criterion not in CONVERGENCE_CRITERIA:
+        raise ValueError(f"Unknown convergence criterion {criterion!r}, expected one of {CONVERGENCE_CRITERIA}")
+
+    arr = np.asarray(values, dtype=float)
+    arr = arr[~np.isnan(arr)]
+    n = len(arr)
+    result = {"converged": False, "count": n, "estimate": math.nan, "half_width": math.inf}
+    if n < 2:
+        return result
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+    if criterion == "ci_width":
+        mean = float(np.mean(arr))
+        half_width = z * float(np.std(arr, ddof=1)) / math.sqrt(n)
+        limit = tolerance * abs(mean) if mean != 0 else tolerance
+        result.update(estimate=mean, half_width=half_width, converged=half_width <= limit)
+        return result
+
+    passed = np.ones(n, dtype=bool)
+    if spec_min is not None:
+        passed &= arr >= spec_min
+    if spec_max is not None:
+        passed &= arr <= spec_max
+    p = float(np.count_nonzero(passed)) / n
+    # Wilson score interval — well behaved when the yield is near 0 or 1.
+    denom = 1.0 + z * z / n
+    half_width = z * math.sqrt(p * (1.0 - p) / n + z * z / (4.0 * n * n)) / denom
+    result.update(estimate=p, half_width=half_width, converged=half_width <= tolerance)
+    return result
+
+
 def compute_mc_statistics(values):
     """Compute statistics for a list of numeric values.
 
@@ -103,6 +103,7 @@ class NetlistGenerator:
         wrdata_filepath="transient_data.txt",
         spice_options=None,
         measurements=None,
+        line_cache=None,
     ):
         """
         Args:
@@ -115,6 +116,9 @@ class NetlistGenerator:
             wrdata_filepath: str - path for wrdata output file
             spice_options: Optional[dict[str, str]] - extra .options key=value pairs
             measurements: Optional[list[str]] - .meas directive strings
+            line_cache: Optional[dict] - per-component netlist lines reused
+                between calls; an entry is only reused for the same component
+                object with unchanged value and nodes
         """
         self.components = components
         self.wires = wires
@@ -126,6 +130,10 @@ class NetlistGenerator:
         self.spice_options = spice_options or {}
         self.measurements = measurements or []
         self._is_temp_sweep = False
+        self._line_cache = line_cache
+
+    # Component types whose lines depend on more than value and nodes
+    _UNCACHED_LINE_TYPES = {"Waveform Source"}
 
     # Component types that use non-numeric or compound value formats and
     # should not be rejected by the simple numeric validator.
@@ -271,117 +279,16 @@ class NetlistGenerator:
                 node_str = node_labels.get(node_num, str(node_num))
                 nodes.append(node_str)
 
-            if comp.component_type == "Resistor":
-                val = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {' '.join(nodes)} {val}")
-            elif comp.component_type == "Capacitor":
-                val = self._sanitize_value(comp.value)
-                ic = f" IC={comp.initial_condition}" if getattr(comp, "initial_condition", None) else ""
-                lines.append(f"{comp_id} {' '.join(nodes)} {val}{ic}")
-            elif comp.component_type == "Inductor":
-                val = self._sanitize_value(comp.value)
-                ic = f" IC={comp.initial_condition}" if getattr(comp, "initial_condition", None) else ""
-                lines.append(f"{comp_id} {' '.join(nodes)} {val}{ic}")
-            elif comp.component_type == "Voltage Source":
-                val = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {' '.join(nodes)} DC {val}")
-            elif comp.component_type == "Current Source":
-                val = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {' '.join(nodes)} DC {val}")
-            elif comp.component_type == "AC Voltage Source":
-                # Vxxx n+ n- AC magnitude phase
-                val = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {' '.join(nodes)} AC {val}")
-            elif comp.component_type == "AC Current Source":
-                # Ixxx n+ n- AC magnitude phase
-                val = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {' '.join(nodes)} AC {val}")
-            elif comp.component_type == "Current Probe":
-                # 0V voltage source for current measurement
-                lines.append(f"{comp_id} {' '.join(nodes)} 0")
-            elif comp.component_type == "Waveform Source":
-                # Use get_spice_value() method if available, otherwise use value
-                if hasattr(comp, "get_spice_value"):
-                    spice_value = self._sanitize_value(comp.get_spice_value())
-                else:
-                    spice_value = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {' '.join(nodes)} {spice_value}")
-            elif comp.component_type == "Op-Amp":
-                # Map terminals to subcircuit nodes: inp, inn, out
-                # Terminal 1 is non-inverting (inp), 0 is inverting (inn), 2 is output (out)
-                opamp_nodes = [nodes[1], nodes[0], nodes[2]]
-                model = comp.value if comp.value in OPAMP_SUBCIRCUITS else "Ideal"
-                subckt_name = "OPAMP_IDEAL" if model == "Ideal" else model
-                lines.append(f"X{comp_id} {' '.join(opamp_nodes)} {subckt_name}")
-            elif comp.component_type == "VCVS":
-                # E<name> out+ out- ctrl+ ctrl- gain
-                # Terminals: 0=ctrl+, 1=ctrl-, 2=out+, 3=out-
-                val = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {nodes[2]} {nodes[3]} {nodes[0]} {nodes[1]} {val}")
-            elif comp.component_type == "VCCS":
-                # G<name> out+ out- ctrl+ ctrl- transconductance
-                # Terminals: 0=ctrl+, 1=ctrl-, 2=out+, 3=out-
-                val = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {nodes[2]} {nodes[3]} {nodes[0]} {nodes[1]} {val}")
-            elif comp.component_type == "CCVS":
-                # H<name> out+ out- Vname transresistance
-                # Insert hidden 0V voltage source for current sensing
-                # Terminals: 0=ctrl+, 1=ctrl-, 2=out+, 3=out-
-                val = self._sanitize_value(comp.value)
-                sense_name = f"Vsense_{comp_id}"
-                lines.append(f"{sense_name} {nodes[0]} {nodes[1]} 0")
-                lines.append(f"{comp_id} {nodes[2]} {nodes[3]} {sense_name} {val}")
-            elif comp.component_type == "CCCS":
-                # F<name> out+ out- Vname gain
-                # Insert hidden 0V voltage source for current sensing
-                # Terminals: 0=ctrl+, 1=ctrl-, 2=out+, 3=out-
-                val = self._sanitize_value(comp.value)
-                sense_name = f"Vsense_{comp_id}"
-                lines.append(f"{sense_name} {nodes[0]} {nodes[1]} 0")
-                lines.append(f"{comp_id} {nodes[2]} {nodes[3]} {sense_name} {val}")
-            elif comp.component_type == "BJT NPN":
-                # Q<name> collector base emitter model_name
-                # Terminals: 0=collector, 1=base, 2=emitter
-                val = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {nodes[0]} {nodes[1]} {nodes[2]} {val}")
-            elif comp.component_type == "BJT PNP":
-                # Q<name> collector base emitter model_name
-                val = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {nodes[0]} {nodes[1]} {nodes[2]} {val}")
-            elif comp.component_type in ("MOSFET NMOS", "MOSFET PMOS"):
-                # M<name> drain gate source bulk model_name
-                # Terminals: 0=drain, 1=gate, 2=source
-                # Bulk (body) tied to source for simplicity
-                val = self._sanitize_value(comp.value)
-                lines.append(f"{comp_id} {nodes[0]} {nodes[1]} {nodes[2]} {nodes[2]} {val}")
-            elif comp.component_type == "VC Switch":
-                # S<name> switch+ switch- ctrl+ ctrl- model_name
-                # Terminals: 0=ctrl+, 1=ctrl-, 2=switch+, 3=switch-
-                model_name = f"SW_{comp_id}"
-                lines.append(f"{comp_id} {nodes[2]} {nodes[3]} {nodes[0]} {nodes[1]} {model_name}")
-            elif comp.component_type in ("Diode", "LED", "Zener Diode"):
-                # D<name> anode cathode model_name
-                # Terminals: 0=anode, 1=cathode
-                model_name = self._diode_model_map.get((comp.component_type, comp.value), f"D_{comp_id}")
-                lines.append(f"{comp_id} {nodes[0]} {nodes[1]} {model_name}")
-            elif comp.component_type == "Transformer":
-                # Transformer modeled as two coupled inductors + K coupling
-                # value = "Lprimary Lsecondary coupling" e.g. "10mH 10mH 0.99"
-                # Terminals: 0=prim+, 1=prim-, 2=sec+, 3=sec-
-                sanitized_val = self._sanitize_value(comp.value)
-                parts = sanitized_val.split()
-                l_prim = parts[0] if len(parts) > 0 else "10mH"
-                l_sec = parts[1] if len(parts) > 1 else "10mH"
-                coupling = parts[2] if len(parts) > 2 else "0.99"
-                prim_name = f"L_prim_{comp_id}"
-                sec_name = f"L_sec_{comp_id}"
-                lines.append(f"{prim_name} {nodes[0]} {nodes[1]} {l_prim}")
-                lines.append(f"{sec_name} {nodes[2]} {nodes[3]} {l_sec}")
-                lines.append(f"K_{comp_id} {prim_name} {sec_name} {coupling}")
-            elif comp.get_spice_symbol() == "X":
-                # Generic subcircuit instance (from subcircuit library)
-                # X<name> node1 node2 ... subckt_name
-                lines.append(f"X{comp_id} {' '.join(nodes)} {comp.value}")
+            diode_model = self._diode_model_map.get((comp.component_type, comp.value))
+            state = (comp.component_type, comp.value, comp.initial_condition, tuple(nodes), diode_model)
+            cached = self._line_cache.get(comp_id) if self._line_cache is not None else None
+            if cached is not None and cached[0] is comp and cached[1] == state:
+                lines.extend(cached[2])
+                continue
+            comp_lines = self._component_lines(comp, nodes)
+            if self._line_cache is not None and comp.component_type not in self._UNCACHED_LINE_TYPES:
+                self._line_cache[comp_id] = (comp, state, comp_lines)
+            lines.extend(comp_lines)
 
         # Add BJT model directives
         bjt_models = set()
@@ -470,6 +377,125 @@ class NetlistGenerator:
         # Defence-in-depth: scan final netlist for dangerous directives
         return sanitize_netlist_text("\n".join(lines))
 
+    def _component_lines(self, comp, nodes):
+        """Netlist lines for one component whose terminals map to *nodes*."""
+        from models.component import OPAMP_SUBCIRCUITS
+
+        comp_id = comp.component_id
+        lines = []
+        if comp.component_type == "Resistor":
+            val = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {' '.join(nodes)} {val}")
+        elif comp.component_type == "Capacitor":
+            val = self._sanitize_value(comp.value)
+            ic = f" IC={comp.initial_condition}" if getattr(comp, "initial_condition", None) else ""
+            lines.append(f"{comp_id} {' '.join(nodes)} {val}{ic}")
+        elif comp.component_type == "Inductor":
+            val = self._sanitize_value(comp.value)
+            ic = f" IC={comp.initial_condition}" if getattr(comp, "initial_condition", None) else ""
+            lines.append(f"{comp_id} {' '.join(nodes)} {val}{ic}")
+        elif comp.component_type == "Voltage Source":
+            val = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {' '.join(nodes)} DC {val}")
+        elif comp.component_type == "Current Source":
+            val = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {' '.join(nodes)} DC {val}")
+        elif comp.component_type == "AC Voltage Source":
+            # Vxxx n+ n- AC magnitude phase
+            val = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {' '.join(nodes)} AC {val}")
+        elif comp.component_type == "AC Current Source":
+            # Ixxx n+ n- AC magnitude phase
+            val = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {' '.join(nodes)} AC {val}")
+        elif comp.component_type == "Current Probe":
+            # 0V voltage source for current measurement
+            lines.append(f"{comp_id} {' '.join(nodes)} 0")
+        elif comp.component_type == "Waveform Source":
+            # Use get_spice_value() method if available, otherwise use value
+            if hasattr(comp, "get_spice_value"):
+                spice_value = self._sanitize_value(comp.get_spice_value())
+            else:
+                spice_value = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {' '.join(nodes)} {spice_value}")
+        elif comp.component_type == "Op-Amp":
+            # Map terminals to subcircuit nodes: inp, inn, out
+            # Terminal 1 is non-inverting (inp), 0 is inverting (inn), 2 is output (out)
+            opamp_nodes = [nodes[1], nodes[0], nodes[2]]
+            model = comp.value if comp.value in OPAMP_SUBCIRCUITS else "Ideal"
+            subckt_name = "OPAMP_IDEAL" if model == "Ideal" else model
+            lines.append(f"X{comp_id} {' '.join(opamp_nodes)} {subckt_name}")
+        elif comp.component_type == "VCVS":
+            # E<name> out+ out- ctrl+ ctrl- gain
+            # Terminals: 0=ctrl+, 1=ctrl-, 2=out+, 3=out-
+            val = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {nodes[2]} {nodes[3]} {nodes[0]} {nodes[1]} {val}")
+        elif comp.component_type == "VCCS":
+            # G<name> out+ out- ctrl+ ctrl- transconductance
+            # Terminals: 0=ctrl+, 1=ctrl-, 2=out+, 3=out-
+            val = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {nodes[2]} {nodes[3]} {nodes[0]} {nodes[1]} {val}")
+        elif comp.component_type == "CCVS":
+            # H<name> out+ out- Vname transresistance
+            # Insert hidden 0V voltage source for current sensing
+            # Terminals: 0=ctrl+, 1=ctrl-, 2=out+, 3=out-
+            val = self._sanitize_value(comp.value)
+            sense_name = f"Vsense_{comp_id}"
+            lines.append(f"{sense_name} {nodes[0]} {nodes[1]} 0")
+            lines.append(f"{comp_id} {nodes[2]} {nodes[3]} {sense_name} {val}")
+        elif comp.component_type == "CCCS":
+            # F<name> out+ out- Vname gain
+            # Insert hidden 0V voltage source for current sensing
+            # Terminals: 0=ctrl+, 1=ctrl-, 2=out+, 3=out-
+            val = self._sanitize_value(comp.value)
+            sense_name = f"Vsense_{comp_id}"
+            lines.append(f"{sense_name} {nodes[0]} {nodes[1]} 0")
+            lines.append(f"{comp_id} {nodes[2]} {nodes[3]} {sense_name} {val}")
+        elif comp.component_type == "BJT NPN":
+            # Q<name> collector base emitter model_name
+            # Terminals: 0=collector, 1=base, 2=emitter
+            val = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {nodes[0]} {nodes[1]} {nodes[2]} {val}")
+        elif comp.component_type == "BJT PNP":
+            # Q<name> collector base emitter model_name
+            val = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {nodes[0]} {nodes[1]} {nodes[2]} {val}")
+        elif comp.component_type in ("MOSFET NMOS", "MOSFET PMOS"):
+            # M<name> drain gate source bulk model_name
+            # Terminals: 0=drain, 1=gate, 2=source
+            # Bulk (body) tied to source for simplicity
+            val = self._sanitize_value(comp.value)
+            lines.append(f"{comp_id} {nodes[0]} {nodes[1]} {nodes[2]} {nodes[2]} {val}")
+        elif comp.component_type == "VC Switch":
+            # S<name> switch+ switch- ctrl+ ctrl- model_name
+            # Terminals: 0=ctrl+, 1=ctrl-, 2=switch+, 3=switch-
+            model_name = f"SW_{comp_id}"
+            lines.append(f"{comp_id} {nodes[2]} {nodes[3]} {nodes[0]} {nodes[1]} {model_name}")
+        elif comp.component_type in ("Diode", "LED", "Zener Diode"):
+            # D<name> anode cathode model_name
+            # Terminals: 0=anode, 1=cathode
+            model_name = self._diode_model_map.get((comp.component_type, comp.value), f"D_{comp_id}")
+            lines.append(f"{comp_id} {nodes[0]} {nodes[1]} {model_name}")
+        elif comp.component_type == "Transformer":
+            # Transformer modeled as two coupled inductors + K coupling
+            # value = "Lprimary Lsecondary coupling" e.g. "10mH 10mH 0.99"
+            # Terminals: 0=prim+, 1=prim-, 2=sec+, 3=sec-
+            sanitized_val = self._sanitize_value(comp.value)
+            parts = sanitized_val.split()
+            l_prim = parts[0] if len(parts) > 0 else "10mH"
+            l_sec = parts[1] if len(parts) > 1 else "10mH"
+            coupling = parts[2] if len(parts) > 2 else "0.99"
+            prim_name = f"L_prim_{comp_id}"
+            sec_name = f"L_sec_{comp_id}"
+            lines.append(f"{prim_name} {nodes[0]} {nodes[1]} {l_prim}")
+            lines.append(f"{sec_name} {nodes[2]} {nodes[3]} {l_sec}")
+            lines.append(f"K_{comp_id} {prim_name} {sec_name} {coupling}")
+        elif comp.get_spice_symbol() == "X":
+            # Generic subcircuit instance (from subcircuit library)
+            # X<name> node1 node2 ... subckt_name
+            lines.append(f"X{comp_id} {' '.join(nodes)} {comp.value}")
+        return lines
+
     def _inject_subcircuit_definitions(self, lines):
         """Inject .subckt definitions for any subcircuit-library components used."""
         try:
@@ -522,49 +548,6 @@ class NetlistGenerator:
         lines.append("* Control block for batch execution")
         lines.append(".control")
         lines.append("run")  # Run first to populate vectors
-        lines.append("")
-        lines.append("* Calculate voltage drops for all resistors")
-
-        # Generate appropriate print/plot commands based on analysis type
-        if node_labels:
-            print_vars = " ".join([f"v({label})" for label in node_labels.values()])
-        else:
-            print_vars = "all"
-        # Define variables for voltages across resistors
-        resistor_voltages_let = []
-        resistor_voltages_print = []
-        resistors = [c for c in self.components.values() if c.component_type == "Resistor"]
-        for res in resistors:
-            try:
-                node1_num = node_map.get((res.component_id, 0))
-                node2_num = node_map.get((res.component_id, 1))
-
-                if node1_num is not None and node2_num is not None:
-                    node1_str = node_labels.get(node1_num, str(node1_num))
-                    node2_str = node_labels.get(node2_num, str(node2_num))
-
-                    # Standardize to lowercase for easier parsing, e.g., v_r1
-                    alias = f"v_{res.component_id.lower()}"
-
-                    if node1_num == 0:  # Connected to ground
-                        let_expression = f"-v({node2_str})"
-                    elif node2_num == 0:  # Connected to ground
-                        let_expression = f"v({node1_str})"
-                    else:
-                        let_expression = f"v({node1_str}) - v({node2_str})"
-
-                    resistor_voltages_let.append(f"let {alias} = {let_expression}")
-                    resistor_voltages_print.append(alias)
-            except (KeyError, TypeError, AttributeError) as e:
-                logger.warning(
-                    "Could not create voltage calculation for %s: %s",
-                    res.component_id,
-                    e,
-                )
-
-        if resistor_voltages_let:
-            lines.extend(resistor_voltages_let)
-
         lines.append("")
         lines.append("* Print to stdout (for parser)")
 
@@ -607,9 +590,6 @@ class NetlistGenerator:
                     else:
                         all_print_vars.append(f"v({node})")
 
-            # Add resistor voltages to the print list
-            all_print_vars.extend(resistor_voltages_print)
-
             # Add current probe measurements: i(probe_id) for each Current Probe
             probes = [c for c in self.components.values() if c.component_type == "Current Probe"]
             for probe in sorted(probes, key=lambda c: c.component_id):
@@ -8,6 +8,7 @@ CircuitModel objects for display on the canvas.
 import logging
 import re
 
+from algorithms.layout import auto_layout_model
 from models.circuit import CircuitModel
 from models.component import DEFAULT_VALUES, SPICE_SYMBOLS, ComponentData
 from models.wire import WireData
@@ -35,6 +36,10 @@ _GRID_COLS = 5  # max components per row
 _START_X = -300
 _START_Y = -200
 
+LAYOUT_AUTO = "auto"
+LAYOUT_GRID = "grid"
+LAYOUT_MODES = (LAYOUT_AUTO, LAYOUT_GRID)
+
 
 class NetlistParseError(ValueError):
     """Raised when a netlist cannot be parsed."""
@@ -387,11 +392,13 @@ def _parse_dc_directive(line):
     return {"type": "DC Sweep", "params": params}
 
 
-def import_netlist(text):
+def import_netlist(text, layout=LAYOUT_AUTO):
     """Parse a SPICE netlist and build a CircuitModel.
 
     Args:
         text: The full text content of a .cir/.spice file.
+        layout: LAYOUT_AUTO places connected components next to each
+            other; LAYOUT_GRID keeps netlist order on a fixed grid.
 
     Returns:
         tuple of (CircuitModel, analysis_dict_or_None)
@@ -399,6 +406,8 @@ def import_netlist(text):
     Raises:
         NetlistParseError: If the netlist cannot be parsed.
     """
+    if layout not in LAYOUT_MODES:
+        raise ValueError(f"Unknown layout {layout!r}; expected one of {', '.join(LAYOUT_MODES)}")
     parsed = parse_netlist(text)
     components_data = parsed["components"]
     analysis = parsed["analysis"]
@@ -521,7 +530,11 @@ def import_netlist(text):
             )
             model.add_wire(wire)
 
-    # Phase 4: Rebuild node graph
+    # Phase 4: Place components by connectivity (wires now describe the nets)
+    if layout == LAYOUT_AUTO:
+        auto_layout_model(model, spacing=_GRID_SPACING, origin=(_START_X, _START_Y))
+
+    # Phase 5: Rebuild node graph
     model.rebuild_nodes()
 
     if analysis:
@@ -540,7 +553,7 @@ def _add_node_terminal(node_to_terminals, node_name, comp_id, term_idx):
 
 
 def _compute_layout(components_data):
-    """Compute grid positions for imported components.
+    """Compute fixed grid positions for imported components, in netlist order.
 
     Returns dict of comp_id -> (x, y).
     """
@@ -4,14 +4,33 @@ simulation/ngspice_runner.py
 Handles execution of ngspice simulations
 """
 
+import asyncio
+import itertools
 import os
 import subprocess
+import time
 from datetime import datetime
 
 from simulation.ngspice_config import resolve_ngspice_path
 from simulation.spice_sanitizer import validate_output_dir
 from utils.constants import SIMULATION_TIMEOUT
 
+# Distinguishes runs started within the same second
+_run_counter = itertools.count()
+
+# How often a cancellable run checks its cancel flag (seconds)
+_CANCEL_POLL_INTERVAL = 0.05
+
+
+async def _kill_process(proc):
+    """Kill an asyncio subprocess and reap it."""
+    if proc.returncode is None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+        await proc.wait()
+
 
 class NgspiceRunner:
     """Runs ngspice simulations and manages output files"""
@@ -32,8 +51,12 @@ class NgspiceRunner:
             "true",
             "yes",
         )
-        # Paths written during the most-recently completed run; cleaned up at
-        # the start of the next run so that results remain readable until then.
+        # Paths written by runs completed since the last cleanup; removed at
+        # the start of the next run so that results remain readable until
+        # then.  Runs only ever append here (see _track_run_files), so
+        # overlapping runs on one runner never drop each other's files.
+        # Only the thread that started a run appends its files, never an
+        # executor worker, so they cannot be handed to a cleanup early.
         self._prev_run_files: list[str] = []
         # Additional files registered by callers (e.g. wrdata files created by
         # SimulationController) that should be cleaned up on the next run.
@@ -57,14 +80,18 @@ class NgspiceRunner:
         """
         if self._keep_files:
             return
-        for path in self._prev_run_files + self._extra_cleanup_files:
+        paths, self._prev_run_files = self._prev_run_files, []
+        extra, self._extra_cleanup_files = self._extra_cleanup_files, []
+        for path in paths + extra:
             try:
                 if os.path.exists(path):
                     os.remove(path)
             except OSError:
                 pass
-        self._prev_run_files = []
-        self._extra_cleanup_files = []
+
+    def _track_run_files(self, paths: list[str]) -> None:
+        """Hand the files a finished run leaves behind to the next cleanup."""
+        self._prev_run_files.extend(paths)
 
     def find_ngspice(self):
         """Find ngspice executable on the system.
@@ -78,13 +105,154 @@ class NgspiceRunner:
             self.ngspice_cmd = result
         return result
 
-    def run_simulation(self, netlist_content):
+    def run_simulation(self, netlist_content, cancel=None):
         """
         Run ngspice simulation with the given netlist
 
+        Args:
+            netlist_content: Netlist text to simulate.
+            cancel: Optional ``threading.Event``; setting it from another
+                thread kills ngspice and the run returns a failure whose
+                stderr is "Simulation cancelled".
+
+        Returns:
+            tuple: (success: bool, output_file: str, stdout: str, stderr: str)
+        """
+        files, failure = self._prepare_run(netlist_content)
+        if failure:
+            return failure
+        result, run_files = self._run_prepared(*files, timeout=SIMULATION_TIMEOUT, cancel=cancel)
+        self._track_run_files(run_files)
+        return result
+
+    def _run_prepared(self, netlist_filename, output_filename, timeout, cancel=None):
+        """Run ngspice on an already written netlist, blocking until it exits.
+
+        Safe to call from a worker thread: nothing is tracked for cleanup
+        here.  Returns ``(result, files)``, where *files* are the paths the
+        run left behind, for the caller to hand to :meth:`_track_run_files`.
+        """
+        command = [self.ngspice_cmd, "-b", netlist_filename, "-o", output_filename]
+        try:
+            if cancel is None:
+                result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+                returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
+            else:
+                returncode, stdout, stderr = self._run_until_cancelled(command, timeout, cancel)
+                if returncode is None:
+                    return (False, None, "", "Simulation cancelled"), [netlist_filename, output_filename]
+            return self._finish_run(returncode, stdout, stderr, netlist_filename, output_filename)
+
+        except subprocess.TimeoutExpired:
+            return (False, None, "", f"Simulation timed out (>{timeout:g} seconds)"), [netlist_filename]
+        except (OSError, subprocess.SubprocessError) as e:
+            return (False, None, "", f"Simulation error: {str(e)}"), [netlist_filename]
+
+    @staticmethod
+    def _run_until_cancelled(command, timeout, cancel):
+        """Run *command* like ``subprocess.run`` but give up as soon as *cancel* is set.
+
+        Returns:
+            ``(returncode, stdout, stderr)``; returncode is None if the run
+            was cancelled and the process killed.
+
+        Raises:
+            subprocess.TimeoutExpired: ngspice ran longer than *timeout*.
+        """
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                stdout, stderr = proc.communicate(timeout=_CANCEL_POLL_INTERVAL)
+                return proc.returncode, stdout, stderr
+            except subprocess.TimeoutExpired:
+                if cancel.is_set() or time.monotonic() >= deadline:
+                    proc.kill()
+                    proc.communicate()
+                    if cancel.is_set():
+                        return None, "", ""
+                    raise subprocess.TimeoutExpired(command, timeout)
+
+    async def run_simulation_async(self, netlist_content, timeout=None, track_output=True):
+        """
+        Run ngspice with ``asyncio.create_subprocess_exec``.
+
+        Same contract as :meth:`run_simulation`, but the event loop stays
+        free while ngspice runs, so several simulations can overlap.  On
+        timeout or cancellation the ngspice process is killed.
+
+        Event loops that cannot start subprocesses (e.g. the selector loop
+        Jupyter uses on Windows) fall back to the blocking runner in the
+        loop's default executor.  The loop still stays free, but a
+        cancelled run then keeps going until ngspice exits or times out.
+
+        Args:
+            netlist_content: Netlist text to simulate.
+            timeout: Seconds to wait for ngspice (default SIMULATION_TIMEOUT).
+            track_output: Register the output file for cleanup by the next
+                run.  Pass False when other runs may start on this runner
+                before the output is read, and hand the file to
+                :meth:`register_extra_files` once it has been parsed.
+
         Returns:
             tuple: (success: bool, output_file: str, stdout: str, stderr: str)
         """
+        timeout = SIMULATION_TIMEOUT if timeout is None else timeout
+        files, failure = self._prepare_run(netlist_content)
+        if failure:
+            return failure
+        result, run_files = await self._run_prepared_async(*files, timeout)
+        if not track_output and result[1] is not None:
+            run_files = [path for path in run_files if path != result[1]]
+        self._track_run_files(run_files)
+        return result
+
+    async def _run_prepared_async(self, netlist_filename, output_filename, timeout):
+        """Asyncio counterpart of :meth:`_run_prepared`, with the same ``(result, files)`` return."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                self.ngspice_cmd,
+                "-b",
+                netlist_filename,
+                "-o",
+                output_filename,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except NotImplementedError:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._run_prepared, netlist_filename, output_filename, timeout)
+        except OSError as e:
+            return (False, None, "", f"Simulation error: {str(e)}"), [netlist_filename]
+
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            await _kill_process(proc)
+            return (False, None, "", f"Simulation timed out (>{timeout:g} seconds)"), [
+                netlist_filename,
+                output_filename,
+            ]
+        except asyncio.CancelledError:
+            await _kill_process(proc)
+            self._track_run_files([netlist_filename, output_filename])
+            raise
+
+        return self._finish_run(
+            proc.returncode,
+            stdout.decode(errors="replace"),
+            stderr.decode(errors="replace"),
+            netlist_filename,
+            output_filename,
+        )
+
+    def _prepare_run(self, netlist_content):
+        """Clean up the previous run, locate ngspice and write the netlist.
+
+        Returns:
+            ``((netlist_filename, output_filename), None)``, or ``(None, failure)``
+            where *failure* is the :meth:`run_simulation` result tuple.
+        """
         # Clean up temp files from the previous run before starting a new one.
         self._cleanup_prev_run()
 
@@ -92,10 +260,10 @@ class NgspiceRunner:
         if self.ngspice_cmd is None:
             ngspice_path = self.find_ngspice()
             if ngspice_path is None:
-                return False, None, "", "ngspice executable not found"
+                return None, (False, None, "", "ngspice executable not found")
 
-        # Create timestamped filenames
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Create unique timestamped filenames (runs may overlap, also across processes)
+        timestamp = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{next(_run_counter)}"
         netlist_filename = os.path.join(self.output_dir, f"netlist_{timestamp}.cir")
         output_filename = os.path.join(self.output_dir, f"output_{timestamp}.txt")
 
@@ -104,57 +272,37 @@ class NgspiceRunner:
             with open(netlist_filename, "w") as f:
                 f.write(netlist_content)
         except OSError as e:
-            return False, None, "", f"Failed to write netlist: {str(e)}"
+            return None, (False, None, "", f"Failed to write netlist: {str(e)}")
+        return (netlist_filename, output_filename), None
 
-        # Run ngspice
-        try:
-            result = subprocess.run(
-                [self.ngspice_cmd, "-b", netlist_filename, "-o", output_filename],
-                capture_output=True,
-                text=True,
-                timeout=SIMULATION_TIMEOUT,
-            )
+    def _finish_run(self, returncode, stdout, stderr, netlist_filename, output_filename):
+        """Classify a completed ngspice run into ``(result, files)``.
 
-            # Check if output file was created and is non-empty
-            if os.path.exists(output_filename) and os.path.getsize(output_filename) > 0:
-                # Track both files so the next run can clean them up.
-                self._prev_run_files = [netlist_filename, output_filename]
-
-                # Check exit code first — a non-zero return code means
-                # ngspice encountered an error even if it wrote output (#508).
-                if result.returncode != 0:
-                    return False, output_filename, result.stdout, result.stderr
-
-                # Detect convergence failures even when ngspice produces output.
-                # ngspice may write partial output before aborting, so check
-                # stderr and stdout for error patterns (#858).
-                from simulation.convergence import ErrorCategory, classify_error
-
-                error_category = classify_error(result.stderr or "", result.stdout or "")
-                if error_category != ErrorCategory.UNKNOWN:
-                    return False, output_filename, result.stdout, result.stderr
-                return True, output_filename, result.stdout, result.stderr
-            else:
-                # Track the netlist for cleanup; output was not produced.
-                self._prev_run_files = [netlist_filename]
-                return (
-                    False,
-                    None,
-                    result.stdout,
-                    result.stderr or "Simulation produced no output",
-                )
+        *result* is the run_simulation result tuple and *files* the paths
+        the next run should clean up.
+        """
+        # Check if output file was created and is non-empty
+        if os.path.exists(output_filename) and os.path.getsize(output_filename) > 0:
+            # Both files are left for the next run to clean up.
+            files = [netlist_filename, output_filename]
 
-        except subprocess.TimeoutExpired:
-            self._prev_run_files = [netlist_filename]
-            return (
-                False,
-                None,
-                "",
-                f"Simulation timed out (>{SIMULATION_TIMEOUT} seconds)",
-            )
-        except (OSError, subprocess.SubprocessError) as e:
-            self._prev_run_files = [netlist_filename]
-            return False, None, "", f"Simulation error: {str(e)}"
+            # Check exit code first — a non-zero return code means
+            # ngspice encountered an error even if it wrote output (#508).
+            if returncode != 0:
+                return (False, output_filename, stdout, stderr), files
+
+            # Detect convergence failures even when ngspice produces output.
+            # ngspice may write partial output before aborting, so check
+            # stderr and stdout for error patterns (#858).
+            from simulation.convergence import ErrorCategory, classify_error
+
+            error_category = classify_error(stderr or "", stdout or "")
+            if error_category != ErrorCategory.UNKNOWN:
+                return (False, output_filename, stdout, stderr), files
+            return (True, output_filename, stdout, stderr), files
+
+        # Only the netlist needs cleaning up; output was not produced.
+        return (False, None, stdout, stderr or "Simulation produced no output"), [netlist_filename]
 
     def read_output(self, output_filename):
         """Read simulation output file"""
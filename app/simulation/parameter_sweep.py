@@ -0,0 +1,175 @@
+"""
+Parameter sweep planning.
+
+Builds the value grids for one- and multi-dimensional parameter sweeps and
+picks refinement points for adaptive sweeps.  The simulation loop itself
+lives in SimulationController.run_parameter_sweep.
+No Qt dependencies — pure computation module.
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+from .monte_carlo import format_spice_value
+
+SWEEP_SPACINGS = ("linear", "log")
+SWEEP_MODES = ("grid", "adaptive")
+
+# Upper bound on the number of simulations in one grid sweep
+MAX_SWEEP_POINTS = 1000
+
+# Refinement stops splitting an interval once it is narrower than this
+# fraction of the sweep span (in the spacing's own coordinates).
+MIN_INTERVAL_FRACTION = 1e-6
+
+
+def _warp(values, spacing):
+    """Map sweep values into the coordinate where the spacing is uniform."""
+    values = np.asarray(values, dtype=float)
+    if spacing == "log":
+        return np.log10(np.abs(values))
+    return values
+
+
+def sweep_axis_values(start, stop, num_steps, spacing="linear"):
+    """
+    Return the values of one sweep axis.
+
+    Args:
+        start, stop: end points (inclusive)
+        num_steps: number of values; 1 yields just ``start``
+        spacing: "linear" or "log" (log requires non-zero end points of
+                 the same sign)
+
+    Raises:
+        ValueError: for an unknown spacing or invalid log end points
+    """
+    if spacing not in SWEEP_SPACINGS:
+        raise ValueError(f"Unknown sweep spacing '{spacing}'. Use one of: {', '.join(SWEEP_SPACINGS)}")
+    if spacing == "log" and (start == 0 or stop == 0 or (start > 0) != (stop > 0)):
+        raise ValueError("Logarithmic sweeps need non-zero start and stop values of the same sign")
+
+    if num_steps <= 1:
+        return [start]
+    if spacing == "log":
+        sign = 1.0 if start > 0 else -1.0
+        values = sign * np.logspace(math.log10(abs(start)), math.log10(abs(stop)), num_steps)
+        # Pin the end points so they are not perturbed by the log round trip
+        values[0], values[-1] = start, stop
+        return values.tolist()
+    return [start + (stop - start) * i / (num_steps - 1) for i in range(num_steps)]
+
+
+def normalize_sweep_parameters(sweep_config):
+    """
+    Return the list of swept parameters described by a sweep config.
+
+    Multi-dimensional sweeps list their axes under ``parameters``; the
+    original single-component keys (component_id, start, stop, num_steps,
+    spacing) are still accepted and describe a one-dimensional sweep.
+    Each entry is a dict with component_id, start, stop, num_steps and
+    spacing.
+    """
+    raw = sweep_config.get("parameters")
+    if not raw:
+        raw = [sweep_config]
+    return [
+        {
+            "component_id": p["component_id"],
+            "start": p["start"],
+            "stop": p["stop"],
+            "num_steps": p["num_steps"],
+            "spacing": p.get("spacing", "linear"),
+        }
+        for p in raw
+    ]
+
+
+def grid_sweep_points(parameters):
+    """
+    Return the full-factorial grid for a list of sweep parameters.
+
+    Points are tuples with one value per parameter, ordered with the first
+    parameter varying slowest (row-major, matching ``grid_shape``).
+
+    Returns:
+        (points, grid_shape)
+
+    Raises:
+        ValueError: if the grid would have more than MAX_SWEEP_POINTS points
+    """
+    num_points = math.prod(max(int(p["num_steps"]), 1) for p in parameters)
+    if num_points > MAX_SWEEP_POINTS:
+        raise ValueError(f"The sweep grid has {num_points} points; the limit is {MAX_SWEEP_POINTS}")
+    axes = [sweep_axis_values(p["start"], p["stop"], p["num_steps"], p["spacing"]) for p in parameters]
+    points = list(itertools.product(*axes))
+    return points, tuple(len(axis) for axis in axes)
+
+
+def refine_sweep_values(values, metric, spacing="linear", tolerance=0.05, max_new=None):
+    """
+    Pick new sweep values where an output metric changes fastest.
+
+    Each interval between neighbouring sweep values is scored by how much
+    the metric changes across it, as a fraction of the metric's total
+    range.  Intervals scoring above ``tolerance`` are bisected (at the
+    geometric mean for log spacing), largest change first.
+
+    Args:
+        values: sweep values simulated so far (any order)
+        metric: metric value for each sweep value; NaN marks a failed run
+        spacing: "linear" or "log"
+        tolerance: largest acceptable metric change per interval as a
+                   fraction of the metric range
+        max_new: cap on the number of values returned
+
+    Returns:
+        List of new sweep values, highest-priority first.  Empty when the
+        curve is resolved to the requested tolerance.  A bisection point
+        that formats (see format_spice_value) to the same SPICE value as
+        a neighbour or another new point is dropped, since it would only
+        repeat a simulation.
+    """
+    x = np.asarray(values, dtype=float)
+    y = np.asarray(metric, dtype=float)
+    if len(x) < 2:
+        return []
+
+    order = np.argsort(x)
+    x, y = x[order], y[order]
+    finite = np.isfinite(y)
+    if finite.sum() < 2:
+        return []
+    span = np.max(y[finite]) - np.min(y[finite])
+    if span == 0:
+        return []
+
+    u = _warp(x, spacing)
+    min_width = (u[-1] - u[0]) * MIN_INTERVAL_FRACTION
+    score = np.abs(np.diff(y)) / span
+    # Intervals touching a failed run cannot be scored; leave them alone.
+    score[~(finite[:-1] & finite[1:])] = 0.0
+    score[np.diff(u) <= min_width] = 0.0
+
+    candidates = np.flatnonzero(score > tolerance)
+    candidates = candidates[np.argsort(-score[candidates], kind="stable")]
+    if max_new is not None:
+        candidates = candidates[:max_new]
+
+    new_values = []
+    seen = set()
+    for i in candidates:
+        if spacing == "log":
+            mid = math.copysign(10 ** ((u[i] + u[i + 1]) / 2), x[i])
+        else:
+            mid = (x[i] + x[i + 1]) / 2
+        text = format_spice_value(float(mid))
+        if not x[i] < mid < x[i + 1] or text in seen:
+            continue
+        if text in (format_spice_value(float(x[i])), format_spice_value(float(x[i + 1]))):
+            continue
+        seen.add(text)
+        new_values.append(float(mid))
+    return new_values
@@ -1,13 +1,31 @@
 """
 simulation/power_metrics.py
 
-Computes RMS voltage/current and average/peak power from transient simulation data.
+Computes RMS voltage/current, average/peak power and energy from transient
+simulation data.
+
+The engine works on columnar ``(runs x samples)`` arrays (see
+StackedResults), so one transient run and a whole sweep or Monte Carlo
+study go through the same code.  Terminal currents come from the
+component values (resistors, capacitors, current sources), from simulator
+vectors when present (``i(<device>)`` branch currents, ``@<device>[...]``
+internals) and, for the rest, from Kirchhoff's current law: each device
+port and each node with a single unknown terminal current determines it.
+Power is integrated over time with the trapezoid rule.  By Tellegen's
+theorem the energies of all components sum to zero, which gives a
+per-run energy-balance check.
 """
 
 import math
+import warnings
+from dataclasses import dataclass, field
 
+import numpy as np
 from utils.format_utils import parse_value
 
+from .stacked_results import StackedResults
+from .waveform_expressions import ExpressionError, WaveformEvaluator
+
 
 def compute_rms(values):
     """Compute the RMS (root-mean-square) of a list of numeric values.
@@ -24,76 +42,455 @@ def compute_rms(values):
     return math.sqrt(mean_sq)
 
 
-def compute_transient_power_metrics(tran_data, components):
+# Ports of multi-terminal parts: terminal groups whose currents sum to zero
+# inside the part.  Two-terminal parts are the single port (0, 1); other
+# multi-terminal parts (library subcircuits) get one open port per terminal.
+_PORTS = {
+    # Output current returns through the (implicit) supplies
+    "Op-Amp": ((0,), (1,), (2,)),
+    "VCVS": ((0, 1), (2, 3)),
+    "VCCS": ((0, 1), (2, 3)),
+    "CCVS": ((0, 1), (2, 3)),
+    "CCCS": ((0, 1), (2, 3)),
+    "VC Switch": ((0, 1), (2, 3)),
+    "Transformer": ((0, 1), (2, 3)),
+    "BJT NPN": ((0, 1, 2),),
+    "BJT PNP": ((0, 1, 2),),
+    "MOSFET NMOS": ((0, 1, 2),),
+    "MOSFET PMOS": ((0, 1, 2),),
+}
+
+# Ideal control inputs, which draw no current
+_NO_CURRENT = {
+    "Op-Amp": (0, 1),
+    "VCVS": (0, 1),
+    "VCCS": (0, 1),
+    "VC Switch": (0, 1),
+}
+
+# Ports across a 0 V sense source: they carry current but absorb no power
+_SENSE_PORTS = {
+    "CCVS": (0, 1),
+    "CCCS": (0, 1),
+    "Current Probe": (0, 1),
+}
+
+# Simulator vectors holding the current into a terminal, as name templates
+# over the lowercase netlist name.  Two-terminal parts not listed here are
+# looked up as ``i(<id>)`` on terminal 0.
+_CURRENT_VECTORS = {
+    "Resistor": (),
+    "Capacitor": (),
+    "CCVS": ((0, "i(vsense_{id})"), (2, "i({id})")),
+    "CCCS": ((0, "i(vsense_{id})"),),
+    "VCVS": ((2, "i({id})"),),
+    "Transformer": ((0, "i(l_prim_{id})"), (2, "i(l_sec_{id})")),
+    "Diode": ((0, "@{id}[id]"),),
+    "LED": ((0, "@{id}[id]"),),
+    "Zener Diode": ((0, "@{id}[id]"),),
+    "BJT NPN": ((0, "@{id}[ic]"), (1, "@{id}[ib]"), (2, "@{id}[ie]")),
+    "BJT PNP": ((0, "@{id}[ic]"), (1, "@{id}[ib]"), (2, "@{id}[ie]")),
+    "MOSFET NMOS": ((0, "@{id}[id]"), (1, "@{id}[ig]"), (2, "@{id}[is]")),
+    "MOSFET PMOS": ((0, "@{id}[id]"), (1, "@{id}[ig]"), (2, "@{id}[is]")),
+}
+
+# Instruments rather than circuit elements; never listed in the metrics
+_NOT_REPORTED = ("Ground", "Current Probe")
+
+
+def _terminal_labels(nodes):
+    """Map ``(component_id, terminal)`` to the node label used in the netlist."""
+    labels = {}
+    for node in nodes or ():
+        label = "0" if node.is_ground else node.get_label()
+        for comp_id, term_idx in node.terminals:
+            labels[(comp_id, term_idx)] = label
+    return labels
+
+
+def _ports(comp):
+    count = comp.get_terminal_count()
+    ports = _PORTS.get(comp.component_type)
+    if ports is not None:
+        return ports
+    return ((0, 1),) if count == 2 else tuple((k,) for k in range(count))
+
+
+def _time_average(values, time):
+    """Time-weighted mean of each row of *values* over *time* (trapezoid rule).
+
+    ngspice picks its transient timestep adaptively, so a plain sample
+    mean over-weights the densely sampled edges.  Falls back to the
+    sample mean when the record spans no time.
+    """
+    span = time[-1] - time[0] if len(time) > 1 else 0.0
+    if not span > 0:
+        return np.nanmean(values, axis=-1)
+    return np.trapezoid(values, time, axis=-1) / span
+
+
+@dataclass
+class PowerAnalysis:
+    """Per-component power of every run of a transient result.
+
+    All waveforms are ``(runs x samples)`` arrays on :attr:`time`; the
+    reductions return one value per run.  Power is absorbed power
+    (passive sign convention): positive when a part dissipates or stores
+    energy, negative when it delivers it.
+
+    Attributes:
+        time: Shared time axis.
+        power: Component ID -> instantaneous absorbed power.
+        voltage: Component ID -> voltage from terminal 0 to terminal 1
+            (two-terminal parts only).
+        current: Component ID -> current into terminal 0 (two-terminal
+            parts only).
+        stored_energy: Component ID -> energy held by capacitors and
+            inductors.
+        component_types: Component ID -> component type.
+        values: Component ID -> value string.
+        unresolved: Components whose power could not be determined.
+    """
+
+    time: np.ndarray
+    power: dict = field(default_factory=dict)
+    voltage: dict = field(default_factory=dict)
+    current: dict = field(default_factory=dict)
+    stored_energy: dict = field(default_factory=dict)
+    component_types: dict = field(default_factory=dict)
+    values: dict = field(default_factory=dict)
+    unresolved: list = field(default_factory=list)
+
+    @property
+    def num_runs(self) -> int:
+        return next(iter(self.power.values())).shape[0] if self.power else 0
+
+    def energy(self, component_id: str) -> np.ndarray:
+        """Energy absorbed by a component over the record, per run."""
+        power = self.power[component_id]
+        if len(self.time) < 2:
+            return np.zeros(power.shape[0])
+        return np.trapezoid(power, self.time, axis=-1)
+
+    def average_power(self, component_id: str) -> np.ndarray:
+        """Time-weighted average power, per run."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return _time_average(self.power[component_id], self.time)
+
+    def peak_power(self, component_id: str) -> np.ndarray:
+        """Largest instantaneous power magnitude, per run."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return np.nanmax(np.abs(self.power[component_id]), axis=-1)
+
+    def rms(self, values: np.ndarray) -> np.ndarray:
+        """Time-weighted RMS of a ``(runs x samples)`` waveform, per run."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return np.sqrt(_time_average(values * values, self.time))
+
+    def energy_balance(self) -> dict:
+        """Delivered vs absorbed energy of each run.
+
+        Returns:
+            dict of per-run arrays: ``delivered`` (energy from parts with
+            negative net energy), ``absorbed``, ``residual`` (their
+            difference, ideally zero) and ``relative_error`` (residual over
+            the larger of the two).  The check is only meaningful when
+            :attr:`unresolved` is empty.
+        """
+        if not self.power:
+            zeros = np.zeros(0)
+            return {"delivered": zeros, "absorbed": zeros, "residual": zeros, "relative_error": zeros}
+        energies = np.array([self.energy(cid) for cid in self.power])
+        delivered = -np.sum(np.minimum(energies, 0.0), axis=0)
+        absorbed = np.sum(np.maximum(energies, 0.0), axis=0)
+        residual = absorbed - delivered
+        scale = np.maximum(delivered, absorbed)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative = np.where(scale > 0, residual / scale, 0.0)
+        return {"delivered": delivered, "absorbed": absorbed, "residual": residual, "relative_error": relative}
+
+    def metrics(self, run: int = 0) -> list[dict]:
+        """Per-component metrics of one run, in the format of compute_transient_power_metrics."""
+        results = []
+        for comp_id, power in self.power.items():
+            component_type = self.component_types[comp_id]
+            if component_type in _NOT_REPORTED or np.isnan(power[run]).all():
+                continue
+            voltage = self.voltage.get(comp_id)
+            current = self.current.get(comp_id)
+            vrms = float(self.rms(voltage[run : run + 1])[0]) if voltage is not None else None
+            irms = float(self.rms(current[run : run + 1])[0]) if current is not None else None
+            stored = self.stored_energy.get(comp_id)
+            results.append(
+                {
+                    "component_id": comp_id,
+                    "component_type": component_type,
+                    "value": self.values[comp_id],
+                    "vrms": vrms,
+                    "irms": irms,
+                    "pavg": float(self.average_power(comp_id)[run]),
+                    "ppeak": float(self.peak_power(comp_id)[run]),
+                    "energy": float(self.energy(comp_id)[run]),
+                    "stored_energy": float(stored[run, -1]) if stored is not None else None,
+                }
+            )
+        return results
+
+
+class _PowerEngine:
+    """Resolves terminal currents and power for one StackedResults."""
+
+    def __init__(self, stacked, components, nodes, run_values):
+        self.evaluator = WaveformEvaluator(stacked)
+        self.time = np.asarray(stacked.axis, dtype=float)
+        self.shape = (stacked.num_runs, max(len(self.time), 1))
+        self.components = {cid: c for cid, c in components.items() if c.component_type != "Ground"}
+        self.nodes = nodes
+        self.labels = _terminal_labels(nodes)
+        self.run_values = run_values
+        # (component_id, terminal) -> current into that terminal
+        self.currents = {}
+
+    # --- Signals ---
+
+    def _vector(self, expression):
+        try:
+            return np.broadcast_to(self.evaluator.evaluate(expression), self.shape)
+        except ExpressionError:
+            return None
+
+    def node_voltage(self, comp_id, terminal):
+        label = self.labels.get((comp_id, terminal))
+        return None if label is None else self._vector(f"v({label})")
+
+    def voltage_across(self, comp_id, a=0, b=1):
+        """Voltage from terminal *a* to *b*, from the node waveforms.
+
+        Results from older netlists that still carry a ``v_<id>`` vector
+        use it for the main port.
+        """
+        va, vb = self.node_voltage(comp_id, a), self.node_voltage(comp_id, b)
+        if va is not None and vb is not None:
+            return va - vb
+        if (a, b) == (0, 1) and self.labels.get((comp_id, 0)) is None:
+            return self._vector(f"v_{comp_id.lower()}")
+        return None
+
+    def value(self, comp):
+        """Component value as a ``(runs x 1)`` column, or None if unparseable.
+
+        *run_values* (one ``{component_id: value}`` dict per run, as kept
+        by Monte Carlo studies) overrides the nominal value run by run.
+        """
+        texts = [comp.value] * self.shape[0]
+        for run, overrides in enumerate((self.run_values or [])[: self.shape[0]]):
+            texts[run] = (overrides or {}).get(comp.component_id, comp.value)
+        try:
+            return np.array([parse_value(text) for text in texts], dtype=float)[:, None]
+        except (ValueError, TypeError):
+            return None
+
+    # --- Currents ---
+
+    def seed_currents(self):
+        """Currents known without solving: from values and simulator vectors."""
+        for comp_id, comp in self.components.items():
+            component_type = comp.component_type
+            for terminal in _NO_CURRENT.get(component_type, ()):
+                self.currents[(comp_id, terminal)] = np.zeros(self.shape)
+
+            templates = _CURRENT_VECTORS.get(component_type)
+            if templates is None:
+                templates = ((0, "i({id})"),) if comp.get_terminal_count() == 2 else ()
+            for terminal, template in templates:
+                vector = self._vector(template.format(id=comp_id.lower()))
+                if vector is not None:
+                    self.currents[(comp_id, terminal)] = vector
+
+            current = self._current_from_value(comp)
+            if current is not None:
+                self.currents[(comp_id, 0)] = current
+
+    def _current_from_value(self, comp):
+        component_type = comp.component_type
+        if component_type == "AC Current Source":
+            # AC-only sources are open in a transient run
+            return np.zeros(self.shape)
+        if component_type not in ("Resistor", "Capacitor", "Current Source"):
+            return None
+        value = self.value(comp)
+        if value is None:
+            return None
+        if component_type == "Current Source":
+            return np.broadcast_to(value, self.shape)
+        voltage = self.voltage_across(comp.component_id)
+        if voltage is None:
+            return None
+        if component_type == "Resistor":
+            if not (value > 0).all():
+                return None
+            return voltage / value
+        if len(self.time) < 2:
+            return np.zeros(self.shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return value * np.gradient(voltage, self.time, axis=-1)
+
+    def _constraints(self):
+        """Terminal groups whose currents sum to zero (device ports and nodes)."""
+        groups = []
+        open_terminal = False
+        for comp_id, comp in self.components.items():
+            no_current = _NO_CURRENT.get(comp.component_type, ())
+            for port in _ports(comp):
+                if len(port) > 1:
+                    groups.append(tuple((comp_id, k) for k in port))
+                elif port[0] not in no_current:
+                    open_terminal = True
+        for node in self.nodes or ():
+            # A part whose current returns through an implicit ground breaks KCL there
+            if node.is_ground and open_terminal:
+                continue
+            group = tuple(sorted(t for t in node.terminals if t[0] in self.components))
+            if group:
+                groups.append(group)
+        return groups
+
+    def solve_currents(self):
+        """Fill in currents by KCL wherever a group has one unknown terminal."""
+        pending = self._constraints()
+        while pending:
+            remaining = []
+            for group in pending:
+                unknown = [t for t in group if t not in self.currents]
+                if len(unknown) == 1:
+                    total = np.zeros(self.shape)
+                    for terminal in group:
+                        if terminal != unknown[0]:
+                            total = total + self.currents[terminal]
+                    self.currents[unknown[0]] = -total
+                elif unknown:
+                    remaining.append(group)
+            if len(remaining) == len(pending):
+                break
+            pending = remaining
+
+    # --- Power ---
+
+    def port_power(self, comp_id, component_type, port):
+        currents = [self.currents.get((comp_id, k)) for k in port]
+        if tuple(port) == _SENSE_PORTS.get(component_type):
+            return np.zeros(self.shape)
+        if len(port) == 2 and currents[0] is not None:
+            voltage = self.voltage_across(comp_id, *port)
+            return None if voltage is None else voltage * currents[0]
+        if any(current is None for current in currents):
+            return None
+        total = np.zeros(self.shape)
+        for terminal, current in zip(port, currents):
+            voltage = self.node_voltage(comp_id, terminal)
+            if voltage is None:
+                return None
+            total = total + voltage * current
+        return total
+
+    def analyze(self):
+        self.seed_currents()
+        self.solve_currents()
+        analysis = PowerAnalysis(time=self.time)
+        for comp_id, comp in self.components.items():
+            component_type = comp.component_type
+            analysis.component_types[comp_id] = component_type
+            analysis.values[comp_id] = comp.value
+            ports = _ports(comp)
+
+            power = self._vector(f"@{comp_id.lower()}[p]")
+            if power is None:
+                parts = [self.port_power(comp_id, component_type, port) for port in ports]
+                if any(part is None for part in parts):
+                    analysis.unresolved.append(comp_id)
+                    continue
+                power = sum(parts[1:], parts[0])
+            analysis.power[comp_id] = np.asarray(power, dtype=float)
+
+            if ports == ((0, 1),):
+                voltage = self.voltage_across(comp_id)
+                current = self.currents.get((comp_id, 0))
+                if voltage is not None:
+                    analysis.voltage[comp_id] = voltage
+                if current is not None:
+                    analysis.current[comp_id] = current
+                value = self.value(comp) if component_type in ("Capacitor", "Inductor") else None
+                if value is not None:
+                    across = voltage if component_type == "Capacitor" else current
+                    if across is not None:
+                        analysis.stored_energy[comp_id] = 0.5 * value * across * across
+        return analysis
+
+
+def analyze_power(data, components, nodes=None, run_values=None) -> PowerAnalysis:
+    """Time-domain power of every component, for one run or a whole study.
+
+    Args:
+        data: Transient row dicts from parse_transient_results, or a
+            StackedResults of a transient sweep / Monte Carlo study.
+        components: dict mapping component_id -> ComponentData.
+        nodes: list of NodeData used to find the nodes on each terminal.
+            Without it only legacy ``v_<id>`` vectors give voltages and
+            no currents can be derived by KCL.
+        run_values: Optional per-run ``{component_id: value}`` overrides,
+            e.g. ``run_values`` of a Monte Carlo result.
+
+    Returns:
+        PowerAnalysis (empty when there is no data).
+    """
+    if not isinstance(data, StackedResults):
+        data = WaveformEvaluator.from_result("Transient", data or []).stacked
+    if not data.ok.any() or not components:
+        return PowerAnalysis(time=np.asarray(data.axis, dtype=float))
+    return _PowerEngine(data, components, nodes, run_values).analyze()
+
+
+def compute_transient_power_metrics(tran_data, components, nodes=None):
     """Compute power metrics from transient simulation data.
 
-    For each resistor, computes:
-    - Vrms: RMS voltage across the component
-    - Irms: RMS current through the component
-    - Pavg: average power dissipated
+    For each component whose power can be resolved, computes:
+    - Vrms: RMS voltage across the component (two-terminal parts)
+    - Irms: RMS current through the component (two-terminal parts)
+    - Pavg: average absorbed power (negative for a part delivering power)
     - Ppeak: peak instantaneous power
+    - energy: energy absorbed over the record
+    - stored_energy: energy held at the end (capacitors and inductors)
+
+    Averages are taken over time rather than over samples, since ngspice's
+    transient timestep is not uniform.
 
     Args:
         tran_data: list[dict] — time-series data from parse_transient_results.
-            Each dict has keys like "time", node labels, and "v_r1" for resistor voltages.
+            Each dict has "time" plus one key per node label.
         components: dict mapping component_id -> ComponentData
+        nodes: list of NodeData used to find the nodes on each terminal.
+            Without it only legacy ``v_<id>`` vectors are used.
 
     Returns:
-        list[dict] with keys: component_id, component_type, value, vrms, irms, pavg, ppeak.
+        list[dict] with keys: component_id, component_type, value, vrms, irms,
+        pavg, ppeak, energy, stored_energy (vrms/irms/stored_energy may be None).
         Only includes components for which metrics could be computed.
     """
     if not tran_data or not components:
         return []
-
-    results = []
-
-    for comp_id, comp in components.items():
-        if comp.component_type == "Ground":
-            continue
-
-        # Look for voltage-across vector in the transient data
-        v_key = f"v_{comp_id.lower()}"
-        if v_key not in tran_data[0]:
-            continue
-
-        voltage_series = [row[v_key] for row in tran_data if v_key in row]
-        if not voltage_series:
-            continue
-
-        vrms = compute_rms(voltage_series)
-
-        if comp.component_type == "Resistor":
-            try:
-                resistance = parse_value(comp.value)
-                if resistance <= 0:
-                    continue
-            except (ValueError, TypeError):
-                continue
-
-            irms = vrms / resistance
-            # Instantaneous power at each time point: P(t) = V(t)^2 / R
-            power_series = [v * v / resistance for v in voltage_series]
-            pavg = sum(power_series) / len(power_series)
-            ppeak = max(abs(p) for p in power_series)
-
-            results.append(
-                {
-                    "component_id": comp_id,
-                    "component_type": comp.component_type,
-                    "value": comp.value,
-                    "vrms": vrms,
-                    "irms": irms,
-                    "pavg": pavg,
-                    "ppeak": ppeak,
-                }
-            )
-
-    return results
+    return analyze_power(tran_data, components, nodes).metrics()
 
 
 def format_power_summary(metrics):
     """Format power metrics as a text table for display.
 
+    Parts that deliver energy show a negative Pavg.  When any part does,
+    an energy balance (delivered vs absorbed) follows the table; stored
+    energy at the end of the record is listed for capacitors and inductors.
+
     Args:
         metrics: list of dicts from compute_transient_power_metrics
 
@@ -115,19 +512,36 @@ def format_power_summary(metrics):
         total_pavg += m["pavg"]
         lines.append(
             f"  {m['component_id']:<12s} {m['value']:>8s}"
-            f" {_fmt_eng(m['vrms'], 'V'):>12s}"
-            f" {_fmt_eng(m['irms'], 'A'):>12s}"
+            f" {_fmt_optional(m['vrms'], 'V'):>12s}"
+            f" {_fmt_optional(m['irms'], 'A'):>12s}"
             f" {_fmt_eng(m['pavg'], 'W'):>12s}"
             f" {_fmt_eng(m['ppeak'], 'W'):>12s}"
         )
 
     lines.append("-" * 70)
     lines.append(f"  {'Total Pavg':<12s} {'':>8s} {'':>12s} {'':>12s} {_fmt_eng(total_pavg, 'W'):>12s}")
+
+    energies = [m["energy"] for m in metrics if m.get("energy") is not None]
+    delivered = -sum(e for e in energies if e < 0)
+    if delivered > 0:
+        absorbed = sum(e for e in energies if e > 0)
+        residual = (absorbed - delivered) / max(absorbed, delivered)
+        lines.append(
+            f"  Energy: delivered {_fmt_eng(delivered, 'J')}, absorbed {_fmt_eng(absorbed, 'J')}"
+            f" (balance error {residual:+.2%})"
+        )
+    stored = [f"{m['component_id']} {_fmt_eng(m['stored_energy'], 'J')}" for m in metrics if m.get("stored_energy")]
+    if stored:
+        lines.append(f"  Stored at end: {', '.join(stored)}")
     lines.append("=" * 70)
 
     return "\n".join(lines)
 
 
+def _fmt_optional(value, unit):
+    return "-" if value is None else _fmt_eng(value, unit)
+
+
 def _fmt_eng(value, unit):
     """Format a value in engineering notation with SI prefix."""
     if value == 0:
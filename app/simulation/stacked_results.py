@@ -0,0 +1,378 @@
+"""
+Compact storage for multi-run studies (parameter sweeps, Monte Carlo).
+
+Instead of keeping every run's row-dict payload, netlist and raw ngspice
+output, each signal is stacked into a 2-D ``(runs x samples)`` NumPy
+array on a shared time / frequency / sweep axis.  Failed runs are kept
+as NaN rows so that row *i* always corresponds to run *i*.
+
+No Qt dependencies — pure computation module.
+"""
+
+import dataclasses
+import warnings
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+# Base analysis types whose payloads can be stacked.
+STACKABLE_TYPES = ("DC Operating Point", "Transient", "DC Sweep", "AC Sweep")
+
+# Per-run scalar reductions accepted by StackedResults.run_metric().
+RUN_METRICS = ("final", "initial", "mid", "max", "min", "pp", "mean", "rms")
+
+_AXIS_NAMES = {
+    "DC Operating Point": "",
+    "Transient": "time",
+    "AC Sweep": "frequency",
+}
+
+
+def _extract_run(analysis_type, data):
+    """Convert one run's parsed payload into ``(axis, signals, phase, axis_name)``.
+
+    *axis* is ``None`` for single-point analyses (DC operating point).
+    Returns ``None`` when the payload has no usable data.
+    """
+    if data is None:
+        return None
+
+    if analysis_type == "DC Operating Point":
+        if isinstance(data, dict) and "node_voltages" in data:
+            voltages = data.get("node_voltages") or {}
+            currents = data.get("branch_currents") or {}
+        elif isinstance(data, dict):
+            voltages, currents = data, {}
+        else:
+            return None
+        signals = {node: np.array([float(v)]) for node, v in voltages.items()}
+        for device, current in currents.items():
+            signals[f"i({device})"] = np.array([float(current)])
+        return (None, signals, {}, "") if signals else None
+
+    if analysis_type == "Transient":
+        if not isinstance(data, list) or not data:
+            return None
+        keys = [k for k in data[0].keys() if k.lower() not in ("time", "index")]
+        axis = np.array([row.get("time", 0.0) for row in data], dtype=float)
+        signals = {k: np.array([row.get(k, np.nan) for row in data], dtype=float) for k in keys}
+        return axis, signals, {}, "time"
+
+    if analysis_type == "DC Sweep":
+        if not isinstance(data, dict):
+            return None
+        headers = data.get("headers", [])
+        rows = data.get("data", [])
+        if not rows or len(headers) < 3:
+            return None
+        table = np.asarray(rows, dtype=float)
+        signals = {headers[c]: table[:, c] for c in range(2, len(headers))}
+        return table[:, 1], signals, {}, headers[1]
+
+    if analysis_type == "AC Sweep":
+        if not isinstance(data, dict) or not data.get("frequencies"):
+            return None
+        axis = np.asarray(data["frequencies"], dtype=float)
+        signals = {node: np.asarray(vals, dtype=float) for node, vals in data.get("magnitude", {}).items()}
+        phase = {node: np.asarray(vals, dtype=float) for node, vals in data.get("phase", {}).items()}
+        return axis, signals, phase, "frequency"
+
+    return None
+
+
+def _stack(names, runs, ref_axis, which):
+    """Stack per-run vectors for *names* onto *ref_axis*; missing rows are NaN."""
+    n_samples = 1 if ref_axis is None else len(ref_axis)
+    stacked = {}
+    for name in names:
+        arr = np.full((len(runs), n_samples), np.nan)
+        for i, run in enumerate(runs):
+            if run is None:
+                continue
+            axis, vectors = run[0], run[which]
+            vec = vectors.get(name)
+            if vec is None or len(vec) == 0:
+                continue
+            if ref_axis is None or (len(axis) == n_samples and np.array_equal(axis, ref_axis)):
+                arr[i, : len(vec)] = vec[:n_samples]
+            else:
+                # Adaptive transient timesteps give each run its own axis.
+                if axis[0] > axis[-1]:
+                    axis, vec = axis[::-1], vec[::-1]
+                arr[i] = np.interp(ref_axis, axis, vec)
+        stacked[name] = arr
+    return stacked
+
+
+class StackedResultsBuilder:
+    """Accumulates per-run results and produces a :class:`StackedResults`.
+
+    Runs are converted to arrays as they arrive, so the row-dict payload
+    of a run can be released as soon as :meth:`add` returns.
+    """
+
+    def __init__(self, analysis_type: str, keep_raw_output: bool = False):
+        self.analysis_type = analysis_type
+        self.keep_raw_output = keep_raw_output
+        self._runs: list = []
+        self._netlist = ""
+        self._raw_outputs: list[str] = []
+        self._use_db = False
+
+    def add(self, result):
+        """Record one run and return a compact copy of *result*.
+
+        The copy keeps status, errors and measurements but drops the netlist
+        and (unless *keep_raw_output*) the raw ngspice output.  Its ``data``
+        is dropped too once the payload has been stacked.
+        """
+        run = self.add_data(result.data if result.success else None)
+
+        if result.netlist and not self._netlist:
+            self._netlist = result.netlist
+        if self.keep_raw_output:
+            self._raw_outputs.append(result.raw_output)
+
+        changes = {"netlist": ""}
+        if not self.keep_raw_output:
+            changes["raw_output"] = ""
+        if run is not None:
+            changes["data"] = None
+        return dataclasses.replace(result, **changes)
+
+    def add_data(self, data):
+        """Record one run's parsed payload (``None`` for a failed run).
+
+        Returns the extracted run, or ``None`` if nothing could be stacked.
+        """
+        run = None
+        if data is not None and self.analysis_type in STACKABLE_TYPES:
+            run = _extract_run(self.analysis_type, data)
+            if run is not None and isinstance(data, dict) and data.get("use_db"):
+                self._use_db = True
+        self._runs.append(run)
+        return run
+
+    def build(self, signals=None) -> "StackedResults":
+        """Stack all recorded runs onto a shared axis.
+
+        Args:
+            signals: Optional iterable of signal names to stack; the others
+                are skipped.  Cheap enough for in-loop checks (e.g. Monte
+                Carlo early stopping) that only need one signal.
+        """
+        ok = np.array([run is not None for run in self._runs], dtype=bool)
+        good = [run for run in self._runs if run is not None]
+
+        ref_axis = None
+        axis_name = _AXIS_NAMES.get(self.analysis_type, "")
+        if good and good[0][0] is not None:
+            # Use the densest run as the shared axis so no run loses detail.
+            ref_axis = max((run[0] for run in good), key=len)
+            axis_name = good[0][3] or axis_name
+
+        signal_names: dict[str, None] = {}
+        phase_names: dict[str, None] = {}
+        for run in good:
+            signal_names.update(dict.fromkeys(run[1]))
+            phase_names.update(dict.fromkeys(run[2]))
+        if signals is not None:
+            wanted = set(signals)
+            signal_names = {name: None for name in signal_names if name in wanted}
+            phase_names = {}
+
+        return StackedResults(
+            analysis_type=self.analysis_type,
+            axis_name=axis_name,
+            axis=np.zeros(0) if ref_axis is None else np.asarray(ref_axis, dtype=float),
+            signals=_stack(signal_names, self._runs, ref_axis, 1),
+            phase=_stack(phase_names, self._runs, ref_axis, 2),
+            ok=ok,
+            netlist=self._netlist,
+            raw_outputs=list(self._raw_outputs) if self.keep_raw_output else None,
+            use_db=self._use_db,
+        )
+
+
+def stack_results(analysis_type: str, results, keep_raw_output: bool = False) -> "StackedResults":
+    """Build a :class:`StackedResults` from a list of per-run results."""
+    builder = StackedResultsBuilder(analysis_type, keep_raw_output=keep_raw_output)
+    for result in results:
+        builder.add(result)
+    return builder.build()
+
+
+@dataclass
+class StackedResults:
+    """Signals from every run of a study as ``(runs x samples)`` arrays.
+
+    Attributes:
+        analysis_type: Base analysis that was run at each step.
+        axis_name: Name of the shared x-axis (``time``, ``frequency``, the
+            DC sweep variable, or ``""`` for operating-point studies).
+        axis: Shared x-axis values (empty for operating-point studies).
+        signals: Signal name -> 2-D array (AC magnitude for AC sweeps).
+        phase: Node name -> 2-D phase array (AC sweeps only).
+        ok: Boolean mask of runs that produced data.
+        netlist: Netlist of the first run, stored once for the whole study.
+        raw_outputs: Per-run ngspice stdout, kept only when debugging.
+        use_db: True if AC magnitudes are in dB.
+    """
+
+    analysis_type: str
+    axis_name: str = ""
+    axis: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    signals: dict = field(default_factory=dict)
+    phase: dict = field(default_factory=dict)
+    ok: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool))
+    netlist: str = ""
+    raw_outputs: Optional[list] = None
+    use_db: bool = False
+
+    @property
+    def num_runs(self) -> int:
+        return len(self.ok)
+
+    @property
+    def num_ok(self) -> int:
+        return int(np.count_nonzero(self.ok))
+
+    @property
+    def signal_names(self) -> list[str]:
+        return list(self.signals)
+
+    def signal(self, name: str, phase: bool = False) -> np.ndarray:
+        """Return the ``(runs x samples)`` array for *name*.
+
+        Raises:
+            KeyError: If the signal was not produced by any run.
+        """
+        return (self.phase if phase else self.signals)[name]
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Flatten the study into equal-length 1-D columns (long format).
+
+        One entry per (run, sample): a ``run`` index column, the axis
+        column (omitted for operating-point studies) and one column per
+        signal, plus ``phase(<node>)`` columns for AC sweeps.  The dict can
+        be passed straight to ``pandas.DataFrame`` or a plotting call.
+        """
+        n_samples = max(len(self.axis), 1)
+        columns = {"run": np.repeat(np.arange(self.num_runs), n_samples)}
+        if len(self.axis):
+            columns[self.axis_name or "axis"] = np.tile(self.axis, self.num_runs)
+        for name, arr in self.signals.items():
+            columns[name] = arr.reshape(-1)
+        for name, arr in self.phase.items():
+            columns[f"phase({name})"] = arr.reshape(-1)
+        return columns
+
+    def take(self, indices) -> "StackedResults":
+        """Return a copy holding only the runs at *indices*, in that order."""
+        indices = np.asarray(indices, dtype=int)
+        return dataclasses.replace(
+            self,
+            signals={name: arr[indices] for name, arr in self.signals.items()},
+            phase={name: arr[indices] for name, arr in self.phase.items()},
+            ok=self.ok[indices],
+            raw_outputs=[self.raw_outputs[i] for i in indices] if self.raw_outputs is not None else None,
+        )
+
+    def percentile_envelope(self, name: str, percentiles=(5.0, 50.0, 95.0), phase: bool = False) -> np.ndarray:
+        """Return percentiles of *name* across successful runs at every sample.
+
+        The result has shape ``(len(percentiles), samples)``.
+        """
+        arr = self.signal(name, phase)[self.ok]
+        if arr.shape[0] == 0:
+            return np.full((len(percentiles), arr.shape[1]), np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return np.nanpercentile(arr, percentiles, axis=0)
+
+    def run_metric(self, name: str, metric: str = "final", at: Optional[float] = None, phase: bool = False):
+        """Reduce *name* to one value per run.
+
+        Args:
+            name: Signal name.
+            metric: One of :data:`RUN_METRICS`.  ``mean`` and ``rms`` are
+                weighted by the axis spacing, so adaptive timesteps do not
+                bias them.  Ignored when *at* is given.
+            at: If given, linearly interpolate each run at this axis value.
+            phase: Read from the AC phase arrays instead of magnitudes.
+
+        Returns:
+            1-D array of length ``num_runs`` (NaN for failed runs).
+
+        Raises:
+            ValueError: If *metric* is unknown.
+        """
+        arr = self.signal(name, phase)
+        if at is not None:
+            return self._interp_at(arr, float(at))
+        if metric not in RUN_METRICS:
+            raise ValueError(f"Unknown run metric {metric!r}, expected one of {RUN_METRICS}")
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            if metric == "final":
+                return arr[:, -1].copy()
+            if metric == "initial":
+                return arr[:, 0].copy()
+            if metric == "mid":
+                return arr[:, arr.shape[1] // 2].copy()
+            if metric == "max":
+                return np.nanmax(arr, axis=1)
+            if metric == "min":
+                return np.nanmin(arr, axis=1)
+            if metric == "pp":
+                return np.nanmax(arr, axis=1) - np.nanmin(arr, axis=1)
+            values = arr if metric == "mean" else arr * arr
+            if len(self.axis) > 1 and self.axis[-1] != self.axis[0]:
+                span = self.axis[-1] - self.axis[0]
+                reduced = np.trapezoid(values, self.axis, axis=1) / span
+            else:
+                reduced = np.nanmean(values, axis=1)
+            return reduced if metric == "mean" else np.sqrt(reduced)
+
+    def _interp_at(self, arr: np.ndarray, x: float) -> np.ndarray:
+        """Vectorized linear interpolation of every run at axis value *x*."""
+        axis = self.axis
+        if len(axis) < 2:
+            return arr[:, 0].copy()
+        if axis[0] > axis[-1]:
+            axis, arr = axis[::-1], arr[:, ::-1]
+        idx = int(np.clip(np.searchsorted(axis, x), 1, len(axis) - 1))
+        x0, x1 = axis[idx - 1], axis[idx]
+        weight = 0.0 if x1 == x0 else float(np.clip((x - x0) / (x1 - x0), 0.0, 1.0))
+        return arr[:, idx - 1] * (1.0 - weight) + arr[:, idx] * weight
+
+    def default_metrics(self) -> dict[str, np.ndarray]:
+        """Return the standard scalar metrics shown for a study.
+
+        Maps a display name to the values of that metric over the
+        successful runs (NaNs removed).
+        """
+        metrics = {}
+        for name, arr in self.signals.items():
+            if self.analysis_type == "DC Operating Point":
+                label = f"I({name[2:-1]})" if name.startswith("i(") else f"V({name})"
+                values = arr[:, 0]
+            elif self.analysis_type == "Transient":
+                label = f"V({name}) final"
+                values = arr[:, -1]
+            elif self.analysis_type == "DC Sweep":
+                label = f"{name} @mid"
+                values = arr[:, arr.shape[1] // 2]
+            elif self.analysis_type == "AC Sweep":
+                mid = len(self.axis) // 2
+                label = f"|{name}| @{self.axis[mid]:.4g}Hz"
+                values = arr[:, mid]
+            else:
+                continue
+            values = values[self.ok]
+            values = values[~np.isnan(values)]
+            if values.size:
+                metrics[label] = values
+        return metrics
@@ -0,0 +1,417 @@
+"""
+Derived-signal expressions evaluated on stored waveforms.
+
+A small expression language for quantities that are not simulated
+directly, e.g. the drop across a resistor or the power it dissipates::
+
+    v(in,out)                       differential voltage
+    (v(in) - v(out))^2 / 1k         instantaneous power in a 1k resistor
+    d/dt(v(out)) * 100n             capacitor current
+    integ(i(v1) * v(in))            energy delivered by a source
+    db(v(out) / v(in))              gain in dB
+
+Supported syntax: numbers with SPICE suffixes, ``+ - * / ^``, parentheses,
+``v(node)``, ``v(a,b)``, ``vm``/``vdb``/``vp``, ``i(device)``, bare signal
+names, the axis name (``time``, ``frequency``, ...), and the functions
+``abs``, ``sqrt``, ``db``, ``phase``, ``d/dt`` (``ddt``) and ``integ``
+(``integral``).
+
+Expressions are parsed once into a tree, evaluated only when requested,
+and vectorized over ``(runs x samples)`` arrays, so a single run and a
+whole sweep or Monte Carlo study share the same code.  AC nodes are
+combined as complex phasors and reduced to a magnitude only at the end,
+so ``v(a,b)`` and ratios account for the phase between the nodes.  Each
+:class:`WaveformEvaluator` memoizes every sub-expression it has computed.
+
+No Qt dependencies — pure computation module.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+from utils.format_utils import parse_spice_value
+
+# Function names accepted in expressions, mapped to their canonical name
+FUNCTIONS = {
+    "abs": "abs",
+    "sqrt": "sqrt",
+    "db": "db",
+    "phase": "phase",
+    "ddt": "ddt",
+    "d/dt": "ddt",
+    "deriv": "ddt",
+    "integ": "integ",
+    "integral": "integ",
+}
+
+_GROUND_NAMES = ("0", "gnd")
+
+_TOKEN_RE = re.compile(
+    r"""
+    \s*(?:
+        (?P<signal>(?:vdb|vm|vp|v|i)\s*\([^()]*\))
+      | (?P<ddt>d/dt)
+      | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?[a-zA-Z]*)
+      | (?P<name>[A-Za-z_][\w#.:]*)
+      | (?P<op>\*\*|[-+*/^(),])
+    )""",
+    re.VERBOSE | re.IGNORECASE,
+)
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be parsed or evaluated."""
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise ExpressionError(f"Unexpected character {text[pos:].strip()[:1]!r} in '{text}'")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "op" and value == "**":
+            value = "^"
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing hashable tuple trees.
+
+    Nodes: ``("num", value)``, ``("sig", func, nodes)``, ``("name", name)``,
+    ``("neg", x)``, ``("bin", op, a, b)`` and ``("call", func, x)``.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _next(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def _expect(self, value):
+        kind, tok = self._next()
+        if tok != value:
+            found = "end of expression" if tok is None else repr(tok)
+            raise ExpressionError(f"Expected {value!r} but found {found} in '{self.text}'")
+
+    def parse(self):
+        if not self.tokens:
+            raise ExpressionError("Empty expression")
+        tree = self._sum()
+        if self.pos != len(self.tokens):
+            raise ExpressionError(f"Unexpected {self._peek()[1]!r} in '{self.text}'")
+        return tree
+
+    def _sum(self):
+        node = self._product()
+        while self._peek()[1] in ("+", "-"):
+            op = self._next()[1]
+            node = ("bin", op, node, self._product())
+        return node
+
+    def _product(self):
+        node = self._unary()
+        while self._peek()[1] in ("*", "/"):
+            op = self._next()[1]
+            node = ("bin", op, node, self._unary())
+        return node
+
+    def _unary(self):
+        if self._peek()[1] == "-":
+            self._next()
+            return ("neg", self._unary())
+        if self._peek()[1] == "+":
+            self._next()
+            return self._unary()
+        return self._power()
+
+    def _power(self):
+        node = self._atom()
+        if self._peek()[1] == "^":
+            self._next()
+            # Right-associative, binds tighter than unary minus on the left
+            node = ("bin", "^", node, self._unary())
+        return node
+
+    def _atom(self):
+        kind, tok = self._next()
+        if kind == "number":
+            value = parse_spice_value(tok)
+            if value is None:
+                raise ExpressionError(f"Invalid number '{tok}'")
+            return ("num", float(value))
+        if kind == "signal":
+            func, inner = tok.split("(", 1)
+            nodes = tuple(n.strip() for n in inner[:-1].split(","))
+            func = func.strip().lower()
+            if not all(nodes) or len(nodes) > (1 if func == "i" else 2):
+                raise ExpressionError(f"Invalid signal reference '{tok}'")
+            return ("sig", func, nodes)
+        if kind in ("name", "ddt"):
+            if self._peek()[1] == "(":
+                func = FUNCTIONS.get(tok.lower())
+                if func is None:
+                    raise ExpressionError(f"Unknown function '{tok}'")
+                self._next()
+                arg = self._sum()
+                self._expect(")")
+                return ("call", func, arg)
+            if kind == "ddt":
+                raise ExpressionError("d/dt must be followed by '('")
+            return ("name", tok)
+        if tok == "(":
+            node = self._sum()
+            self._expect(")")
+            return node
+        found = "end of expression" if tok is None else repr(tok)
+        raise ExpressionError(f"Unexpected {found} in '{self.text}'")
+
+
+@lru_cache(maxsize=256)
+def parse_expression(text: str) -> tuple:
+    """Parse *text* into an expression tree.
+
+    Raises:
+        ExpressionError: on a syntax error or unknown function.
+    """
+    return _Parser(text).parse()
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+
+def _lookup(names, key):
+    """Case-insensitive lookup of *key* in *names*."""
+    if key in names:
+        return key
+    lowered = {name.lower(): name for name in names}
+    return lowered.get(key.lower())
+
+
+def cumulative_trapezoid(y, x):
+    """Running trapezoid integral of *y* over *x* along the last axis, starting at 0."""
+    y = np.asarray(y, dtype=float)
+    if y.shape[-1] < 2:
+        return np.zeros_like(y)
+    steps = 0.5 * (y[..., 1:] + y[..., :-1]) * np.diff(x)
+    return np.concatenate([np.zeros(y.shape[:-1] + (1,)), np.cumsum(steps, axis=-1)], axis=-1)
+
+
+class WaveformEvaluator:
+    """Evaluates expressions against the signals of a StackedResults.
+
+    Every call returns a ``(runs x samples)`` array.  Sub-expressions are
+    memoized, so ``v(a,b)`` is computed once no matter how many
+    expressions use it.
+    """
+
+    def __init__(self, stacked):
+        self._stacked = stacked
+        self._cache = {}
+
+    @classmethod
+    def from_result(cls, analysis_type, data) -> "WaveformEvaluator":
+        """Build an evaluator over one parsed simulation payload."""
+        from .stacked_results import StackedResultsBuilder
+
+        builder = StackedResultsBuilder(analysis_type)
+        builder.add_data(data)
+        return cls(builder.build())
+
+    @property
+    def stacked(self):
+        return self._stacked
+
+    @property
+    def axis(self) -> np.ndarray:
+        return np.asarray(self._stacked.axis, dtype=float)
+
+    def evaluate(self, expression) -> np.ndarray:
+        """Evaluate an expression string (or parsed tree).
+
+        Raises:
+            ExpressionError: on a syntax error or an unknown signal.
+        """
+        if isinstance(expression, str):
+            expression = expression.strip()
+            # Names such as "v-sweep" are not valid expressions on their own
+            found = _lookup(self._stacked.signals, expression)
+            if found is not None:
+                return self._stacked.signals[found]
+            expression = parse_expression(expression)
+        values = self._eval(expression)
+        if np.iscomplexobj(values):
+            # AC phasors are reduced to a magnitude only at the very end
+            values = np.abs(values)
+        return np.broadcast_to(values, self._shape())
+
+    def _shape(self):
+        return (self._stacked.num_runs, max(len(self._stacked.axis), 1))
+
+    def _eval(self, node):
+        cached = self._cache.get(node)
+        if cached is None:
+            cached = self._compute(node)
+            self._cache[node] = cached
+        return cached
+
+    def _compute(self, node):
+        kind = node[0]
+        if kind == "num":
+            return np.float64(node[1])
+        if kind == "sig":
+            return self._signal(node[1], node[2])
+        if kind == "name":
+            return self._name(node[1])
+        if kind == "neg":
+            return -self._eval(node[1])
+        if kind == "call":
+            return self._call(node[1], node[2])
+
+        op, a, b = node[1], self._eval(node[2]), self._eval(node[3])
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            if op == "+":
+                return a + b
+            if op == "-":
+                return a - b
+            if op == "*":
+                return a * b
+            if op == "/":
+                return a / b
+            return np.power(a, b)
+
+    def _call(self, func, arg):
+        if func == "phase" and arg[0] == "sig" and arg[1] == "v" and self._is_ac:
+            return self._signal("vp", arg[2])
+        values = self._eval(arg)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if func == "abs":
+                return np.abs(values)
+            if func == "sqrt":
+                return np.sqrt(values)
+            if func == "db":
+                return 20.0 * np.log10(np.abs(values))
+            if func == "phase":
+                return np.degrees(np.angle(values))
+            values = np.broadcast_to(values, self._shape())
+            axis = self.axis
+            if func == "ddt":
+                if len(axis) < 2:
+                    raise ExpressionError("d/dt needs at least two samples")
+                return np.gradient(values, axis, axis=-1)
+            return cumulative_trapezoid(values, axis)
+
+    def _name(self, name):
+        stacked = self._stacked
+        if stacked.axis_name and name.lower() == stacked.axis_name.lower():
+            return self.axis
+        found = _lookup(stacked.signals, name)
+        if found is not None and not self._is_ac:
+            return stacked.signals[found]
+        if found is not None and _lookup(stacked.phase, found) is None:
+            return self._linear(stacked.signals[found])
+        return self._signal("v", (name,))
+
+    @property
+    def _is_ac(self):
+        return self._stacked.analysis_type == "AC Sweep"
+
+    def _linear(self, magnitude):
+        """AC magnitudes stored in dB converted to linear."""
+        return 10.0 ** (magnitude / 20.0) if self._stacked.use_db else magnitude
+
+    def _signal(self, func, nodes):
+        stacked = self._stacked
+        ref = f"{func}({','.join(nodes)})"
+        if func == "i":
+            device = nodes[0]
+            for candidate in (f"i({device})", f"i_{device}", f"{device}#branch"):
+                found = _lookup(stacked.signals, candidate)
+                if found is not None:
+                    return stacked.signals[found]
+            raise ExpressionError(f"Unknown signal '{ref}'")
+
+        if self._is_ac:
+            if func == "vp" and len(nodes) == 1:
+                stored = self._stored_phase(nodes[0])
+                if stored is not None:
+                    # Keeps ngspice's unwrapping
+                    return stored
+            # Combine AC nodes as complex phasors, so v(a,b) and ratios keep
+            # the phase difference between the nodes
+            columns = [self._phasor(node, ref) for node in nodes]
+            values = columns[0] - columns[1] if len(columns) == 2 else columns[0]
+            if func == "vdb":
+                with np.errstate(divide="ignore"):
+                    return 20.0 * np.log10(np.abs(values))
+            if func == "vp":
+                return np.degrees(np.angle(values))
+            return np.abs(values) if func == "vm" else values
+
+        columns = []
+        for node in nodes:
+            if node.lower() in _GROUND_NAMES:
+                columns.append(np.zeros(self._shape()))
+                continue
+            found = _lookup(stacked.signals, node) or _lookup(stacked.signals, f"v({node})")
+            if found is None:
+                raise ExpressionError(f"Unknown signal '{ref}'")
+            columns.append(stacked.signals[found])
+        values = columns[0] - columns[1] if len(columns) == 2 else columns[0]
+        if func == "vdb":
+            with np.errstate(divide="ignore"):
+                values = 20.0 * np.log10(np.abs(values))
+        return values
+
+    def _phasor(self, node, ref):
+        """Complex AC value of *node*; nodes without a stored phase are taken at 0 degrees."""
+        stacked = self._stacked
+        if node.lower() in _GROUND_NAMES:
+            return np.zeros(self._shape(), dtype=complex)
+        found = _lookup(stacked.signals, node) or _lookup(stacked.signals, f"v({node})")
+        if found is None:
+            raise ExpressionError(f"Unknown signal '{ref}'")
+        degrees = self._stored_phase(found)
+        if degrees is None:
+            degrees = 0.0
+        return self._linear(stacked.signals[found]) * np.exp(1j * np.radians(degrees))
+
+    def _stored_phase(self, node):
+        """Phase of *node* in degrees as ngspice reported it, or None."""
+        stacked = self._stacked
+        found = _lookup(stacked.phase, node) or _lookup(stacked.phase, f"v({node})")
+        if found is not None:
+            return stacked.phase[found]
+        found = _lookup(stacked.signals, f"vp_{node}")
+        return stacked.signals[found] if found is not None else None
+
+
+def evaluate_expression(analysis_type, data, expression) -> np.ndarray:
+    """Evaluate *expression* on one parsed simulation payload.
+
+    Returns a 1-D array aligned with the result's axis.
+    """
+    evaluator = WaveformEvaluator.from_result(analysis_type, data)
+    if not evaluator.stacked.ok.any():
+        raise ExpressionError(f"No {analysis_type} data to evaluate")
+    return np.array(evaluator.evaluate(expression)[0], dtype=float)
@@ -0,0 +1,201 @@
+"""Tests for asyncio simulation: NgspiceRunner, SimulationController and scripting."""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from controllers.simulation_controller import SimulationResult
+from scripting import Circuit, SimulationBatch, simulate_many
+from simulation.ngspice_runner import NgspiceRunner
+
+FAKE_NGSPICE = f"""#!{sys.executable}
+import os, sys, time
+netlist, output = sys.argv[2], sys.argv[4]
+time.sleep(float(os.environ.get("FAKE_NGSPICE_SLEEP", "0")))
+text = open(netlist).read()
+with open(output, "w") as f:
+    f.write("v(out) = %d\\n" % len(text))
+"""
+
+
+@pytest.fixture
+def fake_ngspice(tmp_path, monkeypatch):
+    script = tmp_path / "ngspice"
+    script.write_text(FAKE_NGSPICE)
+    script.chmod(0o755)
+    monkeypatch.chdir(tmp_path)
+    with patch("simulation.ngspice_runner.resolve_ngspice_path", return_value=str(script)):
+        yield str(script)
+
+
+def _divider(r2="1k"):
+    circuit = Circuit()
+    circuit.add_component("Voltage Source", "5V", position=(0, 0))
+    circuit.add_component("Resistor", "1k", position=(100, 0))
+    circuit.add_component("Resistor", r2, position=(200, 0))
+    circuit.add_component("Ground", position=(0, 100))
+    circuit.add_wire("V1", 0, "R1", 0)
+    circuit.add_wire("R1", 1, "R2", 0)
+    circuit.add_wire("R2", 1, "V1", 1)
+    circuit.add_wire("V1", 1, "GND1", 0)
+    circuit.set_analysis("DC Operating Point")
+    return circuit
+
+
+class TestRunnerAsync:
+    def test_success(self, tmp_path, fake_ngspice):
+        runner = NgspiceRunner(output_dir=str(tmp_path / "out"))
+        success, output_file, _, _ = asyncio.run(runner.run_simulation_async("* netlist"))
+        assert success is True
+        assert "v(out)" in runner.read_output(output_file)
+
+    def test_timeout_kills_process(self, tmp_path, fake_ngspice, monkeypatch):
+        monkeypatch.setenv("FAKE_NGSPICE_SLEEP", "5")
+        runner = NgspiceRunner(output_dir=str(tmp_path / "out"))
+        start = time.monotonic()
+        success, output_file, _, stderr = asyncio.run(runner.run_simulation_async("* netlist", timeout=0.2))
+        assert time.monotonic() - start < 3
+        assert success is False
+        assert output_file is None
+        assert "timed out" in stderr
+
+    def test_cancellation_propagates(self, tmp_path, fake_ngspice, monkeypatch):
+        monkeypatch.setenv("FAKE_NGSPICE_SLEEP", "5")
+        runner = NgspiceRunner(output_dir=str(tmp_path / "out"))
+
+        async def cancel_soon():
+            task = asyncio.ensure_future(runner.run_simulation_async("* netlist"))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            await task
+
+        start = time.monotonic()
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(cancel_soon())
+        assert time.monotonic() - start < 3
+
+    def test_concurrent_runs_use_distinct_files(self, tmp_path, fake_ngspice):
+        runner = NgspiceRunner(output_dir=str(tmp_path / "out"))
+
+        async def both():
+            return await asyncio.gather(runner.run_simulation_async("* a"), runner.run_simulation_async("* bb"))
+
+        (ok_a, out_a, _, _), (ok_b, out_b, _, _) = asyncio.run(both())
+        assert ok_a and ok_b
+        assert out_a != out_b
+        # Both runs stay registered for cleanup; neither overwrote the other
+        assert {out_a, out_b} <= set(runner._prev_run_files)
+
+    def test_loop_without_subprocess_support_uses_executor(self, tmp_path, fake_ngspice):
+        runner = NgspiceRunner(output_dir=str(tmp_path / "out"))
+        with patch("asyncio.create_subprocess_exec", side_effect=NotImplementedError):
+            success, output_file, _, _ = asyncio.run(runner.run_simulation_async("* netlist"))
+        assert success is True
+        assert "v(out)" in runner.read_output(output_file)
+
+    def test_executor_fallback_tracks_files_on_the_loop_thread(self, tmp_path, fake_ngspice):
+        runner = NgspiceRunner(output_dir=str(tmp_path / "out"))
+        threads = []
+        track = runner._track_run_files
+        runner._track_run_files = lambda paths: threads.append(threading.current_thread()) or track(paths)
+
+        async def both():
+            return await asyncio.gather(runner.run_simulation_async("* a"), runner.run_simulation_async("* bb"))
+
+        with patch("asyncio.create_subprocess_exec", side_effect=NotImplementedError):
+            results = asyncio.run(both())
+        assert [ok for ok, *_ in results] == [True, True]
+        assert threads == [threading.main_thread()] * 2
+
+    def test_untracked_output_survives_the_next_run(self, tmp_path, fake_ngspice):
+        runner = NgspiceRunner(output_dir=str(tmp_path / "out"))
+        _, output_file, _, _ = asyncio.run(runner.run_simulation_async("* a", track_output=False))
+        assert output_file not in runner._prev_run_files
+
+        asyncio.run(runner.run_simulation_async("* bb"))
+        assert "v(out)" in runner.read_output(output_file)
+
+        runner.register_extra_files([output_file])
+        runner.run_simulation("* ccc")
+        assert not os.path.exists(output_file)
+
+
+class TestCircuitSimulateAsync:
+    def test_matches_blocking_simulate(self, fake_ngspice):
+        circuit = _divider()
+        result = asyncio.run(circuit.simulate_async())
+        assert result.success, result.error
+        assert result.data["node_voltages"] == circuit.simulate().data["node_voltages"]
+
+
+class TestSimulateMany:
+    def test_columnar_results_in_input_order(self, fake_ngspice):
+        circuits = [_divider(r2) for r2 in ("1k", "22k", "470k")]
+        batch = asyncio.run(simulate_many(circuits, concurrency=2))
+        assert batch.ok == [True, True, True]
+        columns = batch.columns()
+        assert columns["run"].tolist() == [0, 1, 2]
+        expected = [r.data["node_voltages"]["out"] for r in batch.results]
+        assert columns["out"].tolist() == expected
+        assert len(set(expected)) == 3
+
+    def test_concurrency_is_bounded(self):
+        active, peak = 0, 0
+
+        async def fake_simulate(self, timeout=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return SimulationResult(success=True, data={"node_voltages": {"out": 1.0}})
+
+        with patch.object(Circuit, "simulate_async", fake_simulate):
+            batch = asyncio.run(simulate_many([Circuit() for _ in range(7)], concurrency=3))
+        assert peak == 3
+        assert batch.stacked.signal("out").shape == (7, 1)
+
+    def test_cancel_cancels_every_run(self):
+        cancelled = []
+
+        async def fake_simulate(self, timeout=None):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(self)
+                raise
+
+        async def main():
+            task = asyncio.ensure_future(simulate_many([Circuit() for _ in range(4)], concurrency=2))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await task
+
+        with patch.object(Circuit, "simulate_async", fake_simulate):
+            with pytest.raises(asyncio.CancelledError):
+                asyncio.run(main())
+        assert len(cancelled) == 2
+
+    def test_mixed_analyses_are_not_stacked(self):
+        batch = SimulationBatch([SimulationResult(success=True)], stacked=None)
+        with pytest.raises(ValueError):
+            batch.columns()
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError, match="concurrency"):
+            asyncio.run(simulate_many([], concurrency=0))
+
+    def test_transient_columns(self):
+        from simulation.stacked_results import stack_results
+
+        rows = [{"time": t, "out": 2.0 * t} for t in (0.0, 1.0, 2.0)]
+        study = stack_results("Transient", [SimulationResult(success=True, data=rows)] * 2)
+        columns = study.columns()
+        assert columns["time"].tolist() == [0.0, 1.0, 2.0] * 2
+        assert columns["run"].tolist() == [0, 0, 0, 1, 1, 1]
+        np.testing.assert_allclose(columns["out"], [0.0, 2.0, 4.0] * 2)
@@ -0,0 +1,256 @@
+"""Tests for algorithms/batch_routing.py — grouped, parallel routing on a shared grid."""
+
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
+from pathlib import Path
+from threading import current_thread, main_thread
+from unittest.mock import patch
+
+import pytest
+from algorithms import batch_routing
+from algorithms.batch_routing import BatchRouter, _GridView, _Obstacles, build_obstacle_grid, partition_requests
+from algorithms.path_finding import get_component_obstacles
+from algorithms.routing_service import ComponentSnapshot, RouteRequest, WireSnapshot, route_wire
+from controllers.circuit_controller import CircuitController
+from models.circuit import CircuitModel
+
+_BODY = ((-30, -10), (30, -10), (30, 10), (-30, 10))
+
+
+def _resistor(cid, x, y):
+    return ComponentSnapshot(cid, (x, y), 0, ((x - 40, y), (x + 40, y)), _BODY)
+
+
+def _pairs(columns, rows, spacing=(300, 280)):
+    """Resistor pairs laid out on a grid, each pair wired R[i].1 -> R[i+1].0."""
+    components, ends = [], []
+    for i in range(columns):
+        for j in range(rows):
+            x, y = i * spacing[0] - 400, j * spacing[1] - 400
+            a, b = _resistor(f"A{i}{j}", x, y), _resistor(f"B{i}{j}", x + 120, y + 60)
+            components += [a, b]
+            ends.append((a, b))
+    return tuple(components), ends
+
+
+def _requests(components, ends, wires=(), **kwargs):
+    return [
+        RouteRequest(
+            a.terminal_positions[1],
+            b.terminal_positions[0],
+            ((a.component_id, 1), (b.component_id, 0)),
+            components,
+            wires,
+            **kwargs,
+        )
+        for a, b in ends
+    ]
+
+
+class TestObstacleGrid:
+    def test_matches_per_wire_obstacles(self):
+        components, ends = _pairs(2, 2)
+        wires = (
+            WireSnapshot(((-200, -300), (200, -300)), node=1),
+            WireSnapshot(((0, -400), (0, 0)), node=None),
+            WireSnapshot(((-300, -240), (100, -240)), node=2, algorithm="astar"),
+        )
+        base = _requests(components, ends, wires)
+        requests = [
+            replace(base[0], node=1),
+            replace(base[1], node=None),
+            replace(base[2], node=7, algorithm="astar"),
+            replace(base[3], node=2, algorithm="astar"),
+        ]
+        grid, buffer = build_obstacle_grid(requests)
+        view = _GridView(grid, memoryview(buffer))
+        try:
+            for request in requests:
+                expected = get_component_obstacles(
+                    {c.component_id: c for c in components},
+                    20,
+                    active_terminals=list(request.active_terminals),
+                    existing_wires=[w for w in wires if w.algorithm == request.algorithm],
+                    current_node=request.node,
+                )
+                obstacles = _Obstacles(view, request, {})
+                cells = [(x, y) for x in range(-30, 20) for y in range(-30, 10)]
+                assert {cell for cell in cells if cell in obstacles} == {cell for cell in cells if cell in expected}
+        finally:
+            view.release()
+
+
+class TestPartition:
+    def test_separate_clusters_form_groups(self):
+        components, ends = _pairs(3, 2)
+        assert partition_requests(_requests(components, ends)) == [[0], [1], [2], [3], [4], [5]]
+
+    def test_overlapping_boxes_share_a_group(self):
+        components, ends = _pairs(3, 2, spacing=(200, 100))
+        groups = partition_requests(_requests(components, ends))
+        assert groups == [[0, 1, 2, 3, 4, 5]]
+
+    def test_groups_are_ordered_by_first_index(self):
+        components, ends = _pairs(2, 1)
+        ends = [ends[1], ends[0], ends[1]]
+        assert partition_requests(_requests(components, ends)) == [[0, 2], [1]]
+
+
+class TestBatchRouter:
+    def test_single_wire_matches_route_wire(self):
+        components, ends = _pairs(1, 1)
+        wires = (WireSnapshot(((-300, -370), (-300, -300)), node=5),)
+        request = _requests(components, ends, wires, node=1)[0]
+        result = BatchRouter(workers=1).route([("w", request)])[0]
+        assert result.key == "w"
+        assert result.waypoints == route_wire(request).waypoints
+
+    def test_later_wires_in_a_group_avoid_earlier_routes(self):
+        components, ends = _pairs(1, 1)
+        a, b = ends[0]
+        first = _requests(components, ends, node=1)[0]
+        # Same endpoints area, different net: must not reuse the first route's cells
+        second = RouteRequest(
+            a.terminal_positions[0],
+            b.terminal_positions[1],
+            ((a.component_id, 0), (b.component_id, 1)),
+            components,
+            node=2,
+        )
+        results = BatchRouter(workers=1).route([("a", first), ("b", second)])
+        cells = [{(round(x / 20), round(y / 20)) for x, y in r.waypoints} for r in results]
+        assert not results[1].routing_failed
+        assert not (cells[0] & cells[1])
+
+    def test_requests_must_share_a_snapshot(self):
+        components, ends = _pairs(2, 1)
+        requests = _requests(components, ends)
+        requests[1] = replace(requests[1], components=components[:2])
+        with pytest.raises(ValueError):
+            BatchRouter(workers=1).route(list(enumerate(requests)))
+
+    def test_process_pool_merges_deterministically(self, monkeypatch):
+        components, ends = _pairs(3, 2)
+        jobs = list(enumerate(_requests(components, ends)))
+        expected = BatchRouter(workers=1).route(jobs)
+
+        monkeypatch.setattr(batch_routing, "MIN_PARALLEL_WIRES", 1)
+        router = BatchRouter(workers=2)
+        pool_calls = []
+        in_pool = router._route_in_pool
+        monkeypatch.setattr(router, "_route_in_pool", lambda *args: pool_calls.append(args) or in_pool(*args))
+        try:
+            results = router.route(jobs)
+        finally:
+            router.shutdown()
+
+        assert len(pool_calls) == 1
+        assert [r.key for r in results] == list(range(len(jobs)))
+        assert [r.waypoints for r in results] == [r.waypoints for r in expected]
+
+    def test_broken_pool_falls_back_to_in_process(self, monkeypatch):
+        components, ends = _pairs(2, 1)
+        jobs = list(enumerate(_requests(components, ends)))
+        monkeypatch.setattr(batch_routing, "MIN_PARALLEL_WIRES", 1)
+
+        with patch.object(BatchRouter, "_route_in_pool", side_effect=BrokenProcessPool("gone")):
+            results = BatchRouter(workers=2).route(jobs)
+
+        assert [r.routing_failed for r in results] == [False, False]
+
+    def test_route_async_resolves_to_the_route_results(self):
+        components, ends = _pairs(2, 1)
+        jobs = list(enumerate(_requests(components, ends)))
+        router = BatchRouter(workers=1)
+        try:
+            results = router.route_async(jobs).result(timeout=30)
+        finally:
+            router.shutdown()
+        assert [r.waypoints for r in results] == [r.waypoints for r in BatchRouter(workers=1).route(jobs)]
+
+
+class TestCanvasBatching:
+    def test_foreground_reroute_uses_one_batch(self, qtbot):
+        from GUI.circuit_canvas import CircuitCanvasView
+
+        ctrl = CircuitController(CircuitModel())
+        view = CircuitCanvasView(ctrl)
+        qtbot.addWidget(view)
+        view.background_routing = False
+        for x in (0, 200, 400):
+            ctrl.add_component("Resistor", (x, 0))
+        ctrl.add_wire("R1", 1, "R2", 0)
+        ctrl.add_wire("R2", 1, "R3", 0)
+
+        batches = []
+        route = BatchRouter.route
+        with patch.object(BatchRouter, "route", lambda self, jobs: batches.append(jobs) or route(self, jobs)):
+            ctrl.move_component("R2", (200, 200))
+            view._do_batch_reroute()
+
+        assert len(batches) == 1
+        assert [key for key, _ in batches[0]] == view.wires
+        end = view.wires[0].end_comp.get_terminal_pos(view.wires[0].end_term)
+        assert ctrl.model.wires[0].waypoints[-1] == (end.x(), end.y())
+
+    def _chain(self, qtbot):
+        from GUI.circuit_canvas import CircuitCanvasView
+
+        ctrl = CircuitController(CircuitModel())
+        view = CircuitCanvasView(ctrl)
+        qtbot.addWidget(view)
+        view.background_routing = False
+        for x in (0, 200, 400):
+            ctrl.add_component("Resistor", (x, 0))
+        ctrl.add_wire("R1", 1, "R2", 0)
+        ctrl.add_wire("R2", 1, "R3", 0)
+        return ctrl, view
+
+    def test_large_batch_is_applied_off_the_gui_thread(self, qtbot, monkeypatch):
+        ctrl, view = self._chain(qtbot)
+        monkeypatch.setattr(batch_routing, "MIN_PARALLEL_WIRES", 1)
+        threads = []
+        route = BatchRouter.route
+        with patch.object(
+            BatchRouter, "route", lambda self, jobs: threads.append(current_thread()) or route(self, jobs)
+        ):
+            ctrl.move_component("R2", (200, 200))
+            view._do_batch_reroute()
+            assert len(view._pending_batches) == 1
+            qtbot.waitUntil(lambda: not view._pending_batches, timeout=10000)
+
+        assert len(threads) == 1 and threads[0] is not main_thread()
+        end = view.wires[0].end_comp.get_terminal_pos(view.wires[0].end_term)
+        assert ctrl.model.wires[0].waypoints[-1] == (end.x(), end.y())
+        view.shutdown_routing()
+
+    def test_rerouted_wire_ignores_its_stale_batch_result(self, qtbot, monkeypatch):
+        ctrl, view = self._chain(qtbot)
+        monkeypatch.setattr(batch_routing, "MIN_PARALLEL_WIRES", 1)
+        ctrl.move_component("R2", (200, 200))
+        view._do_batch_reroute()
+        future, wanted = view._pending_batches[0]
+        view.cancel_background_route(view.wires[0])
+        assert view.wires[0] not in wanted
+
+        applied = []
+        with patch.object(type(view.wires[0]), "apply_route", lambda wire, result: applied.append(wire)):
+            future.result(timeout=10)
+            view._apply_background_routes()
+        assert applied == [view.wires[1]]
+        view.shutdown_routing()
+
+    def test_rotation_reroutes_through_one_batch(self, qtbot):
+        ctrl, view = self._chain(qtbot)
+        batches = []
+        route = BatchRouter.route
+        with patch.object(BatchRouter, "route", lambda self, jobs: batches.append(jobs) or route(self, jobs)):
+            ctrl.rotate_component("R2")
+        assert len(batches) == 1
+        assert {key for key, _ in batches[0]} == set(view.wires)
+
+
+class TestNoQtInBatchRouting:
+    def test_no_pyqt_imports(self):
+        source = Path(batch_routing.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
@@ -0,0 +1,192 @@
+"""Tests for simulation/circuit_diagnostics.py — incremental validation state."""
+
+import random
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from controllers.circuit_controller import CircuitController
+from controllers.commands import DeleteComponentCommand, DeleteWireCommand
+from controllers.file_controller import FileController
+from controllers.simulation_controller import SimulationController
+from models.circuit import CircuitModel
+from models.component import ComponentData
+from simulation import circuit_diagnostics
+from simulation.circuit_diagnostics import CircuitDiagnostics
+from simulation.circuit_semantic_validator import validate_circuit
+
+ANALYSES = ("DC Operating Point", "DC Sweep", "Transient")
+
+
+def _circuit():
+    ctrl = CircuitController(CircuitModel())
+    ctrl.add_component("Voltage Source", (0, 0))
+    ctrl.add_component("Resistor", (200, 0))
+    ctrl.add_component("Ground", (0, 200))
+    ctrl.add_wire("V1", 0, "R1", 0)
+    return ctrl
+
+
+def _assert_matches_full_scan(ctrl):
+    model = ctrl.model
+    for analysis in ANALYSES:
+        assert ctrl.diagnostics.validate(analysis) == validate_circuit(model.components, model.wires, analysis)
+    full = {
+        (c.component_id, i)
+        for c in model.components.values()
+        if c.component_type != "Ground"
+        for i in range(c.get_terminal_count())
+        if not model.wires_at_terminal(c.component_id, i)
+    }
+    assert ctrl.diagnostics.floating_terminals == full
+
+
+class TestParity:
+    def test_tracks_edits(self):
+        ctrl = _circuit()
+        _assert_matches_full_scan(ctrl)
+        assert ctrl.diagnostics.floating_terminals == {("R1", 1), ("V1", 1)}
+
+        ctrl.add_wire("R1", 1, "GND1", 0)
+        ctrl.add_wire("V1", 1, "GND1", 0)
+        _assert_matches_full_scan(ctrl)
+        assert ctrl.diagnostics.validate("DC Operating Point") == (True, [], [])
+
+        ctrl.remove_component("R1")
+        _assert_matches_full_scan(ctrl)
+
+    def test_random_edit_sequences(self):
+        rng = random.Random(7)
+        ctrl = CircuitController(CircuitModel())
+        ctrl.diagnostics
+        types = ["Resistor", "Capacitor", "Voltage Source", "Current Source", "Ground", "Op-Amp"]
+        for step in range(300):
+            ids = list(ctrl.model.components)
+            action = rng.random()
+            if action < 0.3 or len(ids) < 2:
+                ctrl.add_component(rng.choice(types), (step * 20.0, 0.0))
+            elif action < 0.65:
+                a, b = rng.sample(ids, 2)
+                ctrl.add_wire(a, rng.randrange(2), b, rng.randrange(2))
+            elif action < 0.75 and ctrl.model.wires:
+                ctrl.execute_command(DeleteWireCommand(ctrl, rng.randrange(len(ctrl.model.wires))))
+            elif action < 0.85:
+                ctrl.execute_command(DeleteComponentCommand(ctrl, rng.choice(ids)))
+            elif action < 0.9:
+                with ctrl.batch():
+                    for cid in rng.sample(ids, min(3, len(ids))):
+                        ctrl.remove_component(cid)
+            else:
+                ctrl.undo()
+            _assert_matches_full_scan(ctrl)
+
+    def test_load_and_clear(self):
+        ctrl = _circuit()
+        data = ctrl.model.to_dict()
+        ctrl.diagnostics
+        FileController(ctrl.model, circuit_ctrl=ctrl).load_from_model(CircuitModel.from_dict(data))
+        _assert_matches_full_scan(ctrl)
+        ctrl.clear_circuit()
+        _assert_matches_full_scan(ctrl)
+
+
+class TestIncremental:
+    def test_validation_is_memoized_until_a_fact_changes(self):
+        ctrl = _circuit()
+        diagnostics = ctrl.diagnostics
+        with patch.object(circuit_diagnostics, "validation_report", wraps=circuit_diagnostics.validation_report) as spy:
+            diagnostics.validate("Transient")
+            ctrl.move_component("R1", (300, 0))
+            ctrl.update_component_value("R1", "2k")
+            # A second wire on an already connected terminal changes nothing
+            ctrl.add_wire("V1", 0, "R1", 0)
+            diagnostics.validate("Transient")
+            assert spy.call_count == 1
+
+            ctrl.add_wire("R1", 1, "GND1", 0)
+            diagnostics.validate("Transient")
+            assert spy.call_count == 2
+
+    def test_observers_hear_only_touched_components(self):
+        ctrl = _circuit()
+        ctrl.add_component("Resistor", (400, 0))
+        heard = []
+        ctrl.diagnostics.add_observer(heard.append)
+
+        ctrl.add_wire("R1", 1, "GND1", 0)
+        assert heard == [{"R1"}]
+
+    def test_results_cannot_corrupt_the_cache(self):
+        ctrl = _circuit()
+        _, errors, warnings = ctrl.diagnostics.validate("Transient")
+        warnings.append("extra")
+        assert "extra" not in ctrl.diagnostics.validate("Transient")[2]
+
+    def test_edits_behind_the_controller_are_caught(self):
+        ctrl = _circuit()
+        ctrl.diagnostics
+        ctrl.model.components["L1"] = ComponentData("L1", "Inductor", "1m", (400.0, 0.0))
+        assert ("L1", 0) in ctrl.diagnostics.floating_terminals
+        _assert_matches_full_scan(ctrl)
+
+    def test_standalone_refresh(self):
+        model = CircuitModel()
+        diagnostics = CircuitDiagnostics(model)
+        model.add_component(ComponentData("R1", "Resistor", "1k", (0.0, 0.0)))
+        diagnostics.refresh()
+        assert diagnostics.floating_terminals == {("R1", 0), ("R1", 1)}
+
+
+class TestSimulationController:
+    def test_validation_uses_the_engine(self):
+        ctrl = _circuit()
+        sim = SimulationController(ctrl.model, ctrl)
+        with patch("simulation.validate_circuit") as full_scan:
+            first = sim.validate_circuit()
+            second = sim.validate_circuit()
+        full_scan.assert_not_called()
+        assert first.errors == second.errors and first.warnings == second.warnings
+
+    def test_without_a_controller_falls_back_to_a_full_scan(self):
+        ctrl = _circuit()
+        with patch("simulation.validate_circuit", return_value=(True, [], [])) as full_scan:
+            SimulationController(ctrl.model).validate_circuit()
+        assert full_scan.call_count == 1
+
+
+class TestCanvasMarkers:
+    @pytest.fixture
+    def canvas(self, qtbot):
+        from GUI.circuit_canvas import CircuitCanvasView
+
+        ctrl = CircuitController(CircuitModel())
+        view = CircuitCanvasView(ctrl)
+        qtbot.addWidget(view)
+        ctrl.add_component("Voltage Source", (0, 0))
+        ctrl.add_component("Resistor", (200, 0))
+        ctrl.add_component("Ground", (0, 200))
+        ctrl.add_wire("V1", 0, "R1", 0)
+        return view, ctrl
+
+    def test_markers_follow_edits(self, canvas):
+        view, ctrl = canvas
+        assert view.components["R1"]._floating_terminals == {1}
+
+        ctrl.add_wire("R1", 1, "GND1", 0)
+        assert view.components["R1"]._floating_terminals == frozenset()
+
+        ctrl.add_component("Capacitor", (400, 0))
+        assert view.components["C1"]._floating_terminals == {0, 1}
+        assert view.components["GND1"]._floating_terminals == frozenset()
+
+    def test_markers_survive_load(self, canvas):
+        view, ctrl = canvas
+        data = ctrl.model.to_dict()
+        FileController(ctrl.model, circuit_ctrl=ctrl).load_from_model(CircuitModel.from_dict(data))
+        assert view.components["V1"]._floating_terminals == {1}
+
+
+class TestNoQtInDiagnostics:
+    def test_no_pyqt_imports(self):
+        source = Path(circuit_diagnostics.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
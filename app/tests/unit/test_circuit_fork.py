@@ -0,0 +1,191 @@
+"""Tests for copy-on-write circuit cloning and the netlist line cache."""
+
+import pytest
+from controllers.circuit_controller import CircuitController
+from controllers.simulation_controller import SimulationController
+from models.circuit import CircuitModel
+from scripting import Circuit
+
+
+def _divider():
+    circuit = Circuit()
+    circuit.add_component("Voltage Source", "5V", position=(0, 0))
+    circuit.add_component("Resistor", "1k", position=(100, 0))
+    circuit.add_component("Resistor", "1k", position=(200, 0))
+    circuit.add_component("Ground", position=(0, 100))
+    circuit.add_wire("V1", 0, "R1", 0)
+    circuit.add_wire("R1", 1, "R2", 0)
+    circuit.add_wire("R2", 1, "V1", 1)
+    circuit.add_wire("V1", 1, "GND1", 0)
+    return circuit
+
+
+def _connectivity(model):
+    return {frozenset(node.terminals) for node in model.nodes}
+
+
+@pytest.fixture
+def model():
+    return _divider().model
+
+
+class TestModelCopy:
+    def test_copy_shares_objects_until_touched(self, model):
+        clone = model.copy()
+        assert clone.components is not model.components
+        assert all(clone.components[cid] is comp for cid, comp in model.components.items())
+        assert all(a is b for a, b in zip(clone.wires, model.wires))
+        assert all(a is b for a, b in zip(clone.nodes, model.nodes))
+
+        owned = clone.own_component("R2")
+        owned.value = "10k"
+        assert model.components["R2"].value == "1k"
+        assert clone.own_component("R2") is owned
+        assert clone.components["R1"] is model.components["R1"]
+
+    def test_original_edits_do_not_leak_into_copy(self, model):
+        clone = model.copy()
+        model.own_component("R1").value = "2k"
+        model.own_wire(0).waypoints.append((1.0, 2.0))
+        assert clone.components["R1"].value == "1k"
+        assert (1.0, 2.0) not in clone.wires[0].waypoints
+
+    def test_waveform_params_are_not_shared(self):
+        circuit = Circuit()
+        circuit.add_component("Waveform Source", position=(0, 0))
+        clone = circuit.fork()
+        clone._controller.update_component_waveform("VW1", "SIN", {"offset": "1", "amplitude": "2", "frequency": "3"})
+        assert circuit.model.components["VW1"].waveform_params != clone.model.components["VW1"].waveform_params
+
+    def test_missing_targets(self, model):
+        assert model.own_component("nope") is None
+        assert model.own_wire(99) is None
+
+    def test_node_graph_isolated(self, model):
+        before = _connectivity(model)
+        clone = model.copy()
+        clone.remove_wire(1)
+        assert _connectivity(model) == before
+        assert _connectivity(clone) == _connectivity(CircuitModel.from_dict(clone.to_dict()))
+
+        other = model.copy()
+        other.add_wire(type(model.wires[0])("R1", 0, "R2", 1))
+        assert _connectivity(model) == before
+
+    def test_net_name_isolated(self, model):
+        clone = model.copy()
+        node = clone.terminal_to_node[("R1", 1)]
+        CircuitController(clone).set_net_name(node, "mid")
+        assert clone.terminal_to_node[("R1", 1)].custom_label == "mid"
+        assert model.terminal_to_node[("R1", 1)].custom_label is None
+
+    def test_copy_refused_inside_batch(self, model):
+        model.begin_batch()
+        with pytest.raises(RuntimeError):
+            model.copy()
+
+    def test_snapshot_is_detached_and_leaves_the_original_in_place(self, model):
+        wire, component = model.wires[0], model.components["R1"]
+        snap = model.snapshot()
+        assert model.own_wire(0) is wire and model.own_component("R1") is component
+        wire.waypoints.append((1.0, 2.0))
+        component.value = "2k"
+        assert snap.wires[0].waypoints == [] and snap.components["R1"].value == "1k"
+        assert snap.terminal_to_node[("R1", 1)] in snap.nodes
+        assert _connectivity(snap) == _connectivity(model)
+
+
+class TestControllerOnCopy:
+    def test_mutators_leave_original_untouched(self, model):
+        snapshot = model.to_dict()
+        controller = CircuitController(model.copy())
+        controller.rotate_component("R1")
+        controller.flip_component("R2")
+        controller.move_component("V1", (40.0, 40.0))
+        controller.update_component_value("R2", "22k")
+        controller.update_component_initial_condition("R1", "0")
+        controller.update_wire_waypoints(0, [(0.0, 0.0), (10.0, 0.0)])
+        controller.set_wire_locked(1, True)
+        assert model.to_dict() == snapshot
+
+
+class TestScriptingFork:
+    def test_component_edits_stay_in_fork(self):
+        circuit = _divider()
+        variant = circuit.fork()
+        variant.components["R2"].value = "4.7k"
+        assert circuit.components["R2"].value == "1k"
+        assert circuit.model.components["R2"].value == "1k"
+        for comp in variant.find_components(component_type="Resistor"):
+            comp.value = "22k"
+        assert [c.value for c in circuit.find_components(component_type="Resistor")] == ["1k", "1k"]
+
+    def test_components_mapping_is_read_only(self):
+        circuit = _divider()
+        with pytest.raises(TypeError):
+            circuit.components["R9"] = circuit.components["R1"]
+        with pytest.raises(KeyError):
+            circuit.components["R9"]
+        assert set(circuit.components) == {"V1", "R1", "R2", "GND1"}
+
+    def test_monte_carlo_on_fork_leaves_parent_untouched(self, monkeypatch):
+        circuit = _divider()
+        variant = circuit.fork()
+        seen = []
+
+        def fake_run(netlist):
+            seen.append(circuit.model.components["R1"].value)
+            return False, None, "", "no ngspice"
+
+        sim = variant._sim
+        monkeypatch.setattr(sim.runner, "find_ngspice", lambda: "/usr/bin/ngspice")
+        monkeypatch.setattr(sim.runner, "run_simulation", fake_run)
+        sim.run_monte_carlo(
+            {
+                "num_runs": 3,
+                "base_analysis_type": "DC Operating Point",
+                "base_params": {},
+                "tolerances": {"R1": {"tolerance_pct": 10}},
+                "seed": 1,
+            }
+        )
+        assert seen == ["1k"] * 3
+        assert circuit.model.components["R1"].value == "1k"
+
+
+class TestNetlistCache:
+    def test_fork_netlist_matches_fresh_model(self):
+        circuit = _divider()
+        circuit.to_netlist()
+        variant = circuit.fork()
+        variant.update_value("R2", "4.7k")
+        fresh = Circuit(CircuitModel.from_dict(variant.model.to_dict()))
+        assert variant.to_netlist() == fresh.to_netlist()
+        assert " 4.7k" in variant.to_netlist()
+        assert " 4.7k" not in circuit.to_netlist()
+
+    def test_only_touched_components_regenerate(self, monkeypatch):
+        from simulation.netlist_generator import NetlistGenerator
+
+        circuit = _divider()
+        circuit.to_netlist()
+        variant = circuit.fork()
+        variant.update_value("R2", "4.7k")
+
+        generated = []
+        original = NetlistGenerator._component_lines
+
+        def spy(self, comp, nodes):
+            generated.append(comp.component_id)
+            return original(self, comp, nodes)
+
+        monkeypatch.setattr(NetlistGenerator, "_component_lines", spy)
+        variant.to_netlist()
+        assert generated == ["R2"]
+
+    def test_in_place_value_change_invalidates(self):
+        model = _divider().model
+        sim = SimulationController(model)
+        sim.generate_netlist()
+        model.components["R1"].value = "3.3k"
+        assert " 3.3k" in sim.generate_netlist()
@@ -8,6 +8,7 @@ from unittest.mock import patch
 import pytest
 from cli import (
     REPL_BANNER,
+    WatchSession,
     __version__,
     build_parser,
     build_repl_namespace,
@@ -20,6 +21,7 @@ from cli import (
     cmd_stats,
     cmd_validate,
     diff_circuits,
+    is_layout_only_diff,
     load_circuit,
     main,
     try_load_circuit,
@@ -414,6 +416,51 @@ class TestBatchCommand:
             csv_files = list(Path(out_dir).glob("*.csv"))
             assert len(csv_files) == 3
 
+    @staticmethod
+    def _jsonl_records(text):
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    def test_batch_jsonl_streams_records(self, mixed_dir, capsys):
+        code = main(["batch", mixed_dir, "--format", "jsonl"])
+        captured = capsys.readouterr()
+        records = self._jsonl_records(captured.out)
+        assert {r["file"] for r in records} == {"good.json", "bad.json"}
+        assert all("status" in r and "elapsed_s" in r for r in records)
+        assert "succeeded" in captured.err
+        assert code == 1
+
+    def test_batch_parallel_jobs(self, circuit_dir, capsys):
+        main(["batch", circuit_dir, "--format", "jsonl", "--jobs", "2"])
+        records = self._jsonl_records(capsys.readouterr().out)
+        assert sorted(r["file"] for r in records) == ["circuit_1.json", "circuit_2.json", "circuit_3.json"]
+
+    def test_batch_resume_skips_up_to_date_outputs(self, circuit_dir, tmp_path, capsys):
+        from controllers.simulation_controller import SimulationController, SimulationResult
+
+        out_dir = tmp_path / "resume"
+        ok = SimulationResult(success=True, analysis_type="DC Operating Point", data={"node_voltages": {"n1": 1.0}})
+        argv = ["batch", circuit_dir, "--format", "jsonl", "--output-dir", str(out_dir), "--resume"]
+        with patch.object(SimulationController, "run_simulation", return_value=ok) as run:
+            assert main(argv) == 0
+            first = self._jsonl_records(capsys.readouterr().out)
+            assert [r["metrics"] for r in first] == [{"node_voltages": {"n1": 1.0}}] * 3
+
+            (out_dir / "circuit_2.json").unlink()
+            assert main(argv) == 0
+            second = self._jsonl_records(capsys.readouterr().out)
+        assert run.call_count == 4
+        assert {r["file"]: r["status"] for r in second} == {
+            "circuit_1.json": "SKIPPED",
+            "circuit_2.json": "OK",
+            "circuit_3.json": "SKIPPED",
+        }
+
+    def test_batch_resume_requires_output_dir(self, circuit_dir):
+        assert main(["batch", circuit_dir, "--resume"]) == 1
+
+    def test_batch_invalid_jobs(self, circuit_dir):
+        assert main(["batch", circuit_dir, "--jobs", "0"]) == 1
+
 
 class TestVersion:
     def test_version_flag(self, capsys):
@@ -564,6 +611,31 @@ R2 2 0 1k
         if "analysis_type" in data:
             assert data["analysis_type"] == "DC Operating Point"
 
+    TIKZ = r"""
+\begin{circuitikz}
+  \draw (0, 2) to[R, l=$R1$, a={1k}] (0, 1);
+  \draw (0, 1) to[C, l=$C1$, a={10u}] (0, 0);
+\end{circuitikz}
+"""
+
+    def test_import_schematic_keeps_drawing_unless_auto_layout(self, tmp_path):
+        from simulation.circuitikz_parser import import_circuitikz
+
+        source = tmp_path / "rc.tex"
+        source.write_text(self.TIKZ)
+        drawn, _ = import_circuitikz(self.TIKZ)
+        relaid, _ = import_circuitikz(self.TIKZ, auto_layout=True)
+
+        assert main(["import", str(source), "-o", str(tmp_path / "drawn.json")]) == 0
+        assert main(["import", str(source), "--layout", "auto", "-o", str(tmp_path / "auto.json")]) == 0
+        assert json.loads((tmp_path / "drawn.json").read_text()) == drawn.to_dict()
+        assert json.loads((tmp_path / "auto.json").read_text()) == relaid.to_dict()
+
+    def test_import_schematic_rejects_grid_layout(self, tmp_path):
+        source = tmp_path / "rc.tex"
+        source.write_text(self.TIKZ)
+        assert main(["import", str(source), "--layout", "grid"]) == 1
+
 
 class TestDiffCommand:
     @pytest.fixture
@@ -761,6 +833,76 @@ class TestDiffCommand:
             build_parser().parse_args(["diff"])
 
 
+class TestWatchCommand:
+    @pytest.fixture
+    def session(self, voltage_divider):
+        from controllers.simulation_controller import SimulationController, SimulationResult
+
+        ok = SimulationResult(success=True, analysis_type="DC Operating Point", data={"node_voltages": {}})
+        with patch.object(SimulationController, "run_simulation", return_value=ok) as run:
+            yield WatchSession(voltage_divider), run
+
+    @staticmethod
+    def _edit(path, edit):
+        data = json.loads(Path(path).read_text())
+        edit(data)
+        Path(path).write_text(json.dumps(data))
+
+    def test_layout_changes_skip_simulation(self, session, voltage_divider):
+        watch, run = session
+        assert watch.update().status == "simulated"
+
+        def move(data):
+            data["components"][1]["pos"] = {"x": 400, "y": 80}
+            data["components"][1]["rotation"] = 90
+
+        self._edit(voltage_divider, move)
+        update = watch.update()
+        assert update.status == "layout"
+        assert update.diff["components"]["changed"][0]["id"] == "R1"
+        assert run.call_count == 1
+
+    def test_value_change_resimulates_and_revert_reuses_result(self, session, voltage_divider):
+        watch, run = session
+        watch.update()
+
+        def set_r2(value):
+            return lambda data: data["components"][2].update(value=value)
+
+        self._edit(voltage_divider, set_r2("2.2k"))
+        assert watch.update().status == "simulated"
+        self._edit(voltage_divider, set_r2("1k"))
+        assert watch.update().status == "cached"
+        assert run.call_count == 2
+
+    def test_broken_file_reports_error(self, session, voltage_divider):
+        watch, _ = session
+        Path(voltage_divider).write_text("{ not json")
+        update = watch.update()
+        assert update.status == "error"
+        assert "invalid JSON" in update.error
+
+    def test_layout_only_diff(self, voltage_divider):
+        model = load_circuit(voltage_divider)
+        moved = load_circuit(voltage_divider)
+        moved.components["R1"].position = (500.0, 500.0)
+        moved.components["R1"].flip_h = True
+        assert is_layout_only_diff(diff_circuits(model, moved))
+        moved.components["R1"].value = "2k"
+        assert not is_layout_only_diff(diff_circuits(model, moved))
+
+    def test_initial_condition_is_not_layout(self, voltage_divider):
+        model = load_circuit(voltage_divider)
+        changed = load_circuit(voltage_divider)
+        changed.components["R1"].initial_condition = "1V"
+        diff = diff_circuits(model, changed)
+        assert "initial_condition" in diff["components"]["changed"][0]["changes"]
+        assert not is_layout_only_diff(diff)
+
+    def test_missing_file(self, tmp_path):
+        assert main(["watch", str(tmp_path / "missing.json")]) == 1
+
+
 class TestStatsCommand:
     def test_stats_basic(self, voltage_divider):
         model = load_circuit(voltage_divider)
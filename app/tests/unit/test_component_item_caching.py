@@ -0,0 +1,136 @@
+"""Tests for memoized geometry, paint resources, LOD and render caching of component items."""
+
+from unittest.mock import patch
+
+import pytest
+from controllers.circuit_controller import CircuitController
+from GUI.component_item import ComponentGraphicsItem, Ground, Resistor
+from GUI.styles import theme_manager
+from models.circuit import CircuitModel
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+
+
+@pytest.fixture
+def canvas(qtbot):
+    from GUI.circuit_canvas import CircuitCanvasView
+
+    ctrl = CircuitController(CircuitModel())
+    view = CircuitCanvasView(ctrl)
+    qtbot.addWidget(view)
+    ctrl.add_component("Resistor", (0, 0))
+    yield view, ctrl
+    view.set_component_render_cache(False)
+
+
+def _paint(item, scale):
+    image = QImage(200, 200, QImage.Format.Format_ARGB32)
+    painter = QPainter(image)
+    painter.scale(scale, scale)
+    try:
+        item.paint(painter, QStyleOptionGraphicsItem())
+    finally:
+        painter.end()
+
+
+class TestGeometryCache:
+    def test_bounding_rect_is_memoized(self):
+        comp = Resistor("R1")
+        with patch.object(ComponentGraphicsItem, "_compute_bounding_rect", wraps=comp._compute_bounding_rect) as spy:
+            rects = [comp.boundingRect() for _ in range(5)]
+        assert spy.call_count == 1
+        assert all(rect == rects[0] for rect in rects)
+
+    def test_returned_rect_cannot_corrupt_cache(self):
+        comp = Resistor("R1")
+        expected = comp.boundingRect()
+        comp.boundingRect().adjust(-100, -100, 100, 100)
+        assert comp.boundingRect() == expected
+
+    def test_value_change_invalidates(self, canvas):
+        view, ctrl = canvas
+        item = view.components["R1"]
+        before = item.boundingRect()
+        ctrl.update_component_value("R1", "4.7kOhm-precision")
+        assert item.boundingRect().width() > before.width()
+
+    def test_label_toggle_invalidates(self, canvas):
+        view, _ = canvas
+        item = view.components["R1"]
+        view.set_show_component_labels(False)
+        view.set_show_component_values(False)
+        assert item.boundingRect() == item._symbol_rect()
+        view.set_show_component_values(True)
+        assert item.boundingRect() != item._symbol_rect()
+
+    def test_obstacle_shape_follows_symbol_style(self):
+        comp = Resistor("R1")
+        with patch.object(ComponentGraphicsItem, "_compute_obstacle_shape", wraps=comp._compute_obstacle_shape) as spy:
+            first = comp.get_obstacle_shape()
+            first.append((0.0, 0.0))
+            assert comp.get_obstacle_shape() != first
+            assert spy.call_count == 1
+            try:
+                theme_manager.set_symbol_style("iec")
+                comp.get_obstacle_shape()
+            finally:
+                theme_manager.set_symbol_style("ieee")
+            assert spy.call_count == 2
+
+
+class TestPaintResources:
+    def test_resources_rebuilt_only_on_theme_revision(self):
+        comp = Resistor("R1")
+        resources = comp._paint_resources()
+        assert comp._paint_resources() is resources
+        try:
+            theme_manager.set_color_mode("monochrome")
+            mono = comp._paint_resources()
+        finally:
+            theme_manager.set_color_mode("color")
+        assert mono is not resources
+        assert mono["color"] == theme_manager.current_theme.color("text_primary")
+
+
+class TestLevelOfDetail:
+    @pytest.mark.parametrize("cls, comp_id", [(Resistor, "R1"), (Ground, "GND1")])
+    def test_text_and_terminals_skipped_when_zoomed_out(self, qtbot, cls, comp_id):
+        comp = cls(comp_id)
+        with (
+            patch.object(comp, "_draw_label_text") as label,
+            patch.object(comp, "_draw_terminals") as terminals,
+            patch.object(comp, "draw_component_body") as body,
+        ):
+            _paint(comp, 0.1)
+            assert not label.called and not terminals.called
+            assert body.call_count == 1
+            _paint(comp, 1.0)
+            assert label.call_count == 1 and terminals.call_count == 1
+
+
+class TestRenderCache:
+    def test_opt_in_applies_to_existing_and_new_items(self, canvas):
+        view, ctrl = canvas
+        no_cache = QGraphicsItem.CacheMode.NoCache
+        assert view.components["R1"].cacheMode() == no_cache
+
+        view.set_component_render_cache(True)
+        ctrl.add_component("Capacitor", (200, 0))
+        cached = QGraphicsItem.CacheMode.DeviceCoordinateCache
+        assert {item.cacheMode() for item in view.components.values()} == {cached}
+
+        view.set_component_render_cache(False)
+        assert {item.cacheMode() for item in view.components.values()} == {no_cache}
+
+    def test_theme_change_refreshes_cached_items(self, canvas):
+        view, _ = canvas
+        item = view.components["R1"]
+        view.set_component_render_cache(True)
+        with patch.object(type(item), "invalidate_geometry", autospec=True) as invalidate:
+            try:
+                theme_manager.set_color_mode("monochrome")
+            finally:
+                theme_manager.set_color_mode("color")
+        assert invalidate.call_count == 2
+        view.set_component_render_cache(False)
+        assert view._invalidate_component_geometry not in theme_manager._listeners
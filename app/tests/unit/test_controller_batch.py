@@ -0,0 +1,208 @@
+"""Tests for CircuitController.batch() transactions."""
+
+import pytest
+from controllers.circuit_controller import BatchChanges, CircuitController
+from controllers.commands import CompoundCommand, DeleteWireCommand, PasteCommand
+from models.circuit import CircuitModel
+
+
+@pytest.fixture
+def controller():
+    return CircuitController()
+
+
+@pytest.fixture
+def events(controller):
+    recorded = []
+    controller.add_observer(lambda event, data: recorded.append((event, data)))
+    return recorded
+
+
+def _connectivity(model):
+    """Node graph as a comparable set of terminal sets."""
+    return {frozenset(node.terminals) for node in model.nodes}
+
+
+def _reference_connectivity(model):
+    fresh = CircuitModel.from_dict(model.to_dict())
+    return _connectivity(fresh)
+
+
+@pytest.fixture
+def chain(controller):
+    """R1 - R2 - R3 chain with copy of R1/R2 on the clipboard."""
+    for x in (0.0, 100.0, 200.0):
+        controller.add_component("Resistor", (x, 0.0))
+    controller.add_wire("R1", 1, "R2", 0)
+    controller.add_wire("R2", 1, "R3", 0)
+    controller.copy_components(["R1", "R2"])
+    return controller
+
+
+class TestBatchEvents:
+    def test_changes_coalesced_into_one_event(self, controller, events):
+        with controller.batch() as changes:
+            controller.add_component("Resistor", (0.0, 0.0))
+            controller.add_component("Resistor", (100.0, 0.0))
+            controller.add_wire("R1", 1, "R2", 0)
+            assert events == []
+
+        assert [e for e, _ in events] == ["batch_applied"]
+        assert events[0][1] is changes
+        assert [c.component_id for c in changes.added_components] == ["R1", "R2"]
+        assert len(changes.added_wires) == 1
+
+    def test_single_change_delivered_as_plain_event(self, controller, events):
+        with controller.batch():
+            controller.add_component("Resistor", (0.0, 0.0))
+        assert [e for e, _ in events] == ["component_added"]
+
+    def test_empty_batch_is_silent(self, controller, events):
+        with controller.batch():
+            pass
+        assert events == []
+
+    def test_nested_batches_join_the_outer_one(self, controller, events):
+        with controller.batch() as outer:
+            controller.add_component("Resistor", (0.0, 0.0))
+            with controller.batch() as inner:
+                controller.add_component("Resistor", (100.0, 0.0))
+            assert inner is outer
+            assert events == []
+        assert len(events) == 1
+        assert len(events[0][1]) == 2
+
+    def test_batch_committed_on_error(self, controller, events):
+        with pytest.raises(RuntimeError):
+            with controller.batch():
+                controller.add_component("Resistor", (0.0, 0.0))
+                controller.add_component("Resistor", (100.0, 0.0))
+                raise RuntimeError("boom")
+        assert not controller.in_batch()
+        assert events[0][0] == "batch_applied"
+
+    def test_payload_helpers(self):
+        changes = BatchChanges(events=[("component_removed", "R1"), ("wire_removed", 0), ("component_removed", "R2")])
+        assert changes.removed_component_ids == ["R1", "R2"]
+        assert changes.event_names == {"component_removed", "wire_removed"}
+
+
+class TestDeferredNodeGraph:
+    def test_nodes_reconciled_on_exit(self, controller):
+        controller.add_component("Resistor", (0.0, 0.0))
+        controller.add_component("Resistor", (100.0, 0.0))
+        with controller.batch():
+            controller.add_wire("R1", 1, "R2", 0)
+            assert controller.model.nodes == []
+        assert _connectivity(controller.model) == {frozenset({("R1", 1), ("R2", 0)})}
+
+    def test_removals_keep_untouched_node_labels(self, chain):
+        labels_before = {frozenset(n.terminals): n.auto_label for n in chain.model.nodes}
+        chain.add_component("Resistor", (300.0, 0.0))
+        chain.add_wire("R3", 1, "R4", 0)
+        chain.add_wire("R4", 1, "R1", 0)
+        with chain.batch():
+            chain.remove_wire(3)
+            chain.remove_wire(2)
+        assert _connectivity(chain.model) == _reference_connectivity(chain.model)
+        for node in chain.model.nodes:
+            assert node.auto_label == labels_before[frozenset(node.terminals)]
+
+    def test_add_then_remove_inside_batch(self, chain):
+        with chain.batch():
+            chain.add_wire("R3", 1, "R1", 0)
+            chain.remove_wire(len(chain.model.wires) - 1)
+            chain.remove_component("R2")
+        assert _connectivity(chain.model) == _reference_connectivity(chain.model)
+
+
+class TestBatchedOperations:
+    def test_paste_emits_one_event(self, chain, events):
+        new_comps, new_wires = chain.paste_components()
+        assert [e for e, _ in events] == ["batch_applied"]
+        assert len(events[0][1].added_components) == 2
+        assert len(new_wires) == 1
+        assert _connectivity(chain.model) == _reference_connectivity(chain.model)
+
+    def test_undo_paste_is_one_event(self, chain, events):
+        chain.execute_command(PasteCommand(chain))
+        events.clear()
+        chain.undo()
+        assert [e for e, _ in events] == ["batch_applied", "undo_state_changed"]
+        assert len(chain.model.components) == 3
+        assert _connectivity(chain.model) == _reference_connectivity(chain.model)
+
+    def test_compound_undo_with_full_rebuild(self, chain, events):
+        compound = CompoundCommand([DeleteWireCommand(chain, 1), DeleteWireCommand(chain, 0)], "Delete wires")
+        chain.execute_command(compound)
+        assert chain.model.wires == []
+        events.clear()
+        chain.undo()
+        assert events[0][0] == "batch_applied"
+        assert len(chain.model.wires) == 2
+        assert _connectivity(chain.model) == _reference_connectivity(chain.model)
+
+    def test_scripting_batch(self):
+        from scripting.circuit import Circuit
+
+        circuit = Circuit()
+        with circuit.batch():
+            circuit.add_component("Resistor", position=(0, 0))
+            circuit.add_component("Resistor", position=(100, 0))
+            circuit.add_wire("R1", 1, "R2", 0)
+        assert len(circuit.model.nodes) == 1
+
+
+class TestCanvasBatch:
+    def test_canvas_replays_batch(self, qtbot, chain):
+        from GUI.circuit_canvas import CircuitCanvasView
+
+        view = CircuitCanvasView(chain)
+        qtbot.addWidget(view)
+        chain.notify("model_loaded", None)
+        chain.paste_components()
+        assert set(view.components) == set(chain.model.components)
+        assert len(view.wires) == len(chain.model.wires)
+        assert len(view.nodes) == len(chain.model.nodes) == 3
+
+    def test_paste_keeps_clear_routes_and_reroutes_blocked_ones(self, qtbot, controller):
+        from GUI.circuit_canvas import CircuitCanvasView
+
+        view = CircuitCanvasView(controller)
+        qtbot.addWidget(view)
+        controller.add_component("Resistor", (0.0, 0.0))
+        controller.add_component("Resistor", (300.0, 0.0))
+        controller.add_wire("R1", 1, "R2", 0)
+        copied = list(controller.model.wires[0].waypoints)
+        controller.copy_components(["R1", "R2"])
+
+        controller.paste_components(offset=(0.0, 200.0))
+        assert view.wires[-1].model.waypoints == [(x, y + 200.0) for x, y in copied]
+
+        # A component sitting on the next paste location blocks that route
+        controller.add_component("Resistor", (150.0, 400.0))
+        controller.paste_components(offset=(0.0, 200.0))
+        assert view.wires[-1].model.waypoints != [(x, y + 400.0) for x, y in copied]
+
+    def test_paste_reroutes_route_crossing_another_net(self, qtbot, controller):
+        from GUI.circuit_canvas import CircuitCanvasView
+
+        view = CircuitCanvasView(controller)
+        qtbot.addWidget(view)
+        controller.add_component("Resistor", (0.0, 0.0))
+        controller.add_component("Resistor", (300.0, 0.0))
+        controller.add_wire("R1", 1, "R2", 0)
+        copied = list(controller.model.wires[0].waypoints)
+        controller.copy_components(["R1", "R2"])
+
+        # A vertical wire on another net runs across the paste location
+        controller.add_component("Resistor", (150.0, 100.0))
+        controller.add_component("Resistor", (150.0, 350.0))
+        controller.rotate_component("R3")
+        controller.rotate_component("R4")
+        controller.add_wire("R3", 1, "R4", 0)
+        foreign = controller.model.wires[-1].waypoints
+        assert min(y for _, y in foreign) < 200.0 < max(y for _, y in foreign)
+
+        controller.paste_components(offset=(0.0, 200.0))
+        assert view.wires[-1].model.waypoints != [(x, y + 200.0) for x, y in copied]
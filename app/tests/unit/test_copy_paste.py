@@ -184,6 +184,17 @@ class TestPasteComponents:
         assert len(ctrl.model.components) == 4
         assert len(ctrl.model.wires) == 2
 
+    def test_paste_translates_wire_route(self, two_resistor_circuit):
+        ctrl = two_resistor_circuit
+        ctrl.model.wires[0].waypoints = [(40.0, 0.0), (40.0, 40.0), (60.0, 40.0)]
+        ctrl.model.wires[0].locked = True
+        ctrl.copy_components(["R1", "R2"])
+        _, new_wires = ctrl.paste_components(offset=(40.0, 20.0))
+        assert new_wires[0].waypoints == [(80.0, 20.0), (80.0, 60.0), (100.0, 60.0)]
+        assert new_wires[0].locked is True
+        _, again = ctrl.paste_components(offset=(40.0, 20.0))
+        assert again[0].waypoints[0] == (120.0, 40.0)
+
     def test_paste_then_delete(self, controller):
         """Pasted components must be deletable (regression: #443)."""
         controller.add_component("Resistor", (0.0, 0.0))
@@ -12,7 +12,14 @@ import tempfile
 from pathlib import Path
 
 import pytest
-from grading.feedback_exporter import export_student_reports, generate_student_report_html
+from grading.feedback_exporter import (
+    MANIFEST_NAME,
+    SHARED_CSS_NAME,
+    ReportExportError,
+    export_reports,
+    export_student_reports,
+    generate_student_report_html,
+)
 from tests.unit.grading_fakes import FakeBatchResult, FakeCheckResult, FakeGradingResult
 
 # ---------------------------------------------------------------------------
@@ -183,6 +190,87 @@ class TestExportStudentReports:
             assert "student1_report.html" in Path(created[0]).name
 
 
+# ---------------------------------------------------------------------------
+# export_reports (parallel, incremental)
+# ---------------------------------------------------------------------------
+
+
+def _section(count=6):
+    return FakeBatchResult(
+        results=[
+            FakeGradingResult(student_file=f"s{i}.json", check_results=[FakeCheckResult(check_id="c1")])
+            for i in range(count)
+        ]
+    )
+
+
+class TestIncrementalExport:
+    def test_unchanged_reports_are_skipped(self, tmp_path):
+        batch = _section()
+        first = export_reports(batch, str(tmp_path), workers=3)
+        assert len(first.written) == 6 and not first.skipped
+        assert (tmp_path / MANIFEST_NAME).exists()
+
+        batch.results[2].earned_points = 1
+        second = export_reports(batch, str(tmp_path), workers=3)
+        assert second.written == [str(tmp_path / "s2_report.html")]
+        assert len(second.skipped) == 5
+        assert second.paths == first.paths
+
+    def test_deleted_report_is_rewritten(self, tmp_path):
+        batch = _section(2)
+        export_reports(batch, str(tmp_path))
+        (tmp_path / "s0_report.html").unlink()
+        assert export_reports(batch, str(tmp_path)).written == [str(tmp_path / "s0_report.html")]
+
+    def test_force_and_corrupt_manifest(self, tmp_path):
+        batch = _section(2)
+        export_reports(batch, str(tmp_path))
+        assert len(export_reports(batch, str(tmp_path), force=True).written) == 2
+        (tmp_path / MANIFEST_NAME).write_text("{ broken")
+        assert len(export_reports(batch, str(tmp_path)).written) == 2
+
+    def test_shared_css(self, tmp_path):
+        batch = _section(2)
+        export = export_reports(batch, str(tmp_path), shared_css=True)
+        content = Path(export.paths[0]).read_text(encoding="utf-8")
+        assert f'href="{SHARED_CSS_NAME}"' in content
+        assert "<style>" not in content
+        assert (tmp_path / SHARED_CSS_NAME).read_text(encoding="utf-8").startswith("body")
+        # Switching back to inline CSS changes the inputs of every report
+        assert len(export_reports(batch, str(tmp_path)).written) == 2
+
+    def test_schematic_image_embedded_and_hashed(self, tmp_path):
+        batch = _section(2)
+        image = tmp_path / "s1.png"
+        image.write_bytes(b"\x89PNG fake")
+        out = tmp_path / "reports"
+        export = export_reports(batch, str(out), schematic_images={"s1.json": str(image)})
+        assert "data:image/png;base64," in Path(export.paths[1]).read_text(encoding="utf-8")
+        assert "<img" not in Path(export.paths[0]).read_text(encoding="utf-8")
+
+        image.write_bytes(b"\x89PNG changed")
+        again = export_reports(batch, str(out), schematic_images={"s1.json": str(image)})
+        assert again.written == [export.paths[1]]
+
+    def test_failed_report_does_not_lose_the_others(self, tmp_path):
+        batch = _section(4)
+        images = {"s1.json": str(tmp_path / "missing.png"), "s3.json": str(tmp_path / "gone.png")}
+        out = tmp_path / "reports"
+        export = export_reports(batch, str(out), schematic_images=images, workers=2)
+        assert set(export.failed) == {"s1.json", "s3.json"}
+        assert all(isinstance(e, FileNotFoundError) for e in export.failed.values())
+        assert export.written == [str(out / "s0_report.html"), str(out / "s2_report.html")]
+        # The successes were recorded, so a retry only touches the failures
+        assert len(export_reports(batch, str(out)).written) == 2
+
+        with pytest.raises(ReportExportError) as excinfo:
+            export_student_reports(batch, str(tmp_path / "legacy"), schematic_images=images)
+        assert set(excinfo.value.failures) == {"s1.json", "s3.json"}
+        assert (tmp_path / "legacy" / "s2_report.html").exists()
+        assert (tmp_path / "legacy" / MANIFEST_NAME).exists()
+
+
 # ---------------------------------------------------------------------------
 # BatchGradingDialog integration (structural)
 # ---------------------------------------------------------------------------
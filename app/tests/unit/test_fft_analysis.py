@@ -9,6 +9,8 @@ from simulation.fft_analysis import (
     compute_thd,
     find_fundamental_frequency,
     find_harmonics,
+    resample_uniform,
+    steady_state_range,
 )
 
 
@@ -363,3 +365,126 @@ class TestFFTDialogFeatures:
 
         assert "MHz" in FFTAnalysisDialog._format_freq(None, 2.5e6)
         assert "2.50 MHz" == FFTAnalysisDialog._format_freq(None, 2.5e6)
+
+
+def _adaptive_time(duration, n, seed=0):
+    """Irregular, strictly increasing timesteps like ngspice's adaptive stepping."""
+    steps = np.random.default_rng(seed).uniform(0.2, 1.8, n - 1)
+    return np.concatenate([[0.0], np.cumsum(steps)]) * duration / steps.sum()
+
+
+class TestResampling:
+    def test_uniform_input_is_used_as_is(self):
+        time = np.linspace(0, 1, 100, endpoint=False)
+        signal = np.sin(2 * np.pi * 5 * time)
+        uniform_time, uniform_signal = resample_uniform(time, signal)
+        assert uniform_time is not None and np.array_equal(uniform_time, time)
+        assert np.array_equal(uniform_signal, signal)
+
+    def test_adaptive_steps_land_on_a_uniform_grid(self):
+        time = _adaptive_time(0.1, 2000)
+        uniform_time, uniform_signal = resample_uniform(time, np.sin(2 * np.pi * 50 * time))
+        assert np.allclose(np.diff(uniform_time), uniform_time[1] - uniform_time[0])
+        assert np.allclose(uniform_signal, np.sin(2 * np.pi * 50 * uniform_time), atol=1e-3)
+
+    def test_thd_is_accurate_with_adaptive_steps(self):
+        time = _adaptive_time(0.2, 4000)
+        signal = np.sin(2 * np.pi * 50 * time) + 0.1 * np.sin(2 * np.pi * 150 * time)
+        result = analyze_signal_spectrum(time, signal, "v(out)", "hanning")
+        assert result.fundamental_freq == pytest.approx(50, abs=2.5)
+        assert result.thd_percent == pytest.approx(10.0, abs=1.0)
+
+    def test_range_needs_enough_samples(self):
+        time = np.linspace(0, 1, 100)
+        with pytest.raises(ValueError, match="at least 4 samples"):
+            compute_fft(time, np.sin(time), time_range=(0.5, 0.51))
+
+    @pytest.mark.parametrize("time_range", [(2.0, 3.0), (-2.0, -1.0)])
+    def test_range_outside_the_data_is_reported(self, time_range):
+        time = np.linspace(0, 1, 100)
+        with pytest.raises(ValueError, match=r"outside the data \(0 s to 1 s\)"):
+            resample_uniform(time, np.sin(time), time_range)
+
+    def test_reversed_range_is_reported(self):
+        time = np.linspace(0, 1, 100)
+        with pytest.raises(ValueError, match="must be before its end"):
+            resample_uniform(time, np.sin(time), (0.8, 0.2))
+
+
+class TestRealFFT:
+    def test_matches_full_complex_fft(self):
+        time = np.linspace(0, 1, 256, endpoint=False)
+        signal = np.sin(2 * np.pi * 12 * time) + 0.5
+        window = np.hanning(256)
+        full = np.fft.fft(signal * window) / 256 / np.sqrt(np.mean(window**2))
+        expected = np.abs(full[:128])
+        expected[1:] *= 2
+
+        result = compute_fft(time, signal, "Test", "hanning")
+
+        assert np.allclose(result.magnitude, expected)
+        assert np.allclose(result.phase, np.angle(full[:128], deg=True))
+
+
+class TestWelchAveraging:
+    def test_averaging_steadies_the_noise_floor(self):
+        rng = np.random.default_rng(1)
+        time = np.linspace(0, 1, 8192, endpoint=False)
+        signal = np.sin(2 * np.pi * 200 * time) + 0.1 * rng.standard_normal(time.size)
+
+        single = compute_fft(time, signal, "Test", "hanning")
+        averaged = compute_fft(time, signal, "Test", "hanning", segments=8)
+
+        assert averaged.segments == 8
+        assert len(averaged.frequencies) < len(single.frequencies)
+        floor = averaged.frequencies > 1000
+        assert np.std(averaged.magnitude_db[floor]) < np.std(single.magnitude_db[single.frequencies > 1000])
+        peak = averaged.frequencies[np.argmax(averaged.magnitude)]
+        assert peak == pytest.approx(200, abs=averaged.sample_rate / (2 * len(averaged.frequencies)) * 2)
+
+
+class TestSteadyState:
+    def test_skips_the_start_up_and_covers_whole_periods(self):
+        time = np.linspace(0, 0.2, 20000, endpoint=False)
+        signal = np.sin(2 * np.pi * 50 * time) + 3 * np.exp(-time / 0.01)
+
+        start, end = steady_state_range(time, signal)
+
+        assert start >= 0.1 - 1e-9 and end == pytest.approx(time[-1])
+        assert ((end - start) * 50) == pytest.approx(round((end - start) * 50), abs=0.05)
+        steady = analyze_signal_spectrum(time, signal, "v", "none", time_range=(start, end))
+        full = analyze_signal_spectrum(time, signal, "v", "none")
+        assert steady.magnitude[0] < full.magnitude[0]
+
+    def test_without_a_fundamental_uses_the_tail(self):
+        time = np.linspace(0, 1, 100)
+        start, end = steady_state_range(time, np.ones_like(time))
+        assert (start, end) == pytest.approx((0.5, 1.0))
+
+
+class TestFFTDialogCaching:
+    def test_spectra_are_memoized_per_selection(self, qtbot):
+        from unittest.mock import patch
+
+        from controllers.simulation_controller import SimulationController
+        from GUI.waveform_dialog import FFTAnalysisDialog
+
+        time = np.linspace(0, 0.1, 2000, endpoint=False)
+        data = [{"time": t, "v(out)": np.sin(2 * np.pi * 100 * t)} for t in time]
+        with (
+            patch.object(
+                SimulationController, "compute_signal_fft", wraps=SimulationController.compute_signal_fft
+            ) as spy,
+            patch.object(FFTAnalysisDialog, "_replot"),
+        ):
+            dialog = FFTAnalysisDialog(time, data, ["v(out)"])
+            qtbot.addWidget(dialog)
+            dialog.window_combo.setCurrentText("Blackman")
+            dialog.window_combo.setCurrentText("Hanning")
+            dialog.averaging_combo.setCurrentIndex(1)
+            dialog.averaging_combo.setCurrentIndex(0)
+            dialog.range_combo.setCurrentIndex(1)
+            dialog.range_combo.setCurrentIndex(0)
+
+        assert spy.call_count == 4
+        assert dialog._fft_result is dialog._spectra[("v(out)", "hanning", False, 1)]
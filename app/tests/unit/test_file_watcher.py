@@ -0,0 +1,59 @@
+"""Tests for utils.file_watcher."""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+from utils.file_watcher import FileWatcher, file_signature
+
+
+def _touch(path, text):
+    path.write_text(text)
+    # Make the change visible even on filesystems with coarse mtimes
+    stamp = time.time() + 1
+    os.utime(path, (stamp, stamp))
+
+
+class TestFileWatcher:
+    def test_polling_reports_change(self, tmp_path):
+        target = tmp_path / "c.json"
+        target.write_text("a")
+        with FileWatcher(str(target), poll_interval=0.01, settle=0.01, use_notifications=False) as watcher:
+            threading.Timer(0.05, _touch, (target, "bb")).start()
+            assert watcher.wait_for_change(timeout=2)
+            assert not watcher.wait_for_change(timeout=0.05)
+
+    def test_atomic_replace_is_seen(self, tmp_path):
+        target = tmp_path / "c.json"
+        target.write_text("a")
+        with FileWatcher(str(target), poll_interval=0.01, settle=0.01) as watcher:
+            tmp = tmp_path / "c.json.tmp"
+            _touch(tmp, "replacement")
+            os.replace(tmp, target)
+            assert watcher.wait_for_change(timeout=2)
+
+    def test_missing_file_waits(self, tmp_path):
+        target = tmp_path / "later.json"
+        assert file_signature(str(target)) is None
+        with FileWatcher(str(target), poll_interval=0.01, settle=0.01, use_notifications=False) as watcher:
+            assert not watcher.wait_for_change(timeout=0.05)
+            target.write_text("x")
+            assert watcher.wait_for_change(timeout=2)
+
+    def test_stop_unblocks_wait(self, tmp_path):
+        target = tmp_path / "c.json"
+        target.write_text("a")
+        watcher = FileWatcher(str(target), poll_interval=5, use_notifications=False)
+        threading.Timer(0.05, watcher.stop).start()
+        start = time.monotonic()
+        assert not watcher.wait_for_change()
+        assert time.monotonic() - start < 2
+
+
+class TestNoQtInFileWatcher:
+    def test_no_pyqt_imports(self):
+        import utils.file_watcher as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
@@ -0,0 +1,155 @@
+"""Tests for algorithms/global_router.py — net-aware whole-circuit routing."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from algorithms.global_router import GlobalRouteRequest, NetConnection, route_circuit
+from algorithms.routing_service import ComponentSnapshot, WireSnapshot
+from controllers.circuit_controller import CircuitController
+from controllers.file_controller import FileController
+from models.circuit import CircuitModel
+
+GRID = 20
+_PAD = ((-1, -1), (1, -1), (1, 1), (-1, 1))
+
+
+def _pad(cid, pos):
+    """A one-terminal part with a tiny body."""
+    return ComponentSnapshot(cid, pos, 0, (pos,), _PAD)
+
+
+def _conn(key, a, b, net):
+    return NetConnection(key, a.position, b.position, ((a.component_id, 0), (b.component_id, 0)), net=net)
+
+
+def _cells(waypoints):
+    """Grid cells covered by an orthogonal polyline."""
+    cells = set()
+    points = [(round(x / GRID), round(y / GRID)) for x, y in waypoints]
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        for x in range(min(x1, x2), max(x1, x2) + 1):
+            for y in range(min(y1, y2), max(y1, y2) + 1):
+                cells.add((x, y))
+    return cells
+
+
+class TestRouteCircuit:
+    def test_crossing_nets_are_negotiated_apart(self):
+        p1, p2, p3, p4 = _pad("P1", (0, 0)), _pad("P2", (200, 40)), _pad("P3", (0, 40)), _pad("P4", (200, 0))
+        request = GlobalRouteRequest((_conn("a", p1, p2, "A"), _conn("b", p3, p4, "B")), (p1, p2, p3, p4))
+
+        result = route_circuit(request)
+
+        assert result.failures == 0
+        # The first pass lets the nets cross; later passes push them apart
+        assert result.passes >= 2
+        a, b = result.routes["a"], result.routes["b"]
+        assert not _cells(a.waypoints) & _cells(b.waypoints)
+        assert (a.waypoints[0], a.waypoints[-1]) == ((0.0, 0.0), (200.0, 40.0))
+        assert (b.waypoints[0], b.waypoints[-1]) == ((0.0, 40.0), (200.0, 0.0))
+        assert a.key == "a" and not a.routing_failed
+
+    def test_same_net_branch_joins_trunk(self):
+        left, right, tap = _pad("L", (0, 0)), _pad("R", (200, 0)), _pad("T", (100, 100))
+        request = GlobalRouteRequest(
+            (_conn("branch", tap, left, "N"), _conn("trunk", left, right, "N")),
+            (left, right, tap),
+        )
+
+        result = route_circuit(request)
+
+        trunk, branch = result.routes["trunk"], result.routes["branch"]
+        assert trunk.waypoints == ((0.0, 0.0), (200.0, 0.0))
+        # The branch runs along the trunk instead of taking its own L
+        assert (100.0, 0.0) in branch.waypoints
+        assert len(_cells(trunk.waypoints) & _cells(branch.waypoints)) == 6
+
+    def test_fixed_wires_block_other_nets_only(self):
+        p1, p2 = _pad("P1", (0, 0)), _pad("P2", (200, 0))
+        wall = WireSnapshot(((100, -100), (100, 100)), node="W")
+
+        result = route_circuit(GlobalRouteRequest((_conn("a", p1, p2, "A"),), (p1, p2), fixed_wires=(wall,)))
+        assert not _cells(result.routes["a"].waypoints) & _cells(wall.waypoints)
+
+        shared = route_circuit(GlobalRouteRequest((_conn("a", p1, p2, "W"),), (p1, p2), fixed_wires=(wall,))).routes[
+            "a"
+        ]
+        assert shared.waypoints == ((0.0, 0.0), (200.0, 0.0))
+
+    def test_enclosed_terminal_falls_back_to_straight_line(self):
+        p1, p2 = _pad("P1", (0, 0)), _pad("P2", (200, 0))
+        box = WireSnapshot(((-80, -80), (80, -80), (80, 80), (-80, 80), (-80, -80)), node="W")
+
+        result = route_circuit(GlobalRouteRequest((_conn("a", p1, p2, "A"),), (p1, p2), fixed_wires=(box,)))
+
+        assert result.failures == 1
+        route = result.routes["a"]
+        assert route.routing_failed and route.waypoints == ((0, 0), (200, 0))
+
+    def test_empty_request(self):
+        result = route_circuit(GlobalRouteRequest((), ()))
+        assert result.routes == {} and result.failures == 0
+
+
+@pytest.fixture
+def canvas(qtbot):
+    from GUI.circuit_canvas import CircuitCanvasView
+
+    ctrl = CircuitController(CircuitModel())
+    view = CircuitCanvasView(ctrl)
+    qtbot.addWidget(view)
+    for x in (0, 200, 400):
+        ctrl.add_component("Resistor", (x, 0))
+    ctrl.add_wire("R1", 1, "R2", 0)
+    ctrl.add_wire("R2", 1, "R3", 0)
+    ctrl.add_wire("R1", 0, "R3", 1)
+    yield view, ctrl
+    view._cancel_background_routes()
+
+
+class TestCanvasIntegration:
+    def test_reroute_all_is_one_undoable_global_pass(self, canvas):
+        view, ctrl = canvas
+        ctrl.set_wire_locked(2, True)
+        before = [list(w.waypoints) for w in ctrl.model.wires]
+        ctrl.update_wire_waypoints(0, [(60.0, 0.0), (60.0, 200.0), (140.0, 200.0), (140.0, 0.0)])
+
+        with patch("algorithms.global_router.route_circuit", wraps=route_circuit) as router:
+            view.reroute_all_wires()
+
+        assert router.call_count == 1
+        request = router.call_args.args[0]
+        assert [c.key for c in request.connections] == view.wires[:2]
+        assert len(request.fixed_wires) == 1
+        assert len(ctrl.model.wires[0].waypoints) < 4
+        assert [list(w.waypoints) for w in ctrl.model.wires][2] == before[2]
+
+        ctrl.undo()
+        assert len(ctrl.model.wires[0].waypoints) == 4
+
+    def test_loading_unrouted_circuit_routes_once(self, canvas):
+        view, ctrl = canvas
+        data = ctrl.model.to_dict()
+        for wire in data["wires"]:
+            wire["waypoints"] = []
+        messages = []
+        view.statusMessage.connect(lambda text, _timeout: messages.append(text))
+
+        files = FileController(ctrl.model, circuit_ctrl=ctrl)
+
+        with patch("algorithms.global_router.route_circuit", wraps=route_circuit) as router:
+            files.load_from_model(CircuitModel.from_dict(data))
+
+        assert router.call_count == 1
+        assert all(len(w.waypoints) >= 2 for w in ctrl.model.wires)
+        assert all(len(w.waypoints) >= 2 for w in view.wires)
+        assert messages and messages[-1].startswith("Routed 3 wires in")
+
+
+class TestNoQtInGlobalRouter:
+    def test_no_pyqt_imports(self):
+        import algorithms.global_router as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
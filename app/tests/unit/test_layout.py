@@ -0,0 +1,153 @@
+"""Tests for algorithms/layout.py — connectivity-aware auto-layout."""
+
+from pathlib import Path
+
+import pytest
+from algorithms.layout import auto_layout_model, compute_layout
+from cli import build_parser, cmd_import
+from simulation.asc_parser import import_asc
+from simulation.circuitikz_parser import import_circuitikz
+from simulation.netlist_parser import import_netlist
+
+
+def _ladder(sections):
+    lines = ["* RC ladder", "V1 n0 0 5"]
+    for i in range(sections):
+        lines.append(f"R{i + 1} n{i} n{i + 1} 1k")
+        lines.append(f"C{i + 1} n{i + 1} 0 1n")
+    return "\n".join(lines + [".end"])
+
+
+def _wire_length(model):
+    total = 0.0
+    for wire in model.wires:
+        ax, ay = model.components[wire.start_component_id].position
+        bx, by = model.components[wire.end_component_id].position
+        total += abs(ax - bx) + abs(ay - by)
+    return total
+
+
+def _node_sets(model):
+    return sorted(sorted(node.terminals) for node in model.nodes)
+
+
+class TestComputeLayout:
+    def test_empty_and_single(self):
+        assert compute_layout([], []) == {}
+        assert compute_layout(["R1"], [], origin=(-300, -200)) == {"R1": (-300.0, -200.0)}
+
+    def test_positions_are_on_grid_and_distinct(self):
+        ids = [f"C{i}" for i in range(30)]
+        connections = [(ids[i], ids[(i * 7 + 3) % 30]) for i in range(30)]
+        positions = compute_layout(ids, connections, spacing=145, grid_size=10)
+        assert set(positions) == set(ids)
+        assert len(set(positions.values())) == len(ids)
+        for x, y in positions.values():
+            assert x % 10 == 0 and y % 10 == 0
+
+    def test_connected_components_are_neighbours(self):
+        ids = ["A", "B", "C", "D"]
+        positions = compute_layout(ids, [("A", "B"), ("B", "C"), ("C", "D")], spacing=100)
+        for a, b in [("A", "B"), ("B", "C"), ("C", "D")]:
+            (ax, ay), (bx, by) = positions[a], positions[b]
+            assert abs(ax - bx) + abs(ay - by) <= 200
+
+    def test_deterministic(self):
+        ids = [f"N{i}" for i in range(20)]
+        connections = [(ids[i], ids[i + 1]) for i in range(19)] + [("N0", "N10")]
+        assert compute_layout(ids, connections) == compute_layout(ids, connections)
+
+    def test_ignores_unknown_and_self_connections(self):
+        positions = compute_layout(["A", "B"], [("A", "A"), ("A", "Z")])
+        assert len(set(positions.values())) == 2
+
+    def test_disconnected_groups_do_not_overlap(self):
+        ids = ["A", "B", "C", "D", "E"]
+        positions = compute_layout(ids, [("A", "B"), ("C", "D")])
+        assert len(set(positions.values())) == len(ids)
+
+
+class TestNetlistImportLayout:
+    def test_auto_layout_shortens_wires(self):
+        text = _ladder(20)
+        auto, _ = import_netlist(text)
+        grid, _ = import_netlist(text, layout="grid")
+        assert _wire_length(auto) < _wire_length(grid)
+        assert _node_sets(auto) == _node_sets(grid)
+
+    def test_auto_layout_has_no_overlaps(self):
+        model, _ = import_netlist(_ladder(10))
+        positions = [comp.position for comp in model.components.values()]
+        assert len(set(positions)) == len(positions)
+        assert all(x % 10 == 0 and y % 10 == 0 for x, y in positions)
+
+    def test_unknown_layout_rejected(self):
+        with pytest.raises(ValueError, match="layout"):
+            import_netlist(_ladder(1), layout="spiral")
+
+    def test_cli_layout_option(self, tmp_path):
+        netlist = tmp_path / "ladder.cir"
+        netlist.write_text(_ladder(3))
+        args = build_parser().parse_args(["import", str(netlist), "--layout", "grid"])
+        assert args.layout == "grid"
+        assert cmd_import(args) == 0
+        # No option: netlists are laid out automatically, schematics keep their drawing
+        assert build_parser().parse_args(["import", str(netlist)]).layout is None
+
+
+class TestDrawingImportLayout:
+    ASC = """\
+Version 4
+SHEET 1 880 680
+WIRE 192 80 80 80
+WIRE 192 192 192 80
+WIRE 80 256 80 80
+WIRE 192 256 192 192
+WIRE 192 256 80 256
+FLAG 80 256 0
+SYMBOL res 176 64 R0
+SYMATTR InstName R1
+SYMATTR Value 10k
+SYMBOL res 176 176 R0
+SYMATTR InstName R2
+SYMATTR Value 10k
+SYMBOL voltage 80 80 R0
+SYMATTR InstName V1
+SYMATTR Value 5V
+"""
+
+    TIKZ = r"""
+\begin{circuitikz}
+  \draw (0, 2) to[R, l=$R1$, a={1k}] (0, 1);
+  \draw (0, 1) to[C, l=$C1$, a={10u}] (0, 0);
+\end{circuitikz}
+"""
+
+    def test_asc_keeps_drawing_by_default(self):
+        drawn, _, _ = import_asc(self.ASC)
+        relaid, _, _ = import_asc(self.ASC, auto_layout=True)
+        assert _node_sets(relaid) == _node_sets(drawn)
+        positions = [comp.position for comp in relaid.components.values()]
+        assert len(set(positions)) == len(positions)
+
+    def test_circuitikz_auto_layout_clears_waypoints(self):
+        model, _ = import_circuitikz(self.TIKZ, auto_layout=True)
+        assert all(not wire.waypoints for wire in model.wires)
+        positions = [comp.position for comp in model.components.values()]
+        assert len(set(positions)) == len(positions)
+
+
+class TestAutoLayoutModel:
+    def test_relayout_existing_model(self):
+        model, _ = import_netlist(_ladder(5), layout="grid")
+        before = _wire_length(model)
+        auto_layout_model(model)
+        assert _wire_length(model) < before
+
+
+class TestNoQtInLayout:
+    def test_no_pyqt_imports(self):
+        import algorithms.layout as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
@@ -0,0 +1,221 @@
+"""Tests for the live, debounced background operating point."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from controllers.circuit_controller import CircuitController
+from controllers.live_op_controller import LiveOpController, LiveOpJob, LiveOpResult
+from models.circuit import CircuitModel
+from simulation.ngspice_runner import NgspiceRunner
+
+
+def _divider():
+    ctrl = CircuitController(CircuitModel())
+    ctrl.add_component("Voltage Source", (0, 0))
+    ctrl.add_component("Resistor", (200, 0))
+    ctrl.add_component("Ground", (0, 200))
+    ctrl.add_wire("V1", 0, "R1", 0)
+    ctrl.add_wire("R1", 1, "GND1", 0)
+    ctrl.add_wire("V1", 1, "GND1", 0)
+    return ctrl
+
+
+def _fake_runner(tmp_path, output="v(nodeA) = 5.00000\n"):
+    out = tmp_path / "op.txt"
+    out.write_text(output)
+    runner = MagicMock()
+    runner.run_simulation.return_value = (True, str(out), "", "")
+    runner.read_output.side_effect = lambda path: Path(path).read_text()
+    return runner
+
+
+class TestGenerations:
+    def test_netlist_edits_bump_generation_and_cancel(self):
+        ctrl = _divider()
+        live = LiveOpController(ctrl.model, ctrl)
+        job = live.snapshot()
+
+        ctrl.move_component("R1", (220, 0))
+        assert live.generation == 0 and not job.cancel.is_set()
+
+        ctrl.update_component_value("R1", "2k")
+        assert live.generation == 1 and job.cancel.is_set()
+        assert not live.is_current(LiveOpResult(job.generation))
+
+    def test_batches_count_once(self):
+        ctrl = _divider()
+        live = LiveOpController(ctrl.model, ctrl)
+        with ctrl.batch():
+            ctrl.update_component_value("R1", "2k")
+            ctrl.update_component_value("V1", "9V")
+        assert live.generation == 1
+
+    def test_snapshot_skips_finished_and_running_generations(self, tmp_path):
+        ctrl = _divider()
+        live = LiveOpController(ctrl.model, ctrl, runner=_fake_runner(tmp_path))
+        job = live.snapshot()
+        assert live.snapshot() is None
+
+        assert live.finish(live.run(job))
+        assert live.snapshot() is None
+
+        ctrl.update_component_value("R1", "2k")
+        assert live.snapshot().generation == 1
+
+    def test_snapshot_is_isolated_from_later_edits(self):
+        ctrl = _divider()
+        live = LiveOpController(ctrl.model, ctrl)
+        job = live.snapshot()
+        ctrl.update_component_value("R1", "2k")
+        assert job.model.components["R1"].value != "2k"
+
+
+class TestRun:
+    def test_parses_node_voltages(self, tmp_path):
+        ctrl = _divider()
+        runner = _fake_runner(tmp_path)
+        live = LiveOpController(ctrl.model, ctrl, runner=runner)
+
+        result = live.run(live.snapshot())
+
+        assert result.success and result.node_voltages == {"nodeA": pytest.approx(5.0)}
+        netlist = runner.run_simulation.call_args.args[0]
+        assert ".op" in netlist
+        # The live run never touches the user's analysis settings
+        assert ctrl.model.analysis_type == "DC Operating Point"
+
+    def test_invalid_circuit_reports_without_simulating(self, tmp_path):
+        ctrl = CircuitController(CircuitModel())
+        ctrl.add_component("Resistor", (0, 0))
+        runner = _fake_runner(tmp_path)
+        live = LiveOpController(ctrl.model, ctrl, runner=runner)
+
+        result = live.run(live.snapshot())
+
+        assert not result.success and result.error
+        runner.run_simulation.assert_not_called()
+
+    def test_cancelled_run(self, tmp_path):
+        ctrl = _divider()
+        runner = _fake_runner(tmp_path)
+        runner.run_simulation.return_value = (False, None, "", "Simulation cancelled")
+        live = LiveOpController(ctrl.model, ctrl, runner=runner)
+
+        result = live.run(live.snapshot())
+
+        assert result.cancelled and not live.is_current(result)
+
+
+class TestRunnerCancel:
+    def test_cancel_kills_the_process(self):
+        cancel = threading.Event()
+        threading.Timer(0.1, cancel.set).start()
+        start = time.monotonic()
+
+        returncode, _, _ = NgspiceRunner._run_until_cancelled(
+            [sys.executable, "-c", "import time; time.sleep(30)"], 60, cancel
+        )
+
+        assert returncode is None
+        assert time.monotonic() - start < 10
+
+    def test_uncancelled_run_completes(self):
+        returncode, stdout, _ = NgspiceRunner._run_until_cancelled(
+            [sys.executable, "-c", "print('ok')"], 60, threading.Event()
+        )
+        assert returncode == 0 and stdout.strip() == "ok"
+
+
+class TestLiveOperatingPointView:
+    @pytest.fixture
+    def live_view(self, qtbot):
+        from GUI.circuit_canvas import CircuitCanvasView
+        from GUI.live_op import LiveOperatingPoint
+
+        ctrl = _divider()
+        canvas = CircuitCanvasView(ctrl)
+        qtbot.addWidget(canvas)
+        controller = LiveOpController(ctrl.model, ctrl)
+        view = LiveOperatingPoint(ctrl.model, ctrl, canvas, controller=controller)
+        yield view, ctrl, canvas, controller
+        view.shutdown()
+
+    def test_result_reaches_canvas_after_edits_settle(self, qtbot, live_view):
+        view, ctrl, canvas, controller = live_view
+        calls = []
+
+        def run(job):
+            calls.append(job.generation)
+            return LiveOpResult(job.generation, {"nodeA": 5.0})
+
+        controller.run = run
+        view.set_enabled(True)
+        ctrl.update_component_value("R1", "2k")
+        ctrl.update_component_value("R1", "3k")
+
+        qtbot.waitUntil(lambda: canvas.node_voltages == {"nodeA": 5.0})
+        # Both edits fall inside one debounce window
+        assert calls == [controller.generation]
+
+    def test_stale_result_is_dropped(self, qtbot, live_view):
+        view, ctrl, canvas, controller = live_view
+        started, release = threading.Event(), threading.Event()
+        shown = []
+        canvas.set_op_results = lambda voltages, currents=None: shown.append(voltages)
+
+        def run(job: LiveOpJob):
+            started.set()
+            release.wait(5)
+            return LiveOpResult(job.generation, {"generation": job.generation})
+
+        controller.run = run
+        view.set_enabled(True)
+        qtbot.waitUntil(started.is_set)
+        stale = controller.generation
+        ctrl.update_component_value("R1", "2k")
+        release.set()
+
+        qtbot.waitUntil(lambda: bool(shown))
+        assert shown == [{"generation": controller.generation}]
+        assert controller.generation != stale
+
+    def test_wire_edits_after_a_snapshot_reach_the_canvas(self, qtbot):
+        from GUI.circuit_canvas import CircuitCanvasView
+
+        ctrl = CircuitController(CircuitModel())
+        canvas = CircuitCanvasView(ctrl)
+        qtbot.addWidget(canvas)
+        controller = LiveOpController(ctrl.model, ctrl)
+        ctrl.add_component("Voltage Source", (0, 0))
+        ctrl.add_component("Resistor", (200, 0))
+        ctrl.add_wire("V1", 0, "R1", 0)
+        wire = ctrl.model.wires[0]
+        job = controller.snapshot()
+
+        ctrl.update_wire_waypoints(0, [(50.0, 0.0), (50.0, 80.0)])
+        ctrl.set_wire_locked(0, True)
+
+        item = canvas.wires[0]
+        assert ctrl.model.wires[0] is wire and item.model is wire
+        assert item.model.waypoints == [(50.0, 0.0), (50.0, 80.0)] and item.model.locked
+        assert job.model.wires[0].waypoints != wire.waypoints and not job.model.wires[0].locked
+
+    def test_disable_stops_runs(self, qtbot, live_view):
+        view, ctrl, canvas, controller = live_view
+        controller.run = MagicMock(return_value=LiveOpResult(0, {"nodeA": 5.0}))
+        view.set_enabled(True)
+        view.set_enabled(False)
+        qtbot.wait(400)
+        controller.run.assert_not_called()
+
+
+class TestNoQtInLiveOpController:
+    def test_no_pyqt_imports(self):
+        import controllers.live_op_controller as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
@@ -0,0 +1,244 @@
+"""Tests for offline .meas evaluation on stored waveforms."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from controllers.simulation_controller import SimulationController, SimulationResult
+from simulation.measurement_builder import build_directive
+from simulation.measurement_engine import (
+    MeasurementError,
+    crossing_positions,
+    measure_result,
+    measure_stacked,
+    parse_meas_directive,
+    values_at,
+)
+from simulation.stacked_results import stack_results
+
+TAU = 1e-4
+T = np.linspace(0.0, 1e-3, 2001)
+
+
+def _rc_rows(tau=TAU, delay=1e-4):
+    """Step input at *delay* driving a first-order RC response."""
+    return [
+        {
+            "time": t,
+            "in": 1.0 if t > delay else 0.0,
+            "out": 1.0 - np.exp(-max(t - delay, 0.0) / tau),
+        }
+        for t in T
+    ]
+
+
+def _rc_study(taus):
+    return stack_results("Transient", [SimulationResult(success=True, data=_rc_rows(tau)) for tau in taus])
+
+
+class TestParseDirective:
+    def test_window_measurement(self):
+        spec = parse_meas_directive(".meas tran avg_out AVG v(out) FROM=1m TO = 2m")
+        assert (spec.name, spec.domain, spec.kind, spec.variable) == ("avg_out", "tran", "AVG", "v(out)")
+        assert spec.from_val == pytest.approx(1e-3)
+        assert spec.to_val == pytest.approx(2e-3)
+
+    def test_find_when_with_edge(self):
+        spec = parse_meas_directive(".meas tran x FIND v(out) WHEN v(in)=0.5 FALL=2")
+        assert spec.kind == "FIND_WHEN"
+        assert spec.when.variable == "v(in)"
+        assert spec.when.target == pytest.approx(0.5)
+        assert (spec.when.edge, spec.when.occurrence) == ("fall", 2)
+
+    def test_trig_targ(self):
+        spec = parse_meas_directive(".meas tran d TRIG v(in) VAL=0.5 RISE=1 TARG v(out) VAL=0.5 CROSS=LAST")
+        assert spec.trig.variable == "v(in)"
+        assert spec.targ.occurrence == "last"
+
+    def test_prefix_is_optional(self):
+        assert parse_meas_directive("tran m MAX v(out)").kind == "MAX"
+
+    @pytest.mark.parametrize(
+        "directive",
+        [
+            ".meas tran p PARAM='a*2'",
+            ".meas tran",
+            ".meas tran f FIND v(out)",
+            ".meas tran t TRIG v(in) VAL=0.5",
+            ".meas tran w WHEN v(out)",
+            ".meas tran a AVG v(out) FROM=abc",
+        ],
+    )
+    def test_unsupported_or_malformed(self, directive):
+        with pytest.raises(MeasurementError):
+            parse_meas_directive(directive)
+
+    @pytest.mark.parametrize(
+        "meas_type, params",
+        [
+            ("RMS", {"variable": "v(out)", "from_val": "1u", "to_val": ""}),
+            ("FIND_AT", {"variable": "v(out)", "at_val": "2u"}),
+            ("FIND_WHEN", {"variable": "v(out)", "when_var": "v(in)", "when_val": "0.5", "cross": "RISE=1"}),
+            ("TRIG_TARG", {"trig_var": "v(in)", "targ_var": "v(out)"}),
+        ],
+    )
+    def test_parses_builder_output(self, meas_type, params):
+        directive = build_directive("tran", "m1", meas_type, params)
+        assert parse_meas_directive(directive).name == "m1"
+
+
+class TestPrimitives:
+    def test_values_at_scalar_and_per_row(self):
+        axis = np.array([0.0, 1.0, 2.0])
+        arr = np.array([[0.0, 1.0, 2.0], [0.0, 10.0, 20.0]])
+        assert values_at(axis, arr, 0.5).tolist() == [0.5, 5.0]
+        assert values_at(axis, arr, np.array([1.5, 0.25])).tolist() == [1.5, 2.5]
+        assert np.isnan(values_at(axis, arr, 3.0)).all()
+
+    def test_crossings_count_and_direction(self):
+        axis = np.arange(6.0)
+        diff = np.array([[-1.0, 1.0, -1.0, 1.0, -1.0, 1.0]])
+        assert crossing_positions(axis, diff, "rise", 2)[0] == pytest.approx(2.5)
+        assert crossing_positions(axis, diff, "fall", 1)[0] == pytest.approx(1.5)
+        assert crossing_positions(axis, diff, "cross", "last")[0] == pytest.approx(4.5)
+        assert crossing_positions(axis, diff, "rise", 1, td=1.0)[0] == pytest.approx(2.5)
+        assert np.isnan(crossing_positions(axis, diff, "rise", 4)[0])
+
+    @pytest.mark.parametrize("occurrence", [1, "last"])
+    def test_crossing_on_a_single_sample_is_not_found(self, occurrence):
+        positions = crossing_positions(np.array([0.0]), np.array([[1.0], [-1.0]]), "cross", occurrence)
+        assert positions.shape == (2,)
+        assert np.isnan(positions).all()
+
+
+class TestMeasureResult:
+    def test_rise_time_of_rc_step(self):
+        meas = measure_result(
+            "Transient",
+            _rc_rows(),
+            [".meas tran tr TRIG v(out) VAL=0.1 RISE=1 TARG v(out) VAL=0.9 RISE=1"],
+        )
+        assert meas["tr"] == pytest.approx(TAU * np.log(9), rel=1e-3)
+
+    def test_statistics(self):
+        meas = measure_result(
+            "Transient",
+            _rc_rows(),
+            [
+                ".meas tran a AVG v(in)",
+                ".meas tran r RMS v(in)",
+                ".meas tran i INTEG v(in)",
+                ".meas tran pp PP v(out)",
+                ".meas tran lo MIN v(out) FROM=0.5m",
+            ],
+        )
+        assert meas["a"] == pytest.approx(0.9, abs=1e-3)
+        assert meas["r"] == pytest.approx(np.sqrt(0.9), abs=1e-3)
+        assert meas["i"] == pytest.approx(0.9e-3, rel=1e-3)
+        assert meas["pp"] == pytest.approx(1.0, abs=1e-3)
+        assert meas["lo"] == pytest.approx(1.0 - np.exp(-4.0), abs=1e-3)
+
+    def test_find_when_and_deriv(self):
+        meas = measure_result(
+            "Transient",
+            _rc_rows(),
+            [
+                ".meas tran f FIND v(out) AT=0.2m",
+                ".meas tran w WHEN v(out)=0.5",
+                ".meas tran d DERIV v(out) AT=0.2m",
+                ".meas tran diff FIND v(in,out) AT=0.2m",
+            ],
+        )
+        assert meas["f"] == pytest.approx(1.0 - np.exp(-1.0), abs=1e-3)
+        assert meas["w"] == pytest.approx(1e-4 + TAU * np.log(2), rel=1e-3)
+        assert meas["d"] == pytest.approx(np.exp(-1.0) / TAU, rel=1e-2)
+        assert meas["diff"] == pytest.approx(np.exp(-1.0), abs=1e-3)
+
+    def test_unresolved_measurement_is_none(self):
+        meas = measure_result("Transient", _rc_rows(), [".meas tran x WHEN v(out)=2"])
+        assert meas["x"] is None
+
+    def test_unknown_signal_raises(self):
+        with pytest.raises(MeasurementError, match="v\\(nope\\)"):
+            measure_result("Transient", _rc_rows(), [".meas tran x MAX v(nope)"])
+
+    def test_ac_db_and_phase(self):
+        data = {
+            "frequencies": [10.0, 100.0, 1000.0],
+            "magnitude": {"out": [1.0, 0.5, 0.1]},
+            "phase": {"out": [0.0, -45.0, -80.0]},
+        }
+        meas = measure_result(
+            "AC Sweep",
+            data,
+            [".meas ac g FIND vdb(out) AT=10", ".meas ac p FIND vp(out) AT=100", ".meas ac f3 WHEN v(out)=0.5"],
+        )
+        assert meas["g"] == pytest.approx(0.0)
+        assert meas["p"] == pytest.approx(-45.0)
+        assert meas["f3"] == pytest.approx(100.0)
+
+    def test_operating_point_has_no_axis(self):
+        with pytest.raises(MeasurementError):
+            measure_result("DC Operating Point", {"node_voltages": {"out": 1.0}}, [".meas tran m MAX v(out)"])
+
+
+class TestMeasureStacked:
+    def test_vectorized_across_runs(self):
+        taus = [0.5e-4, 1e-4, 2e-4]
+        meas = measure_stacked(_rc_study(taus), [".meas tran tr TRIG v(out) VAL=0.1 RISE=1 TARG v(out) VAL=0.9 RISE=1"])
+        assert meas["tr"] == pytest.approx([tau * np.log(9) for tau in taus], rel=1e-3)
+
+    def test_failed_run_is_nan(self):
+        results = [
+            SimulationResult(success=True, data=_rc_rows()),
+            SimulationResult(success=False, error="boom"),
+        ]
+        meas = measure_stacked(stack_results("Transient", results), [".meas tran m MAX v(out)"])
+        assert meas["m"][0] == pytest.approx(1.0, abs=1e-3)
+        assert np.isnan(meas["m"][1])
+
+    def test_decreasing_dc_sweep_axis(self):
+        data = {"headers": ["Index", "v-sweep", "v(out)"], "data": [[0, 2.0, 4.0], [1, 1.0, 2.0], [2, 0.0, 0.0]]}
+        meas = measure_stacked(
+            stack_results("DC Sweep", [SimulationResult(success=True, data=data)]),
+            [".meas dc m FIND v(out) AT=0.5"],
+        )
+        assert meas["m"][0] == pytest.approx(1.0)
+
+    def test_controller_delegates(self):
+        study = _rc_study([1e-4, 2e-4])
+        meas = SimulationController.evaluate_study_measurements(study, [".meas tran m MAX v(out)"])
+        assert meas["m"].shape == (2,)
+        single = SimulationController.evaluate_measurements("Transient", _rc_rows(), [".meas tran m MAX v(out)"])
+        assert single["m"] == pytest.approx(1.0, abs=1e-3)
+
+
+class TestMonteCarloResultsMeasurement:
+    def test_add_measurement_metric(self, qtbot):
+        from GUI.monte_carlo_results_dialog import MonteCarloResultsDialog
+
+        study = _rc_study([1e-4, 2e-4, 3e-4])
+        dialog = MonteCarloResultsDialog({"base_analysis_type": "Transient", "stacked": study})
+        qtbot.addWidget(dialog)
+        assert dialog._add_meas_btn.isEnabled()
+
+        meas = SimulationController.evaluate_study_measurements(study, [".meas tran w WHEN v(out)=0.5"])
+        dialog.add_measurement_metric("w", meas["w"])
+        assert dialog._metric_combo.currentText() == "meas: w"
+        assert "Runs:   3" in dialog._summary.toPlainText()
+
+    def test_operating_point_has_no_measurements(self, qtbot):
+        from GUI.monte_carlo_results_dialog import MonteCarloResultsDialog
+
+        results = [SimulationResult(success=True, data={"node_voltages": {"out": 1.0}})]
+        dialog = MonteCarloResultsDialog({"base_analysis_type": "DC Operating Point", "results": results})
+        qtbot.addWidget(dialog)
+        assert not dialog._add_meas_btn.isEnabled()
+
+
+class TestNoQtInMeasurementEngine:
+    def test_no_pyqt_imports(self):
+        import simulation.measurement_engine as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
@@ -13,8 +13,11 @@ from simulation.monte_carlo import (
     DEFAULT_TOLERANCES,
     MC_ELIGIBLE_TYPES,
     apply_tolerance,
+    check_convergence,
     compute_mc_statistics,
     format_spice_value,
+    generate_unit_samples,
+    tolerance_from_unit,
 )
 from utils.format_utils import parse_spice_value
 
@@ -106,6 +109,109 @@ class TestApplyTolerance:
         assert np.std(arr) < base * 0.05
 
 
+class TestGenerateUnitSamples:
+    @pytest.mark.parametrize("method", ["random", "lhs", "sobol"])
+    def test_shape_and_range(self, method):
+        samples = generate_unit_samples(16, 3, method, np.random.default_rng(0))
+        assert samples.shape == (16, 3)
+        assert np.all(samples > 0) and np.all(samples < 1)
+
+    def test_lhs_has_one_sample_per_stratum(self):
+        samples = generate_unit_samples(10, 4, "lhs", np.random.default_rng(1))
+        for col in samples.T:
+            assert sorted(np.floor(col * 10).astype(int).tolist()) == list(range(10))
+
+    def test_lhs_blocks_are_each_stratified(self):
+        samples = generate_unit_samples(17, 3, "lhs", np.random.default_rng(3), blocks=[6, 4, 4])
+        # The last three rows form a final block of their own
+        for start, size in [(0, 6), (6, 4), (10, 4), (14, 3)]:
+            block = samples[start : start + size]
+            for col in block.T:
+                assert sorted(np.floor(col * size).astype(int).tolist()) == list(range(size))
+
+    def test_lhs_blocks_are_trimmed_to_run_count(self):
+        samples = generate_unit_samples(5, 2, "lhs", np.random.default_rng(4), blocks=[4, 4, 4])
+        assert samples.shape == (5, 2)
+        with pytest.raises(ValueError):
+            generate_unit_samples(5, 2, "lhs", blocks=[0])
+
+    def test_sobol_is_more_uniform_than_random(self):
+        def max_gap(x):
+            x = np.sort(np.concatenate([[0.0], x, [1.0]]))
+            return np.max(np.diff(x))
+
+        sobol = generate_unit_samples(64, 1, "sobol", np.random.default_rng(2))[:, 0]
+        assert max_gap(sobol) <= 2.0 / 64
+
+    def test_same_seed_reproduces(self):
+        a = generate_unit_samples(8, 2, "sobol", np.random.default_rng(7))
+        b = generate_unit_samples(8, 2, "sobol", np.random.default_rng(7))
+        assert np.array_equal(a, b)
+
+    def test_unknown_method_raises(self):
+        with pytest.raises(ValueError):
+            generate_unit_samples(4, 1, "halton")
+
+
+class TestToleranceFromUnit:
+    def test_median_sample_keeps_value(self):
+        assert parse_spice_value(tolerance_from_unit("1k", 5.0, "gaussian", 0.5)) == pytest.approx(1000.0)
+
+    def test_uniform_extremes_hit_tolerance_band(self):
+        low = parse_spice_value(tolerance_from_unit("1k", 10.0, "uniform", 0.0))
+        high = parse_spice_value(tolerance_from_unit("1k", 10.0, "uniform", 1.0))
+        assert low == pytest.approx(900.0, rel=1e-6)
+        assert high == pytest.approx(1100.0, rel=1e-6)
+
+    def test_gaussian_three_sigma(self):
+        # u at +3 sigma maps to the full tolerance
+        val = parse_spice_value(tolerance_from_unit("1k", 5.0, "gaussian", 0.9986501))
+        assert val == pytest.approx(1050.0, rel=1e-3)
+
+    def test_unparseable_returns_original(self):
+        assert tolerance_from_unit("SIN(0 5 1k)", 5.0, "gaussian", 0.3) == "SIN(0 5 1k)"
+
+    def test_invalid_distribution_raises(self):
+        with pytest.raises(ValueError):
+            tolerance_from_unit("1k", 5.0, "lognormal", 0.3)
+
+    @pytest.mark.parametrize("tolerance", [-1.0, "5"])
+    def test_invalid_tolerance_matches_apply_tolerance(self, tolerance):
+        with pytest.raises(ValueError) as from_unit:
+            tolerance_from_unit("1k", tolerance, "gaussian", 0.3)
+        with pytest.raises(ValueError) as random_draw:
+            apply_tolerance("1k", tolerance, "gaussian")
+        assert str(from_unit.value) == str(random_draw.value)
+
+
+class TestCheckConvergence:
+    def test_tight_values_converge(self):
+        status = check_convergence([1.0, 1.001, 0.999, 1.0], "ci_width", tolerance=0.01)
+        assert status["converged"]
+        assert status["estimate"] == pytest.approx(1.0)
+
+    def test_spread_values_do_not_converge(self):
+        status = check_convergence([0.5, 1.5, 0.7, 1.3], "ci_width", tolerance=0.01)
+        assert not status["converged"]
+
+    def test_single_value_never_converges(self):
+        assert not check_convergence([1.0], "ci_width")["converged"]
+
+    def test_yield_estimate(self):
+        values = [1.0] * 95 + [2.0] * 5
+        status = check_convergence(values, "yield", tolerance=0.05, spec_max=1.5)
+        assert status["estimate"] == pytest.approx(0.95)
+        assert status["converged"]
+
+    def test_yield_tolerance_not_met(self):
+        status = check_convergence([1.0, 2.0, 1.0, 2.0], "yield", tolerance=0.01, spec_min=0.5, spec_max=1.5)
+        assert not status["converged"]
+
+    def test_unknown_criterion_raises(self):
+        with pytest.raises(ValueError):
+            check_convergence([1.0, 2.0], "bayes")
+
+
 class TestComputeMcStatistics:
     def test_basic_statistics(self):
         values = [1.0, 2.0, 3.0, 4.0, 5.0]
@@ -258,6 +364,32 @@ class TestMonteCarloController:
         assert len(data["results"]) == 3
         assert len(data["run_values"]) == 3
         assert data["cancelled"] is False
+        assert data["stacked"].num_runs == 3
+        assert data["stacked"].signal("nodea").shape == (3, 1)
+
+    def test_monte_carlo_steps_do_not_keep_netlists(self):
+        ctrl, _ = self._make_ctrl_with_mock_runner()
+        config = {
+            "num_runs": 3,
+            "base_analysis_type": "DC Operating Point",
+            "base_params": {"analysis_type": "DC Operating Point"},
+            "tolerances": {"R1": {"tolerance_pct": 5.0, "distribution": "gaussian"}},
+        }
+        result = ctrl.run_monte_carlo(config)
+        assert result.netlist
+        assert all(r.netlist == "" and r.raw_output == "" for r in result.data["results"])
+
+    def test_monte_carlo_keep_raw_output(self):
+        ctrl, _ = self._make_ctrl_with_mock_runner()
+        config = {
+            "num_runs": 2,
+            "base_analysis_type": "DC Operating Point",
+            "base_params": {"analysis_type": "DC Operating Point"},
+            "tolerances": {"R1": {"tolerance_pct": 5.0, "distribution": "gaussian"}},
+            "keep_raw_output": True,
+        }
+        result = ctrl.run_monte_carlo(config)
+        assert result.data["stacked"].raw_outputs == ["stdout", "stdout"]
 
     def test_monte_carlo_with_cancellation(self):
         ctrl, mock_runner = self._make_ctrl_with_mock_runner()
@@ -310,6 +442,125 @@ class TestMonteCarloController:
         assert len(set(r1_values)) > 1
 
 
+class TestMonteCarloSampling:
+    _make_ctrl_with_mock_runner = TestMonteCarloController._make_ctrl_with_mock_runner
+
+    def _config(self, **extra):
+        config = {
+            "num_runs": 8,
+            "base_analysis_type": "DC Operating Point",
+            "base_params": {"analysis_type": "DC Operating Point"},
+            "tolerances": {"R1": {"tolerance_pct": 10.0, "distribution": "uniform"}},
+        }
+        config.update(extra)
+        return config
+
+    @pytest.mark.parametrize("sampling", ["lhs", "sobol"])
+    def test_quasi_random_sampling_varies_values(self, sampling):
+        ctrl, _ = self._make_ctrl_with_mock_runner()
+        result = ctrl.run_monte_carlo(self._config(sampling=sampling, seed=3))
+        assert result.data["sampling"] == sampling
+        values = [parse_spice_value(rv["R1"]) for rv in result.data["run_values"]]
+        assert len(set(values)) == 8
+        assert all(900.0 <= v <= 1100.0 for v in values)
+
+    def test_seed_is_recorded_and_reproducible(self):
+        ctrl, _ = self._make_ctrl_with_mock_runner()
+        first = ctrl.run_monte_carlo(self._config(sampling="lhs"))
+        seed = first.data["seed"]
+        assert isinstance(seed, int)
+        second = ctrl.run_monte_carlo(self._config(sampling="lhs", seed=seed))
+        assert first.data["run_values"] == second.data["run_values"]
+
+    def test_random_sampling_reproducible_with_seed(self):
+        ctrl, _ = self._make_ctrl_with_mock_runner()
+        a = ctrl.run_monte_carlo(self._config(seed=11))
+        b = ctrl.run_monte_carlo(self._config(seed=11))
+        assert a.data["run_values"] == b.data["run_values"]
+
+    def test_unknown_sampling_returns_error(self):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+        result = ctrl.run_monte_carlo(self._config(sampling="halton"))
+        assert not result.success
+        assert mock_runner.run_simulation.call_count == 0
+
+    def test_early_stop_when_converged(self):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+        convergence = {"signal": "nodea", "criterion": "ci_width", "tolerance": 0.01, "min_runs": 4, "check_every": 2}
+        result = ctrl.run_monte_carlo(self._config(num_runs=50, convergence=convergence))
+        # The mocked output is constant, so the first check converges.
+        assert mock_runner.run_simulation.call_count == 4
+        assert result.data["stopped_early"] is True
+        assert result.data["convergence"]["converged"]
+
+    def test_lhs_early_stop_uses_whole_hypercubes(self):
+        ctrl, _ = self._make_ctrl_with_mock_runner()
+        convergence = {"signal": "nodea", "criterion": "ci_width", "tolerance": 0.01, "min_runs": 4, "check_every": 2}
+        config = self._config(num_runs=50, sampling="lhs", seed=5, convergence=convergence)
+        result = ctrl.run_monte_carlo(config)
+        # The runs done (the first check block) are a Latin hypercube by themselves
+        values = [parse_spice_value(rv["R1"]) for rv in result.data["run_values"]]
+        unit = (np.array(values) / 1000.0 - 0.9) / 0.2
+        assert sorted(np.floor(unit * 4).astype(int).tolist()) == [0, 1, 2, 3]
+
+    def test_no_early_stop_for_unknown_signal(self):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+        convergence = {"signal": "missing", "min_runs": 2, "check_every": 1}
+        result = ctrl.run_monte_carlo(self._config(num_runs=5, convergence=convergence))
+        assert mock_runner.run_simulation.call_count == 5
+        assert result.data["stopped_early"] is False
+
+    def test_invalid_convergence_settings_return_error(self):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+        result = ctrl.run_monte_carlo(self._config(convergence={"signal": "nodea", "criterion": "bayes"}))
+        assert not result.success
+        assert mock_runner.run_simulation.call_count == 0
+
+
+class TestMonteCarloDialogParameters:
+    @pytest.fixture
+    def dialog(self, qtbot):
+        from GUI.monte_carlo_dialog import MonteCarloDialog
+
+        components = {
+            "R1": ComponentData(component_id="R1", component_type="Resistor", value="1k", position=(0, 0)),
+        }
+        dlg = MonteCarloDialog(components)
+        qtbot.addWidget(dlg)
+        return dlg
+
+    def test_default_sampling_is_random_without_seed(self, dialog):
+        params = dialog.get_parameters()
+        assert params["sampling"] == "random"
+        assert "seed" not in params
+        assert "convergence" not in params
+
+    def test_sampling_seed_and_convergence(self, dialog):
+        dialog.sampling_combo.setCurrentText("Sobol")
+        dialog.seed_edit.setText("42")
+        dialog.stop_check.setChecked(True)
+        dialog.stop_signal_edit.setText("out")
+        dialog.stop_criterion_combo.setCurrentText("Yield estimate")
+        dialog.spec_max_edit.setText("2.5")
+        assert dialog._validate() == []
+        params = dialog.get_parameters()
+        assert params["sampling"] == "sobol"
+        assert params["seed"] == 42
+        assert params["convergence"]["criterion"] == "yield"
+        assert params["convergence"]["spec_max"] == pytest.approx(2.5)
+        assert params["convergence"]["tolerance"] == pytest.approx(0.01)
+
+    def test_yield_without_spec_is_invalid(self, dialog):
+        dialog.stop_check.setChecked(True)
+        dialog.stop_signal_edit.setText("out")
+        dialog.stop_criterion_combo.setCurrentText("Yield estimate")
+        assert any("spec" in e for e in dialog._validate())
+
+    def test_bad_seed_is_invalid(self, dialog):
+        dialog.seed_edit.setText("abc")
+        assert any("Seed" in e for e in dialog._validate())
+
+
 class TestNoQtInMonteCarloModule:
     """Verify that the monte_carlo module has no Qt dependencies."""
 
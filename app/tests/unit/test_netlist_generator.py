@@ -364,6 +364,20 @@ class TestAnalysisCommands:
         )
         assert ".tran" in netlist
 
+    def test_no_derived_resistor_vectors(self, simple_resistor_circuit):
+        """Voltage drops are derived after the run, not computed by ngspice."""
+        components, wires, nodes, t2n = simple_resistor_circuit
+        netlist = _generate(
+            components,
+            wires,
+            nodes,
+            t2n,
+            analysis_type="Transient",
+            analysis_params={"step": "1u", "duration": "10m", "start": "0"},
+        )
+        assert "let " not in netlist
+        assert "v_r1" not in netlist
+
     def test_temperature_sweep(self, simple_resistor_circuit):
         components, wires, nodes, t2n = simple_resistor_circuit
         netlist = _generate(
@@ -3,11 +3,20 @@
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 from controllers.simulation_controller import SimulationController, SimulationResult
 from models.circuit import CircuitModel
 from models.component import ComponentData
 from models.wire import WireData
+from simulation.parameter_sweep import (
+    MAX_SWEEP_POINTS,
+    grid_sweep_points,
+    normalize_sweep_parameters,
+    refine_sweep_values,
+    sweep_axis_values,
+)
+from utils.format_utils import parse_value
 
 
 def _build_simple_circuit():
@@ -244,6 +253,8 @@ class TestParameterSweepExecution:
         assert len(data["results"]) == 3
         assert data["sweep_values"][0] == 1000
         assert data["sweep_values"][-1] == 5000
+        assert data["stacked"].num_runs == 3
+        assert list(data["stacked"].ok) == [True, True, True]
 
     def test_sweep_with_cancellation(self):
         ctrl, mock_runner = self._make_ctrl_with_mock_runner()
@@ -374,6 +385,286 @@ class TestParameterSweepSingleStep:
         assert result.data["sweep_values"] == [4700]
 
 
+class TestSweepPlanning:
+    """Test sweep value generation and adaptive refinement."""
+
+    def test_linear_axis(self):
+        assert sweep_axis_values(0.0, 4.0, 5) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_log_axis(self):
+        values = sweep_axis_values(10.0, 10000.0, 4, "log")
+        assert values == pytest.approx([10.0, 100.0, 1000.0, 10000.0])
+        assert values[0] == 10.0 and values[-1] == 10000.0
+
+    def test_negative_log_axis(self):
+        assert sweep_axis_values(-1.0, -100.0, 3, "log") == pytest.approx([-1.0, -10.0, -100.0])
+
+    @pytest.mark.parametrize("start, stop", [(0.0, 10.0), (-1.0, 10.0)])
+    def test_log_axis_rejects_invalid_range(self, start, stop):
+        with pytest.raises(ValueError):
+            sweep_axis_values(start, stop, 3, "log")
+
+    def test_unknown_spacing_raises(self):
+        with pytest.raises(ValueError):
+            sweep_axis_values(1.0, 2.0, 3, "cubic")
+
+    def test_legacy_config_is_one_parameter(self):
+        params = normalize_sweep_parameters({"component_id": "R1", "start": 1, "stop": 2, "num_steps": 3})
+        assert params == [{"component_id": "R1", "start": 1, "stop": 2, "num_steps": 3, "spacing": "linear"}]
+
+    def test_grid_is_row_major(self):
+        params = [
+            {"component_id": "R1", "start": 1.0, "stop": 2.0, "num_steps": 2, "spacing": "linear"},
+            {"component_id": "C1", "start": 10.0, "stop": 30.0, "num_steps": 3, "spacing": "linear"},
+        ]
+        points, shape = grid_sweep_points(params)
+        assert shape == (2, 3)
+        assert points[:3] == [(1.0, 10.0), (1.0, 20.0), (1.0, 30.0)]
+        assert len(points) == 6
+
+    def test_grid_is_capped_before_it_is_built(self):
+        params = [
+            {"component_id": f"R{i}", "start": 1.0, "stop": 2.0, "num_steps": 1000, "spacing": "linear"}
+            for i in range(3)
+        ]
+        with pytest.raises(ValueError, match=f"1000000000 points; the limit is {MAX_SWEEP_POINTS}"):
+            grid_sweep_points(params)
+
+    def test_refine_targets_fastest_change(self):
+        # Step between 2 and 3: only that interval needs refining
+        new = refine_sweep_values([0, 1, 2, 3, 4], [0, 0, 0, 1, 1], tolerance=0.1)
+        assert new == [2.5]
+
+    def test_refine_log_uses_geometric_midpoint(self):
+        new = refine_sweep_values([1.0, 100.0], [0.0, 1.0], spacing="log")
+        assert new == pytest.approx([10.0])
+
+    def test_refine_stops_when_resolved(self):
+        assert refine_sweep_values([0, 1, 2], [0.0, 0.5, 1.0], tolerance=0.6) == []
+        assert refine_sweep_values([0, 1, 2], [1.0, 1.0, 1.0]) == []
+
+    def test_refine_skips_points_that_format_like_a_neighbour(self):
+        # 1000.0001 and 1000.0002 both format as "1k"; the bisection would repeat a run
+        new = refine_sweep_values([1000.0, 1000.0002, 2000.0], [0.0, 1.0, 1.0], tolerance=0.1)
+        assert new == []
+
+    def test_refine_respects_budget_and_skips_failed_runs(self):
+        new = refine_sweep_values([0, 1, 2, 3], [0.0, np.nan, 0.5, 1.0], tolerance=0.01, max_new=5)
+        assert new == [2.5]
+        assert len(refine_sweep_values([0, 1, 2, 3], [0.0, 0.3, 0.6, 1.0], tolerance=0.01, max_new=2)) == 2
+
+
+class TestMultiDimensionalSweep:
+    """Test grid and adaptive sweeps through the controller."""
+
+    _make_ctrl_with_mock_runner = TestParameterSweepExecution._make_ctrl_with_mock_runner
+
+    def _base(self, **extra):
+        config = {
+            "base_analysis_type": "DC Operating Point",
+            "base_params": {"analysis_type": "DC Operating Point"},
+        }
+        config.update(extra)
+        return config
+
+    def test_grid_sweep_runs_every_combination(self):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+        config = self._base(
+            parameters=[
+                {"component_id": "R1", "start": 1000, "stop": 3000, "num_steps": 3},
+                {"component_id": "V1", "start": 1, "stop": 2, "num_steps": 2},
+            ]
+        )
+        result = ctrl.run_parameter_sweep(config)
+        assert result.success
+        assert mock_runner.run_simulation.call_count == 6
+        data = result.data
+        assert data["grid_shape"] == (3, 2)
+        assert data["sweep_points"][1] == (1000, 2)
+        assert data["sweep_values"] == [1000, 1000, 2000, 2000, 3000, 3000]
+        assert [p["component_type"] for p in data["parameters"]] == ["Resistor", "Voltage Source"]
+        assert data["stacked"].num_runs == 6
+
+    def test_oversized_grid_fails_without_simulating(self):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+        config = self._base(
+            parameters=[
+                {"component_id": "R1", "start": 1000, "stop": 3000, "num_steps": 100},
+                {"component_id": "V1", "start": 1, "stop": 2, "num_steps": 11},
+            ]
+        )
+        result = ctrl.run_parameter_sweep(config)
+        assert not result.success
+        assert "1100 points" in result.error
+        mock_runner.run_simulation.assert_not_called()
+
+    def test_grid_sweep_restores_all_values(self):
+        ctrl, _ = self._make_ctrl_with_mock_runner()
+        config = self._base(
+            parameters=[
+                {"component_id": "R1", "start": 1000, "stop": 3000, "num_steps": 2},
+                {"component_id": "V1", "start": 1, "stop": 2, "num_steps": 2},
+            ]
+        )
+        ctrl.run_parameter_sweep(config)
+        assert ctrl.model.components["R1"].value == "1k"
+        assert ctrl.model.components["V1"].value == "5V"
+
+    def test_grid_sweep_missing_second_component(self):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+        config = self._base(
+            parameters=[
+                {"component_id": "R1", "start": 1000, "stop": 3000, "num_steps": 2},
+                {"component_id": "C9", "start": 1, "stop": 2, "num_steps": 2},
+            ]
+        )
+        result = ctrl.run_parameter_sweep(config)
+        assert not result.success
+        assert "C9" in result.error
+        assert mock_runner.run_simulation.call_count == 0
+
+    def test_log_spacing(self):
+        ctrl, _ = self._make_ctrl_with_mock_runner()
+        config = self._base(component_id="R1", start=100, stop=10000, num_steps=3, spacing="log")
+        result = ctrl.run_parameter_sweep(config)
+        assert result.data["sweep_values"] == pytest.approx([100, 1000, 10000])
+
+    def test_invalid_log_range_returns_error(self):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+        config = self._base(component_id="R1", start=0, stop=10000, num_steps=3, spacing="log")
+        result = ctrl.run_parameter_sweep(config)
+        assert not result.success
+        assert mock_runner.run_simulation.call_count == 0
+
+    def test_adaptive_refines_near_step(self):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+
+        # nodea switches from 0 V to 5 V once R1 exceeds 4.2k
+        def read_output(_path):
+            r1 = parse_value(ctrl.model.components["R1"].value)
+            volts = 5.0 if r1 > 4200 else 0.0
+            return f"Node Voltage\n---- -------\nnodea {volts:e}\n"
+
+        mock_runner.read_output.side_effect = read_output
+        config = self._base(
+            component_id="R1",
+            start=1000,
+            stop=9000,
+            num_steps=5,
+            mode="adaptive",
+            adaptive={"signal": "nodea", "tolerance": 0.05, "max_steps": 12},
+        )
+        result = ctrl.run_parameter_sweep(config)
+        values = result.data["sweep_values"]
+        assert mock_runner.run_simulation.call_count == len(values) <= 12
+        assert values == sorted(values)
+        # All refinement happens inside the 3k..5k interval containing the step
+        added = [v for v in values if v not in (1000, 3000, 5000, 7000, 9000)]
+        assert added and all(3000 < v < 5000 for v in added)
+        nodea = result.data["stacked"].signal("nodea")[:, 0]
+        assert list(nodea) == [5.0 if v > 4200 else 0.0 for v in values]
+
+    def test_adaptive_resolved_curve_stops_after_coarse_pass(self):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+        config = self._base(
+            component_id="R1",
+            start=1000,
+            stop=9000,
+            num_steps=5,
+            mode="adaptive",
+            adaptive={"signal": "nodea", "max_steps": 20},
+        )
+        result = ctrl.run_parameter_sweep(config)
+        # The mocked output is constant, so nothing needs refining
+        assert mock_runner.run_simulation.call_count == 5
+        assert result.data["mode"] == "adaptive"
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {"mode": "adaptive", "adaptive": {}},
+            {"mode": "adaptive", "adaptive": {"signal": "nodea", "reduction": "median"}},
+            {"mode": "spiral"},
+        ],
+    )
+    def test_invalid_mode_settings_return_error(self, extra):
+        ctrl, mock_runner = self._make_ctrl_with_mock_runner()
+        config = self._base(component_id="R1", start=1000, stop=9000, num_steps=5, **extra)
+        result = ctrl.run_parameter_sweep(config)
+        assert not result.success
+        assert mock_runner.run_simulation.call_count == 0
+
+    def test_adaptive_rejects_multiple_parameters(self):
+        ctrl, _ = self._make_ctrl_with_mock_runner()
+        config = self._base(
+            parameters=[
+                {"component_id": "R1", "start": 1000, "stop": 3000, "num_steps": 2},
+                {"component_id": "V1", "start": 1, "stop": 2, "num_steps": 2},
+            ],
+            mode="adaptive",
+            adaptive={"signal": "nodea"},
+        )
+        assert not ctrl.run_parameter_sweep(config).success
+
+
+class TestParameterSweepDialogParameters:
+    """Test the multi-parameter and adaptive settings of ParameterSweepDialog."""
+
+    @pytest.fixture
+    def dialog(self, qtbot):
+        from GUI.parameter_sweep_dialog import ParameterSweepDialog
+
+        model = _build_simple_circuit()
+        dlg = ParameterSweepDialog(model.components)
+        qtbot.addWidget(dlg)
+        return dlg
+
+    def test_default_is_one_linear_grid_parameter(self, dialog):
+        params = dialog.get_parameters()
+        assert params["mode"] == "grid"
+        assert params["spacing"] == "linear"
+        assert len(params["parameters"]) == 1
+        assert params["parameters"][0]["component_id"] == params["component_id"]
+
+    def test_added_parameter_defaults_to_unused_component(self, dialog):
+        dialog._add_extra_row()
+        params = dialog.get_parameters()
+        ids = [p["component_id"] for p in params["parameters"]]
+        assert len(ids) == 2 and ids[0] != ids[1]
+        assert dialog._validate() == []
+
+    def test_duplicate_component_is_invalid(self, dialog):
+        dialog._add_extra_row()
+        combo = dialog.extra_table.cellWidget(0, 0)
+        combo.setCurrentIndex(combo.findData(dialog.component_combo.currentData()))
+        assert any("more than once" in e for e in dialog._validate())
+
+    def test_log_spacing_validation(self, dialog):
+        dialog.spacing_combo.setCurrentText("Logarithmic")
+        dialog.start_edit.setText("0")
+        assert any("Logarithmic" in e for e in dialog._validate())
+
+    def test_adaptive_parameters(self, dialog):
+        dialog._add_extra_row()
+        dialog.mode_combo.setCurrentText("Adaptive")
+        assert not dialog.extra_table.isEnabled()
+        assert any("signal" in e for e in dialog._validate())
+        dialog.adaptive_signal_edit.setText("nodea")
+        assert dialog._validate() == []
+        params = dialog.get_parameters()
+        assert len(params["parameters"]) == 1
+        assert params["adaptive"]["signal"] == "nodea"
+        assert params["adaptive"]["tolerance"] == pytest.approx(0.05)
+
+    def test_grid_size_limit(self, dialog):
+        for _ in range(2):
+            dialog._add_extra_row()
+        dialog.steps_spin.setValue(100)
+        for row in range(2):
+            dialog.extra_table.cellWidget(row, 3).setValue(100)
+        assert any("limit" in e for e in dialog._validate())
+
+
 class TestSweepableComponentTypes:
     """Test that the dialog correctly identifies sweepable components."""
 
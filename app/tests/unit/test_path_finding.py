@@ -1,7 +1,7 @@
 """Tests for path_finding.py — IDA* wire routing algorithm."""
 
 import pytest
-from algorithms.path_finding import IDAStarPathfinder
+from algorithms.path_finding import IDAStarPathfinder, find_path_collisions
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -196,6 +196,26 @@ class TestObstacleAvoidance:
         assert grid_pts[-1] == (4, 0)
 
 
+class TestFindPathCollisions:
+    def test_only_blocked_paths_reported(self):
+        paths = [
+            [_grid(0, 0), _grid(5, 0)],
+            [_grid(0, 2), _grid(0, 6), _grid(4, 6)],
+            [_grid(0, 8), _grid(3, 11)],
+        ]
+        obstacles = {(3, 0), (2, 10), (9, 9)}
+        assert find_path_collisions(paths, obstacles, GRID) == [0, 2]
+
+    def test_terminal_cells_are_ignored(self):
+        paths = [[_grid(0, 0), _grid(0, 3), _grid(4, 3)]]
+        assert find_path_collisions(paths, {(0, 0), (4, 3)}, GRID) == []
+
+    def test_empty_inputs(self):
+        assert find_path_collisions([], {(0, 0)}, GRID) == []
+        assert find_path_collisions([[_grid(0, 0), _grid(4, 0)]], set(), GRID) == []
+        assert find_path_collisions([[_grid(0, 0)]], {(0, 0)}, GRID) == []
+
+
 # ===========================================================================
 # 7. Orthogonal paths (no diagonals)
 # ===========================================================================
@@ -2,8 +2,18 @@
 
 import math
 
+import numpy as np
+import pytest
 from models.component import ComponentData
-from simulation.power_metrics import _fmt_eng, compute_rms, compute_transient_power_metrics, format_power_summary
+from models.node import NodeData
+from simulation.power_metrics import (
+    _fmt_eng,
+    analyze_power,
+    compute_rms,
+    compute_transient_power_metrics,
+    format_power_summary,
+)
+from simulation.stacked_results import StackedResultsBuilder
 
 # ---------------------------------------------------------------------------
 # compute_rms tests
@@ -97,6 +107,18 @@ class TestComputeTransientPowerMetrics:
         # Ppeak = 100/100 = 1.0
         assert abs(m["ppeak"] - 1.0) < 1e-9
 
+    def test_average_is_weighted_by_time(self):
+        """Dense samples during a short pulse must not inflate Pavg."""
+        components = {"R1": _make_component("R1", "Resistor", "1")}
+        # 1 V for the first 1 ms (densely sampled), 0 V for the next 9 ms
+        times = [i * 1e-4 for i in range(11)] + [2e-3, 10e-3]
+        volts = [1.0] * 11 + [0.0, 0.0]
+        data = [{"time": t, "v_r1": v} for t, v in zip(times, volts)]
+        m = compute_transient_power_metrics(data, components)[0]
+        # Trapezoid: 1 W for 1 ms, ramp to 0 over the next 1 ms, then 0
+        assert m["pavg"] == pytest.approx(1.5e-3 / 10e-3)
+        assert m["vrms"] == pytest.approx(math.sqrt(0.15))
+
     def test_multiple_resistors(self):
         """Two resistors should each get their own metrics."""
         components = {
@@ -148,6 +170,227 @@ class TestComputeTransientPowerMetrics:
         # P = V^2/R = 10000/10000 = 1W
         assert abs(metrics[0]["pavg"] - 1.0) < 1e-9
 
+    def test_voltage_derived_from_node_waveforms(self):
+        """With nodes given, the drop is v(a,b) from the node columns."""
+        components = {"R1": _make_component("R1", "Resistor", "100")}
+        nodes = [
+            NodeData(terminals={("R1", 0)}, auto_label="in"),
+            NodeData(terminals={("R1", 1)}, auto_label="out"),
+        ]
+        data = [
+            {"time": 0.0, "in": 10.0, "out": 10.0},
+            {"time": 1e-3, "in": 10.0, "out": 0.0},
+        ]
+        metrics = compute_transient_power_metrics(data, components, nodes)
+        assert abs(metrics[0]["vrms"] - math.sqrt(50)) < 1e-9
+        assert abs(metrics[0]["ppeak"] - 1.0) < 1e-9
+
+    def test_ground_terminal_reads_as_zero(self):
+        components = {"R1": _make_component("R1", "Resistor", "1k")}
+        nodes = [
+            NodeData(terminals={("R1", 0)}, auto_label="out"),
+            NodeData(terminals={("R1", 1)}, is_ground=True, auto_label="0"),
+        ]
+        data = [{"time": 0.0, "out": 10.0}, {"time": 1e-3, "out": 10.0}]
+        metrics = compute_transient_power_metrics(data, components, nodes)
+        assert abs(metrics[0]["pavg"] - 0.1) < 1e-9
+
+
+# ---------------------------------------------------------------------------
+# analyze_power tests
+# ---------------------------------------------------------------------------
+
+
+def _node(label, *terminals, ground=False):
+    return NodeData(terminals=set(terminals), is_ground=ground, auto_label=label)
+
+
+def _rc_charge():
+    """5 V source charging 1u through 1k, sampled densely during the edge."""
+    components = {
+        "V1": _make_component("V1", "Voltage Source", "5"),
+        "R1": _make_component("R1", "Resistor", "1k"),
+        "C1": _make_component("C1", "Capacitor", "1u"),
+        "GND1": _make_component("GND1", "Ground", "0"),
+    }
+    nodes = [
+        _node("in", ("V1", 0), ("R1", 0)),
+        _node("out", ("R1", 1), ("C1", 0)),
+        _node("0", ("V1", 1), ("C1", 1), ("GND1", 0), ground=True),
+    ]
+    time = np.concatenate([np.linspace(0, 1e-3, 400), np.linspace(1e-3, 5e-3, 50)[1:]])
+    vout = 5.0 * (1.0 - np.exp(-time / 1e-3))
+    data = [{"time": t, "in": 5.0, "out": v} for t, v in zip(time, vout)]
+    return data, components, nodes
+
+
+def _stack(runs):
+    builder = StackedResultsBuilder("Transient")
+    for data in runs:
+        builder.add_data(data)
+    return builder.build()
+
+
+def _resistor_load(components, nodes, load_terminal, label="out"):
+    """Add R9 (1k) from *load_terminal*'s node to ground."""
+    components = dict(components, R9=_make_component("R9", "Resistor", "1k"))
+    for node in nodes:
+        if load_terminal in node.terminals:
+            node.terminals.add(("R9", 0))
+        if node.is_ground:
+            node.terminals.add(("R9", 1))
+    return components, nodes
+
+
+class TestAnalyzePower:
+    def test_source_current_follows_from_kcl(self):
+        data, components, nodes = _rc_charge()
+        analysis = analyze_power(data, components, nodes)
+
+        assert analysis.unresolved == []
+        # The source delivers what the resistor burns plus what the capacitor stores
+        source = analysis.energy("V1")[0]
+        assert source < 0
+        assert -source == pytest.approx(analysis.energy("R1")[0] + analysis.energy("C1")[0], rel=1e-3)
+        assert abs(analysis.energy_balance()["relative_error"][0]) < 1e-3
+
+    def test_capacitor_stored_energy(self):
+        data, components, nodes = _rc_charge()
+        metrics = {m["component_id"]: m for m in compute_transient_power_metrics(data, components, nodes)}
+        expected = 0.5 * 1e-6 * (5.0 * (1 - math.exp(-5))) ** 2
+        assert metrics["C1"]["stored_energy"] == pytest.approx(expected)
+        assert metrics["C1"]["energy"] == pytest.approx(expected, rel=1e-3)
+        assert metrics["V1"]["pavg"] < 0 and metrics["V1"]["stored_energy"] is None
+        assert "GND1" not in metrics
+
+    def test_current_source_value(self):
+        components = {
+            "I1": _make_component("I1", "Current Source", "2mA"),
+            "GND1": _make_component("GND1", "Ground", "0"),
+        }
+        # SPICE current flows from n+ through the source, so n- is driven up
+        nodes = [_node("0", ("I1", 0), ("GND1", 0), ground=True), _node("out", ("I1", 1))]
+        components, nodes = _resistor_load(components, nodes, ("I1", 1))
+        data = [{"time": 0.0, "out": 2.0}, {"time": 1e-3, "out": 2.0}]
+
+        analysis = analyze_power(data, components, nodes)
+
+        assert analysis.average_power("I1")[0] == pytest.approx(-4e-3)
+        assert analysis.average_power("R9")[0] == pytest.approx(4e-3)
+
+    def test_semiconductor_from_device_vectors(self):
+        components = {
+            "V1": _make_component("V1", "Voltage Source", "5"),
+            "Q1": _make_component("Q1", "BJT NPN", "2N3904"),
+            "GND1": _make_component("GND1", "Ground", "0"),
+        }
+        nodes = [
+            _node("c", ("Q1", 0), ("V1", 0)),
+            _node("b", ("Q1", 1)),
+            _node("0", ("Q1", 2), ("V1", 1), ("GND1", 0), ground=True),
+        ]
+        row = {"c": 5.0, "b": 0.7, "@q1[ic]": 1e-3, "@q1[ib]": 1e-5}
+        data = [dict(row, time=0.0), dict(row, time=1e-3)]
+
+        analysis = analyze_power(data, components, nodes)
+
+        # The emitter current follows from the device's own KCL
+        assert analysis.average_power("Q1")[0] == pytest.approx(5.0 * 1e-3 + 0.7 * 1e-5)
+        assert analysis.average_power("V1")[0] == pytest.approx(-5e-3)
+        assert "Q1" not in analysis.voltage
+
+    def test_device_power_vector_is_used_directly(self):
+        components = {"D1": _make_component("D1", "Diode", "1N4148")}
+        data = [{"time": 0.0, "@d1[p]": 2e-3}, {"time": 1e-3, "@d1[p]": 4e-3}]
+        assert analyze_power(data, components).average_power("D1")[0] == pytest.approx(3e-3)
+
+    def test_controlled_source_output(self):
+        components = {
+            "V1": _make_component("V1", "Voltage Source", "1"),
+            "G1": _make_component("G1", "VCCS", "1m"),
+            "GND1": _make_component("GND1", "Ground", "0"),
+        }
+        nodes = [
+            _node("ctl", ("V1", 0), ("G1", 0)),
+            _node("out", ("G1", 2)),
+            _node("0", ("V1", 1), ("G1", 1), ("G1", 3), ("GND1", 0), ground=True),
+        ]
+        components, nodes = _resistor_load(components, nodes, ("G1", 2))
+        data = [{"time": 0.0, "ctl": 1.0, "out": -1.0}, {"time": 1e-3, "ctl": 1.0, "out": -1.0}]
+
+        analysis = analyze_power(data, components, nodes)
+
+        assert analysis.unresolved == []
+        assert analysis.average_power("G1")[0] == pytest.approx(-1e-3)
+        # The control input draws nothing, so the source driving it idles
+        assert analysis.average_power("V1")[0] == pytest.approx(0.0)
+
+    def test_opamp_output_returns_through_ground(self):
+        components = {
+            "OA1": _make_component("OA1", "Op-Amp", "Ideal"),
+            "GND1": _make_component("GND1", "Ground", "0"),
+        }
+        nodes = [
+            _node("0", ("OA1", 0), ("OA1", 1), ("GND1", 0), ground=True),
+            _node("out", ("OA1", 2)),
+        ]
+        components, nodes = _resistor_load(components, nodes, ("OA1", 2))
+        data = [{"time": 0.0, "out": 3.0}, {"time": 1e-3, "out": 3.0}]
+
+        analysis = analyze_power(data, components, nodes)
+
+        assert analysis.average_power("OA1")[0] == pytest.approx(-9e-3)
+
+    def test_inductor_branch_current(self):
+        components = {"L1": _make_component("L1", "Inductor", "10m")}
+        nodes = [_node("a", ("L1", 0)), _node("0", ("L1", 1), ground=True)]
+        data = [{"time": t, "a": 1.0, "i(l1)": 100.0 * t} for t in (0.0, 1e-3, 2e-3)]
+
+        metrics = compute_transient_power_metrics(data, components, nodes)
+
+        # Energy in = 1/2 L I^2 at 0.2 A
+        assert metrics[0]["stored_energy"] == pytest.approx(2e-4)
+        assert metrics[0]["energy"] == pytest.approx(2e-4)
+
+    def test_unresolved_components_are_reported(self):
+        components = {
+            "V1": _make_component("V1", "Voltage Source", "5"),
+            "D1": _make_component("D1", "Diode", "1N4148"),
+        }
+        nodes = [_node("a", ("V1", 0), ("D1", 0)), _node("0", ("V1", 1), ("D1", 1), ground=True)]
+        data = [{"time": 0.0, "a": 5.0}, {"time": 1e-3, "a": 5.0}]
+
+        analysis = analyze_power(data, components, nodes)
+
+        assert sorted(analysis.unresolved) == ["D1", "V1"]
+        assert analysis.metrics() == []
+
+    def test_vectorized_over_runs(self):
+        components = {"R1": _make_component("R1", "Resistor", "1k")}
+        nodes = [_node("a", ("R1", 0)), _node("0", ("R1", 1), ground=True)]
+        runs = [[{"time": t, "a": volts} for t in (0.0, 1e-3)] for volts in (1.0, 2.0, 3.0)]
+        stacked = _stack(runs)
+
+        analysis = analyze_power(stacked, components, nodes, run_values=[{}, {"R1": "2k"}, {"R1": 500.0}])
+
+        assert analysis.num_runs == 3
+        assert analysis.average_power("R1") == pytest.approx([1e-3, 2e-3, 18e-3])
+        assert analysis.energy("R1") == pytest.approx([1e-6, 2e-6, 18e-6])
+        assert analysis.metrics(run=2)[0]["irms"] == pytest.approx(6e-3)
+
+    def test_failed_runs_stay_nan(self):
+        components = {"R1": _make_component("R1", "Resistor", "1k")}
+        nodes = [_node("a", ("R1", 0)), _node("0", ("R1", 1), ground=True)]
+        stacked = _stack([[{"time": 0.0, "a": 1.0}, {"time": 1e-3, "a": 1.0}], None])
+
+        power = analyze_power(stacked, components, nodes).average_power("R1")
+
+        assert power[0] == pytest.approx(1e-3) and np.isnan(power[1])
+
+    def test_no_data(self):
+        analysis = analyze_power([], {"R1": _make_component("R1", "Resistor", "1k")})
+        assert analysis.power == {} and analysis.num_runs == 0
+
 
 # ---------------------------------------------------------------------------
 # format_power_summary tests
@@ -202,6 +445,29 @@ class TestFormatPowerSummary:
         # Total should be 0.15W = 150mW
         assert "150 mW" in result
 
+    def test_energy_balance_and_stored_energy(self):
+        data, components, nodes = _rc_charge()
+        result = format_power_summary(compute_transient_power_metrics(data, components, nodes))
+        assert "Energy: delivered 24.8 uJ, absorbed 24.8 uJ" in result
+        assert "Stored at end: C1 12.3 uJ" in result
+
+    def test_multi_terminal_parts_have_no_vrms(self):
+        metrics = [
+            {
+                "component_id": "Q1",
+                "component_type": "BJT NPN",
+                "value": "2N3904",
+                "vrms": None,
+                "irms": None,
+                "pavg": 5e-3,
+                "ppeak": 5e-3,
+                "energy": 5e-6,
+                "stored_energy": None,
+            }
+        ]
+        row = format_power_summary(metrics).splitlines()[5]
+        assert row.split()[2:4] == ["-", "-"]
+
 
 # ---------------------------------------------------------------------------
 # _fmt_eng tests
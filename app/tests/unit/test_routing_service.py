@@ -0,0 +1,181 @@
+"""Tests for background wire routing (algorithms/routing_service.py)."""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from algorithms.path_finding import RoutingCancelled
+from algorithms.routing_service import (
+    ComponentSnapshot,
+    RouteRequest,
+    WireRoutingService,
+    WireSnapshot,
+    route_wire,
+)
+
+BOX = ((-10.0, -10.0), (10.0, -10.0), (10.0, 10.0), (-10.0, 10.0))
+
+
+def _request(end_x=200.0, wires=()):
+    components = (
+        ComponentSnapshot("R1", (0.0, 0.0), 0.0, ((-20.0, 0.0), (20.0, 0.0)), BOX),
+        ComponentSnapshot("R2", (end_x + 20, 0.0), 0.0, ((end_x, 0.0), (end_x + 40, 0.0)), BOX),
+    )
+    return RouteRequest(
+        start=(20.0, 0.0),
+        end=(end_x, 0.0),
+        active_terminals=(("R1", 1), ("R2", 0)),
+        components=components,
+        wires=wires,
+        grid_size=10,
+    )
+
+
+@pytest.fixture
+def service():
+    svc = WireRoutingService()
+    yield svc
+    svc.shutdown()
+
+
+class TestRouteWire:
+    def test_routes_between_terminals(self):
+        result = route_wire(_request())
+        assert not result.routing_failed
+        assert result.waypoints[0] == (20.0, 0.0)
+        assert result.waypoints[-1] == (200.0, 0.0)
+
+    def test_should_stop_aborts_search(self):
+        with pytest.raises(RoutingCancelled):
+            route_wire(_request(), should_stop=lambda: True)
+
+    def test_other_layers_are_not_obstacles(self):
+        blocking = WireSnapshot(waypoints=((100.0, -200.0), (100.0, 200.0)), algorithm="other")
+        assert route_wire(_request(wires=(blocking,))).waypoints == route_wire(_request()).waypoints
+
+
+class TestWireRoutingService:
+    def test_result_is_collected(self, service):
+        generation = service.submit("w1", _request())
+        assert service.wait(5)
+        results = service.collect()
+        assert [r.key for r in results] == ["w1"]
+        assert results[0].generation == generation
+        assert results[0].waypoints[-1] == (200.0, 0.0)
+        assert not service.has_work()
+
+    def test_newer_submit_supersedes_older(self, service):
+        gate = threading.Event()
+        real_route = route_wire
+
+        def slow_route(request, should_stop=None):
+            gate.wait(5)
+            return real_route(request)
+
+        with patch("algorithms.routing_service.route_wire", slow_route):
+            service.submit("blocker", _request())
+            service.submit("w1", _request(end_x=100.0))
+            latest = service.submit("w1", _request(end_x=300.0))
+            gate.set()
+            assert service.wait(5)
+        results = service.collect()
+        wire_results = [r for r in results if r.key == "w1"]
+        assert len(wire_results) == 1
+        assert wire_results[0].generation == latest
+        assert wire_results[0].waypoints[-1] == (300.0, 0.0)
+        assert service.stats()["cancelled"] == 1
+
+    def test_running_job_result_is_discarded_when_stale(self, service):
+        started, release = threading.Event(), threading.Event()
+        real_route = route_wire
+
+        def blocking_route(request, should_stop=None):
+            started.set()
+            release.wait(5)
+            # Ignore should_stop so the stale result reaches the service
+            return real_route(request)
+
+        with patch("algorithms.routing_service.route_wire", blocking_route):
+            service.submit("w1", _request(end_x=100.0))
+            assert started.wait(5)
+            service.submit("w1", _request(end_x=300.0))
+            release.set()
+            assert service.wait(5)
+        results = service.collect()
+        assert [r.waypoints[-1] for r in results] == [(300.0, 0.0)]
+        assert service.stats()["discarded"] == 1
+
+    def test_cancel_stops_running_search(self, service):
+        started, release = threading.Event(), threading.Event()
+        real_route = route_wire
+
+        def blocking_route(request, should_stop=None):
+            started.set()
+            release.wait(5)
+            return real_route(request, should_stop)
+
+        with patch("algorithms.routing_service.route_wire", blocking_route):
+            service.submit("w1", _request())
+            assert started.wait(5)
+            service.cancel("w1")
+            release.set()
+            # The running search sees its stop flag and aborts
+            deadline = time.monotonic() + 5
+            while service.stats()["cancelled"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert service.stats()["cancelled"] == 1
+        assert service.collect() == []
+
+    def test_invalid_workers(self):
+        with pytest.raises(ValueError):
+            WireRoutingService(workers=0)
+
+
+class TestCanvasBackgroundRouting:
+    @pytest.fixture
+    def canvas(self, qtbot):
+        from controllers.circuit_controller import CircuitController
+        from GUI.circuit_canvas import CircuitCanvasView
+        from models.circuit import CircuitModel
+
+        controller = CircuitController(CircuitModel())
+        view = CircuitCanvasView(controller)
+        qtbot.addWidget(view)
+        controller.add_component("Resistor", (0, 0))
+        controller.add_component("Resistor", (200, 0))
+        controller.add_wire("R1", 1, "R2", 0)
+        yield view, controller
+        view._cancel_background_routes()
+
+    def test_drag_reroutes_off_the_gui_thread(self, canvas, qtbot):
+        view, controller = canvas
+        wire = view.wires[0]
+        with patch.object(type(wire), "update_position") as sync_route:
+            controller.move_component("R2", (200, 200))
+            view._do_batch_reroute()
+            sync_route.assert_not_called()
+        # Straight-line preview is shown until the route arrives
+        assert wire.path().elementCount() == 2
+
+        qtbot.waitUntil(lambda: not view._routing_service.has_work() and len(wire.waypoints) > 2, timeout=5000)
+        end = wire.end_comp.get_terminal_pos(wire.end_term)
+        assert controller.model.wires[0].waypoints[-1] == (end.x(), end.y())
+
+    def test_result_for_removed_wire_is_ignored(self, canvas, qtbot):
+        view, controller = canvas
+        controller.move_component("R2", (200, 200))
+        view._do_batch_reroute()
+        controller.remove_wire(0)
+        qtbot.wait(50)
+        view._apply_background_routes()
+        assert controller.model.wires == []
+
+
+class TestNoQtInRoutingService:
+    def test_no_pyqt_imports(self):
+        import algorithms.routing_service as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
@@ -404,6 +404,11 @@ class TestExportHelpers:
                 assert metrics == []
                 assert summary == ""
 
+    def test_analyze_power(self):
+        with patch("simulation.power_metrics.analyze_power", return_value="analysis") as engine:
+            assert SimulationController.analyze_power("stacked", {}, run_values=[{}]) == "analysis"
+        engine.assert_called_once_with("stacked", {}, None, [{}])
+
     def test_generate_results_csv_unknown_type(self):
         ctrl, _ = make_simulation_controller()
         result = ctrl.generate_results_csv({"data": 1}, "Unknown Type", "test")
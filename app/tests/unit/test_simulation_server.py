@@ -0,0 +1,181 @@
+"""Tests for the local simulation server (services/simulation_server.py)."""
+
+import asyncio
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from cli import build_parser
+from controllers.simulation_controller import SimulationController, SimulationResult
+from scripting import Circuit
+from services.simulation_server import SimulationService, create_server, request_key
+
+
+def _divider_dict():
+    circuit = Circuit()
+    circuit.add_component("Voltage Source", "5V", position=(0, 0))
+    circuit.add_component("Resistor", "1k", position=(100, 0))
+    circuit.add_component("Ground", position=(0, 100))
+    circuit.add_wire("V1", 0, "R1", 0)
+    circuit.add_wire("R1", 1, "V1", 1)
+    circuit.add_wire("V1", 1, "GND1", 0)
+    return circuit.model.to_dict()
+
+
+RUBRIC = {
+    "title": "Divider",
+    "total_points": 10,
+    "checks": [
+        {
+            "check_id": "has_r1",
+            "check_type": "component_exists",
+            "points": 10,
+            "params": {"component_id": "R1", "component_type": "Resistor"},
+        },
+    ],
+}
+
+
+@pytest.fixture
+def server():
+    service = SimulationService(workers=2, timeout=5).start()
+    httpd = create_server(service, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield service, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+    service.stop()
+
+
+def _request(url, body=None):
+    data = None if body is None else json.dumps(body).encode()
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestHttpApi:
+    def test_health(self, server):
+        _, base = server
+        status, body = _request(f"{base}/health")
+        assert status == 200
+        assert body["status"] == "ok"
+        assert body["workers"] == 2
+
+    def test_validate_and_netlist(self, server):
+        _, base = server
+        status, body = _request(f"{base}/validate", {"circuit": _divider_dict()})
+        assert status == 200
+        assert body["status"] == "done"
+        assert body["result"]["success"] is True
+
+        _, body = _request(f"{base}/netlist", {"circuit": _divider_dict(), "analysis": "Transient"})
+        assert ".tran" in body["result"]["netlist"]
+
+    def test_grade(self, server):
+        _, base = server
+        _, body = _request(f"{base}/grade", {"circuit": _divider_dict(), "rubric": RUBRIC})
+        assert body["status"] == "done"
+        assert body["result"]["earned_points"] == 10
+        assert body["result"]["percentage"] == 100.0
+
+    def test_queued_job_can_be_polled(self, server):
+        service, base = server
+        status, body = _request(f"{base}/jobs", {"op": "netlist", "circuit": _divider_dict()})
+        assert status == 202
+        service.get(body["id"]).wait(5)
+        status, body = _request(f"{base}/jobs/{body['id']}")
+        assert status == 200
+        assert body["status"] == "done"
+
+    def test_errors(self, server):
+        _, base = server
+        assert _request(f"{base}/jobs", {"op": "explode"})[0] == 400
+        assert _request(f"{base}/nope", {})[0] == 404
+        assert _request(f"{base}/jobs/999999")[0] == 404
+        _, body = _request(f"{base}/validate", {"circuit": "not a circuit"})
+        assert body["status"] == "failed"
+        assert "circuit" in body["error"]
+
+    @pytest.mark.parametrize("length", ["-1", "abc"])
+    def test_bad_content_length_is_rejected(self, server, length):
+        _, base = server
+        conn = http.client.HTTPConnection(urllib.parse.urlsplit(base).netloc, timeout=10)
+        try:
+            conn.request("POST", "/validate", body=b"", headers={"Content-Length": length})
+            resp = conn.getresponse()
+            assert resp.status == 400
+            assert "Content-Length" in json.loads(resp.read())["error"]
+        finally:
+            conn.close()
+
+
+class TestService:
+    def test_results_are_cached_by_content(self, server):
+        service, _ = server
+        first = service.run("netlist", {"circuit": _divider_dict()})
+        second = service.run("netlist", {"circuit": _divider_dict(), "timeout": 3})
+        assert not first.cached and second.cached
+        assert second.result == first.result
+        assert service.stats()["cache_hits"] == 1
+
+    def test_request_key_ignores_timeout(self):
+        assert request_key("simulate", {"circuit": {}, "timeout": 1}) == request_key("simulate", {"circuit": {}})
+        assert request_key("simulate", {"circuit": {}}) != request_key("netlist", {"circuit": {}})
+
+    def test_simulate_reuses_worker_controller(self, server):
+        service, _ = server
+        seen = []
+
+        async def fake_run(self, timeout=None):
+            seen.append(self)
+            return SimulationResult(success=True, analysis_type="DC Operating Point", data={"node_voltages": {}})
+
+        with patch.object(SimulationController, "run_simulation_async", fake_run):
+            for value in ("1k", "2k", "3k", "4k"):
+                circuit = _divider_dict()
+                circuit["components"][1]["value"] = value
+                assert service.run("simulate", {"circuit": circuit}).status == "done"
+        assert len(set(map(id, seen))) <= service.workers
+
+    def test_timeout(self, server):
+        service, _ = server
+
+        async def slow_run(self, timeout=None):
+            await asyncio.sleep(5)
+
+        with patch.object(SimulationController, "run_simulation_async", slow_run):
+            job = service.run("simulate", {"circuit": _divider_dict()}, timeout=0.1)
+        assert job.status == "timeout"
+        assert job.elapsed_s < 2
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            SimulationService(workers=0)
+        with pytest.raises(ValueError, match="timeout"):
+            SimulationService().submit("validate", {}, timeout=0)
+
+
+class TestServeCommand:
+    def test_parser(self):
+        args = build_parser().parse_args(["serve", "--port", "0", "--workers", "3"])
+        assert args.workers == 3
+        assert args.host == "127.0.0.1"
+
+
+class TestNoQtInSimulationServer:
+    def test_no_pyqt_imports(self):
+        import services.simulation_server as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
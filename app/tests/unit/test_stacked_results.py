@@ -0,0 +1,131 @@
+"""Tests for stacked (runs x samples) multi-run result storage."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from controllers.simulation_controller import SimulationResult
+from simulation.stacked_results import StackedResultsBuilder, stack_results
+
+
+def _tran_result(scale, times=(0.0, 1.0, 2.0, 3.0)):
+    rows = [{"time": t, "out": scale * t, "in": 1.0} for t in times]
+    return SimulationResult(success=True, data=rows, netlist=f"* run {scale}", raw_output="stdout")
+
+
+def _op_result(v):
+    return SimulationResult(
+        success=True,
+        data={"node_voltages": {"nodeA": v}, "branch_currents": {"v1": -v / 1000}},
+        netlist="* op",
+    )
+
+
+class TestStacking:
+    def test_transient_shapes(self):
+        stacked = stack_results("Transient", [_tran_result(1.0), _tran_result(2.0), _tran_result(3.0)])
+        assert stacked.num_runs == 3
+        assert stacked.axis_name == "time"
+        assert stacked.signal("out").shape == (3, 4)
+        assert stacked.signal("out")[1, -1] == pytest.approx(6.0)
+
+    def test_failed_run_is_nan_row(self):
+        results = [_tran_result(1.0), SimulationResult(success=False, error="boom"), _tran_result(3.0)]
+        stacked = stack_results("Transient", results)
+        assert list(stacked.ok) == [True, False, True]
+        assert np.isnan(stacked.signal("out")[1]).all()
+
+    def test_runs_on_different_axes_are_interpolated(self):
+        dense = _tran_result(1.0, times=(0.0, 0.5, 1.0, 1.5, 2.0))
+        coarse = _tran_result(2.0, times=(0.0, 2.0))
+        stacked = stack_results("Transient", [coarse, dense])
+        assert len(stacked.axis) == 5
+        assert stacked.signal("out")[0, 1] == pytest.approx(1.0)
+
+    def test_op_signals_include_branch_currents(self):
+        stacked = stack_results("DC Operating Point", [_op_result(1.0), _op_result(2.0)])
+        assert stacked.signal("nodeA")[:, 0].tolist() == [1.0, 2.0]
+        assert "i(v1)" in stacked.signals
+
+    def test_build_with_signal_filter(self):
+        builder = StackedResultsBuilder("Transient")
+        builder.add(_tran_result(1.0))
+        stacked = builder.build(signals=["out"])
+        assert list(stacked.signals) == ["out"]
+
+    def test_ac_phase_stacked_separately(self):
+        data = {"frequencies": [10.0, 100.0], "magnitude": {"out": [1.0, 0.5]}, "phase": {"out": [0.0, -45.0]}}
+        stacked = stack_results("AC Sweep", [SimulationResult(success=True, data=data)])
+        assert stacked.signal("out", phase=True)[0, 1] == pytest.approx(-45.0)
+
+    def test_dc_sweep_axis_named_after_sweep_variable(self):
+        data = {"headers": ["Index", "v-sweep", "v(out)"], "data": [[0, 0.0, 0.0], [1, 1.0, 0.5]]}
+        stacked = stack_results("DC Sweep", [SimulationResult(success=True, data=data)])
+        assert stacked.axis_name == "v-sweep"
+        assert stacked.signal("v(out)").shape == (1, 2)
+
+
+class TestCompaction:
+    def test_netlist_stored_once_and_steps_compacted(self):
+        builder = StackedResultsBuilder("Transient")
+        compact = builder.add(_tran_result(1.0))
+        builder.add(_tran_result(2.0))
+        stacked = builder.build()
+        assert stacked.netlist == "* run 1.0"
+        assert compact.netlist == ""
+        assert compact.raw_output == ""
+        assert compact.data is None
+        assert compact.success
+        assert stacked.raw_outputs is None
+
+    def test_keep_raw_output_when_debugging(self):
+        builder = StackedResultsBuilder("Transient", keep_raw_output=True)
+        compact = builder.add(_tran_result(1.0))
+        assert compact.raw_output == "stdout"
+        assert builder.build().raw_outputs == ["stdout"]
+
+
+class TestMetrics:
+    def test_percentile_envelope(self):
+        stacked = stack_results("Transient", [_tran_result(s) for s in (1.0, 2.0, 3.0)])
+        env = stacked.percentile_envelope("out", (0.0, 50.0, 100.0))
+        assert env.shape == (3, 4)
+        assert env[1, -1] == pytest.approx(6.0)
+        assert env[2, -1] == pytest.approx(9.0)
+
+    @pytest.mark.parametrize(
+        "metric, expected",
+        [("final", 6.0), ("initial", 0.0), ("max", 6.0), ("min", 0.0), ("pp", 6.0), ("mean", 3.0)],
+    )
+    def test_run_metric(self, metric, expected):
+        stacked = stack_results("Transient", [_tran_result(1.0), _tran_result(2.0)])
+        assert stacked.run_metric("out", metric)[1] == pytest.approx(expected)
+
+    def test_run_metric_at_axis_value(self):
+        stacked = stack_results("Transient", [_tran_result(1.0), _tran_result(2.0)])
+        assert stacked.run_metric("out", at=1.5).tolist() == pytest.approx([1.5, 3.0])
+
+    def test_mean_is_time_weighted(self):
+        rows = [{"time": 0.0, "out": 0.0}, {"time": 0.1, "out": 0.0}, {"time": 1.0, "out": 1.0}]
+        stacked = stack_results("Transient", [SimulationResult(success=True, data=rows)])
+        # Trapezoid over time: 0.5 * 0.9 * 1.0 = 0.45
+        assert stacked.run_metric("out", "mean")[0] == pytest.approx(0.45)
+
+    def test_unknown_metric_raises(self):
+        stacked = stack_results("Transient", [_tran_result(1.0)])
+        with pytest.raises(ValueError):
+            stacked.run_metric("out", "median-ish")
+
+    def test_default_metrics_names(self):
+        stacked = stack_results("DC Operating Point", [_op_result(1.0), _op_result(2.0)])
+        metrics = stacked.default_metrics()
+        assert metrics["V(nodeA)"].tolist() == [1.0, 2.0]
+        assert "I(v1)" in metrics
+
+
+class TestNoQtInStackedResults:
+    def test_no_pyqt_imports(self):
+        import simulation.stacked_results as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
@@ -0,0 +1,63 @@
+"""Tests for the --startup-profile import budget check."""
+
+from pathlib import Path
+
+import pytest
+from utils.startup_profile import (
+    DEFERRED_PACKAGES,
+    StartupProfile,
+    parse_importtime,
+    print_startup_profile,
+    profile_startup,
+)
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:      2000 |       2500 |   numpy.core
+import time:      1000 |       3500 | numpy
+import time:       400 |        400 | GUI.styles
+"""
+
+
+class TestParseImporttime:
+    def test_records_and_depth(self):
+        records = parse_importtime(SAMPLE)
+        assert [r.module for r in records] == ["_io", "numpy.core", "numpy", "GUI.styles"]
+        assert records[1].self_ms == pytest.approx(2.0)
+        assert records[2].cumulative_ms == pytest.approx(3.5)
+        assert [r.depth for r in records] == [2, 1, 0, 0]
+
+    def test_header_and_noise_ignored(self):
+        assert parse_importtime("hello\nimport time: self [us] | cumulative | imported package\n") == []
+
+
+class TestStartupProfile:
+    def test_problems(self):
+        profile = StartupProfile("GUI.main_window", 2000.0, {"numpy", "GUI"}, parse_importtime(SAMPLE))
+        problems = profile.problems(budget_ms=1500.0)
+        assert profile.eager_deferred == ["numpy"]
+        assert any("'numpy'" in p for p in problems)
+        assert any("2000 ms" in p for p in problems)
+        assert profile.slowest(1)[0].module == "numpy.core"
+
+    def test_within_budget(self, capsys):
+        profile = StartupProfile("GUI.main_window", 100.0, {"GUI", "PyQt6"})
+        assert profile.problems() == []
+        print_startup_profile(profile)
+        assert "within budget" in capsys.readouterr().out
+
+
+class TestStartupImports:
+    def test_main_window_defers_plotting_and_analysis(self):
+        profile = profile_startup()
+        assert "GUI" in profile.imported
+        assert not set(DEFERRED_PACKAGES) & profile.imported
+
+
+class TestNoQtInStartupProfile:
+    def test_no_pyqt_imports(self):
+        import utils.startup_profile as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
@@ -0,0 +1,228 @@
+"""Tests for the memory-bounded, merging undo history."""
+
+from unittest.mock import patch
+
+import pytest
+from controllers.circuit_controller import CircuitController
+from controllers.commands import (
+    AddComponentCommand,
+    ChangeValueCommand,
+    CompoundCommand,
+    DeleteComponentCommand,
+    DeleteWireCommand,
+    MoveComponentCommand,
+    MoveWaypointCommand,
+    PasteCommand,
+    _deep_size,
+)
+from controllers.undo_manager import UndoManager
+from models.circuit import CircuitModel
+
+
+def _controller(**kwargs):
+    ctrl = CircuitController(CircuitModel())
+    ctrl.undo_manager = UndoManager(**kwargs)
+    return ctrl
+
+
+def _chain(ctrl, n):
+    """n resistors wired in series; returns their IDs."""
+    ids = [ctrl.add_component("Resistor", (i * 100.0, 0.0)).component_id for i in range(n)]
+    for a, b in zip(ids, ids[1:]):
+        ctrl.add_wire(a, 1, b, 0)
+    return ids
+
+
+class TestByteBudget:
+    def test_oldest_commands_are_evicted_past_the_budget(self):
+        ctrl = _controller()
+        ids = _chain(ctrl, 40)
+        for cid in ids[:6]:
+            ctrl.execute_command(DeleteComponentCommand(ctrl, cid))
+        # Deleting the head of the chain always drops one component and one wire,
+        # so this budget fits four and a half such commands
+        manager = ctrl.undo_manager
+        manager.max_bytes = manager.total_bytes * 9 // 12
+
+        for cid in ids[6:10]:
+            ctrl.execute_command(DeleteComponentCommand(ctrl, cid))
+
+        assert manager.get_undo_count() == 4
+        assert manager.total_bytes <= manager.max_bytes
+        assert [command.component_id for command in manager._undo_stack] == ids[6:10]
+
+    def test_newest_command_is_kept_even_if_oversized(self):
+        ctrl = _controller(max_bytes=1)
+        ids = _chain(ctrl, 3)
+        ctrl.execute_command(DeleteComponentCommand(ctrl, ids[0]))
+        ctrl.execute_command(DeleteComponentCommand(ctrl, ids[1]))
+        assert ctrl.undo_manager.get_undo_count() == 1
+        assert ctrl.undo()
+        assert ids[1] in ctrl.model.components
+
+    def test_accounting_follows_redo_and_clear(self):
+        ctrl = _controller()
+        ctrl.execute_command(AddComponentCommand(ctrl, "Resistor", (0, 0)))
+        charged = ctrl.undo_manager.total_bytes
+        assert charged > 0
+
+        ctrl.undo()
+        assert ctrl.undo_manager.total_bytes == charged
+        ctrl.execute_command(AddComponentCommand(ctrl, "Capacitor", (0, 0)))
+        assert ctrl.undo_manager.total_bytes == ctrl.undo_manager.peek_undo().estimated_size()
+
+        ctrl.clear_undo_history()
+        assert ctrl.undo_manager.total_bytes == 0
+
+    def test_deletes_cost_more_than_moves(self):
+        ctrl = _controller(merge_window=0)
+        ids = _chain(ctrl, 3)
+        move = MoveComponentCommand(ctrl, ids[0], (10.0, 10.0))
+        delete = DeleteComponentCommand(ctrl, ids[1])
+        ctrl.execute_command(move)
+        ctrl.execute_command(delete)
+        assert delete.estimated_size() > move.estimated_size()
+
+
+class TestMerging:
+    def test_successive_moves_merge(self):
+        ctrl = _controller()
+        ctrl.add_component("Resistor", (0, 0))
+        for x in (10.0, 20.0, 30.0):
+            ctrl.execute_command(MoveComponentCommand(ctrl, "R1", (x, 0.0)))
+
+        assert ctrl.undo_manager.get_undo_count() == 1
+        ctrl.undo()
+        assert ctrl.model.components["R1"].position == (0, 0)
+        ctrl.redo()
+        assert ctrl.model.components["R1"].position == (30.0, 0.0)
+
+    def test_rapid_value_edits_merge_per_component(self):
+        ctrl = _controller()
+        ctrl.add_component("Resistor", (0, 0))
+        ctrl.add_component("Resistor", (100, 0))
+        ctrl.execute_command(ChangeValueCommand(ctrl, "R1", "2k"))
+        ctrl.execute_command(ChangeValueCommand(ctrl, "R1", "3k"))
+        ctrl.execute_command(ChangeValueCommand(ctrl, "R2", "5k"))
+
+        assert ctrl.undo_manager.get_undo_count() == 2
+        ctrl.undo()
+        ctrl.undo()
+        assert ctrl.model.components["R1"].value == "1k"
+
+    def test_waypoint_drags_merge(self):
+        ctrl = _controller()
+        _chain(ctrl, 2)
+        first = MoveWaypointCommand(ctrl, 0, [], [(50.0, 0.0)])
+        ctrl.undo_manager.push_already_executed(first)
+        ctrl.undo_manager.push_already_executed(MoveWaypointCommand(ctrl, 0, [(50.0, 0.0)], [(50.0, 40.0)]))
+
+        assert ctrl.undo_manager.get_undo_count() == 1
+        assert first.old_waypoints == [] and first.new_waypoints == [(50.0, 40.0)]
+
+    def test_group_drags_merge_when_they_move_the_same_components(self):
+        ctrl = _controller()
+        _chain(ctrl, 3)
+
+        def drag(dx):
+            return CompoundCommand(
+                [MoveComponentCommand(ctrl, cid, (dx, 0.0), old_position=(0.0, 0.0)) for cid in ("R1", "R2")]
+            )
+
+        ctrl.push_already_executed(drag(10.0))
+        ctrl.push_already_executed(drag(20.0))
+        assert ctrl.undo_manager.get_undo_count() == 1
+        ctrl.push_already_executed(CompoundCommand([MoveComponentCommand(ctrl, "R3", (5.0, 0.0), (0.0, 0.0))]))
+        assert ctrl.undo_manager.get_undo_count() == 2
+
+    def test_no_merge_outside_the_window(self):
+        ctrl = _controller(merge_window=0.5)
+        ctrl.add_component("Resistor", (0, 0))
+        with patch("controllers.undo_manager.time.monotonic", side_effect=[0.0, 10.0]):
+            ctrl.execute_command(MoveComponentCommand(ctrl, "R1", (10.0, 0.0)))
+            ctrl.execute_command(MoveComponentCommand(ctrl, "R1", (20.0, 0.0)))
+        assert ctrl.undo_manager.get_undo_count() == 2
+
+    def test_no_merge_into_a_redone_command(self):
+        ctrl = _controller()
+        ctrl.add_component("Resistor", (0, 0))
+        ctrl.execute_command(MoveComponentCommand(ctrl, "R1", (10.0, 0.0)))
+        ctrl.undo()
+        ctrl.redo()
+        ctrl.execute_command(MoveComponentCommand(ctrl, "R1", (20.0, 0.0)))
+        assert ctrl.undo_manager.get_undo_count() == 2
+
+    def test_skipped_commands_do_not_merge(self):
+        ctrl = _controller()
+        ctrl.add_component("Resistor", (0, 0))
+        ctrl.execute_command(ChangeValueCommand(ctrl, "R9", "2k"))
+        ctrl.execute_command(ChangeValueCommand(ctrl, "R9", "3k"))
+        assert ctrl.undo_manager.get_undo_count() == 2
+
+
+class TestPasteDiff:
+    @pytest.fixture
+    def pasted(self):
+        ctrl = _controller()
+        ids = _chain(ctrl, 50)
+        ctrl.copy_components(ids)
+        command = PasteCommand(ctrl)
+        ctrl.execute_command(command)
+        return ctrl, command
+
+    def test_redo_recreates_the_same_paste(self, pasted):
+        ctrl, command = pasted
+        before = {cid: ctrl.model.components[cid].position for cid in command.pasted_component_ids}
+        wires = len(ctrl.model.wires)
+
+        ctrl.undo()
+        assert not set(before) & set(ctrl.model.components)
+        ctrl.redo()
+
+        assert {cid: ctrl.model.components[cid].position for cid in command.pasted_component_ids} == before
+        assert len(ctrl.model.wires) == wires
+        assert list(command.pasted_wire_indices) == list(range(wires - 49, wires))
+
+    def test_redo_falls_back_to_fresh_ids_when_taken(self, pasted):
+        ctrl, command = pasted
+        first_id = command.pasted_component_ids[0]
+        ctrl.undo()
+        ctrl.model.component_counter["R"] = 50
+        ctrl.add_component("Resistor", (0, 0))
+        assert first_id in ctrl.model.components
+        ctrl.redo()
+        assert len(command.pasted_component_ids) == 50
+        assert first_id not in command.pasted_component_ids
+
+    def test_paste_is_stored_compactly(self, pasted):
+        ctrl, command = pasted
+        deletes = CompoundCommand([DeleteComponentCommand(ctrl, cid) for cid in command.pasted_component_ids])
+        ctrl.execute_command(deletes)
+        clipboard = _deep_size(command._source)
+        # The clipboard it replays from is charged; the diff on top of it is small
+        assert command.estimated_size() > clipboard
+        assert (command.estimated_size() - clipboard) * 3 < deletes.estimated_size()
+
+    def test_undo_is_one_batch(self, pasted):
+        ctrl, _ = pasted
+        events = []
+        ctrl.add_observer(lambda event, data: events.append(event))
+        ctrl.undo()
+        assert events.count("batch_applied") == 1
+
+
+class TestBatchedWireRestore:
+    def test_compound_wire_delete_undo_skips_full_rebuilds(self):
+        ctrl = _controller()
+        ids = _chain(ctrl, 30)
+        ctrl.add_component("Ground", (0, 200))
+        ctrl.add_wire(ids[0], 0, "GND1", 0)
+        before = {frozenset(n.terminals): frozenset(n.wire_indices) for n in ctrl.model.nodes}
+
+        indices = sorted(range(0, 29, 3), reverse=True)
+        ctrl.execute_command(CompoundCommand([DeleteWireCommand(ctrl, i) for i in indices]))
+        with patch.object(ctrl.model, "rebuild_nodes", side_effect=AssertionError("full rebuild")):
+            ctrl.undo()
+
+        assert {frozenset(n.terminals): frozenset(n.wire_indices) for n in ctrl.model.nodes} == before
+        assert [n.is_ground for n in ctrl.model.nodes].count(True) == 1
@@ -526,6 +526,15 @@ class TestToggleWireLockCommand:
         cmd.undo()
         assert model.wires[0].locked
 
+    def test_lock_leaves_an_earlier_copy_alone(self):
+        """The lock goes through the controller, so a copy-on-write fork keeps its own state."""
+        model, controller = self._setup_circuit_with_wire()
+        fork = model.copy()
+
+        ToggleWireLockCommand(controller, 0, True).execute()
+        assert model.wires[0].locked
+        assert not fork.wires[0].locked
+
     def test_description_lock(self):
         """Lock command has correct description."""
         model, controller = self._setup_circuit_with_wire()
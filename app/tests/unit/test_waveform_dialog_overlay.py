@@ -77,3 +77,28 @@ class TestWaveformDialogOverlay:
         dlg.clear_overlays()
         dlg.add_dataset(TRAN_DATA_A, "Run 3")
         assert len(dlg._overlay_datasets) == 1
+
+
+class TestWaveformDialogExpressions:
+    def test_add_expression_trace(self, qtbot):
+        dlg = WaveformDialog(TRAN_DATA_A)
+        qtbot.addWidget(dlg)
+        dlg.add_expression_trace("v(in,out)")
+        assert "v(in,out)" in dlg.voltage_keys
+        assert [row["v(in,out)"] for row in dlg.full_data] == pytest.approx([1.0, 0.4, -0.2])
+
+    def test_expression_trace_sits_before_overlays(self, qtbot):
+        dlg = WaveformDialog(TRAN_DATA_A)
+        qtbot.addWidget(dlg)
+        dlg.add_dataset(TRAN_DATA_B, "Run 2")
+        dlg.add_expression_trace("abs(v(out))")
+        dlg.clear_overlays()
+        layout = dlg._toggle_scroll_content.layout()
+        assert layout.count() == len(dlg.voltage_keys)
+
+    def test_invalid_expression_raises(self, qtbot):
+        dlg = WaveformDialog(TRAN_DATA_A)
+        qtbot.addWidget(dlg)
+        with pytest.raises(ValueError):
+            dlg.add_expression_trace("v(nope)")
+        assert len(dlg.voltage_keys) == 2
@@ -0,0 +1,131 @@
+"""Tests for derived-signal waveform expressions."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from controllers.simulation_controller import SimulationController, SimulationResult
+from simulation.stacked_results import stack_results
+from simulation.waveform_expressions import (
+    ExpressionError,
+    WaveformEvaluator,
+    cumulative_trapezoid,
+    evaluate_expression,
+    parse_expression,
+)
+
+T = np.linspace(0.0, 1.0, 101)
+
+
+def _rows(scale=1.0):
+    return [{"time": t, "in": 2.0 * scale, "out": scale * t, "i_v1": -0.5 * scale} for t in T]
+
+
+def _evaluator(scale=1.0):
+    return WaveformEvaluator.from_result("Transient", _rows(scale))
+
+
+class TestParse:
+    def test_precedence(self):
+        assert parse_expression("1+2*3") == ("bin", "+", ("num", 1.0), ("bin", "*", ("num", 2.0), ("num", 3.0)))
+
+    def test_power_is_right_associative_and_binds_tighter_than_negation(self):
+        assert _evaluator().evaluate("-2^2")[0, 0] == pytest.approx(-4.0)
+        assert _evaluator().evaluate("2^3^2")[0, 0] == pytest.approx(512.0)
+        assert _evaluator().evaluate("2**3")[0, 0] == pytest.approx(8.0)
+
+    def test_si_suffix_numbers(self):
+        assert parse_expression("1k") == ("num", 1000.0)
+        assert parse_expression("100n")[1] == pytest.approx(1e-7)
+
+    def test_signal_references(self):
+        assert parse_expression("v(in, out)") == ("sig", "v", ("in", "out"))
+        assert parse_expression("I(V1)") == ("sig", "i", ("V1",))
+        assert parse_expression("d/dt(out)") == ("call", "ddt", ("name", "out"))
+
+    @pytest.mark.parametrize("text", ["", "1 +", "(1", "foo(1)", "v(a,b,c)", "1 $ 2", "d/dt"])
+    def test_syntax_errors(self, text):
+        with pytest.raises(ExpressionError):
+            parse_expression(text)
+
+
+class TestEvaluate:
+    def test_differential_voltage_and_ground(self):
+        ev = _evaluator()
+        assert ev.evaluate("v(in,out)")[0, -1] == pytest.approx(1.0)
+        assert ev.evaluate("v(0,in)")[0, 0] == pytest.approx(-2.0)
+
+    def test_branch_current_from_transient_column(self):
+        assert _evaluator().evaluate("v(in)*i(v1)")[0, 0] == pytest.approx(-1.0)
+
+    def test_derivative_and_integral(self):
+        ev = _evaluator()
+        assert ev.evaluate("d/dt(v(out))")[0] == pytest.approx(np.ones(len(T)))
+        assert ev.evaluate("integ(v(out))")[0, -1] == pytest.approx(0.5)
+        assert ev.evaluate("integral(1)")[0, -1] == pytest.approx(1.0)
+
+    def test_axis_name_is_a_signal(self):
+        assert _evaluator().evaluate("time*2")[0, -1] == pytest.approx(2.0)
+
+    def test_unknown_signal(self):
+        with pytest.raises(ExpressionError, match="v\\(nope\\)"):
+            _evaluator().evaluate("v(nope) + 1")
+
+    def test_subexpressions_are_memoized(self):
+        ev = _evaluator()
+        first = ev.evaluate("v(in,out)")
+        assert np.shares_memory(ev.evaluate("v(in, out)"), first)
+        assert ("sig", "v", ("in", "out")) in ev._cache
+
+    def test_vectorized_over_runs(self):
+        study = stack_results("Transient", [SimulationResult(success=True, data=_rows(s)) for s in (1.0, 2.0, 3.0)])
+        values = WaveformEvaluator(study).evaluate("v(in,out)^2/1k")
+        assert values.shape == (3, len(T))
+        assert values[:, 0].tolist() == pytest.approx([4e-3, 16e-3, 36e-3])
+
+    def test_ac_db_phase_and_linear_magnitude(self):
+        data = {
+            "frequencies": [10.0, 100.0],
+            "magnitude": {"in": [0.0, 0.0], "out": [-6.0206, -20.0]},
+            "phase": {"out": [-10.0, -80.0]},
+            "use_db": True,
+        }
+        ev = WaveformEvaluator(stack_results("AC Sweep", [SimulationResult(success=True, data=data)]))
+        assert ev.evaluate("v(out)/v(in)")[0].tolist() == pytest.approx([0.5, 0.1], rel=1e-4)
+        assert ev.evaluate("db(v(out)/v(in))")[0].tolist() == pytest.approx([-6.0206, -20.0], rel=1e-4)
+        assert ev.evaluate("phase(v(out))")[0].tolist() == pytest.approx([-10.0, -80.0])
+
+    def test_ac_nodes_combine_as_phasors(self):
+        # a = 1 V at 0 deg, b = 1 V at -90 deg
+        data = {
+            "frequencies": [10.0, 100.0],
+            "magnitude": {"a": [1.0, 1.0], "b": [1.0, 1.0]},
+            "phase": {"a": [0.0, 0.0], "b": [-90.0, -90.0]},
+            "use_db": False,
+        }
+        ev = WaveformEvaluator(stack_results("AC Sweep", [SimulationResult(success=True, data=data)]))
+        assert ev.evaluate("v(a,b)")[0].tolist() == pytest.approx([np.sqrt(2)] * 2)
+        assert ev.evaluate("vp(a,b)")[0].tolist() == pytest.approx([45.0, 45.0])
+        assert ev.evaluate("vdb(a,b)")[0].tolist() == pytest.approx([20 * np.log10(np.sqrt(2))] * 2)
+        assert ev.evaluate("phase(v(b)/v(a))")[0].tolist() == pytest.approx([-90.0, -90.0])
+        assert ev.evaluate("abs(v(a)+v(b))")[0].tolist() == pytest.approx([np.sqrt(2)] * 2)
+        assert ev.evaluate("v(b)/v(a)").dtype == float
+
+    def test_cumulative_trapezoid_starts_at_zero(self):
+        out = cumulative_trapezoid(np.array([[1.0, 1.0, 1.0]]), np.array([0.0, 1.0, 3.0]))
+        assert out.tolist() == [[0.0, 1.0, 3.0]]
+
+    def test_evaluate_expression_and_controller(self):
+        values = evaluate_expression("Transient", _rows(), "abs(v(0,out))")
+        assert values.shape == (len(T),)
+        assert values[-1] == pytest.approx(1.0)
+        same = SimulationController.evaluate_waveform_expression("Transient", _rows(), "abs(v(0,out))")
+        assert same.tolist() == values.tolist()
+
+
+class TestNoQtInWaveformExpressions:
+    def test_no_pyqt_imports(self):
+        import simulation.waveform_expressions as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
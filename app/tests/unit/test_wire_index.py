@@ -0,0 +1,194 @@
+"""Tests for models/wire_index.py — component/terminal to wire adjacency."""
+
+from pathlib import Path
+
+import pytest
+from controllers.circuit_controller import CircuitController
+from models.circuit import CircuitModel
+from models.wire import WireData
+from models.wire_index import WireIndex, WireList
+
+
+def _wire(a, ta, b, tb):
+    return WireData(a, ta, b, tb)
+
+
+@pytest.fixture
+def index():
+    return WireIndex(WireData.get_terminals)
+
+
+class TestWireIndex:
+    def test_lookup_by_component_and_terminal(self, index):
+        wires = [_wire("R1", 0, "R2", 0), _wire("R2", 1, "C1", 0), _wire("R1", 1, "C1", 1)]
+        assert index.wires_for(wires, "R2") == wires[:2]
+        assert index.wires_at(wires, "C1", 1) == [wires[2]]
+        assert index.wires_for(wires, "V1") == []
+
+    def test_incremental_updates(self, index):
+        first = _wire("R1", 0, "R2", 0)
+        wires = WireList([first])
+        index.wires_for(wires, "R1")
+        extra = _wire("R1", 1, "R3", 0)
+        wires.append(extra)
+        index.added(wires, extra)
+        assert index.wires_for(wires, "R1") == wires
+        assert index.position(wires, extra) == 1
+
+        del wires[0]
+        index.removed(wires, first)
+        assert index.wires_for(wires, "R2") == []
+        assert index.position(wires, extra) == 0
+        assert index.position(wires, first) is None
+
+    def test_removals_do_not_rebuild(self, index, monkeypatch):
+        wires = WireList(_wire(f"R{i}", 0, f"R{i + 1}", 1) for i in range(50))
+        index.wires_for(wires, "R1")
+        monkeypatch.setattr(WireIndex, "_insert", lambda *args: pytest.fail("index was rebuilt"))
+        for i in (40, 10, 0):
+            wire = wires[i]
+            del wires[i]
+            index.removed(wires, wire)
+        assert [index.position(wires, w) for w in wires] == list(range(47))
+
+    def test_removal_is_by_identity(self, index):
+        first, second = _wire("R1", 0, "R2", 0), _wire("R1", 0, "R2", 0)
+        wires = [first, second]
+        index.wires_for(wires, "R1")
+        del wires[1]
+        index.removed(wires, second)
+        assert index.wires_for(wires, "R1")[0] is first
+
+    def test_direct_edits_trigger_rebuild(self, index):
+        wires = WireList([_wire("R1", 0, "R2", 0)])
+        index.wires_for(wires, "R1")
+        wires.insert(0, _wire("R1", 1, "R3", 0))
+        assert index.wires_for(wires, "R1") == wires
+        replacement = [_wire("R3", 0, "R4", 0)]
+        assert index.wires_for(replacement, "R1") == []
+
+    def test_same_length_replacement_is_noticed(self, index):
+        wires = WireList([_wire("R1", 0, "R2", 0)])
+        assert index.wires_for(wires, "R2") == wires
+        wires[0] = _wire("R1", 0, "R3", 0)
+        assert index.wires_for(wires, "R2") == []
+        assert index.wires_for(wires, "R3") == wires
+
+    def test_plain_lists_are_never_stale(self, index):
+        wires = [_wire("R1", 0, "R2", 0)]
+        index.wires_for(wires, "R1")
+        wires[0] = _wire("R3", 0, "R4", 0)
+        assert index.wires_for(wires, "R1") == []
+
+    def test_self_loop_listed_once(self, index):
+        wires = [_wire("R1", 0, "R1", 1)]
+        assert index.wires_for(wires, "R1") == wires
+
+
+class TestCircuitModelIndex:
+    def _controller(self):
+        ctrl = CircuitController(CircuitModel())
+        for x in (0, 100, 200):
+            ctrl.add_component("Resistor", (x, 0))
+        ctrl.add_wire("R1", 1, "R2", 0)
+        ctrl.add_wire("R2", 1, "R3", 0)
+        ctrl.add_wire("R1", 0, "R3", 1)
+        return ctrl
+
+    def test_remove_component_returns_connected_indices(self):
+        ctrl = self._controller()
+        assert ctrl.model.remove_component("R3") == [1, 2]
+
+    def test_model_wires_replaced_in_place(self):
+        ctrl = self._controller()
+        ctrl.model.wires_for_component("R2")
+        ctrl.model.wires[0] = _wire("R1", 1, "R3", 1)
+        assert ctrl.model.wire_indices_for_component("R2") == [1]
+
+    def test_lookups_follow_wire_removal(self):
+        ctrl = self._controller()
+        ctrl.remove_wire(0)
+        assert ctrl.model.wires_for_component("R2") == [ctrl.model.wires[0]]
+        assert ctrl.model.wire_indices_for_component("R3") == [0, 1]
+
+    def test_duplicate_check_uses_terminal_index(self):
+        ctrl = self._controller()
+        assert ctrl.has_duplicate_wire("R2", 0, "R1", 1)
+        assert not ctrl.has_duplicate_wire("R2", 0, "R1", 0)
+        assert ctrl.add_wire("R3", 0, "R2", 1) is None
+
+    def test_copy_on_write_wire_is_reindexed(self):
+        ctrl = self._controller()
+        clone = ctrl.model.copy()
+        owned = clone.own_wire(0)
+        assert clone.wires_at_terminal("R1", 1)[0] is owned
+        assert ctrl.model.wires_at_terminal("R1", 1)[0] is not owned
+
+    def test_undo_delete_wire_restores_lookup(self):
+        from controllers.commands import DeleteWireCommand
+
+        ctrl = self._controller()
+        command = DeleteWireCommand(ctrl, 0)
+        command.execute()
+        assert ctrl.model.wires_for_component("R1") == [ctrl.model.wires[1]]
+        command.undo()
+        assert ctrl.model.wire_indices_for_component("R1") == [0, 2]
+
+    def test_clear_and_load(self):
+        ctrl = self._controller()
+        data = ctrl.model.to_dict()
+        ctrl.model.clear()
+        assert ctrl.model.wires_for_component("R1") == []
+        loaded = CircuitModel.from_dict(data)
+        assert len(loaded.wires_for_component("R2")) == 2
+
+
+class TestCanvasIndex:
+    @pytest.fixture
+    def canvas(self, qtbot):
+        from GUI.circuit_canvas import CircuitCanvasView
+
+        ctrl = CircuitController(CircuitModel())
+        view = CircuitCanvasView(ctrl)
+        qtbot.addWidget(view)
+        for x in (0, 200):
+            ctrl.add_component("Resistor", (x, 0))
+        ctrl.add_wire("R1", 1, "R2", 0)
+        ctrl.add_wire("R1", 0, "R2", 1)
+        yield view, ctrl
+        view._cancel_background_routes()
+
+    def test_wires_follow_model_edits(self, canvas):
+        view, ctrl = canvas
+        r1 = view.components["R1"]
+        assert view.wires_for_component(r1) == view.wires
+        ctrl.remove_wire(0)
+        assert view.wires_for_component(r1) == view.wires
+        ctrl.clear_circuit()
+        assert view.wires_for_component(r1) == []
+
+    def test_drag_preview_only_touches_attached_wires(self, canvas):
+        from unittest.mock import patch
+
+        from PyQt6.QtCore import QPointF
+        from PyQt6.QtWidgets import QGraphicsItem
+
+        view, ctrl = canvas
+        ctrl.add_component("Resistor", (0, 300))
+        ctrl.add_component("Resistor", (200, 300))
+        ctrl.add_wire("R3", 1, "R4", 0)
+        unrelated = view.wires[-1]
+        r1 = view.components["R1"]
+        with patch.object(type(unrelated), "show_drag_preview", autospec=True) as preview:
+            r1.itemChange(QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged, QPointF(0, 0))
+        previewed = [call.args[0] for call in preview.call_args_list]
+        assert unrelated not in previewed
+        assert len(previewed) == 2
+
+
+class TestNoQtInWireIndex:
+    def test_no_pyqt_imports(self):
+        import models.wire_index as mod
+
+        source = Path(mod.__file__).read_text(encoding="utf-8")
+        assert "PyQt" not in source
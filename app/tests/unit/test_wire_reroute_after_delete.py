@@ -14,13 +14,16 @@ class TestRerouteWiresNearComponents:
 
     def _make_canvas(self):
         """Create a minimal mock canvas with the real _reroute method."""
-        from GUI.circuit_canvas import CircuitCanvasView
+        from GUI.circuit_canvas import CircuitCanvasView, _wire_item_endpoints
+        from models.wire_index import WireIndex
 
         # Grab the unbound method so we can call it on our mock
         reroute = CircuitCanvasView._reroute_wires_near_components
 
         canvas = MagicMock()
         canvas._reroute_wires_near_components = lambda comps: reroute(canvas, comps)
+        canvas._wire_index = WireIndex(_wire_item_endpoints)
+        canvas.wires_for_component = lambda comp: CircuitCanvasView.wires_for_component(canvas, comp)
         canvas._scene = MagicMock()
         return canvas
 
@@ -139,6 +142,7 @@ class TestHandleWireRemovedReroutes:
 
         canvas = MagicMock()
         canvas._handle_wire_removed = lambda idx: handle(canvas, idx)
+        canvas._batch_reroute_neighbours = None  # not replaying a batch
 
         comp_a = MagicMock(name="A")
         comp_b = MagicMock(name="B")
@@ -159,6 +163,7 @@ class TestHandleWireRemovedReroutes:
 
         canvas = MagicMock()
         canvas._handle_wire_removed = lambda idx: handle(canvas, idx)
+        canvas._batch_reroute_neighbours = None  # not replaying a batch
 
         wire = MagicMock()
         canvas.wires = [wire]
@@ -109,6 +109,17 @@ class TestSingleReroutePath:
         assert hasattr(ComponentGraphicsItem, "_schedule_controller_update")
 
 
+def _mock_canvas(canvas_class):
+    """Mock canvas that keeps the real component -> wire lookup."""
+    from GUI.circuit_canvas import _wire_item_endpoints
+    from models.wire_index import WireIndex
+
+    canvas = Mock(spec=canvas_class)
+    canvas._wire_index = WireIndex(_wire_item_endpoints)
+    canvas.wires_for_component = lambda comp: canvas_class.wires_for_component(canvas, comp)
+    return canvas
+
+
 class TestCoSelectedRerouteDedup:
     """Tests for #190: wires between co-selected components rerouted once."""
 
@@ -120,7 +131,7 @@ class TestCoSelectedRerouteDedup:
         """
         from GUI.circuit_canvas import CircuitCanvasView
 
-        canvas = Mock(spec=CircuitCanvasView)
+        canvas = _mock_canvas(CircuitCanvasView)
         canvas._scene = Mock()
         canvas.viewport = Mock(return_value=Mock())
         canvas.window = Mock(return_value=None)
@@ -157,7 +168,7 @@ class TestCoSelectedRerouteDedup:
         """
         from GUI.circuit_canvas import CircuitCanvasView
 
-        canvas = Mock(spec=CircuitCanvasView)
+        canvas = _mock_canvas(CircuitCanvasView)
         canvas._scene = Mock()
         canvas.viewport = Mock(return_value=Mock())
         canvas.window = Mock(return_value=None)
@@ -190,7 +201,7 @@ class TestCoSelectedRerouteDedup:
         """Wire should not be rerouted if other endpoint has lower ID and is selected."""
         from GUI.circuit_canvas import CircuitCanvasView
 
-        canvas = Mock(spec=CircuitCanvasView)
+        canvas = _mock_canvas(CircuitCanvasView)
         canvas._scene = Mock()
         canvas.viewport = Mock(return_value=Mock())
         canvas.window = Mock(return_value=None)
@@ -220,7 +231,7 @@ class TestCoSelectedRerouteDedup:
         """Wire should be rerouted when caller has the lower component ID."""
         from GUI.circuit_canvas import CircuitCanvasView
 
-        canvas = Mock(spec=CircuitCanvasView)
+        canvas = _mock_canvas(CircuitCanvasView)
         canvas._scene = Mock()
         canvas.viewport = Mock(return_value=Mock())
         canvas.window = Mock(return_value=None)
@@ -248,7 +259,7 @@ class TestCoSelectedRerouteDedup:
         """Wire should always be rerouted if other endpoint is not selected."""
         from GUI.circuit_canvas import CircuitCanvasView
 
-        canvas = Mock(spec=CircuitCanvasView)
+        canvas = _mock_canvas(CircuitCanvasView)
         canvas._scene = Mock()
         canvas.viewport = Mock(return_value=Mock())
         canvas.window = Mock(return_value=None)
@@ -0,0 +1,140 @@
+"""Wait for a single file to change on disk.
+
+Uses OS change notifications through the optional ``watchdog`` package
+when it is installed and falls back to polling the file's stat signature
+otherwise.  Editors often save in several steps (truncate + write, or
+write a temp file and rename it over the original), so a change is only
+reported once the file has stopped changing for a short settle period.
+
+No Qt dependencies — pure computation module.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+DEFAULT_POLL_INTERVAL = 0.1
+DEFAULT_SETTLE = 0.05
+
+
+def file_signature(path: str) -> Optional[tuple]:
+    """(mtime_ns, size, inode) of *path*, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileWatcher:
+    """Report changes to one file.
+
+    Usage::
+
+        with FileWatcher("circuit.json") as watcher:
+            while watcher.wait_for_change():
+                reload()
+
+    Args:
+        path: File to watch.  It may be missing temporarily (e.g. during an
+            atomic save); a change is reported once it reappears.
+        poll_interval: Seconds between stat checks when polling.
+        settle: Seconds the file must stay unchanged before reporting.
+        use_notifications: Use watchdog if available (False forces polling).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        settle: float = DEFAULT_SETTLE,
+        use_notifications: bool = True,
+    ):
+        self.path = os.path.abspath(path)
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self._signature = file_signature(self.path)
+        self._event = threading.Event()
+        self._stopped = threading.Event()
+        self._observer = self._start_observer() if use_notifications else None
+
+    @property
+    def uses_notifications(self) -> bool:
+        return self._observer is not None
+
+    def _start_observer(self):
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+
+        watched = self.path
+        event = self._event
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, fs_event):
+                paths = (getattr(fs_event, "src_path", ""), getattr(fs_event, "dest_path", ""))
+                if any(p and os.path.abspath(p) == watched for p in paths):
+                    event.set()
+
+        observer = Observer()
+        # Watch the directory so atomic replace-by-rename is seen too
+        observer.schedule(_Handler(), os.path.dirname(self.path), recursive=False)
+        try:
+            observer.start()
+        except OSError:
+            return None
+        return observer
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Block until the file changes and settles.
+
+        Returns:
+            True on a change; False on *timeout* or after stop().
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._stopped.is_set():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            wait = self.poll_interval if remaining is None else min(self.poll_interval, remaining)
+            # With notifications the event normally fires first; the stat
+            # check still catches anything the observer missed
+            self._event.wait(wait)
+            self._event.clear()
+            if self._stopped.is_set():
+                return False
+            signature = file_signature(self.path)
+            if signature is None or signature == self._signature:
+                continue
+            signature = self._settled(signature)
+            if signature is not None and signature != self._signature:
+                self._signature = signature
+                return True
+        return False
+
+    def _settled(self, signature: tuple) -> Optional[tuple]:
+        """Wait until the signature stops changing and return its final value."""
+        while True:
+            time.sleep(self.settle)
+            current = file_signature(self.path)
+            if current == signature or self._stopped.is_set():
+                return current
+            signature = current
+
+    def stop(self) -> None:
+        """Stop watching; a blocked wait_for_change() returns False."""
+        self._stopped.set()
+        self._event.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,144 @@
+"""Import-time budget check for GUI startup.
+
+Plotting and analysis modules (matplotlib, NumPy, SciPy) are imported
+lazily, the first time a result dialog or analysis engine needs them, so
+the main window can appear without paying for them.  This module verifies
+that stays true::
+
+    python main.py --startup-profile
+
+The check imports the main window in a fresh interpreter with
+``-X importtime``, reports the slowest imports, and fails when the total
+exceeds the budget or when a deferred module was pulled in eagerly.  In a
+frozen (PyInstaller) build, where ``-X importtime`` is unavailable, the
+import is timed in-process instead.
+
+No Qt dependencies — pure computation module.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+STARTUP_MODULE = "GUI.main_window"
+
+# Top-level packages that must not be imported before first use
+DEFERRED_PACKAGES = ("matplotlib", "numpy", "scipy", "pandas")
+
+DEFAULT_BUDGET_MS = 1500.0
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output."""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    """Outcome of profiling the startup import."""
+
+    module: str
+    total_ms: float
+    imported: set[str] = field(default_factory=set)
+    records: list[ImportRecord] = field(default_factory=list)
+
+    @property
+    def eager_deferred(self) -> list[str]:
+        """Deferred packages that were imported during startup."""
+        return [pkg for pkg in DEFERRED_PACKAGES if pkg in self.imported]
+
+    def slowest(self, count: int = 10) -> list[ImportRecord]:
+        """The *count* imports with the largest self time."""
+        return sorted(self.records, key=lambda r: r.self_ms, reverse=True)[:count]
+
+    def problems(self, budget_ms: float = DEFAULT_BUDGET_MS) -> list[str]:
+        """Human-readable budget violations; empty when startup is within budget."""
+        issues = [f"'{pkg}' is imported at startup; import it on first use instead" for pkg in self.eager_deferred]
+        if self.total_ms > budget_ms:
+            issues.append(f"Startup imports took {self.total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+        return issues
+
+
+def parse_importtime(text: str) -> list[ImportRecord]:
+    """Parse the stderr of ``python -X importtime``."""
+    records = []
+    for line in text.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us) / 1000.0, int(cumulative_us) / 1000.0, len(indent) // 2))
+    return records
+
+
+def _top_level(records: list[ImportRecord]) -> set[str]:
+    return {r.module.split(".", 1)[0] for r in records}
+
+
+def _profile_subprocess(module: str) -> StartupProfile:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=app_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        last_line = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else ""
+        raise RuntimeError(f"Importing {module} failed: {last_line}")
+    records = parse_importtime(proc.stderr)
+    total = next((r.cumulative_ms for r in reversed(records) if r.module == module and r.depth == 0), 0.0)
+    total = total or sum(r.self_ms for r in records)
+    return StartupProfile(module, total, _top_level(records), records)
+
+
+def _profile_in_process(module: str) -> StartupProfile:
+    import importlib
+
+    before = set(sys.modules)
+    start = time.perf_counter()
+    importlib.import_module(module)
+    total = (time.perf_counter() - start) * 1000.0
+    imported = {name.split(".", 1)[0] for name in set(sys.modules) - before}
+    return StartupProfile(module, total, imported)
+
+
+def profile_startup(module: str = STARTUP_MODULE) -> StartupProfile:
+    """Measure the imports needed to show the main window.
+
+    Uses a fresh ``-X importtime`` interpreter when running from source and
+    falls back to in-process timing in a frozen build.
+    """
+    if getattr(sys, "frozen", False):
+        return _profile_in_process(module)
+    return _profile_subprocess(module)
+
+
+def print_startup_profile(profile: StartupProfile, budget_ms: float = DEFAULT_BUDGET_MS, count: int = 10) -> None:
+    """Print the profile to stdout in a human-readable format."""
+    print("Spice GUI Startup Profile")
+    print("=" * 40)
+    print(f"  import {profile.module}: {profile.total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+    if profile.records:
+        print("  Slowest imports (self time):")
+        for record in profile.slowest(count):
+            print(f"    {record.self_ms:8.1f} ms  {record.module}")
+    print("-" * 40)
+    problems = profile.problems(budget_ms)
+    if not problems:
+        print("Startup is within budget")
+    for problem in problems:
+        print(f"  [FAIL] {problem}")